@@ -0,0 +1,359 @@
+"""
+Places the states, connectors and the reset entry of a design automatically by a layered layout:
+The nodes are put into rows by their distance (number of transitions) from the reset entry. The order inside each
+row is improved by some sweeps, which move each node to the mean position of its neighbours (barycenter heuristic),
+so that the transitions get short and cross less often.
+
+The layout is calculated on the design dictionary (the format of a .hfe-file), so that it can be used without GUI:
+    python main.py --auto-layout designs/legacy_table.hfe
+In the GUI (button "auto layout") the new coordinates are applied to the canvas items, the transitions are shortened
+to the state borders by TransitionLine.shorten_to_state_border and the layout is stored as one undo step.
+
+All transitions are drawn as straight lines (or loops), the condition&action blocks are placed next to the middle of
+their transition, state action and state comment blocks keep their distance to their state. The blocks which are
+not connected to a state (global actions, default state actions) are not moved.
+
+The coordinates are held in plain Python lists. NumPy arrays would not be faster here: only the ordering of the
+rows could be vectorized, and for 1000 states that took longer than the loops over lists.
+"""
+
+import json
+import math
+import re
+from collections import deque
+
+_NUMBER_OF_SWEEPS = 24
+_NODE_DISTANCE = 8  # in state radii, between neighbours in a row
+_ROW_DISTANCE = 8  # in state radii, between the rows
+_BEND = 1.5  # in state radii, distance between parallel transitions of the same pair of nodes
+_NODE_ELEMENT_NAMES = ("state", "rectangle", "polygon")
+_TRANSITION_REGEX = re.compile(r"transition\d+$")
+
+
+def layout_files(file_names) -> bool:
+    """Replaces the layout of each file by the automatic layout. Returns True, when all files were written."""
+    success = True
+    for file_name in file_names:
+        try:
+            with open(file_name, encoding="utf-8") as fileobject:
+                design_dictionary = json.load(fileobject)
+            layout_design_dictionary(design_dictionary)
+            shorten_transitions(design_dictionary)
+            with open(file_name, "w", encoding="utf-8") as fileobject:
+                json.dump(design_dictionary, fileobject, indent=4, default=str, ensure_ascii=False)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print("Error: The layout of " + file_name + " could not be changed: " + str(e))
+            success = False
+        else:
+            print("Changed the layout of " + file_name)
+    return success
+
+
+def layout_diagram() -> None:
+    """Applies the automatic layout to the diagram in the canvas (as one undo step)."""
+    import canvas_editing
+    import file_handling
+    import undo_handling
+    from elements import transition
+    from project_manager import project_manager
+    from spatial_index import spatial_index
+
+    canvas = project_manager.canvas
+    design_dictionary = file_handling.get_design_dictionary()
+    if not layout_design_dictionary(design_dictionary):
+        return
+    for element_name in (*_NODE_ELEMENT_NAMES, "line", "text"):
+        for definition in design_dictionary[element_name]:
+            canvas.coords(definition[1][0], definition[0])
+    for element_name in ("window_state_action_block", "window_state_comment", "window_condition_action_block"):
+        for definition in design_dictionary[element_name]:
+            canvas.coords(definition[-1][0], definition[0])
+    for element_name in ("state", "rectangle"):
+        for definition in design_dictionary[element_name]:
+            if not definition[1][0].startswith("transition"):  # not a priority rectangle
+                spatial_index.update(canvas.find_withtag(definition[1][0])[0], definition[0])
+    for _coords, tags in design_dictionary["line"]:
+        if _TRANSITION_REGEX.match(tags[0]):
+            transition.TransitionLine.shorten_to_state_border(tags[0])
+            _move_ca_connection_to_transition_start(canvas, tags, canvas.coords(tags[0]))
+    undo_handling.design_has_changed()
+    canvas_editing.view_all()
+
+
+def _move_ca_connection_to_transition_start(canvas, transition_tags, transition_coords) -> None:
+    for tag in transition_tags:
+        if tag.startswith("ca_connection") and tag.endswith("_end"):
+            ca_connection_tag = tag[:-4]
+            ca_connection_coords = canvas.coords(ca_connection_tag)
+            canvas.coords(ca_connection_tag, *ca_connection_coords[:2], transition_coords[0], transition_coords[1])
+
+
+########################################################################################################################
+
+
+def layout_design_dictionary(design_dictionary) -> bool:
+    """Moves all nodes and the blocks connected to them to the automatic layout. The transitions are drawn from node
+    center to node center and must be shortened to the node borders afterwards. Returns False for an empty design."""
+    nodes, node_index_by_tag = _get_nodes(design_dictionary)
+    if not nodes:
+        return False
+    edges = _get_edges(design_dictionary, node_index_by_tag)
+    layer = _get_layers(len(nodes), edges, node_index_by_tag.get("reset_entry"))
+    position = _order_layers(layer, [(start, end) for _, start, end in edges if start != end])
+    state_radius = design_dictionary["state_radius"]
+    # The layout starts at the upper left corner of the old layout:
+    left = min(node["center"][0] for node in nodes)
+    top = min(node["center"][1] for node in nodes)
+    left, top = state_radius * round(left / state_radius), state_radius * round(top / state_radius)
+    offset = -min(position)
+    for index, node in enumerate(nodes):
+        new_center = (
+            left + (position[index] + offset) * _NODE_DISTANCE * state_radius,
+            top + layer[index] * _ROW_DISTANCE * state_radius,
+        )
+        node["move"] = (new_center[0] - node["center"][0], new_center[1] - node["center"][1])
+        node["center"] = new_center
+        node["definition"][0] = _move_coords(node["definition"][0], node["move"])
+    _move_texts_of_nodes(design_dictionary, nodes, node_index_by_tag)
+    _move_state_blocks(design_dictionary, nodes, node_index_by_tag)
+    label_points = _route_transitions(design_dictionary, nodes, edges, state_radius)
+    _move_condition_action_blocks(design_dictionary, label_points, state_radius)
+    return True
+
+
+def _get_nodes(design_dictionary) -> tuple:
+    nodes = []
+    node_index_by_tag = {}
+    for element_name in _NODE_ELEMENT_NAMES:
+        for definition in design_dictionary.get(element_name, []):
+            tag = definition[1][0]
+            if tag.startswith("transition"):  # priority rectangle
+                continue
+            coords = definition[0]
+            if element_name == "polygon":  # The transitions start at the point corner of the reset entry.
+                center = (coords[4], coords[5])
+            else:
+                center = ((coords[0] + coords[2]) / 2, (coords[1] + coords[3]) / 2)
+            node_index_by_tag[tag] = len(nodes)
+            nodes.append({"tag": tag, "definition": definition, "center": center, "move": (0, 0)})
+    return nodes, node_index_by_tag
+
+
+def _get_edges(design_dictionary, node_index_by_tag) -> list:
+    edges = []
+    for definition in design_dictionary.get("line", []):
+        tags = definition[1]
+        if not _TRANSITION_REGEX.match(tags[0]):
+            continue
+        start = end = None
+        for tag in tags:
+            if tag.startswith("coming_from_"):
+                start = node_index_by_tag[tag[12:]]
+            elif tag.startswith("going_to_"):
+                end = node_index_by_tag[tag[9:]]
+        edges.append((definition, start, end))
+    return edges
+
+
+def _get_layers(number_of_nodes, edges, reset_entry_index) -> list:
+    """Returns the row of each node: the number of transitions on the shortest path from the reset entry.
+    Nodes which cannot be reached from the reset entry get rows by their distance from the first such node."""
+    successors = [[] for _ in range(number_of_nodes)]
+    for _, start, end in edges:
+        successors[start].append(end)
+    layer = [-1] * number_of_nodes
+    roots = ([reset_entry_index] if reset_entry_index is not None else []) + list(range(number_of_nodes))
+    for root in roots:
+        if layer[root] != -1:
+            continue
+        layer[root] = 0
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for successor in successors[node]:
+                if layer[successor] == -1:
+                    layer[successor] = layer[node] + 1
+                    queue.append(successor)
+    return layer
+
+
+def _order_layers(layer, edges) -> list:
+    """Returns the position of each node in its row, the rows are centered at position 0."""
+    number_of_nodes = len(layer)
+    row_sizes = [0] * (max(layer) + 1)
+    for row in layer:
+        row_sizes[row] += 1
+    neighbours = [[] for _ in range(number_of_nodes)]
+    for start, end in edges:
+        neighbours[start].append(end)
+        neighbours[end].append(start)
+    position = [0.0] * number_of_nodes
+    keys = [(row, index) for index, row in enumerate(layer)]
+    for _ in range(_NUMBER_OF_SWEEPS + 1):
+        rank_in_row = [0] * len(row_sizes)
+        for key in sorted(keys):
+            index = key[-1]
+            row = layer[index]
+            position[index] = rank_in_row[row] - (row_sizes[row] - 1) / 2
+            rank_in_row[row] += 1
+        keys = [
+            (row, _get_barycenter(position, neighbours[index], position[index]), position[index], index)
+            for index, row in enumerate(layer)
+        ]
+    return position
+
+
+def _get_barycenter(position, neighbours, default) -> float:
+    if not neighbours:
+        return default
+    return sum(position[neighbour] for neighbour in neighbours) / len(neighbours)
+
+
+def _move_coords(coords, move) -> list:
+    return [coordinate + move[index % 2] for index, coordinate in enumerate(coords)]
+
+
+def _move_texts_of_nodes(design_dictionary, nodes, node_index_by_tag) -> None:
+    for definition in design_dictionary.get("text", []):
+        tag = definition[1][0]
+        if tag == "reset_text":
+            node_tag = "reset_entry"
+        elif tag.endswith("_name"):
+            node_tag = tag[:-5]
+        else:  # The priorities are placed when the transitions are shortened.
+            continue
+        if node_tag in node_index_by_tag:
+            definition[0] = _move_coords(definition[0], nodes[node_index_by_tag[node_tag]]["move"])
+
+
+def _move_state_blocks(design_dictionary, nodes, node_index_by_tag) -> None:
+    """State action and state comment blocks keep their distance to the state, their lines end at the state center."""
+    state_tag_by_line_tag = {}
+    for definition in design_dictionary.get("state", []):
+        for tag in definition[1]:
+            if (tag.startswith("connection") and tag.endswith("_end")) or tag.endswith("_comment_line_end"):
+                state_tag_by_line_tag[tag[:-4]] = definition[1][0]
+    lines = {line[1][0]: line for line in design_dictionary.get("line", [])}
+    for element_name in ("window_state_action_block", "window_state_comment"):
+        for definition in design_dictionary.get(element_name, []):
+            line_tag = definition[-1][1][: -len("_start")]
+            state_tag = state_tag_by_line_tag.get(line_tag)
+            if state_tag is None:
+                continue
+            node = nodes[node_index_by_tag[state_tag]]
+            definition[0] = _move_coords(definition[0], node["move"])
+            if line_tag in lines:
+                lines[line_tag][0] = [*definition[0], *node["center"]]
+
+
+def _route_transitions(design_dictionary, nodes, edges, state_radius) -> dict:
+    """Draws each transition from the center of its start node to the center of its end node. Transitions between
+    the same nodes are bent apart, a transition back to its start node is drawn as loop above the node.
+    Returns the point next to which the condition&action block of each transition is placed."""
+    label_points = {}
+    edges_by_pair = {}
+    for definition, start, end in edges:
+        edges_by_pair.setdefault((min(start, end), max(start, end)), []).append((definition, start, end))
+    for (first, second), pair_edges in edges_by_pair.items():
+        first_x, first_y = nodes[first]["center"]
+        second_x, second_y = nodes[second]["center"]
+        for number, (definition, start, end) in enumerate(pair_edges):
+            start_x, start_y = nodes[start]["center"]
+            end_x, end_y = nodes[end]["center"]
+            if start == end:
+                height = (3 + number) * state_radius
+                width = (1 + number / 2) * state_radius
+                definition[0] = [
+                    start_x, start_y,
+                    start_x - width, start_y - height,
+                    start_x + width, start_y - height,
+                    start_x, start_y,
+                ]  # fmt: skip
+                label_points[definition[1][0]] = (start_x + width, start_y - height)
+                continue
+            bend = (number - (len(pair_edges) - 1) / 2) * _BEND * state_radius
+            middle_x, middle_y = (start_x + end_x) / 2, (start_y + end_y) / 2
+            if bend == 0:
+                definition[0] = [start_x, start_y, end_x, end_y]
+            else:
+                # The normal is calculated from the pair, so transitions in opposite directions are bent apart:
+                length = math.hypot(second_x - first_x, second_y - first_y) or 1
+                middle_x += bend * (second_y - first_y) / length
+                middle_y -= bend * (second_x - first_x) / length
+                definition[0] = [start_x, start_y, middle_x, middle_y, end_x, end_y]
+            label_points[definition[1][0]] = (middle_x, middle_y)
+    return label_points
+
+
+def _move_condition_action_blocks(design_dictionary, label_points, state_radius) -> None:
+    transition_tag_by_ca_connection_tag = {}
+    lines = {line[1][0]: line for line in design_dictionary.get("line", [])}
+    for definition in design_dictionary.get("line", []):
+        for tag in definition[1]:
+            if tag.startswith("ca_connection") and tag.endswith("_end"):
+                transition_tag_by_ca_connection_tag[tag[:-4]] = definition[1][0]
+    for definition in design_dictionary.get("window_condition_action_block", []):
+        ca_connection_tag = definition[-1][1][: -len("_anchor")]
+        transition_tag = transition_tag_by_ca_connection_tag.get(ca_connection_tag)
+        if transition_tag is None:
+            continue
+        label_x, label_y = label_points[transition_tag]
+        definition[0] = [label_x + state_radius / 2, label_y]
+        if ca_connection_tag in lines:
+            # The end point is moved to the transition start, when the transition is shortened:
+            lines[ca_connection_tag][0] = [*definition[0], *lines[ca_connection_tag][0][2:]]
+
+
+########################################################################################################################
+
+
+def shorten_transitions(design_dictionary) -> None:
+    """Does the same as TransitionLine.shorten_to_state_border for all transitions of the design dictionary:
+    The ends of each transition are moved to the node borders and the priority is placed at the transition start."""
+    from elements.transition import TransitionLine
+
+    node_coords = {}
+    for element_name in _NODE_ELEMENT_NAMES:
+        for definition in design_dictionary.get(element_name, []):
+            node_coords[definition[1][0]] = definition[0]
+    texts = {definition[1][0]: definition for definition in design_dictionary.get("text", [])}
+    rectangles = {definition[1][0]: definition for definition in design_dictionary.get("rectangle", [])}
+    ca_connection_lines = {}
+    for definition in design_dictionary.get("line", []):
+        if definition[1][0].startswith("ca_connection"):
+            ca_connection_lines[definition[1][0]] = definition
+    priority_distance = design_dictionary["priority_distance"]
+    for definition in design_dictionary.get("line", []):
+        tags = definition[1]
+        if not _TRANSITION_REGEX.match(tags[0]):
+            continue
+        coords = definition[0]
+        start_tag = next(tag[12:] for tag in tags if tag.startswith("coming_from_"))
+        end_tag = next(tag[9:] for tag in tags if tag.startswith("going_to_"))
+        start_coords, end_coords = node_coords[start_tag], node_coords[end_tag]
+        start_radius = 0 if start_tag == "reset_entry" else (start_coords[2] - start_coords[0]) / 2
+        end_radius = (end_coords[2] - end_coords[0]) / 2
+        x0, y0, x1, y1 = coords[:4]
+        coords[:2] = TransitionLine.shorten_vector(start_radius, x0, y0, 0, x1, y1, 1, 0)[:2]
+        x0, y0, x1, y1 = coords[-4:]
+        coords[-2:] = TransitionLine.shorten_vector(0, x0, y0, end_radius, x1, y1, 0, 1)[2:]
+        x0, y0, x1, y1 = coords[:4]
+        priority_x, priority_y = TransitionLine.shorten_vector(priority_distance, x0, y0, 0, x1, y1, 1, 0)[:2]
+        priority_tag = tags[0] + "priority"
+        if priority_tag in texts:
+            texts[priority_tag][0] = [priority_x, priority_y]
+        rectangle_tag = tags[0] + "rectangle"
+        if rectangle_tag in rectangles:
+            rectangle_coords = rectangles[rectangle_tag][0]
+            half_width = (rectangle_coords[2] - rectangle_coords[0]) / 2
+            half_height = (rectangle_coords[3] - rectangle_coords[1]) / 2
+            rectangles[rectangle_tag][0] = [
+                priority_x - half_width,
+                priority_y - half_height,
+                priority_x + half_width,
+                priority_y + half_height,
+            ]
+        for tag in tags:
+            if tag.startswith("ca_connection") and tag.endswith("_end") and tag[:-4] in ca_connection_lines:
+                line = ca_connection_lines[tag[:-4]]
+                line[0] = [*line[0][:2], coords[0], coords[1]]
@@ -5,6 +5,7 @@ all its connected parts.
 
 from tkinter import messagebox
 
+import selection
 import undo_handling
 from elements import (
     condition_action,
@@ -29,7 +30,13 @@ class CanvasDelete:
 
     def __init__(self):
         self.item_was_deleted = False
-        ids = self._find_items_to_delete()
+        # A selected group is deleted in one batch, so that only one undo entry is created.
+        # As <Delete> is bound to all widgets, the group is only deleted when the Canvas has the focus:
+        if selection.get_selected_ids() and selection.canvas_has_focus():
+            ids = selection.get_selected_ids()
+            selection.forget()
+        else:
+            ids = self._find_items_to_delete()
         for canvas_id in ids:
             self._delete_item(canvas_id)
         if self.item_was_deleted:
@@ -2,6 +2,7 @@
 This module contains method used when the user edits the diagram.
 """
 
+import re
 from tkinter import messagebox
 
 import canvas_modify_bindings
@@ -17,10 +18,15 @@ from elements import (
     state_comment,
 )
 from project_manager import project_manager
+from spatial_index import spatial_index
 
 # import inspect
 
 _abs_zoom_factor: float = 1.0
+_apply_fontsize_after_id = None
+_collapsed_text_widgets: list = []
+_collapse_after_id = None
+_BOUND_COMMAND_REGEX = re.compile(r'"\[(\S+) ')  # Finds the command name in the script created by tag_bind.
 
 
 def translate_window_event_coordinates_in_rounded_canvas_coordinates(event) -> list:
@@ -37,6 +43,17 @@ def translate_window_event_coordinates_in_exact_canvas_coordinates(event) -> lis
     return [canvas_grid_x_coordinate, canvas_grid_y_coordinate]
 
 
+def delete_bindings_of_items(*canvas_ids) -> None:
+    """
+    Must be called before canvas items with bindings are deleted. Tk removes the bindings of a deleted item,
+    but the Tcl commands created by tag_bind stay registered and keep their Python callbacks alive.
+    """
+    for canvas_id in canvas_ids:
+        for sequence in project_manager.canvas.tag_bind(canvas_id):
+            for command in _BOUND_COMMAND_REGEX.findall(project_manager.canvas.tag_bind(canvas_id, sequence)):
+                project_manager.canvas.deletecommand(command)
+
+
 def start_view_rectangle(event) -> None:
     [event_x, event_y] = translate_window_event_coordinates_in_exact_canvas_coordinates(event)
     rectangle_id = project_manager.canvas.create_rectangle(event_x, event_y, event_x, event_y, dash=(3, 5))
@@ -85,6 +102,7 @@ def view_rectangle(complete_rectangle, check_fit) -> None:
 
 def view_all() -> None:
     project_manager.grid_drawer.remove_grid()
+    project_manager.window_culling.show_all_windows()
     complete_rectangle = project_manager.canvas.bbox("all")
     if complete_rectangle is not None:
         view_rectangle(complete_rectangle, check_fit=True)
@@ -138,9 +156,11 @@ def canvas_zoom(zoom_center, zoom_factor) -> None:
         project_manager.canvas.scale(
             "all", 0, 0, zoom_factor, zoom_factor
         )  # Scaling must use xoffset=0 and yoffset=0 to preserve the gridspacing of state_radius.
+        spatial_index.scale(zoom_factor)
         _scroll_canvas_to_show_the_zoom_center(zoom_center, zoom_factor)
         _adapt_scroll_bars(zoom_factor)
         _adapt_global_size_variables(zoom_factor)
+        project_manager.window_culling.update_after_idle()
 
 
 def zoom_wheel(event) -> None:
@@ -244,6 +264,8 @@ def _decrement_font_size_if_window_is_too_wide() -> None:
         project_manager.canvas.canvasx(project_manager.canvas.winfo_width()),
         project_manager.canvas.canvasy(project_manager.canvas.winfo_height()),
     ]
+    _apply_pending_font_sizes()  # The bounding box depends on the font sizes of the text boxes.
+    project_manager.window_culling.show_all_windows()
     complete_rectangle = project_manager.canvas.bbox("all")
     if (
         (
@@ -293,15 +315,32 @@ def _adapt_global_size_variables(factor) -> None:
 
 
 def _modify_font_sizes_of_all_canvas_items(factor) -> None:
+    global _apply_fontsize_after_id
     project_manager.fontsize *= factor
     project_manager.label_fontsize *= factor
-    used_label_fontsize = max(project_manager.label_fontsize, 1)
     project_manager.state_name_font.configure(size=int(project_manager.fontsize))
+    # Reconfiguring the fonts of all text boxes is expensive, so it is done only once,
+    # when the user has stopped zooming (the geometry of the diagram is already scaled):
+    if _apply_fontsize_after_id is not None:
+        project_manager.canvas.after_cancel(_apply_fontsize_after_id)
+    _apply_fontsize_after_id = project_manager.canvas.after(150, _apply_fontsize_to_canvas_items_after_idle)
+
+
+def _apply_pending_font_sizes() -> None:
+    if _apply_fontsize_after_id is not None:
+        project_manager.canvas.after_cancel(_apply_fontsize_after_id)
+        _apply_fontsize_to_canvas_items_after_idle()
+
+
+def _apply_fontsize_to_canvas_items_after_idle() -> None:
+    global _apply_fontsize_after_id
+    _apply_fontsize_after_id = None
+    used_label_fontsize = max(project_manager.label_fontsize, 1)
     _apply_fontsize_to_canvas_items(used_label_fontsize)
+    _collapse_text_boxes_if_unreadable()
 
 
 def _apply_fontsize_to_canvas_items(used_label_fontsize: float) -> None:
-    canvas_ids = project_manager.canvas.find_all()
     handlers = [
         (state_action.StateAction.ref_dict, _apply_font_to_state_action),
         (state_comment.StateComment.ref_dict, _apply_font_to_state_comment),
@@ -310,15 +349,59 @@ def _apply_fontsize_to_canvas_items(used_label_fontsize: float) -> None:
         (global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict, _apply_font_to_global_actions_combinatorial),
         (state_actions_default.StateActionsDefault.ref_dict, _apply_font_to_state_actions_default),
     ]
-    for canvas_id in canvas_ids:
-        if project_manager.canvas.type(canvas_id) != "window":
-            continue
-        for ref_dict, handler in handlers:
-            if canvas_id in ref_dict:
-                handler(ref_dict[canvas_id], used_label_fontsize)
-                break
-        else:
-            print("canvas_editing: Fatal, unknown dictionary key ", canvas_id)
+    for ref_dict, handler in handlers:
+        for canvas_id, ref in ref_dict.items():
+            if project_manager.canvas.type(canvas_id) == "window":  # Skip entries of already deleted windows.
+                handler(ref, used_label_fontsize)
+
+
+def collapse_text_boxes_after_idle() -> None:
+    """
+    Must be called when a canvas window is created (insert, open, undo/redo), so that a window created
+    at a small zoom level also shows only its labels. The windows are collapsed after they were filled.
+    """
+    global _collapse_after_id
+    if project_manager.fontsize < constants.MIN_READABLE_FONTSIZE and _collapse_after_id is None:
+        _collapse_after_id = project_manager.canvas.after_idle(_collapse_text_boxes_of_new_windows)
+
+
+def forget_collapsed_text_boxes() -> None:
+    """Must be called when the windows of the design are destroyed."""
+    global _collapsed_text_widgets
+    _collapsed_text_widgets = []
+
+
+def _collapse_text_boxes_of_new_windows() -> None:
+    global _collapse_after_id
+    _collapse_after_id = None
+    _collapse_text_boxes_if_unreadable()
+
+
+def _collapse_text_boxes_if_unreadable() -> None:
+    # At a small zoom level the text boxes cannot be read anyway, so only their labels are shown,
+    # which makes scrolling and zooming faster:
+    global _collapsed_text_widgets
+    if project_manager.fontsize >= constants.MIN_READABLE_FONTSIZE:
+        for text_widget in _collapsed_text_widgets:
+            if text_widget.winfo_exists():
+                text_widget.grid()  # Restores the grid options stored by grid_remove().
+        _collapsed_text_widgets = []
+        return
+    for ref_dict in (
+        state_action.StateAction.ref_dict,
+        state_comment.StateComment.ref_dict,
+        condition_action.ConditionAction.ref_dict,
+        global_actions_clocked.GlobalActionsClocked.ref_dict,
+        global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict,
+        state_actions_default.StateActionsDefault.ref_dict,
+    ):
+        for ref in ref_dict.values():
+            for attribute in ("text_id", "condition_id", "action_id", "text_before_id", "text_after_id"):
+                text_widget = getattr(ref, attribute, None)
+                # Text widgets removed by grid_forget() (empty condition or action) must stay removed:
+                if text_widget is not None and text_widget.winfo_manager() == "grid":
+                    text_widget.grid_remove()
+                    _collapsed_text_widgets.append(text_widget)
 
 
 def _apply_font_to_state_action(widget, used_label_fontsize: float) -> None:
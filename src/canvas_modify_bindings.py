@@ -6,6 +6,7 @@ inserting the different graphical objects.
 import canvas_editing
 import move_handling_canvas_item
 import move_handling_initialization
+import selection
 from elements import (
     connector,
     global_actions_clocked,
@@ -82,6 +83,7 @@ def switch_to_move_mode() -> None:
     #    print("switch_to_move_mode")
     project_manager.root.config(cursor="arrow")
     project_manager.canvas.focus_set()  # Removes the focus from the last used button.
+    selection.clear()
     project_manager.canvas.bind("<Button-1>", move_handling_initialization.move_initialization)
 
 
@@ -5,7 +5,6 @@ Methods needed for HDL generation
 import os
 import re
 import traceback
-import tkinter as tk
 from datetime import datetime
 from tkinter import messagebox
 
@@ -14,6 +13,7 @@ import tag_plausibility
 from codegen import hdl_generation_architecture, hdl_generation_library, hdl_generation_module
 from codegen.hdl_generation_config import GenerationConfig
 from constants import GuiTab
+from design_model import design_model
 from elements import state_comment
 from project_manager import project_manager
 
@@ -24,12 +24,19 @@ from .list_separation_check import ListSeparationCheck
 last_line_number_of_file1 = 0  # pylint: disable=invalid-name # module-level mutable
 
 
-def run_hdl_generation(write_to_file, is_script_mode: bool = False) -> bool:
+def run_hdl_generation(
+    write_to_file, is_script_mode: bool = False, save_design: bool = True, show_in_hdl_tab: bool = True
+) -> bool:
+    """
+    When save_design is False, the links are created without saving a modified design first.
+    When show_in_hdl_tab is False, the written files are not copied into the "Generated HDL" tab (used by fsm_api).
+    """
     config = GenerationConfig.from_main_window()
+    design_model.build()  # The graph of the diagram is read from the canvas tags only once per generation.
     state_tag_list_sorted = _create_sorted_state_tag_list(is_script_mode)
     success = False
     try:
-        _generate_hdl(config, write_to_file, state_tag_list_sorted)
+        _generate_hdl(config, write_to_file, state_tag_list_sorted, save_design, show_in_hdl_tab)
         success = True
     except GenerationError as e:
         if is_script_mode:
@@ -44,7 +51,13 @@ def run_hdl_generation(write_to_file, is_script_mode: bool = False) -> bool:
     return success
 
 
-def _generate_hdl(config: GenerationConfig, write_to_file: bool, state_tag_list_sorted: list) -> None:
+def _generate_hdl(
+    config: GenerationConfig,
+    write_to_file: bool,
+    state_tag_list_sorted: list,
+    save_design: bool = True,
+    show_in_hdl_tab: bool = True,
+) -> None:
     errors = config.validate()
     if errors:
         raise GenerationError("Error in HDL-FSM-Editor", errors)
@@ -53,7 +66,7 @@ def _generate_hdl(config: GenerationConfig, write_to_file: bool, state_tag_list_
         raise GenerationError(
             "Error", ["The database is corrupt. Therefore, no HDL is generated.", "See details at STDOUT."]
         )
-    if project_manager.root.title().endswith("*"):
+    if save_design and project_manager.root.title().endswith("*"):
         file_handling.save()
 
     # Create header with timestamp if enabled
@@ -63,10 +76,10 @@ def _generate_hdl(config: GenerationConfig, write_to_file: bool, state_tag_list_
     else:
         header = f"// Created by HDL-FSM-Editor{at_timestamp}\n"
 
-    _create_hdl(config, header, write_to_file, state_tag_list_sorted)
+    _create_hdl(config, header, write_to_file, state_tag_list_sorted, show_in_hdl_tab)
 
 
-def _create_hdl(config, header, write_to_file, state_tag_list_sorted) -> None:
+def _create_hdl(config, header, write_to_file, state_tag_list_sorted, show_in_hdl_tab=True) -> None:
     file_name, file_name_architecture = _get_file_names(config)
 
     project_manager.link_dict_ref.clear_link_dict(file_name)
@@ -93,7 +106,7 @@ def _create_hdl(config, header, write_to_file, state_tag_list_sorted) -> None:
     # write_hdl_file must be called even if hdl is not needed, as write_hdl_file sets last_line_number_of_file1,
     # which is read by Linking:
     hdl = _write_hdl_file(config, write_to_file, header, entity, architecture, file_name, file_name_architecture)
-    if write_to_file is True:
+    if write_to_file is True and show_in_hdl_tab:
         _copy_hdl_into_generated_hdl_tab(hdl, file_name, file_name_architecture)
 
 
@@ -102,13 +115,7 @@ def _copy_hdl_into_generated_hdl_tab(hdl, file_name, file_name_architecture) ->
     project_manager.date_of_hdl_file_shown_in_hdl_tab = os.path.getmtime(file_name)
     if file_name_architecture != "":
         project_manager.date_of_hdl_file2_shown_in_hdl_tab = os.path.getmtime(file_name_architecture)
-    project_manager.hdl_frame_text.config(state=tk.NORMAL)
-    project_manager.hdl_frame_text.delete("1.0", tk.END)
-    project_manager.hdl_frame_text.insert("1.0", hdl)
-    project_manager.hdl_frame_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
-    project_manager.hdl_frame_text.config(state=tk.DISABLED)
+    project_manager.tab_hdl_ref.show_hdl(hdl)
     project_manager.notebook.show_tab(GuiTab.GENERATED_HDL)
 
 
@@ -242,11 +249,8 @@ def _write_hdl_file(config, write_to_file, header, entity, architecture, path_na
             with open(path_name, "w", encoding="utf-8") as fileobject:
                 fileobject.write(content)
         last_line_number_of_file1 = content.count("\n") + 1  # For example: 3 lines are separated by 2 returns.
-        project_manager.size_of_file1_line_number = (
-            len(str(last_line_number_of_file1)) + 2
-        )  # "+2" because of string ": "
-        project_manager.size_of_file2_line_number = 0
-        content_with_numbers = _add_line_numbers(content)
+        # The line numbers are shown by the gutter of the HDL tab, the text gets only a last return:
+        hdl = content + "\n"
     else:
         content1 = "-- Filename: " + name_of_file + "\n"
         content1 += header
@@ -255,9 +259,6 @@ def _write_hdl_file(config, write_to_file, header, entity, architecture, path_na
             with open(path_name, "w", encoding="utf-8") as fileobject:
                 fileobject.write(content1)
         last_line_number_of_file1 = content1.count("\n") + 1  # For example: 3 lines are separated by 2 returns.
-        project_manager.size_of_file1_line_number = (
-            len(str(last_line_number_of_file1)) + 2
-        )  # "+2" because of string ": "
         _, name_of_architecture_file = os.path.split(path_name_architecture)
         content2 = "-- Filename: " + name_of_architecture_file + "\n"
         content2 += header
@@ -265,13 +266,8 @@ def _write_hdl_file(config, write_to_file, header, entity, architecture, path_na
         if write_to_file:
             with open(path_name_architecture, "w", encoding="utf-8") as fileobject:
                 fileobject.write(content2)
-        content_with_numbers1 = _add_line_numbers(content1)
-        content_with_numbers2 = _add_line_numbers(content2)
-        content_with_numbers = content_with_numbers1 + content_with_numbers2
-        project_manager.size_of_file2_line_number = (
-            len(str(content_with_numbers.count("\n"))) + 2
-        )  # "+2" because of string ": "
-    return content_with_numbers
+        hdl = content1 + "\n" + content2 + "\n"
+    return hdl
 
 
 def _get_file_names(config) -> tuple:
@@ -291,16 +287,6 @@ def _get_file_names(config) -> tuple:
     return file_name, file_name_architecture
 
 
-def _add_line_numbers(text) -> str:
-    text_lines = text.split("\n")
-    text_length_as_string = str(len(text_lines))
-    number_of_needed_digits_as_string = str(len(text_length_as_string))
-    content_with_numbers = ""
-    for line_number, line in enumerate(text_lines, start=1):
-        content_with_numbers += format(line_number, "0" + number_of_needed_digits_as_string + "d") + ": " + line + "\n"
-    return content_with_numbers
-
-
 def _create_sorted_state_tag_list(is_script_mode) -> list:
     state_tag_dict_with_prio = {}
     state_tag_list = []
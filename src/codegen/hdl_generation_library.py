@@ -6,7 +6,8 @@ import re
 import tkinter as tk
 
 import canvas_editing
-from elements import condition_action, global_actions_clocked, global_actions_combinatorial, state_comment
+from design_model import design_model
+from elements import global_actions_clocked, global_actions_combinatorial, state_comment
 from project_manager import project_manager
 
 from .exceptions import GenerationError
@@ -32,13 +33,9 @@ def get_text_from_text_widget(wiget_id) -> str:
     return ""
 
 
-def _get_target_state_name(all_reset_transition_tags):
-    target_state_tag = ""
-    for t in all_reset_transition_tags:
-        if t.startswith("going_to_state"):
-            target_state_tag = t[9:]
-    target_state_name = project_manager.canvas.itemcget(target_state_tag + "_name", "text")
-    return target_state_name
+def _get_target_state_name(reset_transition_tag):
+    target = design_model.transitions[reset_transition_tag].end
+    return target.name if target is not None else ""
 
 
 def create_reset_condition_and_reset_action() -> list:
@@ -63,8 +60,7 @@ def create_reset_condition_and_reset_action() -> list:
     condition = reference_to_reset_condition_custom_text.get(
         "1.0", tk.END + "-1 chars"
     )  # without "return" at the end
-    all_reset_transition_tags = project_manager.canvas.gettags(reset_transition_tag)
-    target_state_name = _get_target_state_name(all_reset_transition_tags)
+    target_state_name = _get_target_state_name(reset_transition_tag)
     action = "state <= " + target_state_name + ";\n"
     reference_to_reset_action_custom_text = ref.action_id
     action_text = reference_to_reset_action_custom_text.get(
@@ -76,47 +72,32 @@ def create_reset_condition_and_reset_action() -> list:
 
 
 def _get_reset_transition_tag() -> str:
-    reset_entry_tags = project_manager.canvas.gettags("reset_entry")
-    reset_transition_tag = ""
-    for t in reset_entry_tags:
-        if t.startswith("transition"):  # look for transition<n>_start
-            reset_transition_tag = t[:-6]
-    return reset_transition_tag
+    reset_entry = design_model.nodes.get("reset_entry")
+    if reset_entry is None or not reset_entry.outgoing:
+        return ""
+    return reset_entry.outgoing[-1].tag
 
 
 def _get_transition_target_condition_action(transition_tag) -> tuple[str, str, str, str]:
-    tags = project_manager.canvas.gettags(transition_tag)
+    transition = design_model.transitions[transition_tag]
     transition_condition = ""
     transition_action = ""
     condition_action_reference = ""
     transition_target = ""
-    for tag in tags:
-        if tag.startswith("going_to_state"):
-            transition_target_tag = tag[9:]
-            transition_target = project_manager.canvas.itemcget(transition_target_tag + "_name", "text")
-        elif tag.startswith("going_to_connector"):
-            transition_target = tag[9:]
-        elif tag.startswith("ca_connection"):  # Complete tag: ca_connection<n>_end
-            condition_action_number = tag[13:-4]
-            condition_action_tag = "condition_action" + condition_action_number
-            condition_action_canvas_item_id = project_manager.canvas.find_withtag(condition_action_tag)[0]
-            condition_action_reference = condition_action.ConditionAction.ref_dict[condition_action_canvas_item_id]
-            if condition_action_reference is not None:
-                transition_condition = _get_transition_condition(condition_action_reference)
-                transition_action = _get_transition_action(condition_action_reference)
+    if transition.end is not None:
+        # The target of a connector is the tag of the connector, the target of a state is its name:
+        transition_target = transition.end.name if transition.end.kind == "state" else transition.end.tag
+    if transition.condition_action is not None:
+        condition_action_reference = transition.condition_action
+        transition_condition = _get_transition_condition(condition_action_reference)
+        transition_action = _get_transition_action(condition_action_reference)
     return transition_target, transition_condition, transition_action, condition_action_reference
 
 
 def _get_condition_action_reference_of_transition(transition_tag) -> None:
-    tags = project_manager.canvas.gettags(transition_tag)
-    for tag in tags:
-        if tag.startswith("ca_connection"):  # Complete tag: ca_connection<n>_end
-            condition_action_number = tag[13:-4]
-            condition_action_tag = "condition_action" + condition_action_number
-            condition_action_canvas_item_id = project_manager.canvas.find_withtag(condition_action_tag)[0]
-            condition_action_reference = condition_action.ConditionAction.ref_dict[condition_action_canvas_item_id]
-            return condition_action_reference
-    return None
+    if transition_tag not in design_model.transitions:
+        return None
+    return design_model.transitions[transition_tag].condition_action
 
 
 def extract_transition_specifications_from_the_graph(state_tag_list_sorted) -> list:
@@ -162,10 +143,8 @@ def extract_transition_specifications_from_the_graph(state_tag_list_sorted) -> l
 
 
 def _get_state_comments(state_tag):
-    all_tags_of_state = project_manager.canvas.gettags(state_tag)
-    if state_tag + "_comment_line_end" in all_tags_of_state:
-        canvas_id_of_comment_window = project_manager.canvas.find_withtag(state_tag + "_comment")[0]
-        reference_to_state_comment_window = state_comment.StateComment.ref_dict[canvas_id_of_comment_window]
+    reference_to_state_comment_window = design_model.nodes[state_tag].comment
+    if reference_to_state_comment_window is not None:
         canvas_id_of_comment_text_widget = reference_to_state_comment_window.text_id
         state_comments = canvas_id_of_comment_text_widget.get("1.0", "end")
         state_comments = re.sub(r"^\s*[0-9]*\s*", "", state_comments)  # Remove order comment at comment start.
@@ -723,15 +702,7 @@ def _get_all_outgoing_transitions_in_priority_order(state_tag) -> list:
 
 
 def _create_outgoing_transition_list_with_priority_information(state_tag) -> list:
-    all_tags_of_the_state = project_manager.canvas.gettags(state_tag)
-    transition_tag_and_priority = []
-    for tag in all_tags_of_the_state:
-        if tag.endswith("_start"):
-            transition_tag = tag[:-6]
-            transition_priority_text_tag = transition_tag + "priority"
-            transition_priority_string = project_manager.canvas.itemcget(transition_priority_text_tag, "text")
-            transition_tag_and_priority.append([transition_tag, transition_priority_string])
-    return transition_tag_and_priority
+    return [[transition.tag, transition.priority] for transition in design_model.nodes[state_tag].outgoing]
 
 
 def _remove_priority_information(transition_tag_and_priority_sorted) -> list:
@@ -745,15 +716,16 @@ def _check_for_equal_priorities(transition_tags_and_priority_sorted, state_tag)
     for n in range(len(transition_tags_and_priority_sorted) - 1):
         if transition_tags_and_priority_sorted[n][1] == transition_tags_and_priority_sorted[n + 1][1]:
             object_coords = project_manager.canvas.coords(state_tag)
-            canvas_editing.view_rectangle(
-                [
-                    object_coords[0] - 2 * (object_coords[2] - object_coords[0]),
-                    object_coords[1] - 2 * (object_coords[3] - object_coords[1]),
-                    object_coords[2] + 2 * (object_coords[2] - object_coords[0]),
-                    object_coords[3] + 2 * (object_coords[3] - object_coords[1]),
-                ],
-                check_fit=False,
-            )
+            if isinstance(project_manager.canvas, tk.Canvas):  # A headless diagram (fsm_api) cannot be shown.
+                canvas_editing.view_rectangle(
+                    [
+                        object_coords[0] - 2 * (object_coords[2] - object_coords[0]),
+                        object_coords[1] - 2 * (object_coords[3] - object_coords[1]),
+                        object_coords[2] + 2 * (object_coords[2] - object_coords[0]),
+                        object_coords[3] + 2 * (object_coords[3] - object_coords[1]),
+                    ],
+                    check_fit=False,
+                )
             state_name = project_manager.canvas.itemcget(state_tag + "_name", "text")
             if state_name == "":
                 state_name = "a connector"
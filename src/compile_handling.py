@@ -3,19 +3,37 @@ This module implements all methods executes the compile command stored in the Co
 """
 
 import os
-import re
+import queue
 import shlex
 import subprocess
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from os.path import exists
 from tkinter import messagebox
 
 from constants import GuiTab
+from log_message_index import log_message_index
 from project_manager import project_manager
 
+_POLL_PERIOD_MS = 50
+_MAX_LINES_PER_POLL = 2000
+_MAX_LOG_LINES = 20000
+_MAX_JOBS = os.cpu_count() or 1
+_JOB_COLORS = ("#eef3ff", "#effaef", "#fff4e8", "#f6eefc")
+# The commands are executed by a worker thread, which sends its output by a queue to the Tk main thread:
+_output_queue = queue.Queue()
+_stop_requested = threading.Event()
+_worker_thread = None
+_running_processes = set()
+_running_processes_lock = threading.Lock()
+
 
 def compile_hdl() -> None:
+    if _worker_thread is not None and _worker_thread.is_alive():
+        messagebox.showinfo("HDL-FSM-Editor", "The compile commands are still running.")
+        return
     project_manager.notebook.show_tab(GuiTab.COMPILE_MSG)
     if (
         project_manager.working_directory_value.get() != ""
@@ -28,60 +46,168 @@ def compile_hdl() -> None:
                 "Error", "The working directory\n" + project_manager.working_directory_value.get() + "\ndoes not exist."
             )
             return
-    project_manager.log_frame_text.config(state=tk.NORMAL)
-    project_manager.log_frame_text.insert(
-        tk.END,
-        "\n++++++++++++++++++++++++++++++++++++++ "
-        + datetime.today().ctime()
-        + " +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++\n",
+    _insert_lines_in_log(
+        [
+            (
+                "\n++++++++++++++++++++++++++++++++++++++ "
+                + datetime.today().ctime()
+                + " +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++\n",
+                None,
+            )
+        ]
     )
-    project_manager.log_frame_text.config(state=tk.DISABLED)
-    start_time = datetime.now()
-    commands = _get_command_list()
-    # print("compile_handling: commands =", commands)
-    for command in commands:
-        success = _execute(command)
-        if not success:
-            break
-    end_time = datetime.now()
-    project_manager.log_frame_text.config(state=tk.NORMAL)
-    _insert_line_in_log("Finished user commands from Control-Tab after " + str(end_time - start_time) + ".\n")
-    project_manager.log_frame_text.config(state=tk.DISABLED)
+    # The variables are replaced before the first command is started, because the replacement may show dialogs:
+    command_groups = []
+    for command_group in _get_command_groups(project_manager.compile_cmd.get()):
+        command_arrays = []
+        for command_array in command_group:
+            command_array_new = _replace_variables(command_array)
+            if command_array_new is None:
+                return
+            if command_array_new:
+                command_arrays.append(command_array_new)
+        if command_arrays:
+            command_groups.append(command_arrays)
+    _start_worker_thread(command_groups)
 
 
-def _execute(command) -> bool:
-    command_array = shlex.split(command)  # Does not split quoted sub-strings with blanks.
-    command_array_new = _replace_variables(command_array)
-    if command_array_new is None:
-        return False
-    for command_part in command_array_new:
-        _insert_line_in_log(command_part + " ")
-    _insert_line_in_log("\n")
+def stop_compile() -> None:
+    """Bound to the Stop button of the log tab: terminates all running commands and skips all following commands."""
+    _stop_requested.set()
+    with _running_processes_lock:
+        processes = list(_running_processes)
+    for process in processes:
+        process.terminate()
+
+
+def _start_worker_thread(command_groups) -> None:
+    global _worker_thread
+    _stop_requested.clear()
+    _worker_thread = threading.Thread(
+        target=_execute_all, args=(command_groups, datetime.now(), _output_queue), daemon=True
+    )
+    _worker_thread.start()
+    project_manager.stop_compile_button.config(state=tk.NORMAL)
+    project_manager.root.after(_POLL_PERIOD_MS, _poll_output_queue)
+
+
+def _execute_all(command_groups, start_time, output_queue) -> None:
+    # Runs in the worker thread, so it must not access any tkinter object.
+    # The groups are executed one after another, the commands of a group are executed in parallel:
+    job_number = 0
+    try:
+        for command_group in command_groups:
+            if _stop_requested.is_set():
+                break
+            if len(command_group) == 1:
+                success = _execute(command_group[0], output_queue, None)
+            else:
+                job_tags = ["job" + str(job_number + index + 1) for index in range(len(command_group))]
+                job_number += len(command_group)
+                with ThreadPoolExecutor(max_workers=min(_MAX_JOBS, len(command_group))) as executor:
+                    results = list(executor.map(_execute, command_group, [output_queue] * len(job_tags), job_tags))
+                success = all(results)
+            if not success:  # The following groups may depend on the failed command.
+                break
+    finally:  # Without "finished" the poll loop of the Tk main thread would never end.
+        result = "Stopped" if _stop_requested.is_set() else "Finished"
+        elapsed_time = str(datetime.now() - start_time)
+        output_queue.put(("line", result + " user commands from Control-Tab after " + elapsed_time + ".\n", None))
+        output_queue.put(("finished", None, None))
+
+
+def _execute(command_array, output_queue, job_tag) -> bool:
+    # A job of a parallel group collects its output and sends it as one block when it has finished,
+    # so that the outputs of the parallel jobs are not mixed in the log:
+    job_lines = [] if job_tag is not None else None
+    header = "[" + job_tag + "] " if job_tag is not None else ""
+    _put_line(output_queue, job_lines, header + " ".join(command_array) + "\n", job_tag)
     try:
         with subprocess.Popen(
-            command_array_new,
+            command_array,
             text=True,  # Decoding is done by Popen.
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
         ) as process:
-            for line in process.stdout:  # Terminates when process.stdout is closed.
-                if line != "\n":  # VHDL report-statements cause empty lines which mess up the protocol.
-                    _insert_line_in_log(line)
-    except FileNotFoundError:
-        command_string = ""
-        for word in command_array_new:
-            command_string += word + " "
-        messagebox.showerror(
-            "Error in HDL-FSM-Editor", "FileNotFoundError caused by compile command:\n" + command_string
-        )
+            with _running_processes_lock:
+                _running_processes.add(process)
+            try:
+                if _stop_requested.is_set():  # The Stop button was pressed before the process was started.
+                    process.terminate()
+                for line in process.stdout:  # Terminates when process.stdout is closed.
+                    if line != "\n":  # VHDL report-statements cause empty lines which mess up the protocol.
+                        _put_line(output_queue, job_lines, line, job_tag)
+            finally:
+                with _running_processes_lock:
+                    _running_processes.discard(process)
+    # OSError: the program does not exist or is not executable, ValueError: the output cannot be decoded.
+    except (OSError, ValueError) as error:
+        _flush_job_lines(output_queue, job_lines)
+        message = type(error).__name__ + " caused by compile command:\n" + " ".join(command_array) + "\n" + str(error)
+        output_queue.put(("error", message, job_tag))
         return False
+    _flush_job_lines(output_queue, job_lines)
     return True
 
 
-def _get_command_list():
-    command_string_tmp = project_manager.compile_cmd.get()
-    command_string = command_string_tmp.replace(";", " ; ")
-    return command_string.split(";")
+def _put_line(output_queue, job_lines, line, job_tag) -> None:
+    if job_lines is None:
+        output_queue.put(("line", line, job_tag))
+    else:
+        job_lines.append((line, job_tag))
+
+
+def _flush_job_lines(output_queue, job_lines) -> None:
+    if job_lines:
+        output_queue.put(("lines", job_lines, None))
+
+
+def _poll_output_queue() -> None:
+    # Inserts the output of the worker thread in batches, so that the log is updated at most every poll period:
+    lines = []
+    finished = False
+    while len(lines) < _MAX_LINES_PER_POLL:
+        try:
+            kind, content, job_tag = _output_queue.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "line":
+            lines.append((content, job_tag))
+        elif kind == "lines":
+            lines.extend(content)
+        elif kind == "error":
+            _insert_lines_in_log(lines)
+            lines = []
+            messagebox.showerror("Error in HDL-FSM-Editor", content)
+        else:
+            finished = True
+            break
+    _insert_lines_in_log(lines)
+    if finished:
+        project_manager.stop_compile_button.config(state=tk.DISABLED)
+    else:
+        project_manager.root.after(_POLL_PERIOD_MS, _poll_output_queue)
+
+
+def _get_command_groups(command_string: str) -> list:
+    # The commands separated by ";" are executed one after another, so each command depends on all commands before.
+    # Commands separated by "&" form a group of independent commands, which are executed in parallel.
+    # Only ";" and "&" outside of quotes are separators, so an argument like "a & b" is not split.
+    lexer = shlex.shlex(command_string, posix=True, punctuation_chars=";&")
+    lexer.whitespace_split = True  # Does not split quoted sub-strings with blanks (as shlex.split).
+    lexer.commenters = ""
+    command_groups = []
+    command_group = [[]]
+    for entry in lexer:
+        if entry and set(entry) <= set(";&"):  # Adjacent separators are returned as one token.
+            command_group.append([])
+            if ";" in entry:
+                command_groups.append([command_array for command_array in command_group if command_array])
+                command_group = [[]]
+        else:
+            command_group[-1].append(entry)
+    command_groups.append([command_array for command_array in command_group if command_array])
+    return [command_group for command_group in command_groups if command_group]
 
 
 def _replace_variables(command_array) -> list | None:
@@ -155,27 +281,44 @@ def _replace_name_var() -> str:
     return project_manager.module_name.get()
 
 
-def _insert_line_in_log(line) -> None:
-    if project_manager.language.get() == "VHDL":
-        # search for compiler-message with ":<line-number>:<column-number>:":
-        regex_message_find = project_manager.regex_message_find_for_vhdl
-    else:
-        regex_message_find = project_manager.regex_message_find_for_verilog
-    try:
-        match_object_of_message = re.match(regex_message_find, line)
-    except re.error as e:
-        print("Error in HDL-FSM-Editor by regular expression", repr(e))
-        return
+def append_to_log(text) -> None:
+    """Appends a text of another module (for example a failure of the live HDL preview) to the log tab."""
+    _insert_lines_in_log([(line, None) for line in text.splitlines(keepends=True)])
+
 
-    line_low = line.lower()
+def _insert_lines_in_log(lines) -> None:
+    if not lines:
+        return
+    # All lines are inserted by 1 insert command, which gets text and tags alternating.
+    # Each line is parsed only here, the result is stored in the log message index:
+    line_number = int(project_manager.log_frame_text.index("end-1c").split(".")[0])
+    insert_arguments = []
+    job_tags = set()
+    for line, job_tag in lines:
+        severity = log_message_index.get_severity(line)
+        log_message_index.add_line(line_number, line, severity)
+        line_number += line.count("\n")
+        tags = () if job_tag is None else (job_tag,)
+        if severity == "note":
+            tags += ("message_green",)
+        elif severity is not None:
+            tags += ("message_red",)
+        insert_arguments.extend([line, tags])
+        if job_tag is not None:
+            job_tags.add(job_tag)
+    for job_tag in job_tags:  # Each job of a parallel group gets its own background color.
+        color = _JOB_COLORS[int(job_tag[3:]) % len(_JOB_COLORS)]
+        project_manager.log_frame_text.tag_configure(job_tag, background=color)
     project_manager.log_frame_text.config(state=tk.NORMAL)
-    if match_object_of_message is not None or " error " in line_low or " warning " in line_low:
-        # Add line together with color-tag to the text:
-        if project_manager.language.get() == "VHDL" and "report note" in line_low:
-            project_manager.log_frame_text.insert(tk.END, line, ("message_green"))
-        else:
-            project_manager.log_frame_text.insert(tk.END, line, ("message_red"))
-    else:
-        project_manager.log_frame_text.insert(tk.END, line)
+    project_manager.log_frame_text.insert(tk.END, *insert_arguments)
+    _trim_log()
     project_manager.log_frame_text.config(state=tk.DISABLED)
     project_manager.log_frame_text.see(tk.END)
+
+
+def _trim_log() -> None:
+    # Keeps the memory of the log bounded, when a chatty simulation runs:
+    number_of_lines = int(project_manager.log_frame_text.index("end-1c").split(".")[0])
+    if number_of_lines > _MAX_LOG_LINES:
+        project_manager.log_frame_text.delete("1.0", str(number_of_lines - _MAX_LOG_LINES + 1) + ".0")
+        log_message_index.shift_lines(-(number_of_lines - _MAX_LOG_LINES))
@@ -345,6 +345,9 @@ _VERILOG_KEYWORDS_ALL_UNUSED = (
 
 CONNECTOR_COLOR = "violet"
 STATE_COLOR = "cyan"
+SELECTION_COLOR = "red"
+# Below this fontsize the text boxes in the diagram are collapsed to their labels:
+MIN_READABLE_FONTSIZE = 4
 
 
 # class GuiTab(StrEnum): # StrEnum does not exist in Linux Mint
@@ -12,9 +12,10 @@ import tkinter as tk
 import config
 import constants
 import file_handling
-from codegen import hdl_generation_architecture_state_actions, hdl_generation_library
+from design_cache import design_cache
 from elements import global_actions_combinatorial
 from project_manager import project_manager
+from search_index import search_index
 from widgets.code_editor import CodeEditor
 
 FUNCTION_DECL_RE = re.compile(r"function\s+(\w+)", re.IGNORECASE)
@@ -73,6 +74,7 @@ class CustomText(CodeEditor):
 
     read_variables_of_all_windows = {}
     written_variables_of_all_windows = {}
+    bulk_load_active = False  # While True, format() does not start any highlighting or linting.
 
     def __init__(self, *args, text_type, **kwargs) -> None:
         """A text widget that report on internal widget commands"""
@@ -114,6 +116,19 @@ class CustomText(CodeEditor):
         self.tag_config("message_red", foreground="red")
         self.tag_config("message_green", foreground="green")
 
+    def destroy(self) -> None:
+        """Removes the text from all registries, which would otherwise keep it alive after its window was deleted."""
+        if self.format_after_id is not None:
+            self.after_cancel(self.format_after_id)
+        CustomText.read_variables_of_all_windows.pop(self, None)
+        CustomText.written_variables_of_all_windows.pop(self, None)
+        search_index.remove_text(self)
+        design_cache.forget_text(self)
+        proxy = self._w
+        super().destroy()
+        # Tk deleted the renamed widget command, but the proxy command created in __init__ still refers to self:
+        self.tk.deletecommand(proxy)
+
     def _open(self) -> str:
         file_handling.open_file()
         # Prevent a second call of open_file() by bind_all binding (which is located in entry 4 of the bind-list):
@@ -124,6 +139,7 @@ class CustomText(CodeEditor):
         try:
             result = self.tk.call(cmd)
             if command in ("insert", "delete", "replace"):
+                search_index.mark_outdated(self)
                 self.event_generate("<<TextModified>>")
             return result
         except Exception:  # pylint: disable=broad-except
@@ -162,6 +178,7 @@ class CustomText(CodeEditor):
     def format(self) -> None:
         """Resizes the text box, updates several lists of signals/variables, and updates the highlighting."""
         text = self.get("1.0", tk.END)
+        search_index.update_text(self, text[:-1])
         self._update_size_of_text_box(text)
         if self.text_type in ("declarations", "variable", "action"):
             self.update_custom_text_class_signals_list()
@@ -170,7 +187,24 @@ class CustomText(CodeEditor):
         elif self.text_type == "generics":
             self.update_custom_text_class_generics_list()
         self._update_entry_of_this_window_in_list_of_read_and_written_variables_of_all_windows()
-        self._update_highlighting_in_all_texts()
+        if not CustomText.bulk_load_active:
+            self._update_highlighting_in_all_texts()
+
+    @classmethod
+    def start_bulk_load(cls) -> None:
+        """Suppresses the highlighting and linting at format() until end_bulk_load() is called."""
+        cls.bulk_load_active = True
+
+    @classmethod
+    def end_bulk_load(cls) -> None:
+        """Runs the highlighting and linting, which was suppressed since start_bulk_load(), once for all texts."""
+        cls.bulk_load_active = False
+        for text_ref in cls.read_variables_of_all_windows:
+            text_ref.update_highlight_tags(project_manager.fontsize, ["control", "datatype", "function"])
+        for text_ref in _get_fixed_text_refs():
+            text_ref.update_highlight_tags(10, ["control", "datatype", "function"])
+        project_manager.highlight_dict_ref.recreate_keyword_list_of_unused_signals_now()
+        cls._update_highlight_tags_in_all_windows_for_not_read_not_written_and_comment_after_idle()
 
     def _update_size_of_text_box(self, text) -> None:
         nr_of_lines = 0
@@ -220,9 +254,29 @@ class CustomText(CodeEditor):
             self._tag_configure_highlight_tag(highlight_tag_name, fontsize)
 
     def _tag_add_highlight_tag(self, highlight_tag_name) -> None:
-        for highlight_search_pattern in project_manager.highlight_dict_ref.highlight_pattern_dict[highlight_tag_name]:
-            if self.text_type != "comment":  # State comment text
-                self._add_highlight_tag_for_single_pattern(highlight_tag_name, highlight_search_pattern)
+        if self.text_type == "comment":  # State comment text
+            return
+        highlight_search_patterns = project_manager.highlight_dict_ref.highlight_pattern_dict[highlight_tag_name]
+        text = self.get("1.0", tk.END + "- 1 chars")
+        # The ranges are cached, because searching all patterns is slow at big designs:
+        ranges = design_cache.get(
+            self,
+            highlight_tag_name,
+            [repr(highlight_search_patterns), text],
+            lambda: self._get_highlight_ranges(highlight_tag_name, highlight_search_patterns, text),
+        )
+        if ranges:
+            self.tag_add(highlight_tag_name, *["1.0 + " + str(position) + " chars" for position in ranges])
+
+    def _get_highlight_ranges(self, highlight_tag_name, highlight_search_patterns, text) -> list:
+        """Returns the start and end positions (as character offsets) of all ranges to be tagged."""
+        if text == "":
+            return []
+        text = self._replace_strings_and_attributes_by_blanks(text)
+        ranges = []
+        for highlight_search_pattern in highlight_search_patterns:
+            ranges += self._get_highlight_ranges_of_single_pattern(highlight_tag_name, highlight_search_pattern, text)
+        return ranges
 
     def _tag_configure_highlight_tag(self, highlight_tag_name, fontsize) -> None:
         if self.text_type not in ("condition", "action", "comment"):
@@ -233,11 +287,9 @@ class CustomText(CodeEditor):
             font=("Courier", int(fontsize), "normal"),
         )  # int() is necessary, because fontsize can be a "real" number.
 
-    def _add_highlight_tag_for_single_pattern(self, highlight_tag_name, highlight_search_pattern) -> None:
-        copy_of_text = self.get("1.0", tk.END + "- 1 chars")
-        if copy_of_text == "":
-            return
-        copy_of_text = self._replace_strings_and_attributes_by_blanks(copy_of_text)
+    def _get_highlight_ranges_of_single_pattern(self, highlight_tag_name, highlight_search_pattern, text) -> list:
+        copy_of_text = text
+        ranges = []
         while True:
             if highlight_tag_name == "comment":
                 match_object = re.search(
@@ -251,11 +303,7 @@ class CustomText(CodeEditor):
                 copy_of_text = (
                     copy_of_text[: match_object.start()] + replace_string + copy_of_text[match_object.end() :]
                 )
-                self.tag_add(
-                    "comment",
-                    "1.0 + " + str(match_object.start()) + " chars",
-                    "1.0 + " + str(match_object.end()) + " chars",
-                )
+                ranges += [match_object.start(), match_object.end()]
             else:
                 # The keyword might be some strange character, when the user stumbles of the keyboard.
                 # Normally this does not cause any problems, because no match_object will be created.
@@ -281,9 +329,8 @@ class CustomText(CodeEditor):
                 )
                 if copy_of_text == old_text:
                     break
-                self.tag_add(
-                    highlight_tag_name, "1.0 + " + str(match_start) + " chars", "1.0 + " + str(match_end) + " chars"
-                )
+                ranges += [match_start, match_end]
+        return ranges
 
     def _replace_strings_and_attributes_by_blanks(self, copy_of_text):
         for search_string in ["'image", "'length", '".*?"', "'.*?'"]:
@@ -321,6 +368,8 @@ class CustomText(CodeEditor):
 
     def update_custom_text_class_signals_list(self) -> None:
         """Updates the signals_list and constants_list of this CustomText object."""
+        from codegen import hdl_generation_library  # The codegen package is imported at first use.
+
         # ["package","generics","ports","variable","condition","generated","action","declarations","log","comment"]
         all_signal_declarations = self.get("1.0", tk.END).lower()
         all_signal_declarations = hdl_generation_library.remove_comments_and_returns(all_signal_declarations)
@@ -335,6 +384,8 @@ class CustomText(CodeEditor):
 
     def update_custom_text_class_ports_list(self) -> None:  # Needed at self==project_manager.interface_ports_text
         """Updates the port_types_list of this CustomText object, if it is the interface_ports_text"""
+        from codegen import hdl_generation_architecture_state_actions
+
         all_port_declarations = self.get("1.0", tk.END).lower()
         self.readable_ports_list = hdl_generation_architecture_state_actions.get_all_readable_ports(
             all_port_declarations, check=False
@@ -346,16 +397,42 @@ class CustomText(CodeEditor):
 
     def update_custom_text_class_generics_list(self) -> None:
         """Updates the generics_list of this CustomText object, if it is the interface_generics_text"""
+        from codegen import hdl_generation_architecture_state_actions
+
         all_generic_declarations = project_manager.interface_generics_text.get("1.0", tk.END).lower()
         self.generics_list = hdl_generation_architecture_state_actions.get_all_generic_names(all_generic_declarations)
 
     def _update_entry_of_this_window_in_list_of_read_and_written_variables_of_all_windows(self) -> None:
+        if self.text_type not in ("condition", "action"):
+            self._calculate_read_and_written_variables()  # Only the function names list may be filled.
+            return
+        # The result is cached, so the key contains everything the analysis depends on:
+        read_variables, written_variables = design_cache.get(
+            self,
+            "variables",
+            [
+                project_manager.language.get(),
+                self.text_type,
+                str(project_manager.language.get() == "VHDL" and self._text_is_global_actions_combinatorial()),
+                repr(project_manager.interface_ports_text.readable_ports_list),
+                repr(project_manager.interface_ports_text.writable_ports_list),
+                repr(project_manager.internals_architecture_text.function_names_list),
+                self.get("1.0", tk.END + "- 1 chars"),
+            ],
+            self._calculate_read_and_written_variables,
+        )
+        CustomText.read_variables_of_all_windows[self] = list(read_variables)
+        CustomText.written_variables_of_all_windows[self] = list(written_variables)
+
+    def _calculate_read_and_written_variables(self) -> list:
+        from codegen import hdl_generation_library
+
         CustomText.read_variables_of_all_windows[self] = []
         CustomText.written_variables_of_all_windows[self] = []
         text = self.get("1.0", tk.END + "- 1 chars")
         text = hdl_generation_library.convert_hdl_lines_into_a_searchable_string(text)
         if text.isspace():
-            return
+            return [[], []]
         if project_manager.language.get() == "VHDL" and self == project_manager.internals_architecture_text:
             self._fill_function_names_list()
         if project_manager.language.get() == "VHDL":
@@ -373,6 +450,7 @@ class CustomText(CodeEditor):
             CustomText.read_variables_of_all_windows[self] = text.split()
         elif self.text_type == "action":
             self._process_action_read_and_written_variables(text)
+        return [CustomText.read_variables_of_all_windows[self], CustomText.written_variables_of_all_windows[self]]
 
     def _process_action_read_and_written_variables(self, text: str) -> None:
         text = self._add_read_variables_from_procedure_calls_to_read_variables_of_all_windows(text)
@@ -805,23 +883,27 @@ class CustomText(CodeEditor):
             300, self._update_highlight_tags_in_all_windows_for_not_read_not_written_and_comment_after_idle
         )
 
-    def _update_highlight_tags_in_all_windows_for_not_read_not_written_and_comment_after_idle(self) -> None:
+    @classmethod
+    def _update_highlight_tags_in_all_windows_for_not_read_not_written_and_comment_after_idle(cls) -> None:
         # Comment must be the last, because in the range of a comment all other tags are deleted:
-        for text_ref in CustomText.read_variables_of_all_windows:
+        for text_ref in cls.read_variables_of_all_windows:
             text_ref.update_highlight_tags(project_manager.fontsize, ["not_read", "not_written", "comment"])
-        text_refs_fixed = [
-            project_manager.interface_generics_text,
-            project_manager.interface_package_text,
-            project_manager.interface_ports_text,
-            project_manager.internals_architecture_text,
-            project_manager.internals_process_clocked_text,
-            project_manager.internals_process_combinatorial_text,
-            project_manager.internals_package_text,
-        ]
-        for text_ref in text_refs_fixed:
+        for text_ref in _get_fixed_text_refs():
             text_ref.update_highlight_tags(10, ["not_read", "not_written", "comment"])
 
 
+def _get_fixed_text_refs() -> list:
+    return [
+        project_manager.interface_generics_text,
+        project_manager.interface_package_text,
+        project_manager.interface_ports_text,
+        project_manager.internals_architecture_text,
+        project_manager.internals_process_clocked_text,
+        project_manager.internals_process_combinatorial_text,
+        project_manager.internals_package_text,
+    ]
+
+
 def _remove_items_from_list(lst: list, items) -> None:
     for item in items:
         if item in lst:
@@ -0,0 +1,113 @@
+"""
+This module caches the results of the text analysis of the CustomText widgets on disk, so that reopening an
+unchanged design does not repeat it. Cached are the read and written variables of each condition and action
+text and the ranges of each highlight tag in each text.
+Each result is stored under a hash of everything it depends on (for example the text and the highlight patterns),
+so a result from the cache is always correct, even when the design was changed by another tool.
+There is one cache file per design file, it is only used when path, size, modification time and content hash
+of the design file are unchanged. The least recently used cache files are removed, when all cache files
+together get bigger than _MAX_CACHE_SIZE.
+"""
+
+import collections
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import constants
+
+_CACHE_DIRECTORY = Path.home() / ".hdl-fsm-editor" / "design_cache"
+_MAX_CACHE_SIZE = 20 * 1024 * 1024  # bytes of all cache files
+_MAX_NUMBER_OF_RESULTS = 20000  # results kept in memory
+
+
+class DesignCache:
+    """
+    The results are kept in memory in least recently used order. Additionally, the key of the latest result
+    of each text widget is remembered, so that only the results of the actual design are written to disk.
+    """
+
+    def __init__(self) -> None:
+        self.results = collections.OrderedDict()  # key -> result (must be JSON serializable)
+        self.keys_in_use = {}  # text widget -> {kind of result -> key}
+
+    def get(self, text_widget, kind, key_parts, calculate):
+        """Returns the cached result for key_parts or calculates (and caches) it by calling calculate()."""
+        key = hashlib.sha1("\0".join([kind, *key_parts]).encode()).hexdigest()
+        self.keys_in_use.setdefault(text_widget, {})[kind] = key
+        if key in self.results:
+            self.results.move_to_end(key)
+            return self.results[key]
+        result = calculate()
+        self.results[key] = result
+        if len(self.results) > _MAX_NUMBER_OF_RESULTS:
+            self.results.popitem(last=False)
+        return result
+
+    def forget_text(self, text_widget) -> None:
+        """Called when a text widget is destroyed, its results stay in the cache."""
+        self.keys_in_use.pop(text_widget, None)
+
+    def open_design(self, file_name) -> None:
+        """Reads the cached results of the design file, if the cache file belongs to the unchanged design file."""
+        self.keys_in_use.clear()
+        cache_file_name = _get_cache_file_name(file_name)
+        try:
+            with open(cache_file_name, encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+            if cache.get("identity") != _get_identity(file_name):
+                return
+            self.results.update(cache["results"])
+            while len(self.results) > _MAX_NUMBER_OF_RESULTS:
+                self.results.popitem(last=False)
+            os.utime(cache_file_name)  # The modification time is the time of the last use.
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            pass  # Without cache all results are calculated.
+
+    def store_design(self, file_name) -> None:
+        """Writes the results of the texts, which still exist, into the cache file of the design file."""
+        results = {}
+        for text_widget, keys in list(self.keys_in_use.items()):
+            if not text_widget.winfo_exists():
+                del self.keys_in_use[text_widget]
+                continue
+            for key in keys.values():
+                if key in self.results:
+                    results[key] = self.results[key]
+        try:
+            identity = _get_identity(file_name)
+            _CACHE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+            with open(_get_cache_file_name(file_name), "w", encoding="utf-8") as cache_file:
+                json.dump({"identity": identity, "results": results}, cache_file)
+            _remove_least_recently_used_cache_files()
+        except OSError:
+            pass  # Without cache the results are calculated again at the next opening of the design.
+
+
+def _get_cache_file_name(file_name) -> Path:
+    return _CACHE_DIRECTORY / (hashlib.sha1(os.path.abspath(file_name).encode()).hexdigest() + ".json")
+
+
+def _get_identity(file_name) -> dict:
+    with open(file_name, "rb") as fileobject:
+        content_hash = hashlib.sha1(fileobject.read()).hexdigest()
+    return {
+        "path": os.path.abspath(file_name),
+        "size": os.path.getsize(file_name),
+        "mtime": os.path.getmtime(file_name),
+        "sha1": content_hash,
+        "version": constants.VERSION,  # Another version may analyze the texts in another way.
+    }
+
+
+def _remove_least_recently_used_cache_files() -> None:
+    cache_files = sorted(_CACHE_DIRECTORY.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    size = 0
+    for cache_file in cache_files:
+        size += cache_file.stat().st_size
+        if size > _MAX_CACHE_SIZE:
+            cache_file.unlink()
+
+
+design_cache = DesignCache()
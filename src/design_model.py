@@ -0,0 +1,125 @@
+"""
+A compact model of the graph of the diagram (states, connectors, reset entry and transitions).
+The graph is stored in the canvas by tags like "coming_from_state3" or "transition5_start".
+The model parses all these tags in one pass over the canvas, afterwards each question about the graph
+(outgoing transitions of a state, target of a transition, ...) is answered without any Tcl call.
+The model must be built again (by build()) before it is used, when the design may have been changed.
+Only the HDL generation reads the graph from the model. The canvas tags stay the stored form of the graph:
+editing, saving and the check of the tags (TagPlausibility) still read and write the tags, not the model.
+"""
+
+import re
+
+from elements import condition_action, state_comment
+from project_manager import project_manager
+
+_STATE_REGEX = re.compile(r"state(\d+)$")
+_STATE_NAME_REGEX = re.compile(r"state(\d+)_name$")
+_STATE_COMMENT_REGEX = re.compile(r"state(\d+)_comment$")
+_CONNECTOR_REGEX = re.compile(r"connector(\d+)$")
+_TRANSITION_REGEX = re.compile(r"transition(\d+)$")
+_TRANSITION_PRIORITY_REGEX = re.compile(r"transition(\d+)priority$")
+_CONDITION_ACTION_REGEX = re.compile(r"condition_action(\d+)$")
+_CA_CONNECTION_END_REGEX = re.compile(r"ca_connection(\d+)_end$")
+
+
+class NodeRecord:
+    """A state, a connector or the reset entry (kind is "state", "connector" or "reset_entry")."""
+
+    __slots__ = ("kind", "number", "canvas_id", "name", "outgoing", "incoming", "comment")
+
+    def __init__(self, kind, number, canvas_id) -> None:
+        self.kind: str = kind
+        self.number: int = number  # 0 for the reset entry
+        self.canvas_id: int = canvas_id
+        self.name: str = ""  # Only states have a name.
+        self.outgoing: list[TransitionRecord] = []
+        self.incoming: list[TransitionRecord] = []
+        self.comment = None  # state_comment.StateComment or None
+
+    @property
+    def tag(self) -> str:
+        return "reset_entry" if self.kind == "reset_entry" else self.kind + str(self.number)
+
+
+class TransitionRecord:
+    __slots__ = ("number", "canvas_id", "start", "end", "priority", "condition_action")
+
+    def __init__(self, number, canvas_id) -> None:
+        self.number: int = number
+        self.canvas_id: int = canvas_id
+        self.start: NodeRecord | None = None
+        self.end: NodeRecord | None = None
+        self.priority: str = ""
+        self.condition_action = None  # condition_action.ConditionAction or None
+
+    @property
+    def tag(self) -> str:
+        return "transition" + str(self.number)
+
+
+class DesignModel:
+    """The records are stored by their tag, so the existing tag based code can use the model step by step."""
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, NodeRecord] = {}
+        self.transitions: dict[str, TransitionRecord] = {}
+
+    def build(self) -> None:
+        self.nodes = {}
+        self.transitions = {}
+        canvas = project_manager.canvas
+        state_names = {}  # state number -> name
+        state_comments = {}  # state number -> StateComment
+        priorities = {}  # transition number -> priority
+        condition_actions = {}  # condition action number -> ConditionAction
+        transition_tags = []  # (record, tags)
+        for canvas_id in canvas.find_all():
+            tags = canvas.gettags(canvas_id)
+            for tag in tags:
+                if match := _STATE_REGEX.match(tag):
+                    self.nodes[tag] = NodeRecord("state", int(match.group(1)), canvas_id)
+                    break
+                if match := _STATE_NAME_REGEX.match(tag):
+                    state_names[int(match.group(1))] = canvas.itemcget(canvas_id, "text")
+                    break
+                if match := _STATE_COMMENT_REGEX.match(tag):
+                    state_comments[int(match.group(1))] = state_comment.StateComment.ref_dict.get(canvas_id)
+                    break
+                if match := _CONNECTOR_REGEX.match(tag):
+                    self.nodes[tag] = NodeRecord("connector", int(match.group(1)), canvas_id)
+                    break
+                if tag == "reset_entry":
+                    self.nodes[tag] = NodeRecord("reset_entry", 0, canvas_id)
+                    break
+                if match := _TRANSITION_REGEX.match(tag):
+                    record = TransitionRecord(int(match.group(1)), canvas_id)
+                    self.transitions[tag] = record
+                    transition_tags.append((record, tags))
+                    break
+                if match := _TRANSITION_PRIORITY_REGEX.match(tag):
+                    priorities[int(match.group(1))] = canvas.itemcget(canvas_id, "text")
+                    break
+                if match := _CONDITION_ACTION_REGEX.match(tag):
+                    condition_actions[int(match.group(1))] = condition_action.ConditionAction.ref_dict.get(canvas_id)
+                    break
+        for node in self.nodes.values():
+            if node.kind == "state":
+                node.name = state_names.get(node.number, "")
+                node.comment = state_comments.get(node.number)
+        for record, tags in transition_tags:
+            record.priority = priorities.get(record.number, "")
+            for tag in tags:
+                if tag.startswith("coming_from_"):
+                    record.start = self.nodes.get(tag[12:])
+                    if record.start is not None:
+                        record.start.outgoing.append(record)
+                elif tag.startswith("going_to_"):
+                    record.end = self.nodes.get(tag[9:])
+                    if record.end is not None:
+                        record.end.incoming.append(record)
+                elif match := _CA_CONNECTION_END_REGEX.match(tag):
+                    record.condition_action = condition_actions.get(int(match.group(1)))
+
+
+design_model = DesignModel()
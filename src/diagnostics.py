@@ -0,0 +1,238 @@
+"""
+This module collects performance data of an editing session.
+It is only active when HDL-FSM-Editor is started with the switch --diagnostics.
+
+- Each call of a Canvas or Text method, which causes a Tcl round trip, is counted and timed per calling function.
+- Each Tk callback (event handlers, commands, after-callbacks) and some functions known to be slow at big designs
+  are timed, each one which needs more than _SLOW_HANDLER_THRESHOLD_MS is logged at once.
+- The latency of the Tk main loop is measured by an after-callback, which checks how late it is called.
+
+At exit a summary is printed to STDOUT and written into _REPORT_FILE_NAME, so it can be attached to a bug report.
+"""
+
+import atexit
+import functools
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+_SLOW_HANDLER_THRESHOLD_MS = 100
+_LATENCY_PROBE_INTERVAL_MS = 50
+_LATENCY_THRESHOLD_MS = 100  # A main loop which reacts later than this, is noticed by the user.
+_MAX_NUMBER_OF_REPORTED_ENTRIES = 40
+_REPORT_FILE_NAME = Path.home() / ".hdl-fsm-editor" / "diagnostics.txt"
+
+_CANVAS_METHOD_NAMES = (
+    "addtag_withtag",
+    "bbox",
+    "coords",
+    "create_line",
+    "create_oval",
+    "create_polygon",
+    "create_rectangle",
+    "create_text",
+    "create_window",
+    "delete",
+    "dtag",
+    "find_all",
+    "find_closest",
+    "find_enclosed",
+    "find_overlapping",
+    "find_withtag",
+    "gettags",
+    "itemcget",
+    "itemconfig",
+    "itemconfigure",
+    "move",
+    "scale",
+    "tag_bind",
+    "tag_lower",
+    "tag_raise",
+    "type",
+)
+_TEXT_METHOD_NAMES = (
+    "count",
+    "delete",
+    "dlineinfo",
+    "get",
+    "index",
+    "insert",
+    "mark_set",
+    "search",
+    "see",
+    "tag_add",
+    "tag_config",
+    "tag_configure",
+    "tag_delete",
+    "tag_ranges",
+    "tag_remove",
+)
+# (module name, class name or None, function name) of functions, whose duration is checked also when they are
+# not called directly by Tk:
+_CHECKED_FUNCTIONS = (
+    ("custom_text", "CustomText", "format"),
+    ("move_handling", None, "move_do"),
+    ("file_handling", None, "save_in_file"),
+    ("undo_handling", None, "undo"),
+    ("undo_handling", None, "redo"),
+    ("undo_handling", None, "design_has_changed"),
+)
+
+_enabled = False
+_start_time = time.perf_counter()
+_tcl_call_records = {}  # (method, caller) -> [number of calls, time in s]
+_handler_records = {}  # handler name -> [number of calls, time in s, max time in s, number of slow calls]
+_latency_records = {"probes": 0, "late_probes": 0, "sum_s": 0.0, "max_s": 0.0}
+_original_call_wrapper_call = tk.CallWrapper.__call__
+
+
+def enable() -> None:
+    """Must be called before the GUI is created, so that all widgets and bindings use the instrumented methods."""
+    global _enabled, _start_time
+    if _enabled:
+        return
+    _enabled = True
+    _start_time = time.perf_counter()
+    for method_name in _CANVAS_METHOD_NAMES:
+        _instrument_tcl_method(tk.Canvas, method_name)
+    for method_name in _TEXT_METHOD_NAMES:
+        _instrument_tcl_method(tk.Text, method_name)
+    tk.CallWrapper.__call__ = _timed_callback
+    for module_name, class_name, function_name in _CHECKED_FUNCTIONS:
+        owner = __import__(module_name)
+        if class_name is not None:
+            owner = getattr(owner, class_name)
+        setattr(owner, function_name, _timed_function(getattr(owner, function_name), module_name))
+    atexit.register(report)
+
+
+def start_latency_probe(root) -> None:
+    """Starts the periodic after-callback, which measures the latency of the main loop."""
+    if _enabled:
+        _schedule_latency_probe(root)
+
+
+def report() -> None:
+    """Prints the summary and writes it into the report file."""
+    lines = [f"\nDiagnostics of a session of {time.perf_counter() - _start_time:.0f} s (times in ms):"]
+    number_of_probes = max(_latency_records["probes"], 1)
+    lines.append(
+        f"Main loop latency: mean = {_latency_records['sum_s'] / number_of_probes * 1000:.1f}, "
+        f"max = {_latency_records['max_s'] * 1000:.1f}, "
+        f"{_latency_records['late_probes']} of {_latency_records['probes']} probes "
+        f"later than {_LATENCY_THRESHOLD_MS}"
+    )
+    lines.append("Handlers (slowest total time first):")
+    lines.append("     total        max   calls   slow  handler")
+    for name, (calls, duration, max_duration, slow_calls) in _get_slowest(_handler_records):
+        lines.append(
+            f"{duration * 1000:10.1f} {max_duration * 1000:10.1f} {calls:7d} {slow_calls:6d}  {name}",
+        )
+    lines.append("Tcl round trips of Canvas and Text methods (slowest total time first):")
+    lines.append("     total   calls  method <- caller")
+    for (method, caller), (calls, duration) in _get_slowest(_tcl_call_records):
+        lines.append(f"{duration * 1000:10.1f} {calls:7d}  {method} <- {caller}")
+    total_calls = sum(calls for calls, _ in _tcl_call_records.values())
+    total_time = sum(duration for _, duration in _tcl_call_records.values())
+    lines.append(f"{total_time * 1000:10.1f} {total_calls:7d}  all Tcl round trips")
+    summary = "\n".join(lines)
+    print(summary)
+    try:
+        _REPORT_FILE_NAME.parent.mkdir(parents=True, exist_ok=True)
+        with open(_REPORT_FILE_NAME, "w", encoding="utf-8") as report_file:
+            report_file.write(summary + "\n")
+        print("The diagnostics were written to", _REPORT_FILE_NAME)
+    except OSError:
+        pass
+
+
+def _get_slowest(records) -> list:
+    return sorted(records.items(), key=lambda item: item[1][1], reverse=True)[:_MAX_NUMBER_OF_REPORTED_ENTRIES]
+
+
+def _instrument_tcl_method(widget_class, method_name) -> None:
+    method = getattr(widget_class, method_name)
+    method_description = widget_class.__name__ + "." + method_name
+
+    @functools.wraps(method)
+    def timed_method(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record = _tcl_call_records.setdefault((method_description, _get_caller_name(sys._getframe(1))), [0, 0.0])
+            record[0] += 1
+            record[1] += time.perf_counter() - start
+
+    setattr(widget_class, method_name, timed_method)
+
+
+def _get_caller_name(frame) -> str:
+    code = frame.f_code
+    # co_qualname exists since Python 3.11:
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}:{frame.f_lineno}"
+
+
+def _timed_callback(call_wrapper, *args):
+    start = time.perf_counter()
+    try:
+        return _original_call_wrapper_call(call_wrapper, *args)
+    finally:
+        _add_handler_record(_get_function_name(call_wrapper.func), time.perf_counter() - start)
+
+
+def _timed_function(function, module_name):
+    name = module_name + "." + function.__qualname__
+
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _add_handler_record(name, time.perf_counter() - start)
+
+    return timed_function
+
+
+def _get_function_name(function) -> str:
+    # The function of an after-callback is wrapped by the local function "callit" of tkinter.Misc.after:
+    code = getattr(function, "__code__", None)
+    if code is not None and code.co_name == "callit" and function.__closure__ is not None:
+        closure = dict(zip(code.co_freevars, function.__closure__))
+        if "func" in closure:
+            return "after: " + _get_function_name(closure["func"].cell_contents)
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return repr(function)
+    name = f"{getattr(function, '__module__', '?')}.{getattr(function, '__qualname__', code.co_name)}"
+    if code.co_name == "<lambda>":
+        name += f":{code.co_firstlineno}"  # Lambdas are only distinguished by their line number.
+    return name
+
+
+def _add_handler_record(name, duration) -> None:
+    record = _handler_records.setdefault(name, [0, 0.0, 0.0, 0])
+    record[0] += 1
+    record[1] += duration
+    record[2] = max(record[2], duration)
+    if duration * 1000 > _SLOW_HANDLER_THRESHOLD_MS:
+        record[3] += 1
+        print(f"Diagnostics: {name} needed {duration * 1000:.0f} ms.")
+
+
+def _schedule_latency_probe(root) -> None:
+    expected_time = time.perf_counter() + _LATENCY_PROBE_INTERVAL_MS / 1000
+    root.after(_LATENCY_PROBE_INTERVAL_MS, lambda: _latency_probe(root, expected_time))
+
+
+def _latency_probe(root, expected_time) -> None:
+    latency = max(time.perf_counter() - expected_time, 0.0)
+    _latency_records["probes"] += 1
+    _latency_records["sum_s"] += latency
+    _latency_records["max_s"] = max(_latency_records["max_s"], latency)
+    if latency * 1000 > _LATENCY_THRESHOLD_MS:
+        _latency_records["late_probes"] += 1
+        print(f"Diagnostics: The main loop reacted {latency * 1000:.0f} ms late.")
+    _schedule_latency_probe(root)
@@ -0,0 +1,417 @@
+"""
+Exports the diagram of HDL-FSM-Editor files (.hfe) as SVG or PNG image without creating any Tk widget.
+
+The image is rendered directly from the design dictionary of the file. The file already contains the geometry the
+editor has calculated: The transitions are shortened to the state borders (see TransitionLine.shorten_to_state_border)
+and all coordinates are stored in the normalized size (see WriteDataCreator), so the renderer only scales them and
+draws the items with the colors and fonts of the editor. As a text block is a Tk widget, it is not stored with its
+size, so its size is estimated from its text.
+
+Many files are exported in parallel by a process pool:
+    python main.py --export-svg designs/*.hfe --export-dir doc/diagrams
+
+PNG images need the package Pillow, SVG images need no additional package.
+"""
+
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+_IMAGE_FORMATS = ("svg", "png")
+_STATE_RADIUS = 20.0  # The state radius at zoom factor 1 in the editor, the diagram is scaled to it.
+_MARGIN = 20
+_SMOOTH_STEPS = 12  # The same number of points per spline segment as Tk uses for smooth lines.
+_ARROW_SHAPE = (8, 10, 3)  # The default arrow shape of Tk lines.
+_DASH = (2, 2)
+_CHAR_WIDTH = 0.6  # of the font size, for Courier
+_LINE_HEIGHT = 1.25  # of the font size
+_TEXT_PADDING = 3
+_POINTS_TO_PIXELS = 4 / 3
+# Colors of the editor, which are Tk color names but no SVG color names:
+_COLORS = {
+    "cyan2": "#00eeee",
+    "PaleTurquoise2": "#aeeeee",
+    "PaleGreen2": "#90ee90",
+    "gray85": "#d9d9d9",
+}
+_TEXT_BLOCK_COLORS = {
+    "window_state_action_block": "cyan2",
+    "window_state_comment": "cyan2",
+    "window_state_actions_default": "cyan2",
+    "window_condition_action_block": "PaleTurquoise2",
+    "window_global_actions": "PaleGreen2",
+    "window_global_actions_combinatorial": "PaleGreen2",
+}
+
+
+class DiagramExportError(Exception):
+    pass
+
+
+def export_diagrams(file_names, image_format, output_directory=None, processes=None) -> bool:
+    """Exports the diagrams of all files, the images are stored beside the files or in output_directory.
+    Returns True, when all images were written, errors are printed."""
+    if image_format not in _IMAGE_FORMATS:
+        raise ValueError(f"Unknown image format {image_format}, allowed are {', '.join(_IMAGE_FORMATS)}.")
+    jobs = []
+    for file_name in file_names:
+        directory = Path(output_directory) if output_directory else Path(file_name).parent
+        jobs.append((file_name, str(directory / (Path(file_name).stem + "." + image_format))))
+    if output_directory:
+        os.makedirs(output_directory, exist_ok=True)
+    if len(jobs) == 1 or processes == 1:
+        results = [_export_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_export_job, jobs, chunksize=4))
+    for (file_name, image_file_name), error in zip(jobs, results):
+        if error:
+            print("Error: The diagram of " + file_name + " could not be exported: " + error)
+        else:
+            print("Exported the diagram of " + file_name + " to " + image_file_name)
+    return not any(results)
+
+
+def _export_job(job) -> str:
+    """Runs in a worker process, returns an error message or an empty string."""
+    file_name, image_file_name = job
+    try:
+        export_diagram(file_name, image_file_name)
+    except (OSError, ValueError, KeyError, IndexError, TypeError, DiagramExportError) as e:
+        return str(e) or type(e).__name__
+    return ""
+
+
+def export_diagram(file_name, image_file_name) -> None:
+    with open(file_name, encoding="utf-8") as fileobject:
+        design_dictionary = json.load(fileobject)
+    diagram = Diagram(design_dictionary)
+    if image_file_name.endswith(".png"):
+        diagram.write_png(image_file_name)
+    else:
+        with open(image_file_name, "w", encoding="utf-8") as fileobject:
+            fileobject.write(diagram.get_svg())
+
+
+class Diagram:
+    """Converts the design dictionary into drawing primitives in image coordinates, which are written as SVG or PNG.
+    Each primitive is a tuple, whose first entry is its kind:
+        ("line", points, color, width, dashed)
+        ("polygon", points, fill, outline)
+        ("oval", box, fill, outline, width)
+        ("rectangle", box, fill, outline)
+        ("text", x, y, text, font_family, font_size, anchor)  with anchor "middle" or "start" (left aligned)
+    """
+
+    def __init__(self, design_dictionary) -> None:
+        self.design_dictionary = design_dictionary
+        self.scale = _STATE_RADIUS / design_dictionary.get("state_radius", _STATE_RADIUS)
+        self.fontsize = design_dictionary.get("fontsize", 10) * self.scale * _POINTS_TO_PIXELS
+        self.label_fontsize = design_dictionary.get("label_fontsize", 8) * self.scale * _POINTS_TO_PIXELS
+        self.background = _get_color(design_dictionary.get("diagram_background_color") or "white")
+        self.hidden_priorities = self._get_hidden_priorities()
+        self.primitives = []
+        # The order is the stacking order of the editor, where the windows of the text blocks are always on top:
+        self._add_lines()
+        self._add_nodes()
+        self._add_texts()
+        self._add_text_blocks()
+        self.box = self._get_bounding_box()
+
+    def _get_hidden_priorities(self) -> set:
+        """Like the editor at loading, the priority of the only transition starting at a node is not shown."""
+        hidden_priorities = set()
+        for element_name in ("state", "polygon", "rectangle"):
+            for definition in self.design_dictionary.get(element_name, []):
+                starts = [tag for tag in definition[1] if tag.startswith("transition") and tag.endswith("_start")]
+                if len(starts) == 1:
+                    hidden_priorities.add(starts[0][: -len("_start")])
+        return hidden_priorities
+
+    def _add_text_blocks(self) -> None:
+        for element_name in _TEXT_BLOCK_COLORS:
+            for block in self.design_dictionary.get(element_name, []):
+                self._add_text_block(element_name, block)
+
+    def _add_text_block(self, element_name, block) -> None:
+        # The window is anchored at the middle of its left border ("w").
+        if element_name == "window_condition_action_block":
+            coords, condition, action, tags = block
+            action_label = (
+                "Transition actions (asynchronous):"
+                if "connected_to_reset_transition" in tags
+                else "Transition actions (clocked):"
+            )
+            parts = []
+            if condition.strip():
+                parts.append(("Transition condition: ", condition))
+            if action.strip():
+                parts.append((action_label, action))
+        elif element_name == "window_global_actions":
+            coords, before, after = block[:3]
+            parts = [
+                ("Global actions clocked (executed before running the state machine):", before),
+                ("Global actions clocked (executed after running the state machine):", after),
+            ]
+        else:
+            coords, text = block[:2]
+            label = {
+                "window_state_action_block": "State actions (combinatorial): ",
+                "window_state_comment": "State-Comment: ",
+                "window_state_actions_default": "Default state actions (combinatorial): ",
+                "window_global_actions_combinatorial": "Global actions combinatorial: ",
+            }[element_name]
+            parts = [(label, text)]
+        if not parts:
+            return
+        lines = []  # (text, is_label)
+        for label, text in parts:
+            lines.append((label, True))
+            lines += [(line, False) for line in text.rstrip("\n").split("\n")]
+        width = max(
+            len(text) * _CHAR_WIDTH * (self.label_fontsize if is_label else self.fontsize) for text, is_label in lines
+        )
+        width += 2 * _TEXT_PADDING
+        height = sum((self.label_fontsize if is_label else self.fontsize) * _LINE_HEIGHT for _, is_label in lines)
+        height += 2 * _TEXT_PADDING
+        x, y = coords[0] * self.scale, coords[1] * self.scale
+        color = _get_color(_TEXT_BLOCK_COLORS[element_name])
+        self.primitives.append(("rectangle", [x, y - height / 2, x + width, y + height / 2], color, color))
+        text_y = y - height / 2 + _TEXT_PADDING
+        for text, is_label in lines:
+            fontsize = self.label_fontsize if is_label else self.fontsize
+            text_y += fontsize * _LINE_HEIGHT
+            family = "Arial" if is_label else "Courier"
+            self.primitives.append(
+                ("text", x + _TEXT_PADDING, text_y - fontsize * 0.3, text, family, fontsize, "start")
+            )
+
+    def _add_lines(self) -> None:
+        for coords, tags in self.design_dictionary.get("line", []):
+            points = [coordinate * self.scale for coordinate in coords]
+            if tags[0].startswith("transition"):
+                points = _smooth(points)
+                arrow = _get_arrow(points)
+                # Like Tk the line ends at the neck of the arrow:
+                points[-2:] = arrow[4:6]
+                self.primitives.append(("line", points, "blue", 1, False))
+                self.primitives.append(("polygon", arrow, "blue", "blue"))
+            else:  # connection, ca_connection and comment lines
+                self.primitives.append(("line", points, "black", 1, True))
+
+    def _add_nodes(self) -> None:
+        for definition in self.design_dictionary.get("state", []):
+            box = [coordinate * self.scale for coordinate in definition[0]]
+            fill = definition[2] if len(definition) == 3 else "cyan"  # Older files have no state color.
+            self.primitives.append(("oval", box, _get_color(fill), "blue", 2))
+        for polygon in self.design_dictionary.get("polygon", []):
+            points = [coordinate * self.scale for coordinate in polygon[0]]
+            self.primitives.append(("polygon", points, "red", "orange"))
+        for coords, tags in self.design_dictionary.get("rectangle", []):
+            box = [coordinate * self.scale for coordinate in coords]
+            if tags[0].startswith("connector"):
+                self.primitives.append(("rectangle", box, _get_color("violet"), "black"))
+            elif tags[0][: -len("rectangle")] not in self.hidden_priorities:
+                self.primitives.append(("rectangle", box, _get_color("cyan"), "black"))
+
+    def _add_texts(self) -> None:
+        for coords, tags, text in self.design_dictionary.get("text", []):
+            if tags[0].endswith("priority") and tags[0][: -len("priority")] in self.hidden_priorities:
+                continue
+            x, y = coords[0] * self.scale, coords[1] * self.scale
+            self.primitives.append(("text", x, y + self.fontsize * 0.35, text, "Arial", self.fontsize, "middle"))
+
+    def _get_bounding_box(self) -> list:
+        xs, ys = [], []
+        for primitive in self.primitives:
+            if primitive[0] == "text":
+                _, x, y, text, _, fontsize, anchor = primitive
+                width = len(text) * _CHAR_WIDTH * fontsize
+                xs += [x - width / 2, x + width / 2] if anchor == "middle" else [x, x + width]
+                ys += [y - fontsize, y]
+            else:
+                xs += primitive[1][0::2]
+                ys += primitive[1][1::2]
+        if not xs:
+            return [0, 0, 2 * _MARGIN, 2 * _MARGIN]
+        return [min(xs) - _MARGIN, min(ys) - _MARGIN, max(xs) + _MARGIN, max(ys) + _MARGIN]
+
+    def get_svg(self) -> str:
+        left, top, right, bottom = self.box
+        width, height = math.ceil(right - left), math.ceil(bottom - top)
+        lines = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="{left:.1f} {top:.1f} {width} {height}">',
+            f'<rect x="{left:.1f}" y="{top:.1f}" width="{width}" height="{height}" fill="{self.background}"/>',
+        ]
+        for primitive in self.primitives:
+            kind = primitive[0]
+            if kind == "line":
+                _, points, color, width, dashed = primitive
+                dash = f' stroke-dasharray="{_DASH[0]},{_DASH[1]}"' if dashed else ""
+                lines.append(
+                    f'<polyline points="{_format_points(points)}" fill="none" stroke="{color}" '
+                    f'stroke-width="{width}"{dash}/>'
+                )
+            elif kind == "polygon":
+                _, points, fill, outline = primitive
+                lines.append(f'<polygon points="{_format_points(points)}" fill="{fill}" stroke="{outline}"/>')
+            elif kind == "oval":
+                _, (x1, y1, x2, y2), fill, outline, width = primitive
+                lines.append(
+                    f'<ellipse cx="{(x1 + x2) / 2:.1f}" cy="{(y1 + y2) / 2:.1f}" rx="{(x2 - x1) / 2:.1f}" '
+                    f'ry="{(y2 - y1) / 2:.1f}" fill="{fill}" stroke="{outline}" stroke-width="{width}"/>'
+                )
+            elif kind == "rectangle":
+                _, (x1, y1, x2, y2), fill, outline = primitive
+                lines.append(
+                    f'<rect x="{x1:.1f}" y="{y1:.1f}" width="{x2 - x1:.1f}" height="{y2 - y1:.1f}" '
+                    f'fill="{fill}" stroke="{outline}"/>'
+                )
+            else:
+                _, x, y, text, family, fontsize, anchor = primitive
+                lines.append(
+                    f'<text x="{x:.1f}" y="{y:.1f}" font-family="{family}" font-size="{fontsize:.1f}" '
+                    f'text-anchor="{anchor}" xml:space="preserve">{escape(text)}</text>'
+                )
+        lines.append("</svg>")
+        return "\n".join(lines) + "\n"
+
+    def write_png(self, image_file_name) -> None:
+        try:
+            from PIL import Image, ImageDraw
+        except ImportError as e:
+            raise DiagramExportError("The export as PNG needs the package Pillow (pip install pillow).") from e
+        left, top, right, bottom = self.box
+        image = Image.new("RGB", (math.ceil(right - left), math.ceil(bottom - top)), self.background)
+        draw = ImageDraw.Draw(image)
+        fonts = {}
+
+        def move(points):
+            return [(points[index] - left, points[index + 1] - top) for index in range(0, len(points) - 1, 2)]
+
+        for primitive in self.primitives:
+            kind = primitive[0]
+            if kind == "line":
+                _, points, color, width, dashed = primitive
+                for segment in _get_dash_segments(points) if dashed else [points]:
+                    draw.line(move(segment), fill=color, width=width)
+            elif kind == "polygon":
+                _, points, fill, outline = primitive
+                draw.polygon(move(points), fill=fill, outline=outline)
+            elif kind == "oval":
+                _, box, fill, outline, width = primitive
+                draw.ellipse(move(box), fill=fill, outline=outline, width=width)
+            elif kind == "rectangle":
+                _, box, fill, outline = primitive
+                draw.rectangle(move(box), fill=fill, outline=outline)
+            else:
+                _, x, y, text, family, fontsize, anchor = primitive
+                key = (family, round(fontsize))
+                if key not in fonts:
+                    fonts[key] = _get_pil_font(family, round(fontsize))
+                draw.text(
+                    (x - left, y - top),
+                    text,
+                    fill="black",
+                    font=fonts[key],
+                    anchor="ms" if anchor == "middle" else "ls",
+                )
+        image.save(image_file_name)
+
+
+def _get_color(color) -> str:
+    if color in _COLORS:
+        return _COLORS[color]
+    return color.replace(" ", "").lower() if not color.startswith("#") else color
+
+
+def _format_points(points) -> str:
+    return " ".join(f"{points[index]:.1f},{points[index + 1]:.1f}" for index in range(0, len(points) - 1, 2))
+
+
+def _smooth(points) -> list:
+    """Returns the points of the quadratic spline, which Tk draws for a line with smooth=True.
+    The spline starts at the first point, ends at the last point and passes the middles of all inner segments."""
+    if len(points) <= 4:
+        return list(points)
+    vertices = [(points[index], points[index + 1]) for index in range(0, len(points) - 1, 2)]
+    smoothed = [vertices[0][0], vertices[0][1]]
+    for index in range(1, len(vertices) - 1):
+        start = vertices[0] if index == 1 else _middle(vertices[index - 1], vertices[index])
+        end = vertices[-1] if index == len(vertices) - 2 else _middle(vertices[index], vertices[index + 1])
+        control = vertices[index]
+        for step in range(1, _SMOOTH_STEPS + 1):
+            t = step / _SMOOTH_STEPS
+            for axis in (0, 1):
+                smoothed.append((1 - t) ** 2 * start[axis] + 2 * (1 - t) * t * control[axis] + t**2 * end[axis])
+    return smoothed
+
+
+def _middle(point1, point2) -> tuple:
+    return (point1[0] + point2[0]) / 2, (point1[1] + point2[1]) / 2
+
+
+def _get_arrow(points) -> list:
+    """Returns the polygon of the arrow head at the end of the line: tip, corner, neck and corner."""
+    neck_length, corner_length, corner_width = _ARROW_SHAPE
+    tip_x, tip_y = points[-2], points[-1]
+    # The direction is taken from the last point, which differs from the tip:
+    direction_x, direction_y = 1.0, 0.0
+    for index in range(len(points) - 4, -1, -2):
+        length = math.hypot(tip_x - points[index], tip_y - points[index + 1])
+        if length > 0:
+            direction_x, direction_y = (tip_x - points[index]) / length, (tip_y - points[index + 1]) / length
+            break
+    return [
+        tip_x,
+        tip_y,
+        tip_x - corner_length * direction_x - corner_width * direction_y,
+        tip_y - corner_length * direction_y + corner_width * direction_x,
+        tip_x - neck_length * direction_x,
+        tip_y - neck_length * direction_y,
+        tip_x - corner_length * direction_x + corner_width * direction_y,
+        tip_y - corner_length * direction_y - corner_width * direction_x,
+    ]
+
+
+def _get_dash_segments(points) -> list:
+    """Splits the line into the segments of a dashed line, as Pillow cannot draw dashed lines."""
+    dash_length, gap_length = _DASH
+    segments = []
+    drawing, remaining = True, dash_length
+    segment = [points[0], points[1]]
+    for index in range(2, len(points) - 1, 2):
+        x, y = points[index - 2], points[index - 1]
+        end_x, end_y = points[index], points[index + 1]
+        length = math.hypot(end_x - x, end_y - y)
+        position = 0.0
+        while length - position > remaining:
+            position += remaining
+            point = [x + (end_x - x) * position / length, y + (end_y - y) * position / length]
+            if drawing:
+                segments.append(segment + point)
+            segment = point
+            drawing = not drawing
+            remaining = dash_length if drawing else gap_length
+        remaining -= length - position
+        if drawing:
+            segment = segment + [end_x, end_y]
+    if drawing and len(segment) >= 4:
+        segments.append(segment)
+    return segments
+
+
+def _get_pil_font(family, size):
+    from PIL import ImageFont
+
+    file_names = ("cour.ttf", "DejaVuSansMono.ttf") if family == "Courier" else ("arial.ttf", "DejaVuSans.ttf")
+    for file_name in file_names:
+        try:
+            return ImageFont.truetype(file_name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
@@ -0,0 +1,59 @@
+"""This module contains the FindResultsPanel class, which lists all hits of a search in a non-modal window."""
+
+import tkinter as tk
+from tkinter import ttk
+
+from project_manager import project_manager
+
+
+class FindResultsPanel:
+    """
+    Only one panel exists, which is reused by each search.
+    A double click (or Return) at a hit calls the jump function with the hit.
+    """
+
+    _instance = None
+
+    def __init__(self) -> None:
+        self.window = tk.Toplevel(project_manager.root)
+        self.window.title("Find Results")
+        self.window.geometry("700x300")
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(1, weight=1)
+        self.status_label = ttk.Label(self.window, text="", padding=3)
+        self.tree = ttk.Treeview(self.window, columns=("location", "line", "text"), show="headings")
+        self.tree.heading("location", text="Location")
+        self.tree.heading("line", text="Line")
+        self.tree.heading("text", text="Text")
+        self.tree.column("location", width=200, stretch=False)
+        self.tree.column("line", width=50, stretch=False, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.status_label.grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.tree.bind("<Double-Button-1>", lambda event: self._jump_to_selected_hit())
+        self.tree.bind("<Return>", lambda event: self._jump_to_selected_hit())
+        self.hits = []
+        self.jump_function = None
+
+    @classmethod
+    def show(cls, status, hits, jump_function) -> None:
+        if cls._instance is None or not cls._instance.window.winfo_exists():
+            cls._instance = FindResultsPanel()
+        cls._instance.fill(status, hits, jump_function)
+
+    def fill(self, status, hits, jump_function) -> None:
+        self.status_label.configure(text=status)
+        self.hits = hits
+        self.jump_function = jump_function
+        self.tree.delete(*self.tree.get_children())
+        for index, hit in enumerate(hits):
+            self.tree.insert("", tk.END, iid=str(index), values=(hit["location"], hit["line"], hit["excerpt"]))
+        self.window.deiconify()
+        self.window.lift()
+
+    def _jump_to_selected_hit(self) -> None:
+        selected = self.tree.selection()
+        if selected and self.jump_function is not None:
+            self.jump_function(self.hits[int(selected[0])])
@@ -0,0 +1,71 @@
+"""This module contains the LogMessagesPanel class, which lists all compiler messages of the log tab."""
+
+import tkinter as tk
+from tkinter import ttk
+
+from project_manager import project_manager
+
+
+class LogMessagesPanel:
+    """
+    Only one panel exists, which is filled again each time it is shown.
+    A double click (or Return) at a message calls the jump function with the line number of the message in the log.
+    """
+
+    _instance = None
+
+    def __init__(self) -> None:
+        self.window = tk.Toplevel(project_manager.root)
+        self.window.title("Compiler Messages")
+        self.window.geometry("800x300")
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(1, weight=1)
+        self.status_label = ttk.Label(self.window, text="", padding=3)
+        self.tree = ttk.Treeview(self.window, columns=("severity", "file", "line", "text"), show="headings")
+        self.tree.heading("severity", text="Severity")
+        self.tree.heading("file", text="File")
+        self.tree.heading("line", text="Line")
+        self.tree.heading("text", text="Message")
+        self.tree.column("severity", width=70, stretch=False)
+        self.tree.column("file", width=200, stretch=False)
+        self.tree.column("line", width=50, stretch=False, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.status_label.grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.tree.bind("<Double-Button-1>", lambda event: self._jump_to_selected_message())
+        self.tree.bind("<Return>", lambda event: self._jump_to_selected_message())
+        self.jump_function = None
+
+    @classmethod
+    def show(cls, messages, jump_function) -> None:
+        if cls._instance is None or not cls._instance.window.winfo_exists():
+            cls._instance = LogMessagesPanel()
+        cls._instance.fill(messages, jump_function)
+
+    def fill(self, messages, jump_function) -> None:
+        number_of_errors = sum(1 for _, message in messages if message["severity"] == "error")
+        number_of_warnings = sum(1 for _, message in messages if message["severity"] == "warning")
+        self.status_label.configure(text=f"Errors = {number_of_errors}, Warnings = {number_of_warnings}")
+        self.jump_function = jump_function
+        self.tree.delete(*self.tree.get_children())
+        for line_number, message in messages:
+            self.tree.insert(
+                "",
+                tk.END,
+                iid=str(line_number),
+                values=(
+                    message["severity"],
+                    message["file_name"] or "",
+                    message["file_line_number"] or "",
+                    message["text"][:200],
+                ),
+            )
+        self.window.deiconify()
+        self.window.lift()
+
+    def _jump_to_selected_message(self) -> None:
+        selected = self.tree.selection()
+        if selected and self.jump_function is not None:
+            self.jump_function(int(selected[0]))
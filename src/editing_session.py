@@ -0,0 +1,480 @@
+"""
+Recording and replaying of editing sessions, used for reproducing performance problems of long sessions.
+
+With the switch --record-session <file> each editing operation of the user (inserting a state, a connector or a
+transition, moving, editing a text, renaming a state, editing a priority, adding an action, a comment or a
+condition&action block, selecting, moving, duplicating or deleting, zooming, undo, redo, opening, saving) is appended
+to the session file.
+With the switch --replay-session <file> the operations of the session file are executed again and the time and
+memory needed by each operation are reported. The replay generates the same mouse events as the user did, so the
+same handlers run (States.insert_state, TransitionLine.transition_start, move_handling.move_do, ...).
+The replay needs a display, at a server a virtual one can be used:
+    xvfb-run python main.py --replay-session session.jsonl
+
+Each line of the session file is a JSON object, which describes one operation. All coordinates are canvas
+coordinates, so the replay is independent of the scroll position of the canvas. Each operation also stores a
+checksum of the design (as stored in the undo stack). When the design differs from it after the operation was
+replayed, the replay fails, because then the session contains an edit, which was not recorded.
+A design opened during the session is copied into a temporary directory before the replay opens it,
+and saving is done into this directory, so no file of the user is changed by a replay.
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+import zlib
+
+import constants
+from project_manager import project_manager
+
+# (module name, class name or None, function name, operation name) of the functions whose calls are recorded:
+_RECORDED_FUNCTIONS = (
+    ("elements.state", "States", "insert_state", "insert_state"),
+    ("elements.connector", "ConnectorInstance", "create_connector", "insert_connector"),
+    ("elements.transition", "TransitionLine", "transition_start", "transition_start"),
+    ("elements.transition", "TransitionLine", "_handle_next_added_transition_point", "transition_point"),
+    ("move_handling_initialization", None, "move_initialization", "move_start"),
+    ("move_handling", None, "move_do", "move"),
+    ("move_handling_finish", None, "move_finish", "move_finish"),
+    ("custom_text", "CustomText", "format", "edit_text"),
+    ("elements.state", "States", "_update_state_name", "rename_state"),
+    ("elements.state", "States", "add_action", "add_state_action"),
+    ("elements.state", "States", "add_comment", "add_state_comment"),
+    ("elements.transition", "TransitionLine", "_update_priority", "edit_priority"),
+    ("elements.transition", "TransitionLine", "add_condition_action", "add_condition_action"),
+    ("elements.transition", "TransitionLine", "straighten_shape", "straighten_transition"),
+    ("selection", None, "toggle", "select"),
+    ("selection", None, "clear", "clear_selection"),
+    ("selection", None, "duplicate", "duplicate"),
+    ("selection", "GroupMove", "finish", "group_move"),
+    ("canvas_delete", "CanvasDelete", "__init__", "delete"),
+    ("canvas_editing", None, "canvas_zoom", "zoom"),
+    ("undo_handling", None, "undo", "undo"),
+    ("undo_handling", None, "redo", "redo"),
+    ("undo_handling", None, "design_has_changed", "design_has_changed"),
+    ("file_handling", None, "new_design", "new"),
+    ("file_handling", None, "open_file_with_name", "open"),
+    ("file_handling", None, "save_in_file", "save"),
+)
+# Operations, which are only recorded, when they have incremented this counter (a failed insertion shows a warning):
+_SUCCESS_COUNTERS = {
+    "insert_state": ("elements.state", "States", "state_number"),
+    "insert_connector": ("elements.connector", "ConnectorInstance", "connector_number"),
+}
+_MAX_NUMBER_OF_REPORTED_OPERATIONS = 20
+
+
+class SessionRecorder:
+    """
+    Records only the calls, which are not made by another recorded function (the depth is 0):
+    For example the call of design_has_changed by insert_state is part of the operation insert_state,
+    but the call of design_has_changed at leaving an edited text is an operation of its own.
+    """
+
+    def __init__(self, file_name) -> None:
+        # The file stays open until the exit of the editor:
+        self.session_file = open(file_name, "w", encoding="utf-8")  # noqa: SIM115
+        self.start_time = time.perf_counter()
+        self.depth = 0
+        self.last_texts = {}  # text id as JSON string -> last recorded text
+
+    def record(self, operation, **parameters) -> None:
+        entry = {"operation": operation, "time": round(time.perf_counter() - self.start_time, 3), **parameters}
+        design_checksum = _get_design_checksum()
+        if design_checksum is not None:
+            entry["design"] = design_checksum
+        self.session_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.session_file.flush()  # The session must be available, even when the editor is killed.
+
+    def record_call(self, operation, args, kwargs, before) -> None:
+        import selection
+
+        if operation in _SUCCESS_COUNTERS and _get_counter(operation) == before["counter"]:
+            return
+        if operation in ("insert_state", "insert_connector", "transition_start", "transition_point"):
+            self.record(operation, **_get_canvas_coordinates(args[0]))
+        elif operation in ("move_start", "move", "move_finish"):
+            if operation == "move_start" and selection.GroupMove.active:
+                return  # The group move is recorded as one operation, when it is finished.
+            if operation != "move" or not kwargs.get("first", len(args) > 2 and args[2]):
+                self.record(operation, **_get_canvas_coordinates(args[0]))
+        elif operation == "delete":
+            if args[0].item_was_deleted:
+                self.record(operation, **before)
+        elif operation == "rename_state":
+            self.record(operation, state=_get_first_tag(args[0].state_id), name=before["text"])
+        elif operation == "edit_priority":
+            self.record(operation, transition=args[1], priority=before["text"])
+        elif operation in ("add_state_action", "add_state_comment"):
+            self.record(operation, state=_get_first_tag(args[0].state_id), x=args[1], y=args[2])
+        elif operation == "add_condition_action":
+            self.record(operation, transition=_get_first_tag(args[0].transition_id), x=args[1], y=args[2])
+        elif operation == "straighten_transition":
+            self.record(operation, transition=_get_first_tag(args[0].transition_id))
+        elif operation == "select":
+            self.record(operation, tag=_get_first_tag(args[0]))
+        elif operation == "clear_selection":
+            if before["selected"]:
+                self.record(operation)
+        elif operation == "group_move":
+            self.record(operation, dx=args[1], dy=args[2])
+        elif operation == "edit_text":
+            self._record_text(args[0])
+        elif operation == "zoom":
+            zoom_center, zoom_factor = args
+            self.record(operation, x=zoom_center[0], y=zoom_center[1], factor=zoom_factor)
+        elif operation == "open":
+            self.record(operation, file=os.path.abspath(args[0]))
+        elif operation == "save":
+            if not args[0].endswith(".tmp"):
+                self.record(operation, file=os.path.abspath(args[0]))
+        else:
+            self.record(operation)
+
+    def _record_text(self, text_widget) -> None:
+        if text_widget.text_type in ("log", "generated"):
+            return
+        text_id = _get_text_id(text_widget)
+        text = text_widget.get("1.0", "end - 1 chars")
+        if self.last_texts.get(json.dumps(text_id)) != text:
+            self.last_texts[json.dumps(text_id)] = text
+            self.record("edit_text", text_id=text_id, text=text)
+
+
+_recorder = None
+_window_ids = {}  # name of a frame in the diagram -> canvas id of its window, only used when recording
+
+
+def start_recording(file_name) -> None:
+    """Must be called before the GUI is created, so that all bindings use the recording functions."""
+    global _recorder
+    _recorder = SessionRecorder(file_name)
+    _recorder.record("session", version=constants.VERSION)
+    for module_name, class_name, function_name, operation in _RECORDED_FUNCTIONS:
+        owner = _get_owner(module_name, class_name)
+        function = getattr(owner, function_name)
+        recording_function = _get_recording_function(function, operation)
+        if class_name is not None and isinstance(owner.__dict__[function_name], classmethod):
+            recording_function = staticmethod(recording_function)  # function is already bound to the class.
+        setattr(owner, function_name, recording_function)
+
+
+def _get_recording_function(function, operation):
+    def recording_function(*args, **kwargs):
+        depth = _recorder.depth
+        before = _get_parameters_before_call(operation, args) if depth == 0 else None
+        _recorder.depth += 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _recorder.depth -= 1
+            if depth == 0:
+                _recorder.record_call(operation, args, kwargs, before)
+
+    return recording_function
+
+
+def _get_parameters_before_call(operation, args) -> dict:
+    """Returns the parameters of the operation, which cannot be read anymore after the operation."""
+    import canvas_delete
+    import selection
+
+    if operation in _SUCCESS_COUNTERS:
+        return {"counter": _get_counter(operation)}
+    if operation == "delete":
+        return {
+            "x": canvas_delete.CanvasDelete.canvas_x_coordinate,
+            "y": canvas_delete.CanvasDelete.canvas_y_coordinate,
+            "group": bool(selection.get_selected_ids()) and selection.canvas_has_focus(),
+        }
+    if operation in ("rename_state", "edit_priority"):
+        return {"text": args[-1].get()}  # The entry widget is destroyed by the operation.
+    if operation == "clear_selection":
+        return {"selected": bool(selection.get_selected_ids())}
+    return {}
+
+
+def _get_owner(module_name, class_name):
+    owner = __import__(module_name, fromlist=["_"])
+    return owner if class_name is None else getattr(owner, class_name)
+
+
+def _get_counter(operation):
+    module_name, class_name, counter_name = _SUCCESS_COUNTERS[operation]
+    return getattr(_get_owner(module_name, class_name), counter_name)
+
+
+def _get_design_checksum():
+    """The checksum ignores the visible center, because it depends on the size of the window."""
+    import undo_handling
+
+    if undo_handling.stack_write_pointer == 0:
+        return None
+    design = undo_handling.stack[undo_handling.stack_write_pointer - 1]
+    lines = [line for line in design.split("\n") if not line.startswith("visible_center|")]
+    return zlib.crc32("\n".join(lines).encode("utf-8"))
+
+
+def _get_first_tag(canvas_id) -> str:
+    return project_manager.canvas.gettags(canvas_id)[0]
+
+
+def _find_canvas_id(first_tag):
+    for canvas_id in project_manager.canvas.find_withtag(first_tag):
+        if project_manager.canvas.gettags(canvas_id)[0] == first_tag:
+            return canvas_id
+    raise LookupError("No canvas item with tag " + first_tag)
+
+
+def _get_canvas_coordinates(event) -> dict:
+    return {"x": project_manager.canvas.canvasx(event.x), "y": project_manager.canvas.canvasy(event.y)}
+
+
+def _get_text_id(text_widget) -> dict:
+    """A text in the diagram is identified by the first tag of its canvas window, other texts by their widget name."""
+    frame = text_widget
+    while frame.master is not None and frame.master is not project_manager.canvas:
+        frame = frame.master
+    if frame.master is None:
+        return {"widget": str(text_widget)}
+    canvas_id = _window_ids.get(str(frame))
+    if canvas_id is None or project_manager.canvas.itemcget(canvas_id, "window") != str(frame):
+        canvas_id = None
+        for window_id in project_manager.canvas.find_all():
+            if project_manager.canvas.type(window_id) == "window":
+                _window_ids[project_manager.canvas.itemcget(window_id, "window")] = window_id
+                if project_manager.canvas.itemcget(window_id, "window") == str(frame):
+                    canvas_id = window_id
+    if canvas_id is None:
+        return {"widget": str(text_widget)}
+    return {
+        "window": project_manager.canvas.gettags(canvas_id)[0],
+        "index": _get_custom_texts(frame).index(text_widget),
+    }
+
+
+def _find_text_widget(text_id):
+    if "widget" in text_id:
+        return project_manager.root.nametowidget(text_id["widget"])
+    for canvas_id in project_manager.canvas.find_withtag(text_id["window"]):
+        if project_manager.canvas.type(canvas_id) == "window":
+            frame = project_manager.root.nametowidget(project_manager.canvas.itemcget(canvas_id, "window"))
+            return _get_custom_texts(frame)[text_id["index"]]
+    raise LookupError("No text window with tag " + text_id["window"])
+
+
+def _get_custom_texts(widget) -> list:
+    import custom_text
+
+    texts = []
+    for child in widget.winfo_children():
+        if isinstance(child, custom_text.CustomText):
+            texts.append(child)
+        texts.extend(_get_custom_texts(child))
+    return texts
+
+
+########################################################################################################################
+
+
+class SessionReplay:
+    """
+    Executes the operations of a session file one after the other. After each operation all pending events
+    and idle callbacks are processed, so that their time is part of the time of the operation.
+    The memory is measured by tracemalloc, which slows down Python code, so all times are bigger than at a
+    normal session, but they are comparable between replays.
+    """
+
+    def __init__(self, file_name) -> None:
+        self.file_name = file_name
+        self.directory = tempfile.TemporaryDirectory(prefix="hdl-fsm-editor-replay-")
+        self.records = []  # (number, operation, time in s, memory in bytes, number of canvas items)
+
+    def run(self) -> bool:
+        with open(self.file_name, encoding="utf-8") as session_file:
+            operations = [json.loads(line) for line in session_file if line.strip() != ""]
+        project_manager.root.update()
+        tracemalloc.start()
+        try:
+            for number, operation in enumerate(operations, start=1):
+                start = time.perf_counter()
+                try:
+                    self._execute(operation)
+                    project_manager.root.update()
+                    if "design" in operation and _get_design_checksum() != operation["design"]:
+                        raise RuntimeError("The design differs from the recorded design (an edit was not recorded)")
+                except Exception as exception:  # pylint: disable=broad-except
+                    print(f"Replay: Operation {number} ({operation['operation']}) failed: {exception!r}")
+                    return False
+                self.records.append(
+                    (
+                        number,
+                        operation["operation"],
+                        time.perf_counter() - start,
+                        tracemalloc.get_traced_memory()[0],
+                        len(project_manager.canvas.find_all()),
+                    )
+                )
+            return True
+        finally:
+            tracemalloc.stop()
+            self._report()
+            self.directory.cleanup()
+
+    def _execute(self, operation) -> None:
+        import canvas_delete
+        import canvas_editing
+        import canvas_modify_bindings
+        import file_handling
+        import selection
+        import undo_handling
+        from elements import state, transition
+
+        name = operation["operation"]
+        if name == "insert_state":
+            canvas_modify_bindings.switch_to_state_insertion()
+            _generate_mouse_event("<Button-1>", operation)
+        elif name == "insert_connector":
+            canvas_modify_bindings.switch_to_connector_insertion()
+            _generate_mouse_event("<Button-1>", operation)
+        elif name == "transition_start":
+            canvas_modify_bindings.switch_to_transition_insertion()
+            _generate_mouse_event("<Button-1>", operation)
+        elif name == "transition_point":
+            _generate_mouse_event("<Button-1>", operation)
+        elif name == "move_start":
+            canvas_modify_bindings.switch_to_move_mode()
+            _generate_mouse_event("<Button-1>", operation)
+        elif name == "move":
+            _generate_mouse_event("<Motion>", operation)
+        elif name == "move_finish":
+            _generate_mouse_event("<ButtonRelease-1>", operation)
+        elif name == "edit_text":
+            text_widget = _find_text_widget(operation["text_id"])
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert("1.0", operation["text"])
+            text_widget.format()
+        elif name == "rename_state":
+            state.States.ref_dict[_find_canvas_id(operation["state"])]._update_state_name(
+                _create_entry(operation["name"])
+            )
+        elif name == "edit_priority":
+            transition.TransitionLine.ref_dict[_find_canvas_id(operation["transition"])]._update_priority(
+                operation["transition"], _create_entry(operation["priority"])
+            )
+        elif name == "add_state_action":
+            state.States.ref_dict[_find_canvas_id(operation["state"])].add_action(operation["x"], operation["y"])
+        elif name == "add_state_comment":
+            state.States.ref_dict[_find_canvas_id(operation["state"])].add_comment(operation["x"], operation["y"])
+        elif name == "add_condition_action":
+            transition.TransitionLine.ref_dict[_find_canvas_id(operation["transition"])].add_condition_action(
+                operation["x"], operation["y"]
+            )
+        elif name == "straighten_transition":
+            transition.TransitionLine.ref_dict[_find_canvas_id(operation["transition"])].straighten_shape()
+        elif name == "select":
+            selection.toggle(_find_canvas_id(operation["tag"]))
+        elif name == "clear_selection":
+            selection.clear()
+        elif name == "duplicate":
+            selection.duplicate()
+        elif name == "group_move":
+            selection.GroupMove(project_manager.canvas).finish(operation["dx"], operation["dy"])
+        elif name == "delete":
+            canvas_delete.CanvasDelete.canvas_x_coordinate = operation["x"]
+            canvas_delete.CanvasDelete.canvas_y_coordinate = operation["y"]
+            if operation["group"]:
+                project_manager.canvas.focus_force()  # A group is only deleted, when the canvas has the focus.
+                project_manager.root.update()
+            else:
+                selection.clear()
+            canvas_delete.CanvasDelete()
+        elif name == "zoom":
+            canvas_editing.canvas_zoom([operation["x"], operation["y"]], operation["factor"])
+        elif name in ("undo", "redo"):
+            project_manager.canvas.focus_set()  # Undo and redo are ignored, when a text has the focus.
+            if name == "undo":
+                undo_handling.undo()
+            else:
+                undo_handling.redo()
+        elif name == "design_has_changed":
+            undo_handling.design_has_changed()
+        elif name == "new":
+            project_manager.root.title("new")  # Prevents the question for saving the design.
+            file_handling.new_design()
+        elif name == "open":
+            copy = os.path.join(self.directory.name, os.path.basename(operation["file"]))
+            shutil.copyfile(operation["file"], copy)
+            project_manager.root.title("new")
+            file_handling.new_design()
+            file_handling.open_file_with_name(copy, is_script_mode=False)
+        elif name == "save":
+            file_handling.save_in_file(os.path.join(self.directory.name, os.path.basename(operation["file"])))
+        elif name != "session":
+            raise ValueError("Unknown operation " + name)
+
+    def _report(self) -> None:
+        if not self.records:
+            return
+        summary = {}  # operation -> [number of calls, time in s, max time in s, memory difference in bytes]
+        memory_before = self.records[0][3]
+        for _, operation, duration, memory, _ in self.records:
+            entry = summary.setdefault(operation, [0, 0.0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] = max(entry[2], duration)
+            entry[3] += memory - memory_before
+            memory_before = memory
+        print(f"\nReplay of {self.file_name} (times in ms, memory in KiB):")
+        print("     total       mean        max   calls     memory  operation")
+        for operation, (calls, duration, max_duration, memory) in sorted(
+            summary.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            print(
+                f"{duration * 1000:10.1f} {duration / calls * 1000:10.2f} {max_duration * 1000:10.1f} "
+                f"{calls:7d} {memory / 1024:10.1f}  {operation}"
+            )
+        print("Slowest operations:")
+        for number, operation, duration, _, _ in sorted(self.records, key=lambda record: record[2], reverse=True)[
+            :_MAX_NUMBER_OF_REPORTED_OPERATIONS
+        ]:
+            print(f"{duration * 1000:10.1f}  {number:7d} {operation}")
+        _, _, _, memory, canvas_items = self.records[-1]
+        print(f"At the end: {memory / 1024:.0f} KiB traced memory, {canvas_items} canvas items")
+        csv_file_name = os.path.splitext(self.file_name)[0] + "_replay.csv"
+        try:
+            with open(csv_file_name, "w", encoding="utf-8", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(["number", "operation", "time_ms", "traced_memory_kib", "canvas_items"])
+                for number, operation, duration, memory, canvas_items in self.records:
+                    writer.writerow(
+                        [number, operation, round(duration * 1000, 3), round(memory / 1024, 1), canvas_items]
+                    )
+            print("The time and memory of each operation were written to", csv_file_name)
+        except OSError:
+            pass
+
+
+def replay(file_name) -> bool:
+    """Replays the session file and prints the report, returns False if an operation failed."""
+    return SessionReplay(file_name).run()
+
+
+def _create_entry(text) -> tk.Entry:
+    """Creates the entry widget, which is read (and destroyed) by the operations which rename."""
+    entry = tk.Entry(project_manager.canvas)
+    entry.insert(0, text)
+    return entry
+
+
+def _generate_mouse_event(sequence, operation) -> None:
+    project_manager.canvas.event_generate(
+        sequence,
+        x=round(operation["x"] - project_manager.canvas.canvasx(0)),
+        y=round(operation["y"] - project_manager.canvas.canvasy(0)),
+    )
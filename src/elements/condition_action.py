@@ -18,6 +18,23 @@ from project_manager import project_manager
 class ConditionAction:
     """This class handles the condition&action box which can be activated for each transition."""
 
+    __slots__ = (
+        "frame_id",
+        "condition_label",
+        "condition_id",
+        "action_label",
+        "action_id",
+        "window_id",
+        "line_id",
+        "action_text",
+        "condition_text",
+        "borderwidth",
+        "difference_x",
+        "difference_y",
+        "frame_enter_func_id",
+        "canvas_enter_func_id",
+    )
+
     conditionaction_id = 0
     ref_dict = {}
 
@@ -107,16 +124,16 @@ class ConditionAction:
             lambda event: move_handling_canvas_window.MoveHandlingCanvasWindow(event, self.frame_id, self.window_id),
         )
         self.canvas_enter_func_id = None
-        self.condition_label.bind("<Enter>", lambda event: self._select_window())
-        self.condition_label.bind("<Leave>", lambda event: self._deselect_window())
+        self.condition_label.bind("<Enter>", lambda event: self.activate_window())
+        self.condition_label.bind("<Leave>", lambda event: self.deactivate_window())
         self.condition_label.bind(
             "<Button-1>",
             lambda event: move_handling_canvas_window.MoveHandlingCanvasWindow(
                 event, self.condition_label, self.window_id
             ),
         )
-        self.action_label.bind("<Enter>", lambda event: self._select_window())
-        self.action_label.bind("<Leave>", lambda event: self._deselect_window())
+        self.action_label.bind("<Enter>", lambda event: self.activate_window())
+        self.action_label.bind("<Leave>", lambda event: self.deactivate_window())
         self.action_label.bind(
             "<Button-1>",
             lambda event: move_handling_canvas_window.MoveHandlingCanvasWindow(
@@ -156,6 +173,7 @@ class ConditionAction:
 
         # Create dictionary for translating the canvas-id of the canvas-window into a reference to this object:
         ConditionAction.ref_dict[self.window_id] = self
+        canvas_editing.collapse_text_boxes_after_idle()
 
     def _show_condition_and_action(self) -> None:
         self.condition_label.grid(row=0, column=0, sticky=(tk.W, tk.E))
@@ -164,7 +182,7 @@ class ConditionAction:
         self.action_id.grid(row=3, column=0, sticky=(tk.W, tk.E))
 
     def _activate_frame(self) -> None:
-        self._select_window()
+        self.activate_window()
         self._show_condition_and_action()
         self.action_text = self.action_id.get("1.0", tk.END)
         self.condition_text = self.condition_id.get("1.0", tk.END)
@@ -182,20 +200,20 @@ class ConditionAction:
         pos = project_manager.canvas.coords(self.window_id)
         project_manager.canvas.coords(self.window_id, (pos[0] + diff, pos[1]))
 
-    def _select_window(self) -> None:
+    def activate_window(self) -> None:
         self._set_borderwidth(1, "WindowSelected.TFrame")
         self.condition_label.configure(style="WindowSelected.TLabel")
         self.action_label.configure(style="WindowSelected.TLabel")
 
     def _deactivate_frame(self) -> None:
-        self._deselect_window()
+        self.deactivate_window()
         if self.canvas_enter_func_id is not None:
             project_manager.canvas.unbind("<Motion>", self.canvas_enter_func_id)
             self.canvas_enter_func_id = None
         self.frame_enter_func_id = self.frame_id.bind("<Enter>", lambda event: self._activate_frame())
         self._hide_empty_condition_or_action()
 
-    def _deselect_window(self) -> None:
+    def deactivate_window(self) -> None:
         project_manager.canvas.focus_set()  # "unfocus" the Text, when the mouse leaves the text.
         self._set_borderwidth(0, style="Window.TFrame")
         self.condition_label.configure(style="Window.TLabel")
@@ -265,5 +283,6 @@ class ConditionAction:
         del custom_text.CustomText.written_variables_of_all_windows[self.action_id]
         project_manager.canvas.delete(self.window_id)
         project_manager.canvas.delete(self.line_id)
+        self.frame_id.destroy()
         project_manager.canvas.dtag("all", "ca_connection" + number + "_end")
         del ConditionAction.ref_dict[self.window_id]
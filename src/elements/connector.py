@@ -7,6 +7,7 @@ import constants
 import undo_handling
 from elements import transition
 from project_manager import project_manager
+from spatial_index import spatial_index
 
 
 class ConnectorInstance:
@@ -14,6 +15,8 @@ class ConnectorInstance:
     For each connector on the canvas a ConnectorInstance object is created.
     """
 
+    __slots__ = ("connector_id",)
+
     connector_number = 0
     difference_x = 0
     difference_y = 0
@@ -21,6 +24,7 @@ class ConnectorInstance:
 
     def __init__(self, coords, tags):
         self.connector_id = project_manager.canvas.create_rectangle(coords, fill=constants.CONNECTOR_COLOR, tags=tags)
+        spatial_index.insert(self.connector_id, "connector", coords)
         project_manager.canvas.tag_bind(
             self.connector_id,
             "<Enter>",
@@ -35,6 +39,7 @@ class ConnectorInstance:
 
     def delete(self):
         connector_tags = project_manager.canvas.gettags(self.connector_id)
+        canvas_editing.delete_bindings_of_items(self.connector_id)
         project_manager.canvas.delete(self.connector_id)
         for connector_tag in connector_tags:
             if connector_tag.startswith("transition") and connector_tag.endswith("_start"):
@@ -45,6 +50,7 @@ class ConnectorInstance:
                 canvas_ids = project_manager.canvas.find_withtag(connector_tag[:-4])
                 if canvas_ids:
                     transition.TransitionLine.ref_dict[canvas_ids[0]].delete()
+        spatial_index.remove(self.connector_id)
         del ConnectorInstance.ref_dict[self.connector_id]
 
     @classmethod
@@ -93,6 +99,7 @@ class ConnectorInstance:
             event_x, event_y, edge_length
         )
         project_manager.canvas.coords(rectangle_id, *new_upper_left_corner, *new_lower_right_corner)
+        spatial_index.update(rectangle_id, [*new_upper_left_corner, *new_lower_right_corner])
 
     @classmethod
     def _calculate_middle_point(cls, coords) -> list:
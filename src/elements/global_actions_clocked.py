@@ -20,6 +20,20 @@ class GlobalActionsClocked:
     Handles the global actions clocked window in the diagram.
     """
 
+    __slots__ = (
+        "frame_id",
+        "label_before",
+        "label_after",
+        "text_before_id",
+        "text_after_id",
+        "window_id",
+        "text_before_content",
+        "text_after_content",
+        "borderwidth",
+        "difference_x",
+        "difference_y",
+    )
+
     global_actions_number = 1
     ref_dict = {}
 
@@ -126,6 +140,7 @@ class GlobalActionsClocked:
             for seq in seq2_list:
                 id.bind(seq, tab_diagram.TabDiagram.scroll_wheel)
         GlobalActionsClocked.ref_dict[self.window_id] = self
+        canvas_editing.collapse_text_boxes_after_idle()
         canvas_modify_bindings.switch_to_move_mode()
 
     def _edit_before_in_external_editor(self):
@@ -194,6 +209,7 @@ class GlobalActionsClocked:
         del custom_text.CustomText.read_variables_of_all_windows[self.text_after_id]
         del custom_text.CustomText.written_variables_of_all_windows[self.text_after_id]
         project_manager.canvas.delete(self.window_id)
+        self.frame_id.destroy()
         del GlobalActionsClocked.ref_dict[self.window_id]
         project_manager.global_action_clocked_button.config(state=tk.NORMAL)
 
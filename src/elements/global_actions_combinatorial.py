@@ -20,6 +20,17 @@ class GlobalActionsCombinatorial:
     Class for combinatorial actions independent from the state machine
     """
 
+    __slots__ = (
+        "frame_id",
+        "label",
+        "text_id",
+        "window_id",
+        "text_content",
+        "borderwidth",
+        "difference_x",
+        "difference_y",
+    )
+
     ref_dict = {}
 
     def __init__(self, menu_x, menu_y, height, width, padding, tags) -> None:
@@ -89,6 +100,7 @@ class GlobalActionsCombinatorial:
                 id.bind(seq, tab_diagram.TabDiagram.scroll_wheel)
         self.frame_id.lower()
         GlobalActionsCombinatorial.ref_dict[self.window_id] = self
+        canvas_editing.collapse_text_boxes_after_idle()
         canvas_modify_bindings.switch_to_move_mode()
 
     def _edit_in_external_editor(self):
@@ -140,6 +152,7 @@ class GlobalActionsCombinatorial:
         del custom_text.CustomText.read_variables_of_all_windows[self.text_id]
         del custom_text.CustomText.written_variables_of_all_windows[self.text_id]
         project_manager.canvas.delete(self.window_id)  # delete window
+        self.frame_id.destroy()
         del GlobalActionsCombinatorial.ref_dict[self.window_id]
         project_manager.global_action_combinatorial_button.config(state=tk.NORMAL)
 
@@ -21,6 +21,8 @@ class ResetEntry:
         difference_y: Difference in y direction between mouse pointer and Reset-Entry polygon at move start.
     """
 
+    __slots__ = ()
+
     difference_x = 0
     difference_y = 0
 
@@ -49,6 +51,7 @@ class ResetEntry:
             if reset_entry_tag.startswith("transition") and reset_entry_tag.endswith("_start"):
                 canvas_id = project_manager.canvas.find_withtag(reset_entry_tag[:-6])[0]
                 transition.TransitionLine.ref_dict[canvas_id].delete()
+        canvas_editing.delete_bindings_of_items(*project_manager.canvas.find_withtag("reset_entry"))
         project_manager.canvas.delete("reset_entry")
         project_manager.canvas.delete("reset_text")
 
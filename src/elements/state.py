@@ -11,9 +11,9 @@ import constants
 import move_handling_canvas_item
 import move_handling_initialization
 import undo_handling
-from dialogs.color_changer import ColorChanger
 from elements import state_action, state_comment, transition
 from project_manager import project_manager
+from spatial_index import spatial_index
 from widgets.option_menu import OptionMenu
 
 
@@ -22,6 +22,8 @@ class States:
     For each state on the canvas a states-object is created.
     """
 
+    __slots__ = ("state_id", "text_id")
+
     state_number = 0
     ref_dict = {}
     difference_x = 0
@@ -37,6 +39,7 @@ class States:
             outline="blue",
             tags=tags,
         )
+        spatial_index.insert(self.state_id, "state", coords)
         state_name = tags[0]
         middle = self._calculate_center(coords)
         self.text_id = project_manager.canvas.create_text(
@@ -135,66 +138,74 @@ class States:
         listbox.destroy()
         project_manager.canvas.delete(window)
         if selected_entry == "add action":
-            tags = project_manager.canvas.gettags(self.state_id)
-            action_block_exists = False
-            for tag in tags:
-                if tag.startswith("connection"):  # searching for "connection<n>_end"
-                    action_block_exists = True
-            if not action_block_exists:
-                project_manager.canvas.addtag_withtag(
-                    "connection" + str(state_action.StateAction.state_action_id) + "_end", self.state_id
-                )
-                line_tags = (
-                    "connection" + str(state_action.StateAction.state_action_id),
-                    "connected_to_" + project_manager.canvas.gettags(self.state_id)[0],
-                )
-                state_action_tags = (
-                    "state_action" + str(state_action.StateAction.state_action_id),
-                    "connection" + str(state_action.StateAction.state_action_id) + "_start",
-                )
-                middle_x, middle_y = self._calculate_center(project_manager.canvas.coords(self.state_id))
-                line_coords = [menu_x + 100, menu_y, middle_x, middle_y]
-                state_action.StateAction(
-                    menu_x + 100,
+            self.add_action(menu_x, menu_y)
+        elif selected_entry == "add comment":
+            self.add_comment(menu_x, menu_y)
+        elif selected_entry == "change color":
+            from dialogs.color_changer import ColorChanger  # Dialogs are imported at first use.
+
+            new_color = ColorChanger(constants.STATE_COLOR).ask_color()
+            project_manager.canvas.itemconfigure(self.state_id, fill=new_color)
+            undo_handling.design_has_changed()
+
+    def add_action(self, menu_x, menu_y) -> None:
+        tags = project_manager.canvas.gettags(self.state_id)
+        action_block_exists = False
+        for tag in tags:
+            if tag.startswith("connection"):  # searching for "connection<n>_end"
+                action_block_exists = True
+        if not action_block_exists:
+            project_manager.canvas.addtag_withtag(
+                "connection" + str(state_action.StateAction.state_action_id) + "_end", self.state_id
+            )
+            line_tags = (
+                "connection" + str(state_action.StateAction.state_action_id),
+                "connected_to_" + project_manager.canvas.gettags(self.state_id)[0],
+            )
+            state_action_tags = (
+                "state_action" + str(state_action.StateAction.state_action_id),
+                "connection" + str(state_action.StateAction.state_action_id) + "_start",
+            )
+            middle_x, middle_y = self._calculate_center(project_manager.canvas.coords(self.state_id))
+            line_coords = [menu_x + 100, menu_y, middle_x, middle_y]
+            state_action.StateAction(
+                menu_x + 100,
+                menu_y,
+                height=1,
+                width=8,
+                padding=1,
+                tags=state_action_tags,
+                line_coords=line_coords,
+                line_tags=line_tags,
+                increment=True,
+            )
+            undo_handling.design_has_changed()
+
+    def add_comment(self, menu_x, menu_y) -> None:
+        tags = project_manager.canvas.gettags(self.state_id)
+        for tag in tags:
+            if tag.endswith("comment_line_end"):
+                return  # There is already a comment attached to this state.
+        state_coords = project_manager.canvas.coords(self.state_id)
+        for tag in tags:
+            if tag.startswith("state"):
+                state_identifier = tag
+                project_manager.canvas.addtag_withtag(state_identifier + "_comment_line_end", state_identifier)
+                state_comment.StateComment(
+                    menu_x,
                     menu_y,
                     height=1,
                     width=8,
                     padding=1,
-                    tags=state_action_tags,
-                    line_coords=line_coords,
-                    line_tags=line_tags,
-                    increment=True,
+                    tags=[state_identifier + "_comment", state_identifier + "_comment_line_start"],
+                    line_coords=[
+                        menu_x + 100,
+                        menu_y,
+                        (state_coords[2] + state_coords[0]) / 2,
+                        (state_coords[3] + state_coords[1]) / 2,
+                    ],
                 )
                 undo_handling.design_has_changed()
-        elif selected_entry == "add comment":
-            tags = project_manager.canvas.gettags(self.state_id)
-            for tag in tags:
-                if tag.endswith("comment_line_end"):
-                    return  # There is already a comment attached to this state.
-            state_coords = project_manager.canvas.coords(self.state_id)
-            for tag in tags:
-                if tag.startswith("state"):
-                    state_identifier = tag
-                    project_manager.canvas.addtag_withtag(state_identifier + "_comment_line_end", state_identifier)
-                    state_comment.StateComment(
-                        menu_x,
-                        menu_y,
-                        height=1,
-                        width=8,
-                        padding=1,
-                        tags=[state_identifier + "_comment", state_identifier + "_comment_line_start"],
-                        line_coords=[
-                            menu_x + 100,
-                            menu_y,
-                            (state_coords[2] + state_coords[0]) / 2,
-                            (state_coords[3] + state_coords[1]) / 2,
-                        ],
-                    )
-                    undo_handling.design_has_changed()
-        elif selected_entry == "change color":
-            new_color = ColorChanger(constants.STATE_COLOR).ask_color()
-            project_manager.canvas.itemconfigure(self.state_id, fill=new_color)
-            undo_handling.design_has_changed()
 
     def _abort_edit_text(self, text_box, old_text) -> None:
         project_manager.canvas.delete("entry-window")
@@ -249,6 +260,7 @@ class States:
                 state_is_too_big = True
         if not state_is_too_big:
             project_manager.canvas.coords(state_tag, state_coords)
+            spatial_index.update(self.state_id, state_coords)
 
     def delete(self) -> None:
         state_tags = project_manager.canvas.gettags(self.state_id)
@@ -271,8 +283,10 @@ class States:
                 canvas_id_of_comment = project_manager.canvas.find_withtag(state_tag[:-9])[0]
                 ref = state_comment.StateComment.ref_dict[canvas_id_of_comment]
                 ref.delete()
+        canvas_editing.delete_bindings_of_items(self.state_id, self.text_id)
         project_manager.canvas.delete(self.state_id)  # delete state
         project_manager.canvas.delete(self.text_id)  # delete state name
+        spatial_index.remove(self.state_id)
         del States.ref_dict[self.state_id]
 
     @classmethod
@@ -290,13 +304,14 @@ class States:
             new_center_x, new_center_y = cls._move_center_to_grid(new_center_x, new_center_y)
         text_tag = cls._determine_the_tag_of_the_state_name(state_id)
         state_radius = cls._determine_the_radius_of_the_state(state_id)
-        project_manager.canvas.coords(
-            state_id,
+        new_state_coords = (
             new_center_x - state_radius,
             new_center_y - state_radius,
             new_center_x + state_radius,
             new_center_y + state_radius,
         )
+        project_manager.canvas.coords(state_id, *new_state_coords)
+        spatial_index.update(state_id, new_state_coords)
         project_manager.canvas.coords(text_tag, new_center_x, new_center_y)
         project_manager.canvas.tag_raise(state_id, "all")
         project_manager.canvas.tag_raise(text_tag, state_id)
@@ -307,7 +322,7 @@ class States:
         event_x_mod, event_y_mod = event_x + cls.difference_x, event_y + cls.difference_y
         event_x_mod = project_manager.state_radius * round(event_x_mod / project_manager.state_radius)
         event_y_mod = project_manager.state_radius * round(event_y_mod / project_manager.state_radius)
-        state_coords = project_manager.canvas.coords(moved_item_id)
+        state_coords = spatial_index.get_bbox(moved_item_id)
         state_radius = (state_coords[2] - state_coords[0]) // 2
         moved_state_coords = (
             event_x_mod - state_radius,
@@ -315,23 +330,14 @@ class States:
             event_x_mod + state_radius,
             event_y_mod + state_radius,
         )
-        overlapping_list = project_manager.canvas.find_overlapping(
+        # The spatial index contains only states and connectors, so no further checks of the found items are needed:
+        overlapping_list = spatial_index.find_overlapping(
             moved_state_coords[0] - project_manager.state_radius / 2,
             moved_state_coords[1] - project_manager.state_radius / 2,
             moved_state_coords[2] + project_manager.state_radius / 2,
             moved_state_coords[3] + project_manager.state_radius / 2,
         )
-        for overlapping_item in overlapping_list:
-            overlapping_with_connector = False
-            tags = project_manager.canvas.gettags(overlapping_item)
-            for tag in tags:
-                if tag.startswith("connector"):
-                    overlapping_with_connector = True
-            if overlapping_item != moved_item_id and (
-                project_manager.canvas.type(overlapping_item) == "oval" or overlapping_with_connector
-            ):
-                return True
-        return False
+        return any(overlapping_item != moved_item_id for overlapping_item in overlapping_list)
 
     @classmethod
     def _calculate_center(cls, coords) -> list:
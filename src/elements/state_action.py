@@ -17,6 +17,18 @@ from project_manager import project_manager
 class StateAction:
     """Implements the state action of a single state."""
 
+    __slots__ = (
+        "frame_id",
+        "label_id",
+        "text_id",
+        "window_id",
+        "line_id",
+        "text_content",
+        "borderwidth",
+        "difference_x",
+        "difference_y",
+    )
+
     state_action_id = 0
     ref_dict = {}
 
@@ -100,6 +112,7 @@ class StateAction:
             for seq in seq2_list:
                 id.bind(seq, tab_diagram.TabDiagram.scroll_wheel)
         StateAction.ref_dict[self.window_id] = self
+        canvas_editing.collapse_text_boxes_after_idle()
 
     def _edit_in_external_editor(self):
         self.text_id.edit_in_external_editor()
@@ -183,4 +196,5 @@ class StateAction:
         project_manager.canvas.delete(self.window_id)  # delete state action window
         del custom_text.CustomText.read_variables_of_all_windows[self.text_id]
         del custom_text.CustomText.written_variables_of_all_windows[self.text_id]
+        self.frame_id.destroy()  # The widgets of the window are not deleted together with the window item.
         del StateAction.ref_dict[self.window_id]
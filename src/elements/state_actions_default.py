@@ -20,6 +20,18 @@ class StateActionsDefault:
     Handles the combinatorial default actions for all states.
     """
 
+    __slots__ = (
+        "frame_id",
+        "label",
+        "text_id",
+        "window_id",
+        "move_rectangle",
+        "text_content",
+        "borderwidth",
+        "difference_x",
+        "difference_y",
+    )
+
     ref_dict = {}
 
     def __init__(self, menu_x, menu_y, height, width, padding, tags) -> None:
@@ -89,6 +101,7 @@ class StateActionsDefault:
             for seq in seq2_list:
                 id.bind(seq, tab_diagram.TabDiagram.scroll_wheel)
         StateActionsDefault.ref_dict[self.window_id] = self
+        canvas_editing.collapse_text_boxes_after_idle()
         canvas_modify_bindings.switch_to_move_mode()
 
     def tag(self) -> None:
@@ -143,6 +156,7 @@ class StateActionsDefault:
         del custom_text.CustomText.read_variables_of_all_windows[self.text_id]
         del custom_text.CustomText.written_variables_of_all_windows[self.text_id]
         project_manager.canvas.delete(self.window_id)  # delete window
+        self.frame_id.destroy()
         del StateActionsDefault.ref_dict[self.window_id]
         project_manager.state_action_default_button.config(state=tk.NORMAL)
 
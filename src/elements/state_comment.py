@@ -19,6 +19,18 @@ class StateComment:
     This class handles "state-comments".
     """
 
+    __slots__ = (
+        "frame_id",
+        "label_id",
+        "text_id",
+        "window_id",
+        "line_id",
+        "text_content",
+        "borderwidth",
+        "difference_x",
+        "difference_y",
+    )
+
     ref_dict = {}
 
     def __init__(
@@ -104,6 +116,7 @@ class StateComment:
                 id.bind(seq, tab_diagram.TabDiagram.scroll_wheel)
 
         StateComment.ref_dict[self.window_id] = self  # Store the object-reference with the Canvas-id as key.
+        canvas_editing.collapse_text_boxes_after_idle()
 
     def _edit_in_external_editor(self):
         self.text_id.edit_in_external_editor()
@@ -181,5 +194,6 @@ class StateComment:
         comment_number = project_manager.canvas.gettags(self.window_id)[0][5:-8]  # remove "state" and "_comment"
         project_manager.canvas.delete(self.window_id)
         project_manager.canvas.delete(self.line_id)
+        self.frame_id.destroy()
         project_manager.canvas.dtag("all", "state" + comment_number + "_comment_line_end")
         del StateComment.ref_dict[self.window_id]
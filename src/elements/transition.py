@@ -21,14 +21,16 @@ class TransitionLine:
     For each transition at the Canvas a TransitionLine object is created.
     """
 
+    __slots__ = ("transition_id", "priority_text", "priority_rectangle")
+
     transition_number = 0
     ref_dict = {}
+    difference_x = 0
+    difference_y = 0
 
     def __init__(self, transition_coords, tags, priority, new_transition=False) -> None:
         if new_transition:
             TransitionLine.transition_number += 1
-        self.difference_x = 0
-        self.difference_y = 0
         transition_tag = tags[0]  # "transition<n>"
         rectangle_coords = self._determine_position_of_priority_rectangle(transition_coords)
         self.transition_id = project_manager.canvas.create_line(
@@ -112,103 +114,110 @@ class TransitionLine:
         design_was_changed = False
         selected_entry = listbox.get(listbox.curselection())
         if selected_entry == "add condition&action":
-            transition_tags = project_manager.canvas.gettags(self.transition_id)
-            has_condition_action = False
-            connected_to_reset_entry = False
-            for tag in transition_tags:
-                if tag.startswith("ca_connection"):
-                    has_condition_action = True
-                elif tag == "coming_from_reset_entry":
-                    connected_to_reset_entry = True
-            if has_condition_action is False:
-                transition_coords = project_manager.canvas.coords(self.transition_id)
-                line_coords = [menu_x, menu_y, transition_coords[0], transition_coords[1]]
-                # Incrementing of conditionaction_id is needed, as in old versions of HFE first conditionaction_id was
-                # incremented and afterwards the tags were created by reading this new value:
-                project_manager.canvas.addtag_withtag(
-                    "ca_connection" + str(condition_action.ConditionAction.conditionaction_id + 1) + "_end",
-                    self.transition_id,
-                )
-                tags = [
-                    "condition_action" + str(condition_action.ConditionAction.conditionaction_id + 1),
-                    "ca_connection" + str(condition_action.ConditionAction.conditionaction_id + 1) + "_anchor",
-                ]
-                if connected_to_reset_entry:
-                    tags.append("connected_to_reset_transition")
-                transition_tags = project_manager.canvas.gettags(self.transition_id)
-                line_tags = [
-                    "ca_connection" + str(condition_action.ConditionAction.conditionaction_id + 1),
-                    "connected_to_" + transition_tags[0],
-                ]
-                condition_action_ref = condition_action.ConditionAction(
-                    menu_x,
-                    menu_y,
-                    connected_to_reset_entry,
-                    height=1,
-                    width=8,
-                    padding=1,
-                    tags=tags,
-                    condition="",
-                    action="",
-                    line_coords=line_coords,
-                    line_tags=line_tags,
-                    increment=True,
-                )
-                condition_action_ref.condition_id.focus()  # Puts the text input cursor into the text box.
-                design_was_changed = True
+            design_was_changed = self.add_condition_action(menu_x, menu_y)
         elif selected_entry == "straighten shape":
-            transition_tags = project_manager.canvas.gettags(self.transition_id)
-            start_state_radius = 0
-            end_state_radius = 0
-            for tag in transition_tags:
-                if tag.startswith("transition"):
-                    transition_tag = tag
-                    TransitionLine.extend_transition_to_state_middle_points(transition_tag)
-                elif tag.startswith("coming_from_"):
-                    start_state = tag.replace("coming_from_", "")
-                    if start_state == "reset_entry":
-                        start_state_radius = 0
-                    else:
-                        start_state_coords = project_manager.canvas.coords(start_state)
-                        start_state_radius = abs(start_state_coords[2] - start_state_coords[0]) / 2
-                elif tag.startswith("going_to_"):
-                    end_state = tag.replace("going_to_", "")
-                    end_state_coords = project_manager.canvas.coords(end_state)
-                    end_state_radius = abs(end_state_coords[2] - end_state_coords[0]) / 2
-            old_coords = project_manager.canvas.coords(self.transition_id)
-            new_coords = []
-            new_coords.append(old_coords[0])
-            new_coords.append(old_coords[1])
-            new_coords.append(old_coords[-2])
-            new_coords.append(old_coords[-1])
-            new_coords = TransitionLine.shorten_vector(
-                start_state_radius, new_coords[0], new_coords[1], end_state_radius, new_coords[2], new_coords[3], 1, 1
-            )
-            project_manager.canvas.coords(self.transition_id, new_coords)
-            # Calculates the position of the priority rectangle by shortening the distance between the first point of
-            # the transition and the second point of the transition.
-            [priority_middle_x, priority_middle_y, _, _] = TransitionLine.shorten_vector(
-                project_manager.priority_distance, new_coords[0], new_coords[1], 0, new_coords[2], new_coords[3], 1, 0
-            )
-            [rectangle_width_half, rectangle_height_half] = TransitionLine.get_rectangle_dimensions(
-                transition_tag + "rectangle"
-            )
-            project_manager.canvas.coords(
-                transition_tag + "rectangle",
-                priority_middle_x - rectangle_width_half,
-                priority_middle_y - rectangle_height_half,
-                priority_middle_x + rectangle_width_half,
-                priority_middle_y + rectangle_height_half,
-            )
-            project_manager.canvas.coords(transition_tag + "priority", priority_middle_x, priority_middle_y)
-            project_manager.canvas.tag_raise(transition_tag + "rectangle", transition_tag)
-            project_manager.canvas.tag_raise(transition_tag + "priority", transition_tag + "rectangle")
+            self.straighten_shape()
             design_was_changed = True
         listbox.destroy()
         project_manager.canvas.delete(window)
         if design_was_changed:
             undo_handling.design_has_changed()  # It must be waited until the window for the menu is deleted.
 
+    def add_condition_action(self, menu_x, menu_y) -> bool:
+        transition_tags = project_manager.canvas.gettags(self.transition_id)
+        has_condition_action = False
+        connected_to_reset_entry = False
+        for tag in transition_tags:
+            if tag.startswith("ca_connection"):
+                has_condition_action = True
+            elif tag == "coming_from_reset_entry":
+                connected_to_reset_entry = True
+        if has_condition_action is False:
+            transition_coords = project_manager.canvas.coords(self.transition_id)
+            line_coords = [menu_x, menu_y, transition_coords[0], transition_coords[1]]
+            # Incrementing of conditionaction_id is needed, as in old versions of HFE first conditionaction_id was
+            # incremented and afterwards the tags were created by reading this new value:
+            project_manager.canvas.addtag_withtag(
+                "ca_connection" + str(condition_action.ConditionAction.conditionaction_id + 1) + "_end",
+                self.transition_id,
+            )
+            tags = [
+                "condition_action" + str(condition_action.ConditionAction.conditionaction_id + 1),
+                "ca_connection" + str(condition_action.ConditionAction.conditionaction_id + 1) + "_anchor",
+            ]
+            if connected_to_reset_entry:
+                tags.append("connected_to_reset_transition")
+            transition_tags = project_manager.canvas.gettags(self.transition_id)
+            line_tags = [
+                "ca_connection" + str(condition_action.ConditionAction.conditionaction_id + 1),
+                "connected_to_" + transition_tags[0],
+            ]
+            condition_action_ref = condition_action.ConditionAction(
+                menu_x,
+                menu_y,
+                connected_to_reset_entry,
+                height=1,
+                width=8,
+                padding=1,
+                tags=tags,
+                condition="",
+                action="",
+                line_coords=line_coords,
+                line_tags=line_tags,
+                increment=True,
+            )
+            condition_action_ref.condition_id.focus()  # Puts the text input cursor into the text box.
+            return True
+        return False
+
+    def straighten_shape(self) -> None:
+        transition_tags = project_manager.canvas.gettags(self.transition_id)
+        start_state_radius = 0
+        end_state_radius = 0
+        for tag in transition_tags:
+            if tag.startswith("transition"):
+                transition_tag = tag
+                TransitionLine.extend_transition_to_state_middle_points(transition_tag)
+            elif tag.startswith("coming_from_"):
+                start_state = tag.replace("coming_from_", "")
+                if start_state == "reset_entry":
+                    start_state_radius = 0
+                else:
+                    start_state_coords = project_manager.canvas.coords(start_state)
+                    start_state_radius = abs(start_state_coords[2] - start_state_coords[0]) / 2
+            elif tag.startswith("going_to_"):
+                end_state = tag.replace("going_to_", "")
+                end_state_coords = project_manager.canvas.coords(end_state)
+                end_state_radius = abs(end_state_coords[2] - end_state_coords[0]) / 2
+        old_coords = project_manager.canvas.coords(self.transition_id)
+        new_coords = []
+        new_coords.append(old_coords[0])
+        new_coords.append(old_coords[1])
+        new_coords.append(old_coords[-2])
+        new_coords.append(old_coords[-1])
+        new_coords = TransitionLine.shorten_vector(
+            start_state_radius, new_coords[0], new_coords[1], end_state_radius, new_coords[2], new_coords[3], 1, 1
+        )
+        project_manager.canvas.coords(self.transition_id, new_coords)
+        # Calculates the position of the priority rectangle by shortening the distance between the first point of
+        # the transition and the second point of the transition.
+        [priority_middle_x, priority_middle_y, _, _] = TransitionLine.shorten_vector(
+            project_manager.priority_distance, new_coords[0], new_coords[1], 0, new_coords[2], new_coords[3], 1, 0
+        )
+        [rectangle_width_half, rectangle_height_half] = TransitionLine.get_rectangle_dimensions(
+            transition_tag + "rectangle"
+        )
+        project_manager.canvas.coords(
+            transition_tag + "rectangle",
+            priority_middle_x - rectangle_width_half,
+            priority_middle_y - rectangle_height_half,
+            priority_middle_x + rectangle_width_half,
+            priority_middle_y + rectangle_height_half,
+        )
+        project_manager.canvas.coords(transition_tag + "priority", priority_middle_x, priority_middle_y)
+        project_manager.canvas.tag_raise(transition_tag + "rectangle", transition_tag)
+        project_manager.canvas.tag_raise(transition_tag + "priority", transition_tag + "rectangle")
+
     def _close_menu(self, _event, window, listbox) -> None:
         listbox.destroy()
         project_manager.canvas.delete(window)
@@ -260,6 +269,7 @@ class TransitionLine:
 
     def delete(self) -> None:
         transition_tags = project_manager.canvas.gettags(self.transition_id)
+        canvas_editing.delete_bindings_of_items(self.transition_id, self.priority_text)
         project_manager.canvas.delete(self.transition_id)
         project_manager.canvas.delete(self.priority_text)
         project_manager.canvas.delete(self.priority_rectangle)
@@ -290,11 +300,36 @@ class TransitionLine:
             project_manager.canvas.itemconfigure(tag_of_outgoing_transition + "priority", state=tk.HIDDEN)
 
     @classmethod
-    def move_to(cls, event_x, event_y, transition_id, point, first, move_list, last=False) -> None:
-        if project_manager.canvas.type(move_list[0][0]) == "line" and (move_list[0][1] in ("start", "end")):
-            middle_of_line_is_moved = False
-        else:
-            middle_of_line_is_moved = True
+    def get_tag_of_moved_line(cls, all_transition_tags) -> str:
+        transition_tag = ""
+        for single_transition_tag in all_transition_tags:
+            if (
+                single_transition_tag.startswith("transition")
+                or single_transition_tag.startswith("connection")
+                or single_transition_tag.endswith("comment_line")
+            ):
+                transition_tag = single_transition_tag
+        return transition_tag
+
+    @classmethod
+    def move_to(
+        cls,
+        event_x,
+        event_y,
+        transition_id,
+        point,
+        first,
+        move_list,
+        last=False,
+        transition_tag=None,
+        middle_of_line_is_moved=None,
+    ) -> None:
+        # transition_tag and middle_of_line_is_moved are provided by the drag plan of move_handling,
+        # so that they must not be determined again at each motion event.
+        if middle_of_line_is_moved is None:
+            middle_of_line_is_moved = not (
+                project_manager.canvas.type(move_list[0][0]) == "line" and (move_list[0][1] in ("start", "end"))
+            )
         if middle_of_line_is_moved is True:
             if first is True:
                 # Calculate the difference between the "anchor" point and the event:
@@ -319,15 +354,18 @@ class TransitionLine:
         if last is True:
             event_x = project_manager.state_radius * round(event_x / project_manager.state_radius)
             event_y = project_manager.state_radius * round(event_y / project_manager.state_radius)
-        all_transition_tags = project_manager.canvas.gettags(transition_id)
-        for single_transition_tag in all_transition_tags:
-            if (
-                single_transition_tag.startswith("transition")
-                or single_transition_tag.startswith("connection")
-                or single_transition_tag.endswith("comment_line")
-            ):
-                transition_tag = single_transition_tag
-                project_manager.canvas.tag_lower(transition_tag)
+        # The stacking order must only be adapted at the begin and at the end of the moving:
+        adapt_stacking_order = transition_tag is None or first is True or last is True
+        if adapt_stacking_order:
+            all_transition_tags = project_manager.canvas.gettags(transition_id)
+            transition_tag = cls.get_tag_of_moved_line(all_transition_tags)
+            for single_transition_tag in all_transition_tags:
+                if (
+                    single_transition_tag.startswith("transition")
+                    or single_transition_tag.startswith("connection")
+                    or single_transition_tag.endswith("comment_line")
+                ):
+                    project_manager.canvas.tag_lower(single_transition_tag)
         # Move transition:
         transition_coords = project_manager.canvas.coords(transition_tag)
         if point == "start":
@@ -344,7 +382,7 @@ class TransitionLine:
             project_manager.canvas.coords(transition_tag, *transition_coords[-8:-2], event_x, event_y)
         else:
             print("transition_handling: Fatal, unknown point =", point)
-        if project_manager.grid_drawer.show_grid:
+        if adapt_stacking_order and project_manager.grid_drawer.show_grid:
             list_of_grid_line_canvas_ids = project_manager.canvas.find_withtag("grid_line")
             if list_of_grid_line_canvas_ids:
                 project_manager.canvas.tag_raise(transition_tag, "grid_line")
@@ -12,11 +12,12 @@ from typing import Any
 import canvas_editing
 import constants
 import custom_text
+import selection
 import tag_plausibility
 import undo_handling
-import update_hdl_tab
 import write_data_creator
 from constants import GuiTab
+from design_cache import design_cache
 from elements import (
     condition_action,
     connector,
@@ -30,9 +31,23 @@ from elements import (
     transition,
 )
 from project_manager import project_manager
+from spatial_index import spatial_index
 
 # Pylint expects this to be a constant with uppercase naming.
 _write_data_creator_ref = None  # pylint: disable=invalid-name # module-level mutable ref
+_ALLOWED_ELEMENT_NAMES_IN_DESIGN_DICTIONARY = (
+    "state",
+    "text",
+    "line",
+    "polygon",
+    "rectangle",
+    "window_state_action_block",
+    "window_state_comment",
+    "window_condition_action_block",
+    "window_global_actions",
+    "window_global_actions_combinatorial",
+    "window_state_actions_default",
+)
 
 
 def ask_save_unsaved_changes(title) -> str:
@@ -124,24 +139,20 @@ def _clear_design() -> bool:
     project_manager.internals_architecture_text.delete("1.0", tk.END)
     project_manager.internals_process_clocked_text.delete("1.0", tk.END)
     project_manager.internals_process_combinatorial_text.delete("1.0", tk.END)
-    project_manager.hdl_frame_text.config(state=tk.NORMAL)
-    project_manager.hdl_frame_text.delete("1.0", tk.END)
-    project_manager.hdl_frame_text.config(state=tk.DISABLED)
+    project_manager.notebook.show_hdl("")
+    forget_design_elements()
     project_manager.canvas.delete("all")
+    spatial_index.clear()
+    selection.forget()
     state.States.state_number = 0
     transition.TransitionLine.transition_number = 0
     project_manager.reset_entry_button.config(state=tk.NORMAL)
     connector.ConnectorInstance.connector_number = 0
     condition_action.ConditionAction.conditionaction_id = 0
-    condition_action.ConditionAction.ref_dict = {}
     state_action.StateAction.state_action_id = 0
-    state_action.StateAction.ref_dict = {}
-    state_actions_default.StateActionsDefault.ref_dict = {}
     project_manager.state_action_default_button.config(state=tk.NORMAL)
     project_manager.global_action_clocked_button.config(state=tk.NORMAL)
     project_manager.global_action_combinatorial_button.config(state=tk.NORMAL)
-    global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict = {}
-    global_actions_clocked.GlobalActionsClocked.ref_dict = {}
     project_manager.state_radius = 20.0
     project_manager.priority_distance = 14
     project_manager.reset_entry_size = 40
@@ -159,24 +170,42 @@ def _clear_design() -> bool:
     return True
 
 
+def forget_design_elements() -> None:
+    """
+    Must be called before all canvas items are deleted (at a new design and at undo/redo, which rebuild the design).
+    Empties the dictionaries of all elements and destroys the widgets of their windows and their item bindings,
+    because otherwise each rebuild would keep all replaced elements alive until the end of the session.
+    """
+    canvas_ids = list(project_manager.canvas.find_withtag("reset_entry"))
+    for state_ref in state.States.ref_dict.values():
+        canvas_ids += [state_ref.state_id, state_ref.text_id]
+    for transition_ref in transition.TransitionLine.ref_dict.values():
+        canvas_ids += [transition_ref.transition_id, transition_ref.priority_text]
+    canvas_ids += list(connector.ConnectorInstance.ref_dict)
+    canvas_editing.delete_bindings_of_items(*canvas_ids)
+    for element_class in (
+        state_action.StateAction,
+        state_comment.StateComment,
+        condition_action.ConditionAction,
+        global_actions_clocked.GlobalActionsClocked,
+        global_actions_combinatorial.GlobalActionsCombinatorial,
+        state_actions_default.StateActionsDefault,
+    ):
+        for ref in element_class.ref_dict.values():
+            ref.frame_id.destroy()
+        element_class.ref_dict = {}
+    canvas_editing.forget_collapsed_text_boxes()
+    state.States.ref_dict = {}
+    transition.TransitionLine.ref_dict = {}
+    connector.ConnectorInstance.ref_dict = {}
+
+
 ########################################################################################################################
 
 
 def save_in_file(save_filename) -> None:  # Called at saving and at every design change (writing to .tmp-file)
     global _write_data_creator_ref
-    allowed_element_names_in_design_dictionary = (
-        "state",
-        "text",
-        "line",
-        "polygon",
-        "rectangle",
-        "window_state_action_block",
-        "window_state_comment",
-        "window_condition_action_block",
-        "window_global_actions",
-        "window_global_actions_combinatorial",
-        "window_state_actions_default",
-    )
+    allowed_element_names_in_design_dictionary = _ALLOWED_ELEMENT_NAMES_IN_DESIGN_DICTIONARY
     if _write_data_creator_ref is None:
         _write_data_creator_ref = write_data_creator.WriteDataCreator(project_manager.state_radius)
     if not save_filename.endswith(".tmp"):
@@ -196,6 +225,8 @@ def save_in_file(save_filename) -> None:  # Called at saving and at every design
             json.dump(design_dictionary, fileobject, indent=4, default=str, ensure_ascii=False)
         if not save_filename.endswith(".tmp") and os.path.isfile(f"{project_manager.previous_file}.tmp"):
             os.remove(f"{project_manager.previous_file}.tmp")
+        if not save_filename.endswith(".tmp"):
+            design_cache.store_design(save_filename)  # So the saved design is opened again without text analysis.
         project_manager.root.config(cursor=old_cursor)
     except Exception as _:
         project_manager.root.config(cursor=old_cursor)
@@ -205,6 +236,11 @@ def save_in_file(save_filename) -> None:  # Called at saving and at every design
         messagebox.showerror("Error", "The database is corrupt.\nDo not use the written file.\nSee details at STDOUT.")
 
 
+def get_design_dictionary() -> dict[str, Any]:
+    """Returns the design as it would be written into a .tmp-file (used as snapshot by the live HDL preview)."""
+    return _save_design_to_dict(_ALLOWED_ELEMENT_NAMES_IN_DESIGN_DICTIONARY)
+
+
 def _save_design_to_dict(allowed_element_names_in_design_dictionary) -> dict[str, Any]:
     design_dictionary = {}
     _save_control_data(design_dictionary)
@@ -394,7 +430,11 @@ def _do_load_file(read_filename: str, replaced_read_filename: str, is_script_mod
     if _write_data_creator_ref is None:
         _write_data_creator_ref = write_data_creator.WriteDataCreator(project_manager.state_radius)
     _write_data_creator_ref.store_as_compare_object(design_dictionary)
+    if not is_script_mode:
+        design_cache.open_design(replaced_read_filename)  # The results of the text analysis are read from the cache.
     _load_design_from_dict(design_dictionary)
+    if not is_script_mode and replaced_read_filename == read_filename:
+        design_cache.store_design(read_filename)
     if os.path.isfile(f"{read_filename}.tmp") and not is_script_mode:
         os.remove(f"{read_filename}.tmp")
 
@@ -410,6 +450,8 @@ def _do_load_file(read_filename: str, replaced_read_filename: str, is_script_mod
     dir_name, file_name = os.path.split(read_filename)
     project_manager.root.title(f"{file_name} ({dir_name})")
     if not is_script_mode:
+        import update_hdl_tab  # Imports the codegen package, which is not needed before.
+
         update_ref = update_hdl_tab.UpdateHdlTab(
             design_dictionary["language"],
             design_dictionary["number_of_files"],
@@ -435,12 +477,17 @@ def _load_design_from_dict(design_dictionary: dict[str, Any]) -> None:
     # Bring the notebook tab with the diagram into the foreground
     project_manager.notebook.show_tab(GuiTab.DIAGRAM)
 
-    _load_control_data(design_dictionary)
-    _load_interface_data(design_dictionary)
-    _load_internals_data(design_dictionary)
-    _load_log_config(design_dictionary)
-    _load_canvas_data(design_dictionary)
-    _load_canvas_elements(design_dictionary)
+    # All texts are highlighted once after loading instead of after inserting each single text:
+    custom_text.CustomText.start_bulk_load()
+    try:
+        _load_control_data(design_dictionary)
+        _load_interface_data(design_dictionary)
+        _load_internals_data(design_dictionary)
+        _load_log_config(design_dictionary)
+        _load_canvas_data(design_dictionary)
+        _load_canvas_elements(design_dictionary)
+    finally:
+        custom_text.CustomText.end_bulk_load()
 
 
 def _load_control_data(design_dictionary: dict[str, Any]) -> None:
@@ -471,16 +518,7 @@ def _load_interface_data(design_dictionary: dict[str, Any]) -> None:
     project_manager.interface_generics_text.insert("1.0", design_dictionary["interface_generics"])
     project_manager.interface_ports_text.insert("1.0", design_dictionary["interface_ports"])
 
-    # Update highlight tags and custom text class lists
-    project_manager.interface_package_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
-    project_manager.interface_generics_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
-    project_manager.interface_ports_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
+    # The highlighting is done by CustomText.end_bulk_load().
     project_manager.interface_generics_text.update_custom_text_class_generics_list()
     project_manager.interface_ports_text.update_custom_text_class_ports_list()
 
@@ -494,19 +532,7 @@ def _load_internals_data(design_dictionary: dict[str, Any]) -> None:
         "1.0", design_dictionary["internals_process_combinatorial"]
     )
 
-    # Update highlight tags and custom text class lists
-    project_manager.internals_package_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
-    project_manager.internals_architecture_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
-    project_manager.internals_process_clocked_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
-    project_manager.internals_process_combinatorial_text.update_highlight_tags(
-        10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-    )
+    # The highlighting is done by CustomText.end_bulk_load().
     project_manager.internals_architecture_text.update_custom_text_class_signals_list()
     project_manager.internals_process_clocked_text.update_custom_text_class_signals_list()
     project_manager.internals_process_combinatorial_text.update_custom_text_class_signals_list()
@@ -9,63 +9,112 @@ from tkinter import messagebox
 import canvas_editing
 import undo_handling
 from constants import GuiTab
+from dialogs.find_results import FindResultsPanel
 from elements import (
     condition_action,
     global_actions_clocked,
     global_actions_combinatorial,
+    state,
     state_action,
     state_actions_default,
     state_comment,
+    transition,
 )
 from project_manager import project_manager
+from search_index import search_index
 
 
 class FindReplace:
     """
-    The methods _search_in_canvas_text() and _search_in_entry_widget() use <string>.find(), re.findall() and re.sub().
-    All other search-methods use text_widget.search() for find and replace.
-    In order to have identical behaviour in _search_in_canvas_text() and _search_in_entry_widget(),
-    there the search_string/replace_string are "escaped".
+    All hits are collected from the search index and are listed in the FindResultsPanel, from where the user can
+    jump to each hit. A replace changes all hits in one batch and creates only one entry in the undo stack.
+    In text fields the search string is used as regular expression, in canvas texts and entry widgets it is "escaped".
+    Both searches ignore the case.
     """
 
+    last_hit_text_ref = None  # The text field, in which the hit of the last jump is highlighted.
+
     def __init__(self, search_string, replace_string, replace) -> None:
-        self.number_of_hits_all = 0
         self.search_pattern = search_string.get()
         self.replace_pattern = replace_string.get()
-        self.replace = replace
         if self.search_pattern == "":
             messagebox.showinfo("HDL-FSM-Editor", "The search is aborted because you searched for an empty string.")
             return
-        continue_search = self._search_in_diagram()
-        if not continue_search:
-            return
-        continue_search = self._search_in_all_text_fields()
-        if not continue_search:
-            return
-        continue_search = self._search_in_all_entry_widgets()
-        if not continue_search:
+        try:
+            self.text_field_regex = re.compile(self.search_pattern, flags=re.IGNORECASE)
+        except re.error as error:
+            messagebox.showerror("HDL-FSM-Editor", "The search string is no valid regular expression:\n" + str(error))
             return
+        self.escaped_regex = re.compile(re.escape(self.search_pattern), flags=re.IGNORECASE)
+        hits = self._find_all_hits()
         if replace:
-            undo_handling.design_has_changed()
-            messagebox.showinfo("HDL-FSM-Editor", "Number of replacements = " + str(self.number_of_hits_all))
+            number_of_replacements = self._replace_all_hits(hits)
+            if number_of_replacements:
+                undo_handling.design_has_changed()
+            FindResultsPanel.show("Number of replacements = " + str(number_of_replacements), [], FindReplace.jump_to)
         else:
-            messagebox.showinfo("HDL-FSM-Editor", "Number of hits = " + str(self.number_of_hits_all))
-
-    def _search_in_diagram(self) -> bool:
-        all_canvas_items = project_manager.canvas.find_all()
-        continue_search = True
-        for item in all_canvas_items:
-            if project_manager.canvas.type(item) == "window":
-                text_ids = self._get_text_ids_of_canvas_window(item)
-                continue_search = self._search_in_all_text_fields_of_canvas_window(item, text_ids)
-            elif project_manager.canvas.type(item) == "text":
-                continue_search = self._search_in_canvas_text(item)
-            if continue_search is False:
-                break
-        return continue_search
-
-    def _search_in_all_text_fields(self) -> bool:
-        continue_search = True
+            FindResultsPanel.show("Number of hits = " + str(len(hits)), hits, FindReplace.jump_to)
+
+    def _find_all_hits(self) -> list:
+        hits = []
+        all_text_fields = self._get_text_fields_of_diagram() + self._get_text_fields_of_tabs()
+        search_index.remove_all_texts_except({text_field["ref"] for text_field in all_text_fields})
+        for text_field in all_text_fields:
+            text = search_index.get_text(text_field["ref"])
+            for match in self.text_field_regex.finditer(text):
+                if match.end() > match.start():
+                    hits.append(self._create_hit(text_field, "text_field", text, match))
+        for canvas_id in self._get_canvas_text_ids():
+            text = project_manager.canvas.itemcget(canvas_id, "text")
+            source = {"tab": GuiTab.DIAGRAM, "ref": canvas_id, "location": "Diagram: " + text}
+            for match in self.escaped_regex.finditer(text):
+                hits.append(self._create_hit(source, "canvas_text", text, match))
+        for entry_widget_info in project_manager.entry_widgets:
+            value = search_index.get_entry_value(entry_widget_info["stringvar"])
+            source = {"tab": GuiTab.CONTROL, "ref": entry_widget_info, "location": "Control"}
+            for match in self.escaped_regex.finditer(value):
+                hits.append(self._create_hit(source, "entry", value, match))
+        return hits
+
+    def _create_hit(self, source, kind, text, match) -> dict:
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        line_end = text.find("\n", match.start())
+        if line_end == -1:
+            line_end = len(text)
+        return {
+            **source,
+            "kind": kind,
+            "start": match.start(),
+            "end": match.end(),
+            "line": text.count("\n", 0, match.start()) + 1,
+            "excerpt": text[line_start:line_end].strip()[:100],
+        }
+
+    def _get_text_fields_of_diagram(self) -> list:
+        text_fields = []
+        for ref_dict, text_attributes in (
+            (state_action.StateAction.ref_dict, ["text_id"]),
+            (state_comment.StateComment.ref_dict, ["text_id"]),
+            (condition_action.ConditionAction.ref_dict, ["condition_id", "action_id"]),
+            (global_actions_clocked.GlobalActionsClocked.ref_dict, ["text_before_id", "text_after_id"]),
+            (global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict, ["text_id"]),
+            (state_actions_default.StateActionsDefault.ref_dict, ["text_id"]),
+        ):
+            for window_id, ref in ref_dict.items():
+                location = "Diagram: " + project_manager.canvas.gettags(window_id)[0]
+                for text_attribute in text_attributes:
+                    text_fields.append(
+                        {
+                            "tab": GuiTab.DIAGRAM,
+                            "ref": getattr(ref, text_attribute),
+                            "update": "",
+                            "window_id": window_id,
+                            "location": location,
+                        }
+                    )
+        return text_fields
+
+    def _get_text_fields_of_tabs(self) -> list:
         text_fields = []
         if project_manager.language.get() == "VHDL":
             text_fields.append(
@@ -86,162 +135,98 @@ class FindReplace:
         )
         text_fields.append({"tab": GuiTab.GENERATED_HDL, "ref": project_manager.hdl_frame_text, "update": ""})
         for text_field in text_fields:
-            if continue_search:
-                continue_search = self._search_in_text_field(text_field)
-        return continue_search
+            text_field["location"] = text_field["tab"].value
+        return text_fields
 
-    def _search_in_all_entry_widgets(self):
-        continue_search = True
-        for entry_widget_info in project_manager.entry_widgets:
-            if continue_search:
-                continue_search = self._search_in_entry_widget(entry_widget_info)
-        return continue_search
-
-    def _get_text_ids_of_canvas_window(self, item) -> list:
-        text_ids = []
-        if item in state_action.StateAction.ref_dict:
-            text_ids.append(state_action.StateAction.ref_dict[item].text_id)
-        elif item in condition_action.ConditionAction.ref_dict:
-            text_ids.append(condition_action.ConditionAction.ref_dict[item].condition_id)
-            text_ids.append(condition_action.ConditionAction.ref_dict[item].action_id)
-        elif item in global_actions_clocked.GlobalActionsClocked.ref_dict:
-            text_ids.append(global_actions_clocked.GlobalActionsClocked.ref_dict[item].text_before_id)
-            text_ids.append(global_actions_clocked.GlobalActionsClocked.ref_dict[item].text_after_id)
-        elif item in global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict:
-            text_ids.append(global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict[item].text_id)
-        elif item in state_actions_default.StateActionsDefault.ref_dict:
-            text_ids.append(state_actions_default.StateActionsDefault.ref_dict[item].text_id)
-        elif item in state_comment.StateComment.ref_dict:
-            text_ids.append(state_comment.StateComment.ref_dict[item].text_id)
-        return text_ids
-
-    def _search_in_all_text_fields_of_canvas_window(self, item, text_ids_of_actions) -> bool:
-        for text_id in text_ids_of_actions:
-            text_field = {"tab": GuiTab.DIAGRAM, "ref": text_id, "update": "", "window_id": item}
-            continue_search = self._search_in_text_field(text_field)
-            if not continue_search:
-                break
-        return continue_search
-
-    def _search_in_canvas_text(self, item) -> bool:
-        text = project_manager.canvas.itemcget(item, "text")
-        start = 0
-        continue_search = True
-        while True:
-            hit_begin = text.find(self.search_pattern, start, len(text))
-            if hit_begin == -1:
-                break
-            if self.replace:
-                # All hits are replaced in 1 action:
-                search_pattern_escaped = re.escape(self.search_pattern)
-                replace_pattern_escaped = re.escape(self.replace_pattern)
-                self.number_of_hits_all += len(re.findall(search_pattern_escaped, text, flags=re.IGNORECASE))
-                text = re.sub(search_pattern_escaped, replace_pattern_escaped, text, flags=re.IGNORECASE)
-                project_manager.canvas.itemconfigure(item, text=text)
-                start = len(text)  # The search-pattern cannot be found again in the next loop.
-            else:
-                self.number_of_hits_all += 1
-                self._move_in_foreground(GuiTab.DIAGRAM)
-                project_manager.canvas.select_from(item, hit_begin)
-                project_manager.canvas.select_to(item, hit_begin + len(self.search_pattern) - 1)
-                object_coords = project_manager.canvas.bbox(item)
-                canvas_editing.view_rectangle(object_coords, check_fit=False)
-                object_center = project_manager.canvas.coords(item)
-                canvas_editing.canvas_zoom(object_center, 0.25)
-                continue_search = messagebox.askyesno("Continue", "Find next")
-                if continue_search is False:
-                    break
-                start = hit_begin + len(self.search_pattern)
-            if start == hit_begin:
-                messagebox.showinfo(
-                    "HDL-FSM-Editor", "Search in canvas text is aborted as for unknown reason no progress happens."
-                )
-                break
-        return continue_search
-
-    def _search_in_text_field(self, text_field) -> bool:
-        count = tk.IntVar()
-        start = "1.0"
-        continue_search = True
-        while True:
-            index = text_field["ref"].search(
-                self.search_pattern, start, tk.END, count=count, regexp=True, nocase=1
-            )  # index = "line.column"
-            if index == "" or count.get() == 0:
-                break
-            if self.replace:
-                if text_field["ref"].cget("state") != tk.DISABLED:
-                    self.number_of_hits_all += 1
-                    end_index = index + "+" + str(len(self.search_pattern)) + " chars"
-                    text_field["ref"].delete(index, end_index)
-                    text_field["ref"].insert(index, self.replace_pattern)
-                    start = index + "+" + str(len(self.replace_pattern)) + " chars"
-                    if text_field["tab"] == GuiTab.INTERFACE:
-                        if text_field["update"] == "Generics":
-                            text_field["ref"].update_custom_text_class_generics_list()
-                        else:  # kind=="ports"
-                            text_field["ref"].update_custom_text_class_ports_list()
-                    elif text_field["tab"] == GuiTab.INTERNALS:
-                        text_field["ref"].update_custom_text_class_signals_list()
-                    elif text_field["tab"] == GuiTab.DIAGRAM:
-                        text_field["ref"].format_after_idle()
-                else:
-                    break
-            else:
-                self.number_of_hits_all += 1
-                self._move_in_foreground(text_field["tab"])
-                text_field["ref"].tag_add("hit", index, index + " + " + str(count.get()) + " chars")
-                text_field["ref"].tag_configure("hit", background="blue")
-                start = index + " + " + str(count.get()) + " chars"
-                if text_field["tab"] == GuiTab.DIAGRAM:
-                    object_coords = project_manager.canvas.bbox(text_field["window_id"])
-                    object_coords_new = []
-                    object_coords_new.append(object_coords[0] - 100)
-                    object_coords_new.append(object_coords[1] - 100)
-                    object_coords_new.append(object_coords[2] + 300)
-                    object_coords_new.append(object_coords[3] + 300)
-                    canvas_editing.view_rectangle(object_coords_new, check_fit=False)
-                else:
-                    text_field["ref"].see(index)
-                continue_search = messagebox.askyesno("Continue", "Find next")
-                text_field["ref"].tag_remove("hit", index, index + " + " + str(count.get()) + " chars")
-                if not continue_search:
-                    break
-        return continue_search
-
-    def _search_in_entry_widget(self, entry_widget_info) -> bool:
-        value = entry_widget_info["stringvar"].get()
-        start = 0
-        continue_search = True
-        while True:
-            hit_begin = value.find(self.search_pattern, start, len(value))
-            if hit_begin == -1:
-                break
-            if self.replace:
-                # All hits are replaced in 1 action:
-                search_pattern_escaped = re.escape(self.search_pattern)
-                replace_pattern_escaped = re.escape(self.replace_pattern)
-                self.number_of_hits_all += len(re.findall(search_pattern_escaped, value, flags=re.IGNORECASE))
-                value = re.sub(search_pattern_escaped, replace_pattern_escaped, value, flags=re.IGNORECASE)
-                entry_widget_info["stringvar"].set(value)
-                start = len(value)  # The search-pattern cannot be found again in the next loop.
+    def _get_canvas_text_ids(self) -> list:
+        # State names and transition priorities:
+        return [ref.text_id for ref in state.States.ref_dict.values()] + [
+            ref.priority_text for ref in transition.TransitionLine.ref_dict.values()
+        ]
+
+    def _replace_all_hits(self, hits) -> int:
+        hits_of_source = {}  # id of the hit source -> list of its hits
+        for hit in hits:
+            hits_of_source.setdefault((hit["kind"], id(hit["ref"])), []).append(hit)
+        number_of_replacements = 0
+        for hits_in_one_source in hits_of_source.values():
+            first_hit = hits_in_one_source[0]
+            if first_hit["kind"] == "text_field":
+                number_of_replacements += self._replace_in_text_field(first_hit, hits_in_one_source)
+            elif first_hit["kind"] == "canvas_text":
+                text = project_manager.canvas.itemcget(first_hit["ref"], "text")
+                project_manager.canvas.itemconfigure(first_hit["ref"], text=self._replace_in_string(text))
+                number_of_replacements += len(hits_in_one_source)
             else:
-                self.number_of_hits_all += 1
-                self._move_in_foreground(GuiTab.CONTROL)
-                entry_widget_info["entry"].select_range(hit_begin, hit_begin + len(self.search_pattern))
-                continue_search = messagebox.askyesno("Continue", "Find next")
-                if continue_search is False:
-                    break
-                start = hit_begin + len(self.search_pattern)
-            if start == hit_begin:
-                messagebox.showinfo(
-                    "HDL-FSM-Editor",
-                    "Search in entry field of Control-tab is aborted as for unknown reason no progress happens.",
-                )
-                break
-        return continue_search
-
-    def _move_in_foreground(self, tab: GuiTab) -> None:
+                stringvar = first_hit["ref"]["stringvar"]
+                stringvar.set(self._replace_in_string(stringvar.get()))
+                number_of_replacements += len(hits_in_one_source)
+        return number_of_replacements
+
+    def _replace_in_string(self, text) -> str:
+        return self.escaped_regex.sub(lambda _: self.replace_pattern, text)
+
+    def _replace_in_text_field(self, text_field, hits_in_text_field) -> int:
+        text_ref = text_field["ref"]
+        if text_ref.cget("state") == tk.DISABLED:
+            return 0
+        # Replace from the end of the text, so that the positions of the remaining hits stay valid:
+        for hit in reversed(hits_in_text_field):
+            text_ref.delete("1.0 + " + str(hit["start"]) + " chars", "1.0 + " + str(hit["end"]) + " chars")
+            text_ref.insert("1.0 + " + str(hit["start"]) + " chars", self.replace_pattern)
+        # The lists of signals are updated only once for all replacements in this text field:
+        if text_field["tab"] == GuiTab.INTERFACE:
+            if text_field["update"] == "Generics":
+                text_ref.update_custom_text_class_generics_list()
+            else:  # kind=="ports"
+                text_ref.update_custom_text_class_ports_list()
+        elif text_field["tab"] == GuiTab.INTERNALS:
+            text_ref.update_custom_text_class_signals_list()
+        elif text_field["tab"] == GuiTab.DIAGRAM:
+            text_ref.format_after_idle()
+        return len(hits_in_text_field)
+
+    @classmethod
+    def jump_to(cls, hit) -> None:
+        """Brings the hit into the foreground and highlights it."""
+        if cls.last_hit_text_ref is not None and cls.last_hit_text_ref.winfo_exists():
+            cls.last_hit_text_ref.tag_remove("hit", "1.0", tk.END)
+        cls.last_hit_text_ref = None
+        cls._move_in_foreground(hit["tab"])
+        if hit["kind"] == "text_field":
+            start_index = "1.0 + " + str(hit["start"]) + " chars"
+            hit["ref"].tag_add("hit", start_index, "1.0 + " + str(hit["end"]) + " chars")
+            hit["ref"].tag_configure("hit", background="blue")
+            cls.last_hit_text_ref = hit["ref"]
+            if hit["tab"] == GuiTab.DIAGRAM:
+                cls._view_canvas_window(hit["window_id"])
+            hit["ref"].see(start_index)
+        elif hit["kind"] == "canvas_text":
+            project_manager.canvas.select_from(hit["ref"], hit["start"])
+            project_manager.canvas.select_to(hit["ref"], hit["end"] - 1)
+            canvas_editing.view_rectangle(project_manager.canvas.bbox(hit["ref"]), check_fit=False)
+            canvas_editing.canvas_zoom(project_manager.canvas.coords(hit["ref"]), 0.25)
+        else:
+            hit["ref"]["entry"].focus_set()
+            hit["ref"]["entry"].select_range(hit["start"], hit["end"])
+
+    @classmethod
+    def _view_canvas_window(cls, window_id) -> None:
+        # The bbox of a window hidden by window culling is empty, so the rectangle is calculated from the window size:
+        coords = project_manager.canvas.coords(window_id)
+        frame = project_manager.canvas.nametowidget(project_manager.canvas.itemcget(window_id, "window"))
+        canvas_editing.view_rectangle(
+            [
+                coords[0] - 100,
+                coords[1] - 100,
+                coords[0] + frame.winfo_reqwidth() + 300,
+                coords[1] + frame.winfo_reqheight() + 300,
+            ],
+            check_fit=False,
+        )
+
+    @classmethod
+    def _move_in_foreground(cls, tab: GuiTab) -> None:
         notebook_ids = project_manager.notebook.tabs()
         for notebook_id in notebook_ids:
             if project_manager.notebook.tab(notebook_id, option="text") == tab.value:
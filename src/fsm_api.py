@@ -0,0 +1,473 @@
+"""
+Python API for building HDL-FSM-Editor designs by a program and for generating their HDL.
+
+A Design is built without any GUI, it can be validated and saved as .hfe-file, which can be opened by the editor:
+
+    import fsm_api
+
+    design = fsm_api.Design("counter", clock_signal_name="clk_i", reset_signal_name="res_i")
+    design.interface_ports = "clk_i : in std_logic;\\nres_i : in std_logic;\\nstart_i : in std_logic"
+    idle = design.add_state("idle", 200, 100)
+    running = design.add_state("running", 200, 300, action="running_o <= '1';")
+    design.add_transition(design.add_reset_entry(50, 100), idle, condition="res_i='1'")
+    design.add_transition(idle, running, condition="start_i='1'")
+    design.add_transition(running, idle)
+    design.save("counter.hfe")
+
+The HDL of many designs is generated in this process by a Generator. The code generation reads the design from the
+diagram, so the Generator loads each design into a headless diagram (see headless_diagram.py), which needs no Tk
+window and no display. So a design needs no process start, also at a server without display:
+
+    with fsm_api.Generator() as generator:
+        for design in designs:
+            generator.generate(design, generate_path="hdl")
+"""
+
+import json
+import math
+
+import constants
+
+_STATE_RADIUS = 20.0  # The values of a new design in the editor.
+_PRIORITY_DISTANCE = 14
+_RESET_ENTRY_SIZE = 40
+_FONTSIZE = 10
+_LABEL_FONTSIZE = 8
+_LANGUAGES = ("VHDL", "Verilog", "SystemVerilog")
+
+
+class DesignError(Exception):
+    """Raised when a design is not consistent, the message contains one line for each problem."""
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__("\n".join(errors))
+
+
+class Node:
+    """A state, a connector or the reset entry of a design (kind is "state", "connector" or "reset_entry")."""
+
+    __slots__ = ("kind", "number", "name", "x", "y", "action", "comment", "color")
+
+    def __init__(self, kind, number, name, x, y) -> None:
+        self.kind: str = kind
+        self.number: int = number
+        self.name: str = name  # Only states have a name.
+        self.x: float = x
+        self.y: float = y
+        self.action: str = ""  # The state action (only states have one).
+        self.comment: str = ""  # Only states have a comment.
+        self.color: str = constants.STATE_COLOR
+
+    @property
+    def tag(self) -> str:
+        return "reset_entry" if self.kind == "reset_entry" else self.kind + str(self.number)
+
+
+class Transition:
+    """A transition of a design, the priority 1 is the highest priority of the transitions starting at a node."""
+
+    __slots__ = ("number", "start", "end", "condition", "action", "priority", "points")
+
+    def __init__(self, number, start, end, condition, action, priority, points) -> None:
+        self.number: int = number
+        self.start: Node = start
+        self.end: Node = end
+        self.condition: str = condition
+        self.action: str = action
+        self.priority: int = priority
+        self.points: list = points  # Additional points of the line between start and end, like [x1, y1, x2, y2].
+
+    @property
+    def tag(self) -> str:
+        return "transition" + str(self.number)
+
+
+class Design:
+    """
+    The texts of the interface and internals tabs and of the global actions are stored in the attributes of the same
+    name, the diagram is built by the add-methods. All coordinates are canvas coordinates of the diagram.
+    """
+
+    def __init__(
+        self,
+        module_name,
+        language="VHDL",
+        number_of_files=1,
+        clock_signal_name="clk",
+        reset_signal_name="reset",
+        generate_path=".",
+    ) -> None:
+        self.module_name: str = module_name
+        self.language: str = language
+        self.number_of_files: int = number_of_files
+        self.clock_signal_name: str = clock_signal_name
+        self.reset_signal_name: str = reset_signal_name
+        self.generate_path: str = generate_path
+        self.include_timestamp_in_output: bool = False
+        self.interface_package: str = "library ieee;\nuse ieee.std_logic_1164.all;" if language == "VHDL" else ""
+        self.interface_generics: str = ""
+        self.interface_ports: str = ""
+        self.internals_package: str = ""
+        self.internals_architecture: str = ""
+        self.internals_process: str = ""  # Clocked process
+        self.internals_process_combinatorial: str = ""
+        self.global_actions_before: str = ""  # Clocked global actions before the state machine
+        self.global_actions_after: str = ""  # Clocked global actions after the state machine
+        self.global_actions_combinatorial: str = ""
+        self.state_actions_default: str = ""
+        self.nodes: list[Node] = []
+        self.transitions: list[Transition] = []
+        self.reset_entry: Node | None = None
+
+    def add_state(self, name, x, y, action="", comment="", color=constants.STATE_COLOR) -> Node:
+        state = Node("state", self._get_next_number("state"), name, x, y)
+        state.action = action
+        state.comment = comment
+        state.color = color
+        self.nodes.append(state)
+        return state
+
+    def add_connector(self, x, y) -> Node:
+        connector = Node("connector", self._get_next_number("connector"), "", x, y)
+        self.nodes.append(connector)
+        return connector
+
+    def add_reset_entry(self, x, y) -> Node:
+        """The transition from the reset entry ends at the point (x, y), the entry is drawn left of it."""
+        if self.reset_entry is not None:
+            raise DesignError(["A design can only have one reset entry."])
+        self.reset_entry = Node("reset_entry", 1, "", x, y)
+        self.nodes.append(self.reset_entry)
+        return self.reset_entry
+
+    def add_transition(self, start, end, condition="", action="", priority=None, points=()) -> Transition:
+        """Without a priority the transition gets a lower priority than all other transitions starting at start."""
+        for node in (start, end):
+            if node not in self.nodes:
+                raise DesignError([f"The node {node.tag} does not belong to the design {self.module_name}."])
+        if priority is None:
+            priority = 1 + max((t.priority for t in self.transitions if t.start is start), default=0)
+        transition = Transition(len(self.transitions), start, end, condition, action, priority, list(points))
+        self.transitions.append(transition)
+        return transition
+
+    def get_state(self, name) -> Node:
+        for node in self.nodes:
+            if node.kind == "state" and node.name == name:
+                return node
+        raise KeyError(name)
+
+    def validate(self) -> list[str]:
+        """Returns a message for each problem, which would make the design unusable by the editor or the codegen."""
+        errors = []
+        if not self.module_name.strip():
+            errors.append("No module name is specified")
+        if self.language not in _LANGUAGES:
+            errors.append(f"Unsupported language: {self.language}")
+        if self.number_of_files not in (1, 2):
+            errors.append(f"Invalid file number setting: {self.number_of_files}")
+        if not self.clock_signal_name.strip():
+            errors.append("No clock signal name is specified")
+        if not self.reset_signal_name.strip():
+            errors.append("No reset signal name is specified")
+        state_names = [node.name for node in self.nodes if node.kind == "state"]
+        if "" in state_names:
+            errors.append("A state has no name.")
+        for name in sorted({name for name in state_names if state_names.count(name) > 1}):
+            errors.append(f"The state name {name} is used by more than one state.")
+        errors += self._validate_reset_entry()
+        for node in self.nodes:
+            errors += self._validate_outgoing_transitions(node)
+            if node.kind == "connector" and not any(t.end is node for t in self.transitions):
+                errors.append(f"The connector {node.tag} has no incoming transition.")
+        return errors
+
+    def check(self) -> None:
+        errors = self.validate()
+        if errors:
+            raise DesignError(errors)
+
+    def _validate_reset_entry(self) -> list[str]:
+        if self.reset_entry is None:
+            return ["The design has no reset entry."]
+        errors = []
+        reset_transitions = [t for t in self.transitions if t.start is self.reset_entry]
+        if len(reset_transitions) != 1:
+            errors.append("Exactly one transition must start at the reset entry.")
+        elif reset_transitions[0].end.kind != "state":
+            errors.append("The transition from the reset entry must end at a state.")
+        elif not reset_transitions[0].condition.strip():
+            errors.append("No reset condition is specified at the transition from the reset entry.")
+        if any(t.end is self.reset_entry for t in self.transitions):
+            errors.append("A transition must not end at the reset entry.")
+        return errors
+
+    def _validate_outgoing_transitions(self, node) -> list[str]:
+        outgoing = sorted((t for t in self.transitions if t.start is node), key=lambda t: t.priority)
+        if node.kind == "reset_entry":
+            return []
+        name = node.name if node.kind == "state" else node.tag
+        errors = []
+        priorities = [t.priority for t in outgoing]
+        if len(set(priorities)) != len(priorities):
+            errors.append(f"The transitions starting at {name} do not have different priorities.")
+        if any(not t.condition.strip() for t in outgoing[:-1]):
+            errors.append(f"A transition starting at {name} with no condition hides a transition with lower priority.")
+        if node.kind == "connector" and not outgoing:
+            errors.append(f"The connector {node.tag} has no outgoing transition.")
+        return errors
+
+    def to_dict(self) -> dict:
+        """Returns the design in the format of a .hfe-file (see file_handling.get_design_dictionary())."""
+        self.check()
+        design_dictionary = {
+            "modulename": self.module_name,
+            "language": self.language,
+            "generate_path": self.generate_path,
+            "additional_sources": "",
+            "working_directory": "",
+            "number_of_files": self.number_of_files if self.language == "VHDL" else 1,
+            "reset_signal_name": self.reset_signal_name,
+            "clock_signal_name": self.clock_signal_name,
+            "compile_cmd": "",
+            "edit_cmd": "",
+            "include_timestamp_in_output": self.include_timestamp_in_output,
+            "interface_package": self.interface_package,
+            "interface_generics": self.interface_generics,
+            "interface_ports": self.interface_ports,
+            "internals_package": self.internals_package,
+            "internals_architecture": self.internals_architecture,
+            "internals_process": self.internals_process,
+            "internals_process_combinatorial": self.internals_process_combinatorial,
+            "regex_message_find": "(.*?):([0-9]+):[0-9]+:.*" if self.language == "VHDL" else "(.*?):([0-9]+): .*",
+            "regex_file_name_quote": "\\1",
+            "regex_file_line_number_quote": "\\2",
+            "diagram_background_color": "white",
+            "state_radius": _STATE_RADIUS,
+            "reset_entry_size": _RESET_ENTRY_SIZE,
+            "priority_distance": _PRIORITY_DISTANCE,
+            "fontsize": _FONTSIZE,
+            "label_fontsize": _LABEL_FONTSIZE,
+        }
+        _DiagramWriter(self, design_dictionary).write()
+        return design_dictionary
+
+    def save(self, file_name) -> None:
+        with open(file_name, "w", encoding="utf-8") as fileobject:
+            json.dump(self.to_dict(), fileobject, indent=4, default=str, ensure_ascii=False)
+
+    def _get_next_number(self, kind) -> int:
+        return 1 + max((node.number for node in self.nodes if node.kind == kind), default=0)
+
+
+class _DiagramWriter:
+    """Creates the canvas items of the diagram with the same coordinates and tags as the editor does."""
+
+    def __init__(self, design, design_dictionary) -> None:
+        self.design = design
+        self.design_dictionary = design_dictionary
+        self.node_tags = {node: [node.tag] for node in design.nodes}  # Tags of the items of the nodes
+        self.number_of_state_actions = 0
+        self.number_of_condition_actions = 0
+
+    def write(self) -> None:
+        for element_name in (
+            "state",
+            "text",
+            "line",
+            "polygon",
+            "rectangle",
+            "window_state_action_block",
+            "window_state_comment",
+            "window_condition_action_block",
+            "window_global_actions",
+            "window_global_actions_combinatorial",
+            "window_state_actions_default",
+        ):
+            self.design_dictionary[element_name] = []
+        for transition in self.design.transitions:
+            self._write_transition(transition)
+        for node in self.design.nodes:
+            if node.kind == "state":
+                self._write_state(node)
+        for node in self.design.nodes:
+            if node.kind == "connector":
+                self._write_connector(node)
+            elif node.kind == "reset_entry":
+                self._write_reset_entry(node)
+        self._write_global_windows()
+        self.design_dictionary["state_number"] = max(
+            (node.number for node in self.design.nodes if node.kind == "state"), default=0
+        )
+        self.design_dictionary["transition_number"] = len(self.design.transitions)
+        self.design_dictionary["connector_number"] = max(
+            (node.number for node in self.design.nodes if node.kind == "connector"), default=0
+        )
+        self.design_dictionary["conditionaction_id"] = self.number_of_condition_actions
+        # A new state action gets a tag with the current number, which is incremented afterwards:
+        self.design_dictionary["mytext_id"] = self.number_of_state_actions + 1
+
+    def _write_state(self, state) -> None:
+        radius = _STATE_RADIUS
+        tags = self.node_tags[state]
+        coords = [state.x - radius, state.y - radius, state.x + radius, state.y + radius]
+        self.design_dictionary["text"].append([[state.x, state.y], [state.tag + "_name"], state.name])
+        if state.action:
+            self.number_of_state_actions += 1
+            number = str(self.number_of_state_actions)
+            window_coords = [state.x + 3 * radius, state.y + 3 * radius]
+            tags.append("connection" + number + "_end")
+            self.design_dictionary["line"].append(
+                [[*window_coords, state.x, state.y], ["connection" + number, "connected_to_" + state.tag]]
+            )
+            self.design_dictionary["window_state_action_block"].append(
+                [window_coords, state.action, ["state_action" + number, "connection" + number + "_start"]]
+            )
+        if state.comment:
+            window_coords = [state.x - 3 * radius, state.y - 3 * radius]
+            tags.append(state.tag + "_comment_line_end")
+            self.design_dictionary["line"].append([[*window_coords, state.x, state.y], [state.tag + "_comment_line"]])
+            self.design_dictionary["window_state_comment"].append(
+                [window_coords, state.comment, [state.tag + "_comment", state.tag + "_comment_line_start"]]
+            )
+        self.design_dictionary["state"].append([coords, tags, state.color])
+
+    def _write_connector(self, connector) -> None:
+        half_size = _STATE_RADIUS / 4
+        coords = [connector.x - half_size, connector.y - half_size, connector.x + half_size, connector.y + half_size]
+        self.design_dictionary["rectangle"].append([coords, self.node_tags[connector]])
+
+    def _write_reset_entry(self, reset_entry) -> None:
+        # The same shape as ResetEntry._create_polygon_shape_for_reset_entry(), the point corner is at (x, y):
+        size = _RESET_ENTRY_SIZE
+        x, y = reset_entry.x, reset_entry.y
+        coords = [
+            *(x - size / 2 - 4 * size / 5, y - 3 * size / 10),
+            *(x + size / 2 - 4 * size / 5, y - 3 * size / 10),
+            *(x, y),
+            *(x + size / 2 - 4 * size / 5, y + 3 * size / 10),
+            *(x - size / 2 - 4 * size / 5, y + 3 * size / 10),
+        ]
+        self.design_dictionary["polygon"].append([coords, self.node_tags[reset_entry]])
+        self.design_dictionary["text"].append([[x - 4 * size / 5, y], ["reset_text"], "Reset"])
+
+    def _write_transition(self, transition) -> None:
+        coords = _get_transition_coords(transition)
+        tags = [
+            transition.tag,
+            "coming_from_" + transition.start.tag,
+            "going_to_" + transition.end.tag,
+        ]
+        self.node_tags[transition.start].append(transition.tag + "_start")
+        self.node_tags[transition.end].append(transition.tag + "_end")
+        if transition.condition or transition.action or transition.start.kind == "reset_entry":
+            self.number_of_condition_actions += 1
+            number = str(self.number_of_condition_actions)
+            tags.append("ca_connection" + number + "_end")
+            window_coords = [(coords[0] + coords[-2]) / 2 + _STATE_RADIUS, (coords[1] + coords[-1]) / 2]
+            window_tags = ["condition_action" + number, "ca_connection" + number + "_anchor"]
+            if transition.start.kind == "reset_entry":
+                window_tags.append("connected_to_reset_transition")
+            self.design_dictionary["line"].append(
+                [[*window_coords, coords[0], coords[1]], ["ca_connection" + number, "connected_to_" + transition.tag]]
+            )
+            self.design_dictionary["window_condition_action_block"].append(
+                [window_coords, transition.condition, transition.action, window_tags]
+            )
+        self.design_dictionary["line"].append([coords, tags])
+        # The editor places the priority, the coordinates are only needed by the format:
+        self.design_dictionary["text"].append(
+            [[coords[0], coords[1]], [transition.tag + "priority"], str(transition.priority)]
+        )
+
+    def _write_global_windows(self) -> None:
+        right_border = max((node.x for node in self.design.nodes), default=0) + 6 * _STATE_RADIUS
+        top_border = min((node.y for node in self.design.nodes), default=0)
+        if self.design.global_actions_before or self.design.global_actions_after:
+            self.design_dictionary["window_global_actions"].append(
+                [
+                    [right_border, top_border],
+                    self.design.global_actions_before,
+                    self.design.global_actions_after,
+                    ["global_actions1"],
+                ]
+            )
+        if self.design.global_actions_combinatorial:
+            self.design_dictionary["window_global_actions_combinatorial"].append(
+                [
+                    [right_border, top_border + 4 * _STATE_RADIUS],
+                    self.design.global_actions_combinatorial,
+                    ["global_actions_combinatorial1"],
+                ]
+            )
+        if self.design.state_actions_default:
+            self.design_dictionary["window_state_actions_default"].append(
+                [
+                    [right_border, top_border + 8 * _STATE_RADIUS],
+                    self.design.state_actions_default,
+                    ["state_actions_default"],
+                ]
+            )
+
+
+def _get_transition_coords(transition) -> list:
+    start, end = transition.start, transition.end
+    points = list(transition.points)
+    if not points and start is end:  # A loop is drawn above the node.
+        points = [start.x + 2 * _STATE_RADIUS, start.y - 3 * _STATE_RADIUS]
+        points += [start.x - 2 * _STATE_RADIUS, start.y - 3 * _STATE_RADIUS]
+    first_point = points[:2] if points else [end.x, end.y]
+    last_point = points[-2:] if points else [start.x, start.y]
+    return [*_get_border_point(start, *first_point), *points, *_get_border_point(end, *last_point)]
+
+
+def _get_border_point(node, towards_x, towards_y) -> list:
+    """Returns the point of the border of node, where a line from the center to (towards_x, towards_y) leaves it."""
+    if node.kind == "reset_entry":
+        return [node.x, node.y]  # The point corner of the reset entry
+    delta_x, delta_y = towards_x - node.x, towards_y - node.y
+    length = math.hypot(delta_x, delta_y)
+    if length == 0:
+        return [node.x, node.y]
+    scale = _STATE_RADIUS / length
+    if node.kind == "connector":  # A connector is a square.
+        scale = _STATE_RADIUS / 4 / max(abs(delta_x), abs(delta_y))
+    return [node.x + delta_x * scale, node.y + delta_y * scale]
+
+
+########################################################################################################################
+
+
+class Generator:
+    """
+    Generates the HDL of designs in this process. The design is not loaded into an editor window, but into a
+    headless diagram, so no display is needed (CI/batch). Errors of the generation are printed to STDOUT as in
+    batch mode (--generate-hdl).
+    """
+
+    def __enter__(self) -> "Generator":
+        return self
+
+    def __exit__(self, *_exception_info) -> None:
+        pass
+
+    def generate(self, design, generate_path=None) -> bool:
+        """
+        Returns True, when the HDL files were written into generate_path (default: design.generate_path).
+        Raises DesignError, when the design is not consistent.
+        """
+        import headless_diagram
+        import tag_plausibility
+        from codegen import hdl_generation
+
+        design_dictionary = design.to_dict()
+        if generate_path is not None:
+            design_dictionary["generate_path"] = generate_path
+        with headless_diagram.installed(design_dictionary):
+            if not tag_plausibility.TagPlausibility().get_tag_status_is_okay():
+                print(f"Error: The design {design.module_name} could not be loaded, see details above.")
+                return False
+            return hdl_generation.run_hdl_generation(
+                write_to_file=True, is_script_mode=True, save_design=False, show_in_hdl_tab=False
+            )
@@ -2,6 +2,8 @@
 This class draws a grid into the canvas.
 """
 
+import tkinter as tk
+
 from project_manager import project_manager
 
 
@@ -13,39 +15,66 @@ class GridDraw:
     def __init__(self, canvas) -> None:
         self.canvas = canvas
         self.show_grid = True
+        # The grid lines are not created again at each redraw, but are moved to their new position:
+        self.grid_line_ids = []
+        self.drawn_grid_key = None  # Visible window and grid size the grid lines were positioned for.
 
     def remove_grid(self) -> None:
-        self.canvas.delete("grid_line")
+        # Hidden items are neither scaled into the bounding box of the diagram nor found by find_overlapping():
+        self.canvas.itemconfigure("grid_line", state=tk.HIDDEN)
 
     def draw_grid(self) -> None:
-        if self.show_grid is True:
-            visible_window = [
-                self.canvas.canvasx(0),
-                self.canvas.canvasy(0),
-                self.canvas.canvasx(self.canvas.winfo_width()),
-                self.canvas.canvasy(self.canvas.winfo_height()),
-            ]
-            grid_size = project_manager.state_radius
-            if grid_size > 8:
-                self.__draw_horizontal_grid(grid_size, visible_window)
-                self.__draw_vertical_grid(grid_size, visible_window)
+        if self.grid_line_ids and self.canvas.type(self.grid_line_ids[0]) is None:
+            self.grid_line_ids = []  # The canvas was cleared by canvas.delete("all").
+        visible_window = [
+            self.canvas.canvasx(0),
+            self.canvas.canvasy(0),
+            self.canvas.canvasx(self.canvas.winfo_width()),
+            self.canvas.canvasy(self.canvas.winfo_height()),
+        ]
+        grid_size = project_manager.state_radius
+        grid_key = (self.show_grid, grid_size, *visible_window)
+        if grid_key != self.drawn_grid_key or not self.grid_line_ids:
+            self.drawn_grid_key = grid_key
+            self.__position_grid_lines(grid_size, visible_window)
+        self.canvas.itemconfigure("grid_line", state=tk.NORMAL)
         self.canvas.tag_lower("grid_line")
 
-    def __draw_horizontal_grid(self, grid_size, visible_window) -> None:
+    def __position_grid_lines(self, grid_size, visible_window) -> None:
+        line_coords_list = []
+        if self.show_grid is True and grid_size > 8:
+            line_coords_list += self.__get_horizontal_grid_coords(grid_size, visible_window)
+            line_coords_list += self.__get_vertical_grid_coords(grid_size, visible_window)
+        for index, line_coords in enumerate(line_coords_list):
+            if index < len(self.grid_line_ids):
+                self.canvas.coords(self.grid_line_ids[index], *line_coords)
+            else:
+                self.grid_line_ids.append(
+                    self.canvas.create_line(*line_coords, dash=(1, 1), fill="gray85", tags="grid_line")
+                )
+        if len(self.grid_line_ids) > len(line_coords_list):
+            self.canvas.delete(*self.grid_line_ids[len(line_coords_list) :])
+            del self.grid_line_ids[len(line_coords_list) :]
+
+    def __get_horizontal_grid_coords(self, grid_size, visible_window) -> list:
         # An extra margin of 3*grid_size is used because otherwise there are sometimes too few grid-lines:
         x_min = visible_window[0] - visible_window[0] % grid_size - 3 * grid_size
         x_max = visible_window[2] + visible_window[2] % grid_size + 3 * grid_size
         y = visible_window[1] - visible_window[1] % grid_size - 3 * grid_size
         y_max = visible_window[3] + visible_window[3] % grid_size + 3 * grid_size
+        coords_list = []
         while y < y_max:
-            self.canvas.create_line(x_min, y, x_max, y, dash=(1, 1), fill="gray85", tags="grid_line")
+            coords_list.append((x_min, y, x_max, y))
             y += grid_size
+        return coords_list
 
-    def __draw_vertical_grid(self, grid_size, visible_window) -> None:
+    def __get_vertical_grid_coords(self, grid_size, visible_window) -> list:
         x = visible_window[0] - visible_window[0] % grid_size
         x_max = visible_window[2] + visible_window[2] % grid_size
         y_min = visible_window[1] - visible_window[1] % grid_size
         y_max = visible_window[3] + visible_window[3] % grid_size
+        coords_list = []
         while x < x_max:
-            self.canvas.create_line(x, y_min, x, y_max, dash=(1, 1), fill="gray85", tags="grid_line")
+            coords_list.append((x, y_min, x, y_max))
             x += grid_size
+        return coords_list
@@ -0,0 +1,170 @@
+"""
+Live preview of the generated HDL.
+When the live preview is switched on (menu HDL), the HDL is generated again each time the edits have settled.
+The generation reads the design directly from the widgets, so it cannot run in a thread of this process.
+Instead the design is written as snapshot into a temporary .hfe-file, which is generated by a second
+HDL-FSM-Editor process in batch mode (--generate-hdl). The GUI stays responsive while this process runs.
+No file of the user is written: the snapshot is generated into the temporary directory and the design is not saved.
+When the generation fails, the last generated HDL stays in the "Generated HDL" tab and the output of the
+generation is appended to the log tab.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from project_manager import project_manager
+
+_SETTLE_TIME_MS = 1000  # The generation starts when the design was not changed for this time.
+_POLL_INTERVAL_MS = 100
+
+
+class HdlPreview:
+    """
+    Each generation gets a run number. A design change increments the run number and terminates a running
+    generation process, so the result of a superseded generation is never shown.
+    The result is copied into the "Generated HDL" tab in one step. The links of the HDL lines to the diagram
+    are created only when the user follows a link (Control-click in the HDL tab, by update_links_if_outdated()),
+    because creating them runs the whole HDL generation in the GUI process and blocks the GUI.
+    """
+
+    def __init__(self) -> None:
+        self._run_number = 0
+        self._settle_after_id = None
+        self._poll_after_id = None
+        self._process = None
+        self._result_queue = queue.Queue()
+        self._directory = None  # tempfile.TemporaryDirectory, created at the first generation
+        self.links_are_outdated = False
+
+    def is_enabled(self) -> bool:
+        return project_manager.live_hdl_preview is not None and project_manager.live_hdl_preview.get()
+
+    def enable_changed(self) -> None:
+        """Called by the check button in the HDL menu."""
+        if self.is_enabled():
+            self.design_has_changed()
+        else:
+            self._cancel()
+
+    def design_has_changed(self) -> None:
+        """Called at each design change, starts a new generation when the design has settled."""
+        if not self.is_enabled():
+            return
+        self._cancel()
+        self._settle_after_id = project_manager.root.after(_SETTLE_TIME_MS, self._start_generation)
+
+    def update_links_if_outdated(self) -> None:
+        """Creates the links for the HDL shown by the preview, called when the user follows a link in the HDL tab."""
+        if not self.links_are_outdated:
+            return
+        from codegen import hdl_generation  # The codegen package is imported at first use.
+
+        self.links_are_outdated = False
+        hdl_generation.run_hdl_generation(write_to_file=False, is_script_mode=True, save_design=False)
+
+    def _cancel(self) -> None:
+        self._run_number += 1
+        if self._settle_after_id is not None:
+            project_manager.root.after_cancel(self._settle_after_id)
+            self._settle_after_id = None
+        if self._poll_after_id is not None:
+            project_manager.root.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+        self._process = None
+
+    def _start_generation(self) -> None:
+        import file_handling
+
+        self._settle_after_id = None
+        if self._directory is None:
+            self._directory = tempfile.TemporaryDirectory(prefix="hdl-fsm-editor-preview-")
+        snapshot = file_handling.get_design_dictionary()
+        snapshot["generate_path"] = self._directory.name
+        snapshot["include_timestamp_in_output"] = False  # A timestamp would mark the header line as changed.
+        snapshot_file_name = os.path.join(self._directory.name, "preview.hfe")
+        with open(snapshot_file_name, "w", encoding="utf-8") as fileobject:
+            json.dump(snapshot, fileobject, indent=4, default=str, ensure_ascii=False)
+        self._process = subprocess.Popen(
+            _get_generate_command(snapshot_file_name),
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),  # Only defined (and needed) at Windows.
+        )
+        threading.Thread(
+            target=self._wait_for_process,
+            args=(self._run_number, self._process, _get_file_names(snapshot)),
+            daemon=True,
+        ).start()
+        if self._poll_after_id is None:
+            self._poll_after_id = project_manager.root.after(_POLL_INTERVAL_MS, self._poll_result)
+
+    def _wait_for_process(self, run_number, process, file_names) -> None:
+        # Runs in a worker thread, which must not access any widget.
+        output, _ = process.communicate()
+        hdl_list = []
+        if process.returncode == 0:
+            try:
+                for file_name in file_names:
+                    with open(file_name, encoding="utf-8") as fileobject:
+                        hdl_list.append(fileobject.read())
+            except OSError:
+                hdl_list = []
+        self._result_queue.put((run_number, process.returncode, output, hdl_list))
+
+    def _poll_result(self) -> None:
+        self._poll_after_id = None
+        while not self._result_queue.empty():
+            run_number, returncode, output, hdl_list = self._result_queue.get()
+            if run_number != self._run_number:
+                continue  # The design was changed while this generation was running.
+            self._process = None
+            if returncode != 0 or not hdl_list:
+                self._show_failure(output)
+            else:
+                self._show_hdl(hdl_list)
+            return
+        if self._process is None:
+            return  # The generation was cancelled, so no result will come.
+        self._poll_after_id = project_manager.root.after(_POLL_INTERVAL_MS, self._poll_result)
+
+    def _show_failure(self, output) -> None:
+        import compile_handling
+
+        compile_handling.append_to_log("Live HDL preview: The generation failed:\n" + output.rstrip("\n") + "\n")
+
+    def _show_hdl(self, hdl_list) -> None:
+        from codegen import hdl_generation
+
+        # The same text as after a generation by the menu, with a return after each file:
+        hdl_generation.last_line_number_of_file1 = hdl_list[0].count("\n") + 1
+        self.links_are_outdated = True
+        project_manager.notebook.show_hdl("".join(hdl + "\n" for hdl in hdl_list))
+
+
+def _get_generate_command(file_name) -> list:
+    if getattr(sys, "frozen", False):  # Packaged by PyInstaller, the executable is HDL-FSM-Editor itself.
+        return [sys.executable, "--generate-hdl", file_name]
+    return [sys.executable, str(Path(__file__).parent / "main.py"), "--generate-hdl", file_name]
+
+
+def _get_file_names(design_dictionary) -> list:
+    path_and_module = os.path.join(design_dictionary["generate_path"], design_dictionary["modulename"])
+    if design_dictionary["language"] == "Verilog":
+        return [path_and_module + ".v"]
+    if design_dictionary["language"] == "SystemVerilog":
+        return [path_and_module + ".sv"]
+    if design_dictionary["number_of_files"] == 1:
+        return [path_and_module + ".vhd"]
+    return [path_and_module + "_e.vhd", path_and_module + "_fsm.vhd"]
+
+
+hdl_preview = HdlPreview()
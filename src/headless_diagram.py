@@ -0,0 +1,280 @@
+"""
+A diagram without GUI, built from a design dictionary (in the format of a .hfe-file).
+The HDL generation reads the design from the canvas items, from the text widgets of the canvas windows and from
+the variables of the control tab. This module provides objects which answer the same calls as these widgets,
+so the HDL of a design can be generated without creating any Tk window (used by fsm_api.Generator in CI/batch).
+The canvas items are created in the same order and with the same tags as file_handling creates them at loading.
+"""
+
+from contextlib import contextmanager
+from typing import Any
+
+import link_dictionary
+from elements import (
+    condition_action,
+    global_actions_clocked,
+    global_actions_combinatorial,
+    state_action,
+    state_actions_default,
+    state_comment,
+)
+from project_manager import project_manager
+
+_TEXT_NAMES = {
+    "interface_package_text": "interface_package",
+    "interface_generics_text": "interface_generics",
+    "interface_ports_text": "interface_ports",
+    "internals_package_text": "internals_package",
+    "internals_architecture_text": "internals_architecture",
+    "internals_process_clocked_text": "internals_process",
+    "internals_process_combinatorial_text": "internals_process_combinatorial",
+}
+_WINDOW_CLASSES = (
+    condition_action.ConditionAction,
+    global_actions_clocked.GlobalActionsClocked,
+    global_actions_combinatorial.GlobalActionsCombinatorial,
+    state_action.StateAction,
+    state_actions_default.StateActionsDefault,
+    state_comment.StateComment,
+)
+
+
+class HeadlessVariable:
+    """Answers get() like a tk.StringVar, tk.IntVar or tk.BooleanVar."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class HeadlessText:
+    """Answers get() like a tk.Text, which always ends with a return, for the indices used by the HDL generation."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def get(self, index1: str, index2: str) -> str:
+        if index1 != "1.0":
+            raise ValueError(f"Unsupported text index: {index1}")
+        index2 = index2.replace(" ", "")
+        if index2 == "end":
+            return self.text + "\n"
+        if index2 == "end-1chars":
+            return self.text
+        raise ValueError(f"Unsupported text index: {index2}")
+
+
+class HeadlessWindow:
+    """The texts of a canvas window, stored under the attribute names of the element classes (text_id, ...)."""
+
+    def __init__(self, **texts: str) -> None:
+        for name, text in texts.items():
+            setattr(self, name, HeadlessText(text))
+
+
+class _Item:
+    __slots__ = ("item_type", "coords", "tags", "text")
+
+    def __init__(self, item_type, coords, tags, text) -> None:
+        self.item_type: str = item_type
+        self.coords: list[float] = list(coords)
+        self.tags: list[str] = list(tags)
+        self.text: str = text
+
+
+class HeadlessCanvas:
+    """Answers the canvas calls of the HDL generation and of TagPlausibility; the stacking order is kept in a list."""
+
+    def __init__(self) -> None:
+        self._items: dict[int, _Item] = {}
+        self._display_list: list[int] = []  # Canvas ids from bottom to top, as returned by find_all().
+        self._last_id = 0
+
+    def create(self, item_type, coords, tags, text="") -> int:
+        if isinstance(tags, str):
+            tags = (tags,)
+        self._last_id += 1
+        self._items[self._last_id] = _Item(item_type, coords, tags, text)
+        self._display_list.append(self._last_id)
+        return self._last_id
+
+    def find_all(self) -> tuple:
+        return tuple(self._display_list)
+
+    def find_withtag(self, tag_or_id) -> tuple:
+        if isinstance(tag_or_id, int):
+            return (tag_or_id,) if tag_or_id in self._items else ()
+        if tag_or_id == "all":
+            return self.find_all()
+        return tuple(canvas_id for canvas_id in self._display_list if tag_or_id in self._items[canvas_id].tags)
+
+    def gettags(self, tag_or_id) -> tuple:
+        canvas_ids = self.find_withtag(tag_or_id)
+        return tuple(self._items[canvas_ids[0]].tags) if canvas_ids else ()
+
+    def type(self, tag_or_id) -> str | None:
+        canvas_ids = self.find_withtag(tag_or_id)
+        return self._items[canvas_ids[0]].item_type if canvas_ids else None
+
+    def coords(self, tag_or_id) -> list[float]:
+        canvas_ids = self.find_withtag(tag_or_id)
+        return list(self._items[canvas_ids[0]].coords) if canvas_ids else []
+
+    def itemcget(self, tag_or_id, option) -> str:
+        if option != "text":
+            raise ValueError(f"Unsupported item option: {option}")
+        canvas_ids = self.find_withtag(tag_or_id)
+        return self._items[canvas_ids[0]].text if canvas_ids else ""
+
+    def itemconfigure(self, tag_or_id, text=None, tags=None) -> None:
+        for canvas_id in self.find_withtag(tag_or_id):
+            if text is not None:
+                self._items[canvas_id].text = text
+            if tags is not None:
+                self._items[canvas_id].tags = list(tags)
+
+    def dtag(self, tag_or_id, tag_to_delete) -> None:
+        for canvas_id in self.find_withtag(tag_or_id):
+            item = self._items[canvas_id]
+            item.tags = [tag for tag in item.tags if tag != tag_to_delete]
+
+    def delete(self, tag_or_id) -> None:
+        for canvas_id in self.find_withtag(tag_or_id):
+            del self._items[canvas_id]
+            self._display_list.remove(canvas_id)
+
+    def tag_lower(self, canvas_id) -> None:
+        self._display_list.remove(canvas_id)
+        self._display_list.insert(0, canvas_id)
+
+
+class HeadlessDiagram:
+    """The canvas, the windows and the control values of one design dictionary."""
+
+    def __init__(self, design_dictionary: dict[str, Any]) -> None:
+        self.canvas = HeadlessCanvas()
+        self.ref_dicts: dict[type, dict[int, HeadlessWindow]] = {window_class: {} for window_class in _WINDOW_CLASSES}
+        language = design_dictionary["language"]
+        self.variables = {
+            "language": language,
+            "module_name": design_dictionary["modulename"],
+            "generate_path_value": design_dictionary["generate_path"],
+            # For Verilog and SystemVerilog, always use single file mode regardless of what's in the file:
+            "select_file_number_text": design_dictionary["number_of_files"] if language == "VHDL" else 1,
+            "include_timestamp_in_output": design_dictionary.get("include_timestamp_in_output", False),
+            "clock_signal_name": design_dictionary["clock_signal_name"],
+            "reset_signal_name": design_dictionary["reset_signal_name"],
+        }
+        self.texts = {name: design_dictionary[key] for name, key in _TEXT_NAMES.items()}
+        self._create_items(design_dictionary)
+
+    def _create_items(self, design_dictionary: dict[str, Any]) -> None:
+        canvas = self.canvas
+        for coords, tags, *_ in design_dictionary["state"]:
+            canvas.create("oval", coords, tags)
+            canvas.create("text", coords, tags[0] + "_name", "dummy")
+        for coords, tags in design_dictionary["polygon"]:
+            canvas.create("polygon", coords, tags)
+            canvas.create("text", coords, "reset_text", "Reset")
+        priorities = {}  # Its order is the order in which file_handling creates the transitions.
+        for _, tags, text in design_dictionary["text"]:
+            if any(tag.startswith("state") for tag in tags):
+                state_name_tag = next(tag for tag in tags if tag.startswith("state"))
+                canvas.itemconfigure(state_name_tag, text=text, tags=tags)
+            elif "reset_text" not in tags:
+                for tag in tags:
+                    if tag.startswith("transition"):
+                        priorities[tag[:-8]] = text
+        transition_lines, window_lines = self._sort_lines(design_dictionary["line"])
+        for coords, tags in design_dictionary["rectangle"]:
+            if any(tag.startswith("connector") for tag in tags):
+                canvas.create("rectangle", coords, tags)
+        for transition_tag in {**priorities, **transition_lines}:
+            if transition_tag not in transition_lines:
+                continue
+            coords, tags = transition_lines[transition_tag]
+            canvas.tag_lower(canvas.create("line", coords, tags))
+            canvas.create("text", coords, transition_tag + "priority", priorities.get(transition_tag, ""))
+            canvas.create("rectangle", coords, transition_tag + "rectangle")
+        self._create_windows(design_dictionary, window_lines)
+
+    def _sort_lines(self, line_definitions) -> tuple[dict, dict]:
+        transition_lines = {}
+        window_lines = {}  # The lines to the state actions, state comments and condition actions.
+        for coords, tags in line_definitions:
+            for tag in tags:
+                if tag.startswith(("ca_connection", "connection")):
+                    window_lines[tag] = (coords, tags)
+                    break
+                if tag.endswith("_comment_line"):
+                    window_lines[tag[:-5]] = (coords, tags)
+                if tag.startswith("transition"):
+                    transition_lines[tags[0]] = (coords, tags)
+                    break
+        return transition_lines, window_lines
+
+    def _create_windows(self, design_dictionary: dict[str, Any], window_lines: dict) -> None:
+        for coords, text, tags in design_dictionary["window_state_action_block"]:
+            for tag in tags:
+                if tag.startswith("connection"):
+                    self._create_window(state_action.StateAction, coords, tags, text_id=text)
+                    self._create_window_line(*window_lines[tag[:-6]])
+        for coords, text, tags in design_dictionary.get("window_state_comment", []):
+            self._create_window_line(window_lines[tags[0]][0], tags[0] + "_line")
+            self._create_window(state_comment.StateComment, coords, tags, text_id=text)
+        for coords, condition, action, tags in design_dictionary["window_condition_action_block"]:
+            for tag in tags:
+                if tag.startswith("ca_connection") and tag.endswith("_anchor"):
+                    self._create_window(
+                        condition_action.ConditionAction, coords, tags, condition_id=condition, action_id=action
+                    )
+                    self._create_window_line(*window_lines[tag[:-7]])
+        for coords, text_before, text_after, tags in design_dictionary["window_global_actions"]:
+            self._create_window(
+                global_actions_clocked.GlobalActionsClocked,
+                coords,
+                tags,
+                text_before_id=text_before,
+                text_after_id=text_after,
+            )
+        for coords, text, tags in design_dictionary["window_global_actions_combinatorial"]:
+            self._create_window(global_actions_combinatorial.GlobalActionsCombinatorial, coords, tags, text_id=text)
+        for coords, text, tags in design_dictionary["window_state_actions_default"]:
+            self._create_window(state_actions_default.StateActionsDefault, coords, tags, text_id=text)
+
+    def _create_window(self, window_class, coords, tags, **texts: str) -> None:
+        self.ref_dicts[window_class][self.canvas.create("window", coords, tags)] = HeadlessWindow(**texts)
+
+    def _create_window_line(self, coords, tags) -> None:
+        self.canvas.tag_lower(self.canvas.create("line", coords, tags))
+
+
+@contextmanager
+def installed(design_dictionary: dict[str, Any]):
+    """
+    Replaces the canvas, the canvas windows, the control values and the texts of the tabs in project_manager by
+    the headless diagram of the design dictionary, while the with-block runs.
+    """
+    diagram = HeadlessDiagram(design_dictionary)
+    replacements = {"canvas": diagram.canvas, "link_dict_ref": link_dictionary.LinkDictionary()}
+    replacements.update({name: HeadlessVariable(value) for name, value in diagram.variables.items()})
+    replacements.update({name: HeadlessText(text) for name, text in diagram.texts.items()})
+    originals = {name: getattr(project_manager, name) for name in replacements}
+    original_ref_dicts = {window_class: window_class.ref_dict for window_class in _WINDOW_CLASSES}
+    try:
+        for name, value in replacements.items():
+            setattr(project_manager, name, value)
+        for window_class, ref_dict in diagram.ref_dicts.items():
+            window_class.ref_dict = ref_dict
+        yield diagram
+    finally:
+        for name, value in originals.items():
+            setattr(project_manager, name, value)
+        for window_class, ref_dict in original_ref_dicts.items():
+            window_class.ref_dict = ref_dict
@@ -17,8 +17,6 @@ line-number and file-name are determined and the corresponding entry of the Link
 import tkinter as tk
 
 import main_window
-from codegen import hdl_generation
-from codegen.hdl_generation_config import GenerationConfig
 from constants import GuiTab
 from project_manager import project_manager
 
@@ -94,6 +92,9 @@ class LinkDictionary:
         widget.highlight_item(hdl_item_type, object_identifier, number_of_line)
 
     def jump_to_hdl(self, selected_file, file_line_number) -> None:
+        from codegen import hdl_generation  # The codegen package is imported at first use.
+        from codegen.hdl_generation_config import GenerationConfig
+
         if project_manager.select_file_number_text.get() == 2:
             gen_config = GenerationConfig.from_main_window()
             file_name_architecture = gen_config.get_architecture_file()
@@ -27,6 +27,12 @@ class HighLightDict:
             300, self._recreate_keyword_list_of_unused_signals_after_idle
         )
 
+    def recreate_keyword_list_of_unused_signals_now(self) -> None:
+        if self.recreate_after_id is not None:
+            project_manager.root.after_cancel(self.recreate_after_id)
+            self.recreate_after_id = None
+        self._recreate_keyword_list_of_unused_signals_after_idle()
+
     def _recreate_keyword_list_of_unused_signals_after_idle(self) -> None:
         self.highlight_pattern_dict["not_read"].clear()
         self.highlight_pattern_dict["not_written"].clear()
@@ -0,0 +1,123 @@
+"""
+This module indexes the compiler messages in the log tab.
+Each log line is parsed once when it is inserted, so hovering and navigating through the messages
+needs neither a regular expression nor a Tcl round trip to read the log.
+"""
+
+import bisect
+import re
+
+from project_manager import project_manager
+
+
+class LogMessageIndex:
+    """
+    The messages are stored with the line number they had at insertion (key) and an offset,
+    so that removing lines at the top of the log (clear, trim) or inserting lines there only changes the offset.
+    """
+
+    def __init__(self) -> None:
+        self.message_dict = {}  # key -> {"file_name", "file_line_number", "severity", "text"}
+        self.keys = []  # sorted keys of message_dict
+        self.line_offset = 0  # line number in the log = key + line_offset
+        self._regex_string = None
+        self._regex = None
+        self.regex_error = None
+
+    def clear(self) -> None:
+        self.message_dict.clear()
+        self.keys.clear()
+        self.line_offset = 0
+
+    def shift_lines(self, delta) -> None:
+        """Must be called when lines are inserted (delta>0) or deleted (delta<0) at the top of the log."""
+        self.line_offset += delta
+        first_valid = bisect.bisect_left(self.keys, 1 - self.line_offset)
+        for key in self.keys[:first_valid]:
+            del self.message_dict[key]
+        del self.keys[:first_valid]
+
+    def get_regex(self):
+        """Returns the compiled regex for the current language, which is compiled again only when it was edited."""
+        regex_string = (
+            project_manager.regex_message_find_for_vhdl
+            if project_manager.language.get() == "VHDL"
+            else project_manager.regex_message_find_for_verilog
+        )
+        if regex_string != self._regex_string:
+            self._regex_string = regex_string
+            try:
+                self._regex = re.compile(regex_string)
+                self.regex_error = None
+            except re.error as e:
+                self._regex = None
+                self.regex_error = e
+        return self._regex
+
+    def get_severity(self, line) -> str | None:
+        """Returns the severity of the line, or None if the line is no compiler message."""
+        line_low = line.lower()
+        regex = self.get_regex()
+        regex_matches = regex is not None and regex.match(line) is not None
+        if not regex_matches and " error " not in line_low and " warning " not in line_low:
+            return None
+        if project_manager.language.get() == "VHDL" and "report note" in line_low:
+            return "note"
+        if "warning" in line_low:
+            return "warning"
+        return "error"
+
+    def add_line(self, line_number, line, severity) -> None:
+        """Adds the log line, when it is a compiler message. The line must be added after all lines before it."""
+        if severity is None:
+            return
+        line = line.rstrip("\n")
+        file_name, file_line_number = None, None
+        regex = self.get_regex()
+        if regex is not None and regex.match(line) is not None:
+            file_name = regex.sub(project_manager.regex_file_name_quote, line)
+            file_line_number_string = regex.sub(project_manager.regex_file_line_number_quote, line)
+            if file_line_number_string != line:
+                try:
+                    file_line_number = int(file_line_number_string)
+                except ValueError:
+                    file_line_number = None
+        key = line_number - self.line_offset
+        if key not in self.message_dict:
+            self.keys.append(key)
+        self.message_dict[key] = {
+            "file_name": file_name,
+            "file_line_number": file_line_number,
+            "severity": severity,
+            "text": line,
+        }
+
+    def rebuild(self, log_text) -> None:
+        """Parses the complete log again, which is needed after the regex was edited."""
+        self.clear()
+        for line_number, line in enumerate(log_text.split("\n"), start=1):
+            self.add_line(line_number, line, self.get_severity(line))
+
+    def get_message(self, line_number):
+        return self.message_dict.get(line_number - self.line_offset)
+
+    def get_all_messages(self) -> list:
+        """Returns a list of (line_number, message) for all messages in the log."""
+        return [(key + self.line_offset, self.message_dict[key]) for key in self.keys]
+
+    def get_next_line_number(self, line_number, forward, severities=("error", "warning")) -> int | None:
+        """Returns the log line number of the next (or previous) message with one of the severities."""
+        key = line_number - self.line_offset
+        if forward:
+            position = bisect.bisect_right(self.keys, key)
+            candidates = range(position, len(self.keys))
+        else:
+            position = bisect.bisect_left(self.keys, key)
+            candidates = range(position - 1, -1, -1)
+        for position in candidates:
+            if self.message_dict[self.keys[position]]["severity"] in severities:
+                return self.keys[position] + self.line_offset
+        return None
+
+
+log_message_index = LogMessageIndex()
@@ -8,40 +8,79 @@ from os.path import exists
 from tkinter import messagebox
 
 import constants
-import file_handling
-import main_window
-import undo_handling
-from codegen import hdl_generation
-from project_manager import project_manager
+import startup_profile
+
+# The modules of the GUI are imported in the functions, so that their import time can be measured by startup_profile.
 
 
 def _setup_application_ui() -> None:
     """Set up the main application UI components."""
+    import main_window
+    import undo_handling
+
     main_window.create_gui()
     main_window.set_word_boundaries()
     # Initialize undo/redo system
     undo_handling.design_has_changed()
 
 
-def _parse_and_process_arguments() -> None:
-    """Parse command-line arguments and process them."""
+def _parse_arguments() -> argparse.Namespace:
+    """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="HDL-FSM-Editor: A tool for modeling FSMs")
     parser.add_argument("filename", nargs="?", help="HDL-FSM-Editor file (.hfe) to open")
     parser.add_argument("--no-version-check", action="store_true", help="Skip version check at startup")
     parser.add_argument("--no-message", action="store_true", help="Skip message check at startup")
     parser.add_argument("--generate-hdl", action="store_true", help="Generate HDL and exit")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--startup-profile", action="store_true", help="Report the import and construction times of the startup"
+    )
+    parser.add_argument(
+        "--diagnostics", action="store_true", help="Report the Tcl calls, slow handlers and main loop latency at exit"
+    )
+    parser.add_argument("--record-session", metavar="FILE", help="Record all editing operations into FILE")
+    parser.add_argument(
+        "--replay-session", metavar="FILE", help="Replay the editing operations of FILE, report their times and exit"
+    )
+    parser.add_argument(
+        "--memory-report", action="store_true", help="Trace the allocated memory and report it by subsystem at exit"
+    )
+    parser.add_argument(
+        "--memory-stress-test",
+        metavar="N",
+        type=int,
+        help="Insert, edit, delete, undo and redo N times, check that the memory use stays bounded and exit",
+    )
+    parser.add_argument(
+        "--export-svg", metavar="FILE", nargs="+", help="Export the diagrams of the files as SVG images and exit"
+    )
+    parser.add_argument(
+        "--export-png", metavar="FILE", nargs="+", help="Export the diagrams of the files as PNG images and exit"
+    )
+    parser.add_argument(
+        "--export-dir", metavar="DIR", help="Directory for the exported images (default: beside each file)"
+    )
+    parser.add_argument(
+        "--auto-layout",
+        metavar="FILE",
+        nargs="+",
+        help="Replace the layout of the files by an automatic layout and exit",
+    )
+    return parser.parse_args()
+
+
+def _process_arguments(args) -> None:
+    """Process the command-line arguments."""
+    import file_handling
+    import main_window
+    from project_manager import project_manager
 
     # In batch generation mode, skip version and message checks by default
     if args.generate_hdl:
         args.no_version_check = True
         args.no_message = True
 
-    # Handle version and message checks
-    if not args.no_version_check:
-        main_window.check_version()
-    if not args.no_message:
-        main_window.read_message()
+    # Handle version and message checks (their results are shown in the log tab when they arrive)
+    main_window.start_startup_checks(not args.no_version_check, not args.no_message)
 
     # Handle filename
     if args.filename:
@@ -63,21 +102,72 @@ def _parse_and_process_arguments() -> None:
             if args.generate_hdl:
                 file_handling.open_file_with_name(args.filename, is_script_mode=True)
             else:
-                file_handling.open_file_with_name(args.filename, is_script_mode=False)
+                with startup_profile.measure("open " + args.filename):
+                    file_handling.open_file_with_name(args.filename, is_script_mode=False)
             project_manager.canvas.bind("<Visibility>", lambda _event: main_window.view_all_after_window_is_built())
 
     # Handle batch generation
     if args.generate_hdl:
-        success = hdl_generation.run_hdl_generation(write_to_file=True, is_script_mode=True)
+        from codegen import hdl_generation
+
+        with startup_profile.measure("generate HDL"):
+            success = hdl_generation.run_hdl_generation(write_to_file=True, is_script_mode=True)
+        startup_profile.report()
         sys.exit(0 if success else 1)
 
 
 def _main() -> None:
     """Main entry point for HDL-FSM-Editor."""
+    args = _parse_arguments()
+    if args.export_svg or args.export_png:
+        # The diagrams are rendered from the files without any Tk widget, so no window is created.
+        import diagram_export
+
+        success = True
+        if args.export_svg:
+            success &= diagram_export.export_diagrams(args.export_svg, "svg", args.export_dir)
+        if args.export_png:
+            success &= diagram_export.export_diagrams(args.export_png, "png", args.export_dir)
+        sys.exit(0 if success else 1)
+    if args.auto_layout:
+        import auto_layout
+
+        success = auto_layout.layout_files(args.auto_layout)
+        sys.exit(0 if success else 1)
+    if args.startup_profile:
+        startup_profile.enable()
+    if args.diagnostics:
+        import diagnostics
+
+        diagnostics.enable()
+    if args.memory_report:
+        import memory_report
+
+        memory_report.enable()
+    if args.record_session:
+        import editing_session
+
+        editing_session.start_recording(args.record_session)
     print(constants.HEADER_STRING)
-    _setup_application_ui()
-    _parse_and_process_arguments()
+    with startup_profile.measure("main window"):
+        _setup_application_ui()
+    _process_arguments(args)
+    from project_manager import project_manager
+
     project_manager.root.wm_deiconify()
+    if args.diagnostics:
+        diagnostics.start_latency_probe(project_manager.root)
+    if args.replay_session:
+        import editing_session
+
+        success = editing_session.replay(args.replay_session)
+        sys.exit(0 if success else 1)
+    if args.memory_stress_test is not None:
+        import memory_report
+
+        success = memory_report.run_stress_test(args.memory_stress_test)
+        sys.exit(0 if success else 1)
+    project_manager.root.after_idle(startup_profile.report)
     project_manager.root.mainloop()
 
 
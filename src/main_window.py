@@ -2,11 +2,13 @@
 This module contains all methods to create the main-window of the HDL-FSM-Editor.
 """
 
+import json
+import queue
 import re
 import sys
+import threading
+import time
 import tkinter as tk
-import urllib.error
-import urllib.request
 from pathlib import Path
 from tkinter import ttk
 
@@ -16,9 +18,15 @@ import link_dictionary
 import linting
 import menu_bar
 import notebook_top
+from log_message_index import log_message_index
 from project_manager import project_manager
 
-_check_version_result: str = ""  # wird nur in main_window.py verwendet, kann in Attribut umgewandelt werden
+_VERSION_URL = "http://www.hdl-fsm-editor.de/index.php"
+_MESSAGE_URL = "http://www.hdl-fsm-editor.de/message.txt"
+_URL_TIMEOUT_S = 3
+_STARTUP_CHECK_POLL_PERIOD_MS = 100
+_CACHE_TTL_S = 24 * 60 * 60
+_CACHE_FILE_NAME = Path.home() / ".hdl-fsm-editor" / "startup_checks.json"
 
 
 def create_gui() -> None:
@@ -55,11 +63,36 @@ def set_word_boundaries() -> None:
     project_manager.root.tk.call("set", "tcl_nonwordchars", "[^a-zA-Z0-9_]")
 
 
-def check_version() -> None:
-    global _check_version_result
+def start_startup_checks(check_version_enabled, read_message_enabled) -> None:
+    """
+    The checks run in a background thread, so that the window does not wait for the network.
+    Their results are copied into the log tab when they arrive.
+    """
+    if not check_version_enabled and not read_message_enabled:
+        return
+    result_queue = queue.Queue()
+    threading.Thread(
+        target=lambda: result_queue.put(
+            (
+                check_version() if check_version_enabled else None,
+                read_message() if read_message_enabled else None,
+            )
+        ),
+        daemon=True,
+    ).start()
+    project_manager.root.after(_STARTUP_CHECK_POLL_PERIOD_MS, _poll_startup_checks, result_queue)
+
+
+def check_version(url=_VERSION_URL) -> str:
+    # Runs in a background thread, so it must not access any tkinter object.
+    import urllib.request  # Imported here, as it is not needed when the checks are switched off.
+
+    cached_result = _read_cache("version", url)
+    if cached_result is not None:
+        return cached_result
     try:
         print("Checking for a newer version ...")
-        with urllib.request.urlopen("http://www.hdl-fsm-editor.de/index.php") as source:
+        with urllib.request.urlopen(url, timeout=_URL_TIMEOUT_S) as source:
             website_source = str(source.read())
         version_start = website_source.find("Version")
         new_version = website_source[version_start : version_start + 24]
@@ -67,27 +100,80 @@ def check_version() -> None:
         new_version = new_version[:end_index]
         new_version = re.sub(" ", "", new_version)
         if new_version != "Version" + constants.VERSION:
-            _check_version_result = (
+            check_version_result = (
                 "Please update to the new version of HDL-FSM-Editor available at http://www.hdl-fsm-editor.de"
             )
         else:
-            _check_version_result = "Your version of HDL-FSM-Editor is up to date."
-    except urllib.error.URLError:
-        _check_version_result = "HDL-FSM-Editor version could not be checked, as you are offline."
-    print(_check_version_result)
+            check_version_result = "Your version of HDL-FSM-Editor is up to date."
+        _write_cache("version", url, check_version_result)
+    except (urllib.error.URLError, OSError):  # A timeout is raised as OSError.
+        check_version_result = "HDL-FSM-Editor version could not be checked, as you are offline."
+    return check_version_result
+
 
+def read_message(url=_MESSAGE_URL) -> str:
+    # Runs in a background thread, so it must not access any tkinter object.
+    import urllib.request
 
-def read_message() -> None:
+    cached_result = _read_cache("message", url)
+    if cached_result is not None:
+        return cached_result
     try:
-        with urllib.request.urlopen("http://www.hdl-fsm-editor.de/message.txt") as source:
+        with urllib.request.urlopen(url, timeout=_URL_TIMEOUT_S) as source:
             message = source.read()
-        _read_message_result = message.decode()
+        read_message_result = message.decode()
+        _write_cache("message", url, read_message_result)
     except urllib.error.URLError:
-        _read_message_result = "No message was found."
-    except ConnectionRefusedError:
-        _read_message_result = ""
-    print(_read_message_result)
-    _copy_message_into_log_tab(_read_message_result)
+        read_message_result = "No message was found."
+    except OSError:  # ConnectionRefusedError or timeout
+        read_message_result = ""
+    return read_message_result
+
+
+def _poll_startup_checks(result_queue) -> None:
+    try:
+        check_version_result, read_message_result = result_queue.get_nowait()
+    except queue.Empty:
+        project_manager.root.after(_STARTUP_CHECK_POLL_PERIOD_MS, _poll_startup_checks, result_queue)
+        return
+    for result in (check_version_result, read_message_result):
+        if result is not None:
+            print(result)
+    # The result of the version check is always copied, an empty message (server offline) is left out:
+    results = [result for result in (check_version_result, read_message_result) if result]
+    if results:
+        _copy_message_into_log_tab(results)
+
+
+def _read_cache(key, url) -> str | None:
+    # Only successful checks are cached, so an offline start does not hide the result of the next online start.
+    try:
+        with open(_CACHE_FILE_NAME, encoding="utf-8") as cache_file:
+            entry = json.load(cache_file).get(key)
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(entry, dict) or entry.get("url") != url or entry.get("version") != constants.VERSION:
+        return None
+    if not 0 <= time.time() - entry.get("time", 0) < _CACHE_TTL_S:
+        return None
+    return entry.get("result")
+
+
+def _write_cache(key, url, result) -> None:
+    try:
+        with open(_CACHE_FILE_NAME, encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    cache[key] = {"url": url, "version": constants.VERSION, "time": time.time(), "result": result}
+    try:
+        _CACHE_FILE_NAME.parent.mkdir(parents=True, exist_ok=True)
+        with open(_CACHE_FILE_NAME, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file)
+    except OSError:
+        pass  # Without cache the checks are only repeated at the next start.
 
 
 def view_all_after_window_is_built() -> None:
@@ -139,9 +225,9 @@ def _get_resource_path(resource_name: str) -> Path:
     return base_path / "rsc" / resource_name
 
 
-def _copy_message_into_log_tab(_read_message_result) -> None:
-    project_manager.log_frame_text.config(state=tk.NORMAL)
-    project_manager.log_frame_text.insert(
-        "1.0", constants.HEADER_STRING + "\n" + _check_version_result + "\n" + _read_message_result + "\n"
-    )
+def _copy_message_into_log_tab(results) -> None:
+    message = constants.HEADER_STRING + "\n" + "".join(result + "\n" for result in results)
     project_manager.log_frame_text.config(state=tk.NORMAL)
+    project_manager.log_frame_text.insert("1.0", message)
+    log_message_index.shift_lines(message.count("\n"))
+    project_manager.log_frame_text.config(state=tk.DISABLED)
@@ -0,0 +1,251 @@
+"""
+This module reports the memory used by HDL-FSM-Editor, broken down by subsystem, so that leaks of long sessions can
+be found. The report is shown by the menu entry Info -> Memory Report and is printed at exit, when HDL-FSM-Editor is
+started with the switch --memory-report. Only with this switch tracemalloc is started at startup, so that the report
+also contains the allocated memory of each subsystem, otherwise it contains only the numbers of objects.
+
+With the switch --memory-stress-test <n> a state with action and comment is inserted, edited and deleted <n> times,
+each change is undone and redone. Afterwards the registries of the editor must have the same size as before and the
+allocated memory must not have grown by more than _MAX_MEMORY_GROWTH. The result is printed as a JSON line.
+"""
+
+import atexit
+import collections
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from project_manager import project_manager
+
+_NUMBER_OF_WARMUP_CYCLES = 10
+_MAX_MEMORY_GROWTH = 2 * 1024 * 1024  # bytes, allowed at a stress test after the warmup cycles
+_NUMBER_OF_REPORTED_FILES = 10
+# Subsystem -> names of the source files and of the packages, whose allocations belong to the subsystem:
+_SUBSYSTEM_SOURCES = {
+    "undo stack": ("undo_handling.py",),
+    "widget registry": ("custom_text.py", "elements", "widgets", "tkinter"),
+    "link dict": ("link_dictionary.py", "codegen"),
+    "highlighting data": ("linting.py", "viewport_highlighting.py", "design_cache.py", "search_index.py"),
+}
+
+
+def enable() -> None:
+    """Must be called at startup, so that tracemalloc also traces the memory allocated when the GUI is built."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    atexit.register(lambda: print(get_report()))
+
+
+def get_report() -> str:
+    gc.collect()
+    lines = ["Memory report of HDL-FSM-Editor", ""]
+    for subsystem, counters in _get_counters_by_subsystem().items():
+        lines.append(subsystem + ":")
+        lines += [f"    {name:45} {value:12,}" for name, value in counters.items()]
+    lines += ["", "Objects of HDL-FSM-Editor classes:"]
+    lines += [f"    {name:45} {number:12,}" for name, number in _count_editor_objects().most_common()]
+    lines.append(f"    {'all objects tracked by the garbage collector':45} {len(gc.get_objects()):12,}")
+    lines.append("")
+    if tracemalloc.is_tracing():
+        lines += _get_tracemalloc_report()
+    else:
+        lines.append("Start HDL-FSM-Editor with --memory-report to get the allocated memory of each subsystem.")
+    return "\n".join(lines)
+
+
+def _get_counters_by_subsystem() -> dict:
+    import custom_text
+    import undo_handling
+    from design_cache import design_cache
+    from search_index import search_index
+
+    counters = {
+        "undo stack": {
+            "entries": len(undo_handling.stack),
+            "stack write pointer": undo_handling.stack_write_pointer,
+            "bytes of all entries": sum(sys.getsizeof(entry) for entry in undo_handling.stack),
+        },
+        "widget registry": {},
+        "link dict": {
+            "files": len(project_manager.link_dict_ref.link_dict),
+            "lines": sum(len(lines) for lines in project_manager.link_dict_ref.link_dict.values()),
+        },
+        "highlighting data": {
+            "not read patterns": len(project_manager.highlight_dict_ref.highlight_pattern_dict["not_read"]),
+            "not written patterns": len(project_manager.highlight_dict_ref.highlight_pattern_dict["not_written"]),
+            "texts in search index": len(search_index.text_dict),
+            "characters in search index": sum(len(text) for text in search_index.text_dict.values()),
+            "results in design cache": len(design_cache.results),
+            "texts using the design cache": len(design_cache.keys_in_use),
+        },
+    }
+    for element_class in _get_element_classes():
+        entries = element_class.ref_dict
+        counters["widget registry"][element_class.__name__ + ".ref_dict"] = len(entries)
+        counters["widget registry"][element_class.__name__ + ".ref_dict stale"] = sum(
+            1 for canvas_id in entries if project_manager.canvas.type(canvas_id) is None
+        )
+    counters["widget registry"]["CustomText.read_variables_of_all_windows"] = len(
+        custom_text.CustomText.read_variables_of_all_windows
+    )
+    counters["widget registry"]["CustomText.written_variables_of_all_windows"] = len(
+        custom_text.CustomText.written_variables_of_all_windows
+    )
+    counters["widget registry"]["canvas items"] = len(project_manager.canvas.find_all())
+    counters["widget registry"]["Tk widgets in the diagram"] = _count_widgets(project_manager.canvas)
+    counters["widget registry"]["Tcl commands"] = len(
+        project_manager.root.tk.splitlist(project_manager.root.tk.call("info", "commands"))
+    )
+    if project_manager.tab_hdl_is_built:  # Reading tab_hdl_ref would build the HDL tab.
+        counters["highlighting data"]["cached blocks of the HDL tab"] = len(
+            project_manager.tab_hdl_ref._highlighter.cache
+        )
+    return counters
+
+
+def _get_element_classes() -> list:
+    from elements import (
+        condition_action,
+        connector,
+        global_actions_clocked,
+        global_actions_combinatorial,
+        state,
+        state_action,
+        state_actions_default,
+        state_comment,
+        transition,
+    )
+
+    return [
+        state.States,
+        transition.TransitionLine,
+        connector.ConnectorInstance,
+        state_action.StateAction,
+        state_comment.StateComment,
+        condition_action.ConditionAction,
+        state_actions_default.StateActionsDefault,
+        global_actions_clocked.GlobalActionsClocked,
+        global_actions_combinatorial.GlobalActionsCombinatorial,
+    ]
+
+
+def _count_widgets(widget) -> int:
+    children = widget.winfo_children()
+    return len(children) + sum(_count_widgets(child) for child in children)
+
+
+def _count_editor_objects() -> collections.Counter:
+    source_directory = Path(__file__).parent
+    editor_modules = {
+        name
+        for name, module in sys.modules.items()
+        if getattr(module, "__file__", None) and source_directory in Path(module.__file__).parents
+    }
+    return collections.Counter(
+        type(item).__qualname__ for item in gc.get_objects() if type(item).__module__ in editor_modules
+    )
+
+
+def _get_tracemalloc_report() -> list:
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"Memory allocated by Python: {current:,} bytes (peak {peak:,} bytes)", "Allocated memory by subsystem:"]
+    statistics = tracemalloc.take_snapshot().statistics("filename")
+    size_by_subsystem = dict.fromkeys([*_SUBSYSTEM_SOURCES, "other"], 0)
+    for statistic in statistics:
+        size_by_subsystem[_get_subsystem(statistic.traceback[0].filename)] += statistic.size
+    lines += [f"    {subsystem:45} {size:12,}" for subsystem, size in size_by_subsystem.items()]
+    lines.append("Source files with the most allocated memory:")
+    lines += [
+        f"    {statistic.traceback[0].filename:45} {statistic.size:12,}"
+        for statistic in statistics[:_NUMBER_OF_REPORTED_FILES]
+    ]
+    return lines
+
+
+def _get_subsystem(file_name) -> str:
+    path = Path(file_name)
+    for subsystem, sources in _SUBSYSTEM_SOURCES.items():
+        if path.name in sources or path.parent.name in sources:
+            return subsystem
+    return "other"
+
+
+########################################################################################################################
+
+
+def run_stress_test(number_of_cycles) -> bool:
+    """Must be called with an empty design, when the main window is shown."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    for _ in range(_NUMBER_OF_WARMUP_CYCLES):
+        _run_edit_cycle()
+    counters_before, memory_before = _get_stress_test_measurement()
+    for _ in range(number_of_cycles):
+        _run_edit_cycle()
+    counters_after, memory_after = _get_stress_test_measurement()
+    growth = {
+        name: counters_after[name] - counters_before[name]
+        for name in counters_after
+        if counters_after[name] != counters_before[name]
+    }
+    success = not growth and memory_after - memory_before <= _MAX_MEMORY_GROWTH
+    print(
+        json.dumps(
+            {
+                "cycles": number_of_cycles,
+                "success": success,
+                "memory_growth": memory_after - memory_before,
+                "max_memory_growth": _MAX_MEMORY_GROWTH,
+                "counter_growth": growth,
+            }
+        )
+    )
+    if not success:
+        print(get_report())
+    return success
+
+
+def _get_stress_test_measurement():
+    project_manager.root.update()
+    gc.collect()
+    counters = {}
+    for subsystem_counters in _get_counters_by_subsystem().values():
+        counters |= subsystem_counters
+    del counters["bytes of all entries"]  # The undo stack is bounded by its number of entries.
+    return counters, tracemalloc.get_traced_memory()[0]
+
+
+def _run_edit_cycle() -> None:
+    import canvas_delete
+    import undo_handling
+    from elements import state, state_action, state_comment
+
+    start_pointer = undo_handling.stack_write_pointer
+    state.States.insert_state(SimpleNamespace(x=200, y=200))
+    state_id = project_manager.canvas.find_withtag("state" + str(state.States.state_number))[0]
+    state_ref = state.States.ref_dict[state_id]
+    state_coords = project_manager.canvas.coords(state_id)
+    state_x, state_y = (state_coords[0] + state_coords[2]) / 2, (state_coords[1] + state_coords[3]) / 2
+    state_ref.add_action(state_x, state_y - 100)
+    state_ref.add_comment(state_x, state_y + 100)
+    project_manager.root.update()
+    for text_ref in (
+        next(reversed(state_action.StateAction.ref_dict.values())).text_id,
+        next(reversed(state_comment.StateComment.ref_dict.values())).text_id,
+    ):
+        text_ref.insert("1.0", "counter <= counter + 1;")
+        text_ref.format()
+        undo_handling.design_has_changed()
+    project_manager.root.update()
+    canvas_delete.CanvasDelete.canvas_x_coordinate = state_x
+    canvas_delete.CanvasDelete.canvas_y_coordinate = state_y
+    canvas_delete.CanvasDelete()
+    project_manager.canvas.focus_set()  # Undo and redo are ignored, when a text has the focus.
+    number_of_changes = undo_handling.stack_write_pointer - start_pointer
+    operations = [undo_handling.undo, undo_handling.redo, undo_handling.undo]
+    for function in [operation for operation in operations for _ in range(number_of_changes)]:
+        function()
+        project_manager.root.update()
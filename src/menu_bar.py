@@ -5,19 +5,20 @@ import sys
 import tkinter as tk
 from tkinter import messagebox, ttk
 
-import compile_handling
 import constants
 import file_handling
-import find_replace
+import selection
 import undo_handling
-import update_hdl_tab
-from codegen import hdl_generation
-from dialogs import help_selection, help_shortcuts
+from hdl_preview import hdl_preview
 from project_manager import project_manager
 
 
 class MenuBar:
-    """This object creates the menu bar of the tool and manages its functionality."""
+    """
+    This object creates the menu bar of the tool and manages its functionality.
+    The modules for generating, compiling, searching and the help dialogs are imported at their first use,
+    so that they do not delay the startup.
+    """
 
     def __init__(self, row, column) -> None:
         menue_frame = ttk.Frame(project_manager.root, borderwidth=2, relief=tk.RAISED)
@@ -42,11 +43,16 @@ class MenuBar:
         hdl_menu.add_command(
             label="Generate",
             accelerator="Ctrl+g",
-            command=lambda: hdl_generation.run_hdl_generation(write_to_file=True),
+            command=self._generate_hdl,
             font=("Arial", 10),
         )
-        hdl_menu.add_command(
-            label="Compile", accelerator="Ctrl+p", command=compile_handling.compile_hdl, font=("Arial", 10)
+        hdl_menu.add_command(label="Compile", accelerator="Ctrl+p", command=self._compile_hdl, font=("Arial", 10))
+        project_manager.live_hdl_preview = tk.BooleanVar(value=False)
+        hdl_menu.add_checkbutton(
+            label="Live Preview",
+            variable=project_manager.live_hdl_preview,
+            command=hdl_preview.enable_changed,
+            font=("Arial", 10),
         )
 
         tool_title = ttk.Label(menue_frame, text="HDL-FSM-Editor", font=("Arial", 15))
@@ -59,7 +65,7 @@ class MenuBar:
         search_button = ttk.Button(
             search_frame,
             text="Find",
-            command=lambda: find_replace.FindReplace(search_string, replace_string, replace=False),
+            command=lambda: self._find_replace(search_string, replace_string, replace=False),
             style="Find.TButton",
         )
         search_string_entry = ttk.Entry(search_frame, width=23, textvariable=search_string)
@@ -67,21 +73,17 @@ class MenuBar:
         replace_button = ttk.Button(
             search_frame,
             text="Find & Replace",
-            command=lambda: find_replace.FindReplace(search_string, replace_string, replace=True),
+            command=lambda: self._find_replace(search_string, replace_string, replace=True),
             style="Find.TButton",
         )
         search_string_entry.bind(
-            "<Return>", lambda event: find_replace.FindReplace(search_string, replace_string, replace=False)
-        )
-        search_button.bind(
-            "<Return>", lambda event: find_replace.FindReplace(search_string, replace_string, replace=False)
+            "<Return>", lambda event: self._find_replace(search_string, replace_string, replace=False)
         )
+        search_button.bind("<Return>", lambda event: self._find_replace(search_string, replace_string, replace=False))
         replace_string_entry.bind(
-            "<Return>", lambda event: find_replace.FindReplace(search_string, replace_string, replace=True)
-        )
-        replace_button.bind(
-            "<Return>", lambda event: find_replace.FindReplace(search_string, replace_string, replace=True)
+            "<Return>", lambda event: self._find_replace(search_string, replace_string, replace=True)
         )
+        replace_button.bind("<Return>", lambda event: self._find_replace(search_string, replace_string, replace=True))
         search_string_entry.grid(row=0, column=0)
         search_button.grid(row=0, column=1)
         replace_string_entry.grid(row=0, column=2)
@@ -90,12 +92,12 @@ class MenuBar:
         help_menu = tk.Menu(project_manager.root, tearoff=0)
         help_menu.add_command(
             label="Editing Shortcuts",
-            command=help_shortcuts.ShortCutsDialog,
+            command=self._show_shortcuts_dialog,
             font=("Arial", 10),
         )
         help_menu.add_command(
             label="Text Selection",
-            command=help_selection.SelectionDialog,
+            command=self._show_selection_dialog,
             font=("Arial", 10),
         )
 
@@ -107,11 +109,14 @@ class MenuBar:
             menu=help_menu,
             font=("Arial", 10),
         )
+        info_menu.add_command(label="Memory Report", command=self._show_memory_report, font=("Arial", 10))
         info_menu.add_command(
             label="About", command=lambda: messagebox.showinfo("About:", constants.HEADER_STRING), font=("Arial", 10)
         )
 
-        project_manager.notebook.bind("<<NotebookTabChanged>>", lambda event: self._handle_notebook_tab_changed_event())
+        project_manager.notebook.bind(
+            "<<NotebookTabChanged>>", lambda event: self._handle_notebook_tab_changed_event(), add="+"
+        )
 
         file_menu_button.grid(row=0, column=0)
         hdl_menu_button.grid(row=0, column=1)
@@ -122,11 +127,9 @@ class MenuBar:
         # Bindings of the menus:
         project_manager.root.bind_all("<Control-o>", lambda event: file_handling.open_file())
         project_manager.root.bind_all("<Control-s>", lambda event: file_handling.save())
-        project_manager.root.bind_all(
-            "<Control-g>", lambda event: hdl_generation.run_hdl_generation(write_to_file=True)
-        )
+        project_manager.root.bind_all("<Control-g>", lambda event: self._generate_hdl())
         project_manager.root.bind_all("<Control-n>", lambda event: file_handling.new_design())
-        project_manager.root.bind_all("<Control-p>", lambda event: compile_handling.compile_hdl())
+        project_manager.root.bind_all("<Control-p>", lambda event: self._compile_hdl())
         project_manager.root.bind_all("<Control-f>", lambda event: search_string_entry.focus_set())
         project_manager.root.bind_all("<Control-O>", lambda event: self._capslock_warning("O"))
         project_manager.root.bind_all("<Control-S>", lambda event: self._capslock_warning("S"))
@@ -135,6 +138,37 @@ class MenuBar:
         project_manager.root.bind_all("<Control-P>", lambda event: self._capslock_warning("P"))
         project_manager.root.bind_all("<Control-F>", lambda event: self._capslock_warning("F"))
 
+    def _generate_hdl(self) -> None:
+        from codegen import hdl_generation
+
+        hdl_generation.run_hdl_generation(write_to_file=True)
+
+    def _compile_hdl(self) -> None:
+        import compile_handling
+
+        compile_handling.compile_hdl()
+
+    def _find_replace(self, search_string, replace_string, replace) -> None:
+        import find_replace
+
+        find_replace.FindReplace(search_string, replace_string, replace=replace)
+
+    def _show_shortcuts_dialog(self) -> None:
+        from dialogs import help_shortcuts
+
+        help_shortcuts.ShortCutsDialog()
+
+    def _show_selection_dialog(self) -> None:
+        from dialogs import help_selection
+
+        help_selection.SelectionDialog()
+
+    def _show_memory_report(self) -> None:
+        import memory_report
+        from dialogs import text_dialog
+
+        text_dialog.TextDialog("Memory Report", memory_report.get_report(), "800x600", font=("Courier", 10))
+
     def _handle_notebook_tab_changed_event(self) -> None:
         self._enable_undo_redo_if_diagram_tab_is_active_else_disable()
         self._update_hdl_tab_if_necessary()
@@ -144,6 +178,7 @@ class MenuBar:
             project_manager.canvas.bind_all("<Control-z>", lambda event: undo_handling.undo())
             project_manager.canvas.bind_all("<Control-Z>", lambda event: undo_handling.redo())
         else:
+            selection.clear()  # Otherwise a Delete key pressed later in the diagram tab would delete the group.
             project_manager.canvas.unbind_all(
                 "<Control-z>"
             )  # necessary, because if you type Control-z when another tab is active,
@@ -182,6 +217,8 @@ class MenuBar:
                     default="yes",
                 )
                 if answer == "yes":
+                    import update_hdl_tab
+
                     update_ref = update_hdl_tab.UpdateHdlTab(
                         project_manager.language.get(),
                         project_manager.select_file_number_text.get(),
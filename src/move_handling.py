@@ -3,7 +3,6 @@ This module contains a method to decide which graphical object must be moved.
 """
 
 import canvas_editing
-import constants
 from elements import (
     condition_action,
     connector,
@@ -17,37 +16,116 @@ from elements import (
     transition,
 )
 from project_manager import project_manager
+from spatial_index import spatial_index
+
+# Motion events are coalesced, so that the diagram is updated at most once per display frame:
+_FRAME_PERIOD_MS = 16
+_pending_motion = None  # [event_x, event_y, move_list] of the latest not yet handled motion event
+_pending_motion_after_id = None
+# The move_list is resolved only once per moving into a drag plan, which holds the element references:
+_drag_plan_move_list = None
+_drag_plan = []
+_middle_of_line_is_moved = True
 
 
 def move_do(event, move_list, first, move_to_grid=False) -> None:
     [event_x, event_y] = canvas_editing.translate_window_event_coordinates_in_exact_canvas_coordinates(event)
-    move_to_coordinates(event_x, event_y, move_list, first, move_to_grid)
+    if first or move_to_grid:
+        move_to_coordinates(event_x, event_y, move_list, first, move_to_grid)
+    else:
+        move_to_coordinates_at_next_frame(event_x, event_y, move_list)
+
+
+def move_to_coordinates_at_next_frame(event_x, event_y, move_list) -> None:
+    """Only the last of all motion events arriving during one frame period moves the items."""
+    global _pending_motion, _pending_motion_after_id
+    _pending_motion = [event_x, event_y, move_list]
+    if _pending_motion_after_id is None:
+        _pending_motion_after_id = project_manager.canvas.after(_FRAME_PERIOD_MS, _move_to_pending_coordinates)
+
+
+def _move_to_pending_coordinates() -> None:
+    global _pending_motion, _pending_motion_after_id
+    _pending_motion_after_id = None
+    if _pending_motion is not None:
+        event_x, event_y, move_list = _pending_motion
+        _pending_motion = None
+        _move_to_coordinates(event_x, event_y, move_list, first=False, move_to_grid=False)
+
+
+def _cancel_pending_motion() -> None:
+    global _pending_motion, _pending_motion_after_id
+    if _pending_motion_after_id is not None:
+        project_manager.canvas.after_cancel(_pending_motion_after_id)
+        _pending_motion_after_id = None
+    _pending_motion = None
 
 
 def move_to_coordinates(event_x, event_y, move_list, first, move_to_grid):
+    # A pending motion is older than this call and must not be executed afterwards:
+    _cancel_pending_motion()
+    _move_to_coordinates(event_x, event_y, move_list, first, move_to_grid)
+
+
+def _move_to_coordinates(event_x, event_y, move_list, first, move_to_grid):
+    global _drag_plan_move_list, _drag_plan, _middle_of_line_is_moved
+    if first or move_list is not _drag_plan_move_list:
+        _drag_plan = _create_drag_plan(move_list)
+        _drag_plan_move_list = move_list
+        _middle_of_line_is_moved = not (
+            project_manager.canvas.type(move_list[0][0]) == "line" and move_list[0][1] in ("start", "end")
+        )
     if _connector_moved_too_close_to_other_object(move_list, event_x, event_y):
         return
+    for kind, item_id, item_point_to_move, ref in _drag_plan:
+        if kind == "state":
+            state.States.move_to(event_x, event_y, item_id, first, move_to_grid)
+        elif kind == "reset_entry":
+            reset_entry.ResetEntry.move_to(event_x, event_y, item_id, first, move_to_grid)
+        elif kind == "transition":
+            transition.TransitionLine.move_to(
+                event_x,
+                event_y,
+                item_id,
+                item_point_to_move,
+                first,
+                move_list,
+                move_to_grid,
+                transition_tag=ref,
+                middle_of_line_is_moved=_middle_of_line_is_moved,
+            )
+        elif kind in ("comment_line", "connection_line"):
+            ref.move_line_point_to(event_x, event_y, first)
+        elif kind == "connector":
+            connector.ConnectorInstance.move_to(event_x, event_y, item_id, first, move_to_grid)
+        elif kind == "window":
+            ref.move_to(event_x, event_y, first)
+
+
+def _create_drag_plan(move_list) -> list:
+    # Each entry of the drag plan is [kind, item_id, point_to_move, reference], where reference is
+    # the tag of a transition or the object of a window, whose methods are called at moving.
+    drag_plan = []
     for entry in move_list:
         item_id = entry[0]
         item_point_to_move = entry[1]
         item_type = project_manager.canvas.type(item_id)
         if item_type == "oval":
-            state.States.move_to(event_x, event_y, item_id, first, move_to_grid)
+            drag_plan.append(["state", item_id, item_point_to_move, None])
         elif item_type == "polygon":
-            reset_entry.ResetEntry.move_to(event_x, event_y, item_id, first, move_to_grid)
+            drag_plan.append(["reset_entry", item_id, item_point_to_move, None])
         elif item_type == "line":
             tags = project_manager.canvas.gettags(item_id)
             if tags[0].startswith("transition"):
-                transition.TransitionLine.move_to(
-                    event_x, event_y, item_id, item_point_to_move, first, move_list, move_to_grid
-                )
+                transition_tag = transition.TransitionLine.get_tag_of_moved_line(tags)
+                drag_plan.append(["transition", item_id, item_point_to_move, transition_tag])
             elif (
                 tags[0].endswith("comment_line") and item_point_to_move == "end"
             ):  # state is moved and state_comment line must follow
                 tag_of_comment_window = tags[0][:-5]  # tag[0] = state<number>_comment_line
                 canvas_id_of_comment_window = project_manager.canvas.find_withtag(tag_of_comment_window)[0]
                 ref = state_comment.StateComment.ref_dict[canvas_id_of_comment_window]
-                ref.move_line_point_to(event_x, event_y, first)
+                drag_plan.append(["comment_line", item_id, item_point_to_move, ref])
             elif (
                 tags[0].startswith("connection") and item_point_to_move == "end"
             ):  # state is moved and state action line must follow
@@ -56,9 +134,9 @@ def move_to_coordinates(event_x, event_y, move_list, first, move_to_grid):
                     tag_of_connected_state_action
                 )[0]
                 ref = state_action.StateAction.ref_dict[canvas_id_of_connected_state_action]
-                ref.move_line_point_to(event_x, event_y, first)
+                drag_plan.append(["connection_line", item_id, item_point_to_move, ref])
         elif item_type == "rectangle":
-            connector.ConnectorInstance.move_to(event_x, event_y, item_id, first, move_to_grid)
+            drag_plan.append(["connector", item_id, item_point_to_move, None])
         elif item_type == "window":
             if item_id in state_action.StateAction.ref_dict:
                 ref = state_action.StateAction.ref_dict[item_id]
@@ -72,18 +150,16 @@ def move_to_coordinates(event_x, event_y, move_list, first, move_to_grid):
                 ref = global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict[item_id]
             else:
                 ref = condition_action.ConditionAction.ref_dict[item_id]
-            ref.move_to(event_x, event_y, first)
+            drag_plan.append(["window", item_id, item_point_to_move, ref])
         else:
             print("move: Fatal, unknown canvas type", "|" + item_type + "|")
+    return drag_plan
 
 
 def _connector_moved_too_close_to_other_object(move_list, event_x, event_y) -> bool:
     for entry in move_list:
         moved_item_id = entry[0]
-        if (
-            project_manager.canvas.type(moved_item_id) == "rectangle"
-            and project_manager.canvas.itemcget(moved_item_id, "fill") == constants.CONNECTOR_COLOR
-        ):
+        if spatial_index.get_kind(moved_item_id) == "connector":
             # Keep the distance between event and anchor point constant:
             event_x_mod, event_y_mod = (
                 event_x + connector.ConnectorInstance.difference_x,
@@ -95,24 +171,18 @@ def _connector_moved_too_close_to_other_object(move_list, event_x, event_y) -> b
             event_y_mod = project_manager.state_radius * round(
                 event_y_mod / project_manager.state_radius
             )  # move event_y to grid.
-            connector_coords = project_manager.canvas.coords(moved_item_id)
+            connector_coords = spatial_index.get_bbox(moved_item_id)
             edge_length = connector_coords[2] - connector_coords[0]
             new_upper_left_corner = [event_x_mod - edge_length / 2, event_y_mod - edge_length / 2]
             new_lower_right_corner = [event_x_mod + edge_length / 2, event_y_mod + edge_length / 2]
             moved_connector_coords = [*new_upper_left_corner, *new_lower_right_corner]
-            overlapping_list = project_manager.canvas.find_overlapping(
+            # The spatial index contains only states and connectors:
+            overlapping_list = spatial_index.find_overlapping(
                 moved_connector_coords[0] - project_manager.state_radius / 2,
                 moved_connector_coords[1] - project_manager.state_radius / 2,
                 moved_connector_coords[2] + project_manager.state_radius / 2,
                 moved_connector_coords[3] + project_manager.state_radius / 2,
             )
-            for overlapping_item in overlapping_list:
-                if overlapping_item != moved_item_id and (
-                    project_manager.canvas.type(overlapping_item) == "oval"
-                    or (
-                        project_manager.canvas.type(overlapping_item) == "rectangle"
-                        and project_manager.canvas.itemcget(overlapping_item, "fill") == constants.CONNECTOR_COLOR
-                    )
-                ):
-                    return True
+            if any(overlapping_item != moved_item_id for overlapping_item in overlapping_list):
+                return True
     return False
@@ -6,6 +6,7 @@ This module handles the movement of states at the Canvas.
 import move_handling
 import move_handling_finish
 import move_handling_initialization
+import selection
 import undo_handling
 from project_manager import project_manager
 
@@ -20,6 +21,11 @@ class MoveHandlingCanvasItem:
     def __init__(self, event, canvas_id):
         if MoveHandlingCanvasItem.transition_insertion_runs:
             return  # Button-1 shall now not move any canvas item
+        if selection.event_has_shift(event):
+            return  # The state is selected by the Shift-Button-1 binding of the Canvas.
+        if selection.start_group_move([canvas_id], project_manager.canvas):
+            return
+        selection.clear()
         self.canvas_id = canvas_id
         self.move_list = move_handling_initialization.create_move_list([self.canvas_id], event.x, event.y)
 
@@ -40,13 +46,7 @@ class MoveHandlingCanvasItem:
         self.funcid_release = project_manager.canvas.tag_bind(self.canvas_id, "<ButtonRelease-1>", self._release)
 
     def _motion(self, motion_event):
-        move_handling.move_to_coordinates(
-            motion_event.x,
-            motion_event.y,
-            self.move_list,
-            first=False,
-            move_to_grid=False,
-        )
+        move_handling.move_to_coordinates_at_next_frame(motion_event.x, motion_event.y, self.move_list)
 
     def _release(self, release_event):
         project_manager.canvas.tag_unbind(self.canvas_id, "<Motion>", self.funcid_motion)
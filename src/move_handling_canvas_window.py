@@ -5,6 +5,7 @@ A MoveCanvasWindow object is created, when the user moves a Canvas window object
 import move_handling
 import move_handling_finish
 import move_handling_initialization
+import selection
 import undo_handling
 from project_manager import project_manager
 
@@ -13,6 +14,12 @@ class MoveHandlingCanvasWindow:
     """Handles dragging of a canvas window when the user moves it."""
 
     def __init__(self, event, widget, window_id):
+        if selection.event_has_shift(event):
+            selection.toggle(window_id)
+            return
+        if selection.start_group_move([window_id], widget):
+            return
+        selection.clear()
         self.move_active = True
         self.widget = widget
         self.window_id = window_id
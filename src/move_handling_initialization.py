@@ -11,15 +11,21 @@ import canvas_editing
 import move_handling
 import move_handling_canvas_item
 import move_handling_finish
+import selection
 from elements import transition
 from project_manager import project_manager
 
 
 def move_initialization(event) -> None:
+    if selection.GroupMove.active:
+        return  # The group move was already started by the binding of a selected state.
     [event_x, event_y] = canvas_editing.translate_window_event_coordinates_in_exact_canvas_coordinates(event)
     items_near_mouse_click_location = _create_a_list_of_overlapping_items_near_the_mouse_click_location(
         event_x, event_y
     )
+    if selection.start_group_move(items_near_mouse_click_location, project_manager.canvas):
+        return
+    selection.clear()
     if _any_item_is_not_allowed_to_be_moved(items_near_mouse_click_location):
         return
     move_list = create_move_list(items_near_mouse_click_location, event_x, event_y)
@@ -4,12 +4,11 @@ This module handling contains all needed methods for the notebook widget.
 
 from tkinter import ttk
 
+import startup_profile
 import tab_control
 import tab_diagram
-import tab_hdl
 import tab_interface
 import tab_internals
-import tab_log
 from constants import GuiTab
 from project_manager import project_manager
 
@@ -17,18 +16,59 @@ from project_manager import project_manager
 class NotebookTop(ttk.Notebook):
     """
     For the top-level notebook widget a NotebookTop object is created.
+    The tabs "Generated HDL" and "Compile Messages" get only an empty frame at startup.
+    Their modules are imported and their contents are built, when they are shown or their widgets are used first.
     """
 
     def __init__(self, row, column) -> None:
         super().__init__(padding=5)
         self.grid(column=column, row=row, sticky="nsew")
         project_manager.notebook = self
-        project_manager.tab_control_ref = tab_control.TabControl()
-        project_manager.tab_interface_ref = tab_interface.TabInterface()
-        project_manager.tab_internals_ref = tab_internals.TabInternals()
-        project_manager.tab_diagram_ref = tab_diagram.TabDiagram()
-        project_manager.tab_hdl_ref = tab_hdl.TabHDL()
-        project_manager.tab_log_ref = tab_log.TabLog()
+        with startup_profile.measure("tab " + GuiTab.CONTROL.value):
+            project_manager.tab_control_ref = tab_control.TabControl()
+        with startup_profile.measure("tab " + GuiTab.INTERFACE.value):
+            project_manager.tab_interface_ref = tab_interface.TabInterface()
+        with startup_profile.measure("tab " + GuiTab.INTERNALS.value):
+            project_manager.tab_internals_ref = tab_internals.TabInternals()
+        with startup_profile.measure("tab " + GuiTab.DIAGRAM.value):
+            project_manager.tab_diagram_ref = tab_diagram.TabDiagram()
+        self._deferred_tab_frames = {}
+        self._hdl_of_deferred_hdl_tab = ""
+        for tab in (GuiTab.GENERATED_HDL, GuiTab.COMPILE_MSG):
+            tab_frame = ttk.Frame(self)
+            self.add(tab_frame, sticky="nsew", text=tab.value)
+            self._deferred_tab_frames[tab] = tab_frame
+        self.bind("<<NotebookTabChanged>>", lambda event: self._build_selected_tab())
+
+    def build_deferred_tab(self, tab: GuiTab) -> None:
+        tab_frame = self._deferred_tab_frames.pop(tab, None)
+        if tab_frame is None:
+            return
+        with startup_profile.measure("tab " + tab.value):
+            if tab == GuiTab.GENERATED_HDL:
+                import tab_hdl
+
+                project_manager.tab_hdl_ref = tab_hdl.TabHDL(tab_frame)
+                if self._hdl_of_deferred_hdl_tab:
+                    project_manager.tab_hdl_ref.show_hdl(self._hdl_of_deferred_hdl_tab)
+                    self._hdl_of_deferred_hdl_tab = ""
+            else:
+                import tab_log
+
+                project_manager.tab_log_ref = tab_log.TabLog(tab_frame)
+
+    def show_hdl(self, hdl) -> None:
+        """Shows the HDL in the HDL tab, a not yet built HDL tab shows the HDL when it is built."""
+        if project_manager.tab_hdl_is_built:
+            project_manager.tab_hdl_ref.show_hdl(hdl)
+        else:
+            self._hdl_of_deferred_hdl_tab = hdl
+
+    def _build_selected_tab(self) -> None:
+        selected_tab_text = self.tab(self.select(), option="text")
+        for tab in list(self._deferred_tab_frames):
+            if tab.value == selected_tab_text:
+                self.build_deferred_tab(tab)
 
     def show_tab(self, tab: GuiTab) -> None:
         notebook_ids = self.tabs()
@@ -6,6 +6,8 @@ This module provides a simple way to access application state throughout the app
 import tkinter as tk
 from tkinter import ttk
 
+from constants import GuiTab
+
 # from project import Project
 
 
@@ -43,17 +45,20 @@ class ProjectManager:
         self._interface_ports_label: ttk.Label = None
         self._hdl_frame_text = None  #: custom_text.CustomText = None
         self._log_frame_text = None  #: custom_text.CustomText = None
+        self._stop_compile_button: ttk.Button = None
         self._internals_architecture_label: ttk.Label = None
         self._internals_process_clocked_label: ttk.Label = None
         self._internals_process_combinatorial_label: ttk.Label = None
         self._diagram_background_color: tk.StringVar = None
         self._diagram_background_color_error: ttk.Label = None
         self._include_timestamp_in_output: tk.BooleanVar = None
+        self._live_hdl_preview: tk.BooleanVar = None
         self._state_action_default_button: ttk.Button = None
         self._global_action_clocked_button: ttk.Button = None
         self._global_action_combinatorial_button: ttk.Button = None
         self._reset_entry_button: ttk.Button = None
         self._grid_drawer = None  # : grid_drawing.GridDraw
+        self._window_culling = None  # : window_culling.WindowCulling
         self._undo_button: ttk.Button = None
         self._redo_button: ttk.Button = None
         self._regex_message_find_for_vhdl: str = "(.*?):([0-9]+):[0-9]+:.*"
@@ -62,8 +67,6 @@ class ProjectManager:
         )
         self._regex_file_name_quote: str = "\\1"
         self._regex_file_line_number_quote: str = "\\2"
-        self._size_of_file1_line_number: int = 0
-        self._size_of_file2_line_number: int = 0
         self._date_of_hdl_file_shown_in_hdl_tab: float = 0.0
         self._date_of_hdl_file2_shown_in_hdl_tab: float = 0.0
         self._link_dict_ref = None  #: link_dictionary.LinkDictionary
@@ -179,7 +182,9 @@ class ProjectManager:
 
     @property
     def tab_hdl_ref(self):  # -> tab_hdl.TabHDL:
-        """Get the tab HDL reference."""
+        """Get the tab HDL reference (the HDL tab is built at the first access)."""
+        if self._tab_hdl_ref is None and self._notebook is not None:
+            self._notebook.build_deferred_tab(GuiTab.GENERATED_HDL)
         return self._tab_hdl_ref
 
     @tab_hdl_ref.setter
@@ -187,6 +192,11 @@ class ProjectManager:
         """Set the tab HDL reference."""
         self._tab_hdl_ref = value
 
+    @property
+    def tab_hdl_is_built(self) -> bool:
+        """Check if the HDL tab was built already (without building it as tab_hdl_ref does)."""
+        return self._tab_hdl_ref is not None
+
     @property
     def tab_diagram_ref(self):  # -> tab_diagram.TabDiagram:
         """Get the tab diagram reference."""
@@ -257,26 +267,6 @@ class ProjectManager:
         """Set the date of HDL file 2 shown in HDL tab."""
         self._date_of_hdl_file2_shown_in_hdl_tab = value
 
-    @property
-    def size_of_file1_line_number(self) -> int:
-        """Get the size of file 1 line number."""
-        return self._size_of_file1_line_number
-
-    @size_of_file1_line_number.setter
-    def size_of_file1_line_number(self, value: int) -> None:
-        """Set the size of file 1 line number."""
-        self._size_of_file1_line_number = value
-
-    @property
-    def size_of_file2_line_number(self) -> int:
-        """Get the size of file 2 line number."""
-        return self._size_of_file2_line_number
-
-    @size_of_file2_line_number.setter
-    def size_of_file2_line_number(self, value: int) -> None:
-        """Set the size of file 2 line number."""
-        self._size_of_file2_line_number = value
-
     @property
     def regex_file_name_quote(self) -> str:
         """Get the regex file name quote pattern."""
@@ -347,6 +337,16 @@ class ProjectManager:
         """Set the grid drawer."""
         self._grid_drawer = value
 
+    @property
+    def window_culling(self):  # -> window_culling.WindowCulling:
+        """Get the window culling."""
+        return self._window_culling
+
+    @window_culling.setter
+    def window_culling(self, value):  # -> None:
+        """Set the window culling."""
+        self._window_culling = value
+
     @property
     def reset_entry_button(self) -> ttk.Button:
         """Get the reset entry button."""
@@ -397,6 +397,16 @@ class ProjectManager:
         """Set the include timestamp in output BooleanVar."""
         self._include_timestamp_in_output = value
 
+    @property
+    def live_hdl_preview(self) -> tk.BooleanVar:
+        """Get the live HDL preview BooleanVar."""
+        return self._live_hdl_preview
+
+    @live_hdl_preview.setter
+    def live_hdl_preview(self, value: tk.BooleanVar) -> None:
+        """Set the live HDL preview BooleanVar."""
+        self._live_hdl_preview = value
+
     @property
     def diagram_background_color_error(self) -> tk.Label:
         """Get the diagram background color error Label."""
@@ -479,7 +489,9 @@ class ProjectManager:
 
     @property
     def log_frame_text(self) -> tk.Entry:
-        """Get the log frame Entry widget."""
+        """Get the log frame Entry widget (the log tab is built at the first access)."""
+        if self._log_frame_text is None and self._notebook is not None:
+            self._notebook.build_deferred_tab(GuiTab.COMPILE_MSG)
         return self._log_frame_text
 
     @log_frame_text.setter
@@ -487,9 +499,23 @@ class ProjectManager:
         """Set the log frame Entry widget."""
         self._log_frame_text = value
 
+    @property
+    def stop_compile_button(self) -> ttk.Button:
+        """Get the stop compile Button widget (the log tab is built at the first access)."""
+        if self._stop_compile_button is None and self._notebook is not None:
+            self._notebook.build_deferred_tab(GuiTab.COMPILE_MSG)
+        return self._stop_compile_button
+
+    @stop_compile_button.setter
+    def stop_compile_button(self, value: ttk.Button) -> None:
+        """Set the stop compile Button widget."""
+        self._stop_compile_button = value
+
     @property
     def hdl_frame_text(self) -> tk.Entry:
-        """Get the HDL frame Entry widget."""
+        """Get the HDL frame Entry widget (the HDL tab is built at the first access)."""
+        if self._hdl_frame_text is None and self._notebook is not None:
+            self._notebook.build_deferred_tab(GuiTab.GENERATED_HDL)
         return self._hdl_frame_text
 
     @hdl_frame_text.setter
@@ -0,0 +1,53 @@
+"""
+This module caches the contents of all text sources which are searched by find_replace.
+So a search needs no Tcl round trip for texts, which were not modified since the last search.
+"""
+
+import tkinter as tk
+
+
+class SearchIndex:
+    """
+    The text of a CustomText is stored by CustomText.format() and is marked as outdated by each insert or delete,
+    so that only the outdated texts are read again at the next search.
+    The values of the entry widgets are stored by traces of their variables.
+    """
+
+    def __init__(self) -> None:
+        self.text_dict = {}  # CustomText -> text content (without the last newline)
+        self.outdated_texts = set()
+        self.entry_value_dict = {}  # name of the variable of the entry -> value
+
+    def update_text(self, text_ref, text) -> None:
+        self.text_dict[text_ref] = text
+        self.outdated_texts.discard(text_ref)
+
+    def mark_outdated(self, text_ref) -> None:
+        self.outdated_texts.add(text_ref)
+
+    def get_text(self, text_ref) -> str:
+        if text_ref in self.outdated_texts or text_ref not in self.text_dict:
+            self.update_text(text_ref, text_ref.get("1.0", tk.END + "- 1 chars"))
+        return self.text_dict[text_ref]
+
+    def remove_text(self, text_ref) -> None:
+        self.text_dict.pop(text_ref, None)
+        self.outdated_texts.discard(text_ref)
+
+    def remove_all_texts_except(self, text_refs) -> None:
+        """Drops the texts of deleted text boxes, so that the index does not keep them alive."""
+        for text_ref in [text_ref for text_ref in self.text_dict if text_ref not in text_refs]:
+            del self.text_dict[text_ref]
+        self.outdated_texts.intersection_update(text_refs)
+
+    def watch_entry(self, stringvar) -> None:
+        self.entry_value_dict[str(stringvar)] = stringvar.get()
+        stringvar.trace_add("write", lambda *_: self.entry_value_dict.update({str(stringvar): stringvar.get()}))
+
+    def get_entry_value(self, stringvar) -> str:
+        if str(stringvar) not in self.entry_value_dict:
+            self.watch_entry(stringvar)
+        return self.entry_value_dict[str(stringvar)]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,378 @@
+"""
+This module handles the group selection of diagram objects (states, connectors, reset entry and text boxes).
+Objects are selected by Shift-Button-1 (toggle a single object) or by a Shift-Button-1 rubber band.
+A selected group is moved by one Canvas move-command, deleted in one batch or duplicated,
+and each of these operations creates only one entry in the undo stack.
+"""
+
+from tkinter import messagebox
+
+import canvas_editing
+import constants
+import move_handling_finish
+import undo_handling
+from elements import (
+    condition_action,
+    connector,
+    global_actions_clocked,
+    global_actions_combinatorial,
+    state,
+    state_action,
+    state_actions_default,
+    state_comment,
+    transition,
+)
+from project_manager import project_manager
+from spatial_index import spatial_index
+
+_SHIFT_MASK = 0x0001
+_GROUP_MOVE_TAG = "group_move"
+_selected_ids = set()  # Canvas ids of ovals (states), rectangles (connectors), the reset entry polygon and windows.
+
+
+def event_has_shift(event) -> bool:
+    return bool(event.state & _SHIFT_MASK)
+
+
+def is_selected(canvas_id) -> bool:
+    return canvas_id in _selected_ids
+
+
+def get_selected_ids() -> list:
+    return list(_selected_ids)
+
+
+def group_is_selected() -> bool:
+    return len(_selected_ids) > 1
+
+
+def start_group_move(canvas_ids, widget) -> bool:
+    """Starts a group move, when one of the clicked Canvas items belongs to a selected group."""
+    if group_is_selected() and any(_get_selectable_id(canvas_id) in _selected_ids for canvas_id in canvas_ids):
+        GroupMove(widget)
+        return True
+    return False
+
+
+def toggle(canvas_id) -> None:
+    if canvas_id in _selected_ids:
+        _selected_ids.discard(canvas_id)
+        _show_selection_marker(canvas_id, False)
+    else:
+        _selected_ids.add(canvas_id)
+        _show_selection_marker(canvas_id, True)
+
+
+def clear() -> None:
+    for canvas_id in _selected_ids:
+        _show_selection_marker(canvas_id, False)
+    _selected_ids.clear()
+
+
+def forget() -> None:
+    """Must be called when all Canvas items were deleted, as then no selection marker must be removed anymore."""
+    _selected_ids.clear()
+
+
+def canvas_has_focus() -> bool:
+    try:
+        return project_manager.canvas.focus_get() is project_manager.canvas
+    except KeyError:  # focus_get() fails, when the popdown list of a combobox has the focus.
+        return False
+
+
+def focus_out() -> None:
+    """Bound to <FocusOut> of the Canvas: the selection is cleared, when another widget of the editor gets the focus.
+    When another application gets the focus, the selection is kept."""
+    project_manager.canvas.after_idle(_clear_if_editor_focus_is_outside_of_canvas)
+
+
+def _clear_if_editor_focus_is_outside_of_canvas() -> None:
+    try:
+        focus = project_manager.canvas.focus_get()
+    except KeyError:
+        focus = project_manager.root
+    if focus is not None and focus is not project_manager.canvas:
+        clear()
+
+
+def shift_click(event) -> None:
+    """Bound to Shift-Button-1 at the Canvas: toggles the object under the cursor or starts a rubber band."""
+    project_manager.canvas.focus_set()  # Needed for the Control-d binding.
+    [event_x, event_y] = canvas_editing.translate_window_event_coordinates_in_exact_canvas_coordinates(event)
+    for canvas_id in reversed(project_manager.canvas.find_overlapping(event_x, event_y, event_x, event_y)):
+        selectable_id = _get_selectable_id(canvas_id)
+        if selectable_id is not None:
+            toggle(selectable_id)
+            return
+    _start_rubber_band(event_x, event_y)
+
+
+def duplicate() -> None:
+    """Copies the selected states and connectors together with the transitions between them."""
+    ids_to_copy = [
+        canvas_id for canvas_id in _selected_ids if spatial_index.get_kind(canvas_id) in ("state", "connector")
+    ]
+    if not ids_to_copy:
+        return
+    bboxes = [spatial_index.get_bbox(canvas_id) for canvas_id in ids_to_copy]
+    group_width = max(bbox[2] for bbox in bboxes) - min(bbox[0] for bbox in bboxes)
+    offset = project_manager.state_radius * round(
+        (group_width + 2 * project_manager.state_radius) / project_manager.state_radius
+    )
+    for bbox in bboxes:
+        if spatial_index.find_overlapping(bbox[0] + offset, bbox[1], bbox[2] + offset, bbox[3]):
+            messagebox.showwarning(
+                "Warning in HDL-FSM-Editor",
+                "The selection could not be copied, because the copy\nwould be positioned too close to another object.",
+            )
+            return
+    tag_of_copy = {}  # Maps the tag of each copied state or connector to the tag of its copy.
+    ids_of_copies = []
+    for canvas_id in ids_to_copy:
+        coords = project_manager.canvas.coords(canvas_id)
+        coords = [coords[0] + offset, coords[1], coords[2] + offset, coords[3]]
+        if spatial_index.get_kind(canvas_id) == "state":
+            ref = state.States(
+                coords,
+                tags=["state" + str(state.States.state_number + 1)],
+                text=_get_unused_state_name(
+                    project_manager.canvas.itemcget(state.States.ref_dict[canvas_id].text_id, "text")
+                ),
+                fill_color=project_manager.canvas.itemcget(canvas_id, "fill"),
+                new_state=True,
+            )
+            copy_id = ref.state_id
+        else:
+            connector.ConnectorInstance.connector_number += 1
+            ref = connector.ConnectorInstance(coords, "connector" + str(connector.ConnectorInstance.connector_number))
+            copy_id = ref.connector_id
+        tag_of_copy[project_manager.canvas.gettags(canvas_id)[0]] = project_manager.canvas.gettags(copy_id)[0]
+        ids_of_copies.append(copy_id)
+    _duplicate_transitions_between_copied_objects(tag_of_copy, offset)
+    transition.TransitionLine.hide_priority_of_single_outgoing_transitions()
+    clear()
+    for copy_id in ids_of_copies:
+        toggle(copy_id)
+    undo_handling.design_has_changed()
+
+
+def _duplicate_transitions_between_copied_objects(tag_of_copy, offset) -> None:
+    for transition_id in list(transition.TransitionLine.ref_dict):
+        start_tag = end_tag = None
+        for tag in project_manager.canvas.gettags(transition_id):
+            if tag.startswith("coming_from_"):
+                start_tag = tag[12:]
+            elif tag.startswith("going_to_"):
+                end_tag = tag[9:]
+        if start_tag in tag_of_copy and end_tag in tag_of_copy:
+            transition_tag = transition.TransitionLine.get_tag_of_moved_line(
+                project_manager.canvas.gettags(transition_id)
+            )
+            new_transition_tag = "transition" + str(transition.TransitionLine.transition_number + 1)
+            project_manager.canvas.addtag_withtag(new_transition_tag + "_start", tag_of_copy[start_tag])
+            project_manager.canvas.addtag_withtag(new_transition_tag + "_end", tag_of_copy[end_tag])
+            coords = project_manager.canvas.coords(transition_id)
+            coords[0::2] = [x + offset for x in coords[0::2]]
+            transition.TransitionLine(
+                coords,
+                [new_transition_tag, "coming_from_" + tag_of_copy[start_tag], "going_to_" + tag_of_copy[end_tag]],
+                project_manager.canvas.itemcget(transition_tag + "priority", "text"),
+                new_transition=True,
+            )
+
+
+def _get_unused_state_name(state_name) -> str:
+    used_names = {project_manager.canvas.itemcget(ref.text_id, "text") for ref in state.States.ref_dict.values()}
+    new_name = state_name + "_copy"
+    number = 2
+    while new_name in used_names:
+        new_name = state_name + "_copy" + str(number)
+        number += 1
+    return new_name
+
+
+def _start_rubber_band(event_x, event_y) -> None:
+    rectangle_id = project_manager.canvas.create_rectangle(event_x, event_y, event_x, event_y, dash=(3, 5))
+    project_manager.canvas.tag_raise(rectangle_id, "all")
+    project_manager.canvas.bind("<B1-Motion>", lambda event: _draw_rubber_band(event, rectangle_id, event_x, event_y))
+    project_manager.canvas.bind("<ButtonRelease-1>", lambda event: _end_rubber_band(rectangle_id))
+
+
+def _draw_rubber_band(event, rectangle_id, start_x, start_y) -> None:
+    [event_x, event_y] = canvas_editing.translate_window_event_coordinates_in_exact_canvas_coordinates(event)
+    project_manager.canvas.coords(rectangle_id, start_x, start_y, event_x, event_y)
+
+
+def _end_rubber_band(rectangle_id) -> None:
+    project_manager.canvas.unbind("<B1-Motion>")
+    project_manager.canvas.unbind("<ButtonRelease-1>")
+    rubber_band = project_manager.canvas.coords(rectangle_id)
+    project_manager.canvas.delete(rectangle_id)
+    project_manager.window_culling.show_all_windows()  # Hidden windows are not found by find_enclosed.
+    for canvas_id in project_manager.canvas.find_enclosed(*rubber_band):
+        selectable_id = _get_selectable_id(canvas_id)
+        if selectable_id is not None and selectable_id not in _selected_ids:
+            toggle(selectable_id)
+    project_manager.window_culling.update_after_idle()
+
+
+def _get_selectable_id(canvas_id):
+    item_type = project_manager.canvas.type(canvas_id)
+    tags = project_manager.canvas.gettags(canvas_id)
+    if item_type == "oval" or (item_type == "rectangle" and canvas_id in connector.ConnectorInstance.ref_dict):
+        return canvas_id
+    if item_type == "polygon" and "reset_entry" in tags:
+        return canvas_id
+    if item_type == "text" and tags and tags[0].startswith("state") and tags[0].endswith("_name"):
+        return project_manager.canvas.find_withtag(tags[0][:-5])[0]
+    if item_type == "text" and "reset_text" in tags:
+        return project_manager.canvas.find_withtag("reset_entry")[0]
+    if item_type == "window" and _get_window_ref(canvas_id) is not None:
+        return canvas_id
+    return None
+
+
+def _get_window_ref(window_id):
+    for ref_dict in (
+        state_action.StateAction.ref_dict,
+        state_comment.StateComment.ref_dict,
+        condition_action.ConditionAction.ref_dict,
+        global_actions_clocked.GlobalActionsClocked.ref_dict,
+        global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict,
+        state_actions_default.StateActionsDefault.ref_dict,
+    ):
+        if window_id in ref_dict:
+            return ref_dict[window_id]
+    return None
+
+
+def _show_selection_marker(canvas_id, selected) -> None:
+    item_type = project_manager.canvas.type(canvas_id)
+    if item_type == "window":
+        ref = _get_window_ref(canvas_id)
+        if ref is not None:
+            if selected:
+                ref.activate_window()
+            else:
+                ref.deactivate_window()
+    elif item_type == "oval":
+        project_manager.canvas.itemconfigure(canvas_id, outline=constants.SELECTION_COLOR if selected else "blue")
+    elif item_type == "rectangle":
+        project_manager.canvas.itemconfigure(canvas_id, outline=constants.SELECTION_COLOR if selected else "black")
+    elif item_type == "polygon":
+        project_manager.canvas.itemconfigure(canvas_id, outline=constants.SELECTION_COLOR if selected else "orange")
+
+
+class GroupMove:
+    """
+    Moves all selected objects by one Canvas move-command per mouse motion.
+    Only the lines which connect a selected object with a not selected object are adapted point by point.
+    """
+
+    active = False
+
+    def __init__(self, widget) -> None:
+        GroupMove.active = True
+        self.widget = widget
+        self.start_x, self.start_y = _get_pointer_canvas_coordinates()
+        self.delta_x = self.delta_y = 0
+        self.moved_ids = []  # states and connectors, which must be updated in the spatial index.
+        self.window_ids = []
+        self.partly_moved_lines = []  # [line_tag, index of the moved x-coordinate]
+        self.moved_transition_ids = []
+        self._tag_the_items_to_move()
+        self.funcid_motion = self.widget.bind("<B1-Motion>", lambda event: self._motion())
+        self.funcid_release = self.widget.bind("<ButtonRelease-1>", lambda event: self._release())
+
+    def _tag_the_items_to_move(self) -> None:
+        moved_points = {}  # line_tag -> set of moved line ends
+        for canvas_id in _selected_ids:
+            project_manager.canvas.addtag_withtag(_GROUP_MOVE_TAG, canvas_id)
+            tags = project_manager.canvas.gettags(canvas_id)
+            item_type = project_manager.canvas.type(canvas_id)
+            if item_type == "oval":
+                project_manager.canvas.addtag_withtag(_GROUP_MOVE_TAG, tags[0] + "_name")
+            elif item_type == "polygon":
+                project_manager.canvas.addtag_withtag(_GROUP_MOVE_TAG, "reset_text")
+            elif item_type == "window":
+                self.window_ids.append(canvas_id)
+            if item_type in ("oval", "rectangle"):
+                self.moved_ids.append(canvas_id)
+            for tag in tags:
+                if tag.endswith("_start"):
+                    moved_points.setdefault(tag[:-6], set()).add("start")
+                elif tag.endswith("_end"):
+                    moved_points.setdefault(tag[:-4], set()).add("end")
+        for line_tag, points in moved_points.items():
+            line_ids = project_manager.canvas.find_withtag(line_tag)
+            if not line_ids:
+                continue
+            if line_tag.startswith("transition"):
+                self.moved_transition_ids.append([line_ids[0], "start" if len(points) == 1 else ""])
+            if len(points) == 2:
+                project_manager.canvas.addtag_withtag(_GROUP_MOVE_TAG, line_tag)
+                if line_tag.startswith("transition"):
+                    project_manager.canvas.addtag_withtag(_GROUP_MOVE_TAG, line_tag + "rectangle")
+                    project_manager.canvas.addtag_withtag(_GROUP_MOVE_TAG, line_tag + "priority")
+            else:
+                if line_tag.startswith("transition"):
+                    transition.TransitionLine.extend_transition_to_state_middle_points(line_tag)
+                self.partly_moved_lines.append([line_tag, 0 if "start" in points else -2])
+
+    def _motion(self) -> None:
+        event_x, event_y = _get_pointer_canvas_coordinates()
+        self._move_by(event_x - self.start_x - self.delta_x, event_y - self.start_y - self.delta_y)
+
+    def _move_by(self, step_x, step_y) -> None:
+        if step_x == 0 and step_y == 0:
+            return
+        project_manager.canvas.move(_GROUP_MOVE_TAG, step_x, step_y)
+        for line_tag, index in self.partly_moved_lines:
+            line_coords = project_manager.canvas.coords(line_tag)
+            line_coords[index] += step_x
+            line_coords[index + 1] += step_y
+            project_manager.canvas.coords(line_tag, line_coords)
+        self.delta_x += step_x
+        self.delta_y += step_y
+
+    def _release(self) -> None:
+        event_x, event_y = _get_pointer_canvas_coordinates()
+        self.finish(event_x - self.start_x, event_y - self.start_y)
+
+    def finish(self, pointer_delta_x, pointer_delta_y) -> None:
+        """Moves the group by the distance the pointer was moved (rounded to the grid) and ends the group move."""
+        self.widget.unbind("<B1-Motion>", self.funcid_motion)
+        self.widget.unbind("<ButtonRelease-1>", self.funcid_release)
+        # Keep all states and connectors at the grid:
+        grid_delta_x = project_manager.state_radius * round(pointer_delta_x / project_manager.state_radius)
+        grid_delta_y = project_manager.state_radius * round(pointer_delta_y / project_manager.state_radius)
+        self._move_by(grid_delta_x - self.delta_x, grid_delta_y - self.delta_y)
+        for canvas_id in self.moved_ids:
+            spatial_index.update(canvas_id, project_manager.canvas.coords(canvas_id))
+        if self._group_overlaps_other_objects():
+            self._move_by(-self.delta_x, -self.delta_y)
+            for canvas_id in self.moved_ids:
+                spatial_index.update(canvas_id, project_manager.canvas.coords(canvas_id))
+        project_manager.canvas.dtag(_GROUP_MOVE_TAG, _GROUP_MOVE_TAG)
+        move_list = self.moved_transition_ids + [[window_id, ""] for window_id in self.window_ids]
+        move_handling_finish.move_finish_for_transitions(move_list)
+        GroupMove.active = False
+        if self.delta_x != 0 or self.delta_y != 0:
+            undo_handling.design_has_changed()
+
+    def _group_overlaps_other_objects(self) -> bool:
+        for canvas_id in self.moved_ids:
+            bbox = spatial_index.get_bbox(canvas_id)
+            if any(overlapping_id not in _selected_ids for overlapping_id in spatial_index.find_overlapping(*bbox)):
+                return True
+        return False
+
+
+def _get_pointer_canvas_coordinates() -> list:
+    # The pointer position is used, because the events of windows have coordinates relative to the window.
+    canvas = project_manager.canvas
+    return [
+        canvas.canvasx(canvas.winfo_pointerx() - canvas.winfo_rootx()),
+        canvas.canvasy(canvas.winfo_pointery() - canvas.winfo_rooty()),
+    ]
@@ -0,0 +1,83 @@
+"""
+A uniform grid index of the states and connectors of the diagram.
+It answers proximity checks during moving without asking the Canvas (every Canvas access is a Tcl round trip).
+"""
+
+import math
+
+
+class SpatialIndex:
+    """
+    Stores the bounding box of each state and connector in all grid cells the box touches.
+    The index must be updated by each code which changes the coordinates of a state or connector.
+    """
+
+    def __init__(self, cell_size=80.0) -> None:
+        self.cell_size = cell_size
+        self.bbox_dict: dict[int, tuple] = {}  # canvas_id -> (x0, y0, x1, y1)
+        self.kind_dict: dict[int, str] = {}  # canvas_id -> "state" or "connector"
+        self.cell_dict: dict[tuple, set] = {}  # (column, row) -> set of canvas_ids
+
+    def clear(self) -> None:
+        self.bbox_dict.clear()
+        self.kind_dict.clear()
+        self.cell_dict.clear()
+
+    def insert(self, canvas_id, kind, bbox) -> None:
+        self.kind_dict[canvas_id] = kind
+        self.bbox_dict[canvas_id] = tuple(bbox)
+        for cell in self._get_cells(bbox):
+            self.cell_dict.setdefault(cell, set()).add(canvas_id)
+
+    def update(self, canvas_id, bbox) -> None:
+        if canvas_id in self.kind_dict:
+            kind = self.kind_dict[canvas_id]
+            self.remove(canvas_id)
+            self.insert(canvas_id, kind, bbox)
+
+    def remove(self, canvas_id) -> None:
+        bbox = self.bbox_dict.pop(canvas_id, None)
+        self.kind_dict.pop(canvas_id, None)
+        if bbox is None:
+            return
+        for cell in self._get_cells(bbox):
+            ids_in_cell = self.cell_dict.get(cell)
+            if ids_in_cell is not None:
+                ids_in_cell.discard(canvas_id)
+                if not ids_in_cell:
+                    del self.cell_dict[cell]
+
+    def scale(self, factor) -> None:
+        """Must be called when the canvas is scaled by canvas.scale("all", 0, 0, factor, factor)."""
+        old_bbox_dict = self.bbox_dict
+        old_kind_dict = self.kind_dict
+        self.bbox_dict, self.kind_dict, self.cell_dict = {}, {}, {}
+        self.cell_size *= factor
+        for canvas_id, bbox in old_bbox_dict.items():
+            self.insert(canvas_id, old_kind_dict[canvas_id], [coord * factor for coord in bbox])
+
+    def get_bbox(self, canvas_id):
+        return self.bbox_dict.get(canvas_id)
+
+    def get_kind(self, canvas_id):
+        return self.kind_dict.get(canvas_id)
+
+    def find_overlapping(self, x0, y0, x1, y1) -> list:
+        """Returns the canvas ids of all indexed items whose bounding box overlaps the rectangle."""
+        hits = set()
+        for cell in self._get_cells((x0, y0, x1, y1)):
+            for canvas_id in self.cell_dict.get(cell, ()):
+                bbox = self.bbox_dict[canvas_id]
+                if bbox[0] <= x1 and bbox[2] >= x0 and bbox[1] <= y1 and bbox[3] >= y0:
+                    hits.add(canvas_id)
+        return list(hits)
+
+    def _get_cells(self, bbox) -> list:
+        column_min = math.floor(bbox[0] / self.cell_size)
+        column_max = math.floor(bbox[2] / self.cell_size)
+        row_min = math.floor(bbox[1] / self.cell_size)
+        row_max = math.floor(bbox[3] / self.cell_size)
+        return [(column, row) for column in range(column_min, column_max + 1) for row in range(row_min, row_max + 1)]
+
+
+spatial_index = SpatialIndex()
@@ -0,0 +1,78 @@
+"""
+This module measures the time needed for importing the modules and for constructing the GUI at startup.
+It is only active when HDL-FSM-Editor is started with the switch --startup-profile.
+"""
+
+import builtins
+import contextlib
+import sys
+import time
+
+_MAX_NUMBER_OF_REPORTED_IMPORTS = 40
+
+_enabled = False
+_original_import = builtins.__import__
+_import_depth = 0
+_import_records = []  # (depth, module name, inclusive time in s), in the order the imports have finished
+_construction_records = []  # (name, time in s)
+_start_time = time.perf_counter()
+
+
+def enable() -> None:
+    """Starts measuring all imports of modules, which were not imported before."""
+    global _enabled, _start_time
+    _enabled = True
+    _start_time = time.perf_counter()
+    builtins.__import__ = _timed_import
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextlib.contextmanager
+def measure(name):
+    """Measures the time needed by the body of the with-statement, when profiling is enabled."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _construction_records.append((name, time.perf_counter() - start))
+
+
+def report() -> None:
+    """Prints all measured times and stops measuring."""
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    builtins.__import__ = _original_import
+    print("\nStartup profile (times in ms):")
+    print("Construction:")
+    for name, duration in _construction_records:
+        print(f"{duration * 1000:10.1f}  {name}")
+    print("Imports (inclusive time, slowest first):")
+    slowest_imports = sorted(_import_records, key=lambda record: record[2], reverse=True)
+    for depth, module_name, duration in slowest_imports[:_MAX_NUMBER_OF_REPORTED_IMPORTS]:
+        print(f"{duration * 1000:10.1f}  {'  ' * depth}{module_name}")
+    total_import_time = sum(duration for depth, _, duration in _import_records if depth == 0)
+    print(f"{total_import_time * 1000:10.1f}  all imports ({len(_import_records)} modules)")
+    print(f"{(time.perf_counter() - _start_time) * 1000:10.1f}  startup until first idle")
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):  # noqa: A002
+    global _import_depth
+    # Only imports which load new modules are recorded (for example "from codegen import hdl_generation"):
+    number_of_modules = len(sys.modules)
+    start = time.perf_counter()
+    _import_depth += 1
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_depth -= 1
+        if len(sys.modules) != number_of_modules:
+            module_name = name if not fromlist or fromlist[0] == "*" else name + "." + ",".join(fromlist)
+            _import_records.append((_import_depth, module_name, time.perf_counter() - start))
@@ -6,8 +6,8 @@ from tkinter.filedialog import askdirectory, askopenfilename
 import constants
 import undo_handling
 from constants import GuiTab
-from dialogs.color_changer import ColorChanger
 from project_manager import project_manager
+from search_index import search_index
 
 
 class TabControl:
@@ -105,7 +105,7 @@ class TabControl:
         _compile_cmd_docu = ttk.Label(
             control_frame,
             text="Variables for compile command:\n$file1\t= Entity-File\n$file2\t= Architecture-File\n$file\t\
-= File with Entity and Architecture\n$name\t= Module Name",
+= File with Entity and Architecture\n$name\t= Module Name\nCommands separated by & run in parallel.",
             padding=5,
         )
         project_manager.compile_cmd_docu = _compile_cmd_docu
@@ -174,6 +174,8 @@ class TabControl:
             {"stringvar": additional_sources_value, "entry": _additional_sources_entry},
             {"stringvar": working_directory_value, "entry": _working_directory_entry},
         ]
+        for entry_widget_info in project_manager.entry_widgets:
+            search_index.watch_entry(entry_widget_info["stringvar"])
 
     def switch_language_mode(self) -> None:  # also called from file_handling.py
         new_language = project_manager.language.get()
@@ -203,7 +205,7 @@ class TabControl:
             project_manager.compile_cmd.set("ghdl -a $file1 $file2; ghdl -e $name; ghdl -r $name")
             project_manager.compile_cmd_docu.config(
                 text="Variables for compile command:\n$file1\t= Entity-File\n$file2\t= Architecture-File\n$file\t\
-    = File with Entity and Architecture\n$name\t= Entity Name"
+    = File with Entity and Architecture\n$name\t= Entity Name\nCommands separated by & run in parallel."
             )
         else:  # "Verilog" or "SystemVerilog"
             project_manager.highlight_dict_ref.highlight_dict = constants.VERILOG_HIGHLIGHT_PATTERN_DICT
@@ -239,7 +241,8 @@ class TabControl:
             else:
                 project_manager.compile_cmd.set("iverilog -g2012 -o $name $file; vvp $name")
             project_manager.compile_cmd_docu.config(
-                text="Variables for compile command:\n$file\t= Module-File\n$name\t= Module Name"
+                text="Variables for compile command:\n$file\t= Module-File\n$name\t= Module Name\n"
+                "Commands separated by & run in parallel."
             )
 
     def _show_path_has_changed(self) -> None:
@@ -283,6 +286,8 @@ class TabControl:
             )
 
     def choose_bg_color(self) -> None:  # also called from canvas_editing.py
+        from dialogs.color_changer import ColorChanger  # Dialogs are imported at first use.
+
         new_color = ColorChanger(project_manager.canvas.cget("bg")).ask_color()
         if new_color is not None:
             project_manager.canvas.configure(bg=new_color)
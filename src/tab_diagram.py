@@ -6,7 +6,9 @@ import canvas_editing
 import canvas_modify_bindings
 import grid_drawing
 import move_handling_initialization
+import selection
 import undo_handling
+import window_culling
 from constants import GuiTab
 from project_manager import project_manager
 from widgets.option_menu import OptionMenu
@@ -88,6 +90,7 @@ class TabDiagram:
         view_area_button = ttk.Button(button_frame, text="view area", style="View.TButton")
         plus_button = ttk.Button(button_frame, text="+", style="View.TButton")
         minus_button = ttk.Button(button_frame, text="-", style="View.TButton")
+        auto_layout_button = ttk.Button(button_frame, text="auto layout", style="View.TButton")
 
         # Layout of the button area:
         new_state_button.grid(row=0, column=0)
@@ -100,6 +103,7 @@ class TabDiagram:
         view_area_button.grid(row=0, column=7)
         plus_button.grid(row=0, column=8)
         minus_button.grid(row=0, column=9)
+        auto_layout_button.grid(row=0, column=10)
         button_frame.columnconfigure(4, weight=1)
         button_frame.columnconfigure(5, weight=1)
 
@@ -118,10 +122,14 @@ class TabDiagram:
         view_all_button.config(command=canvas_editing.view_all)
         plus_button.config(command=canvas_editing.zoom_plus)
         minus_button.config(command=canvas_editing.zoom_minus)
+        auto_layout_button.config(command=self._auto_layout)
 
         canvas.bind_all("<Delete>", lambda event: canvas_delete.CanvasDelete())
         canvas.bind("<Home>", lambda event: canvas_editing.view_all())
         canvas.bind("<Button-1>", move_handling_initialization.move_initialization)
+        canvas.bind("<Shift-Button-1>", selection.shift_click)
+        canvas.bind("<FocusOut>", lambda event: selection.focus_out())
+        canvas.bind("<Control-d>", lambda event: selection.duplicate())
         canvas.bind("<Motion>", canvas_delete.CanvasDelete.store_mouse_position)
         canvas.bind("<Control-MouseWheel>", canvas_editing.zoom_wheel)  # MouseWheel used at Windows.
         canvas.bind("<Control-Button-4>", canvas_editing.zoom_wheel)  # MouseWheel-Scroll-Up used at Linux.
@@ -138,16 +146,19 @@ class TabDiagram:
         self._create_font_for_state_names()
         grid_drawer = grid_drawing.GridDraw(canvas)
         project_manager.grid_drawer = grid_drawer
+        project_manager.window_culling = window_culling.WindowCulling(canvas)
 
     def _scroll_xview(self, *args) -> None:
         project_manager.grid_drawer.remove_grid()
         project_manager.canvas.xview(*args)
         project_manager.grid_drawer.draw_grid()
+        project_manager.window_culling.update_after_idle()
 
     def _scroll_yview(self, *args) -> None:
         project_manager.grid_drawer.remove_grid()
         project_manager.canvas.yview(*args)
         project_manager.grid_drawer.draw_grid()
+        project_manager.window_culling.update_after_idle()
 
     def _scroll_start(self, event) -> None:
         project_manager.grid_drawer.remove_grid()
@@ -158,6 +169,7 @@ class TabDiagram:
 
     def _scroll_end(self, _event) -> None:
         project_manager.grid_drawer.draw_grid()
+        project_manager.window_culling.update_after_idle()
 
     @classmethod
     def scroll_wheel(cls, event) -> None:
@@ -175,10 +187,17 @@ class TabDiagram:
         dx, dy = (delta, 0) if scroll_direction == "x" else (0, delta)
         project_manager.canvas.scan_dragto(int(event.x + dx), int(event.y + dy), gain=1)
         project_manager.grid_drawer.draw_grid()
+        project_manager.window_culling.update_after_idle()
+
+    def _auto_layout(self) -> None:
+        import auto_layout  # Imported at first use, as it is only needed by this button.
+
+        auto_layout.layout_diagram()
 
     def _check_for_window_resize(self, _) -> None:
         project_manager.grid_drawer.remove_grid()
         project_manager.grid_drawer.draw_grid()
+        project_manager.window_culling.update_after_idle()
 
     def _create_font_for_state_names(self) -> None:
         project_manager.state_name_font = font.Font(font="TkDefaultFont")
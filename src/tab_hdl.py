@@ -1,3 +1,4 @@
+import difflib
 import re
 import tkinter as tk
 from tkinter import ttk
@@ -5,37 +6,89 @@ from tkinter import ttk
 import custom_text
 from codegen import hdl_generation
 from codegen.hdl_generation_config import GenerationConfig
-from constants import GuiTab
+from hdl_preview import hdl_preview
 from project_manager import project_manager
+from viewport_highlighting import ViewportHighlighter
+from widgets.line_number_gutter import LineNumberGutter
 
 
 class TabHDL:
     """Module for creating and managing the HDL Notebook Tab."""
 
-    def __init__(self) -> None:
+    def __init__(self, hdl_frame) -> None:
+        """The hdl_frame is the (empty) frame, which was added to the notebook by NotebookTop."""
         self._line_number_under_pointer_hdl_tab: int = 0
         self._func_id_jump: str | None = None
+        self._shown_lines: list[str] = []  # The lines (with returns) of the HDL shown in the text.
 
-        hdl_frame = ttk.Frame(project_manager.notebook)
-        hdl_frame.grid()
-        hdl_frame.columnconfigure(0, weight=1)
+        hdl_frame.columnconfigure(1, weight=1)
         hdl_frame.rowconfigure(0, weight=1)
 
         hdl_frame_text = custom_text.CustomText(hdl_frame, text_type="generated", undo=False, font=("Courier", 10))
         project_manager.hdl_frame_text = hdl_frame_text
-        hdl_frame_text.grid(row=0, column=0, sticky="nsew")
+        hdl_frame_text.grid(row=0, column=1, sticky="nsew")
         hdl_frame_text.columnconfigure((0, 0), weight=1)
         hdl_frame_text.config(state=tk.DISABLED)
 
         hdl_frame_text_scroll = ttk.Scrollbar(
             hdl_frame, orient=tk.VERTICAL, cursor="arrow", command=hdl_frame_text.yview
         )
-        hdl_frame_text.config(yscrollcommand=hdl_frame_text_scroll.set)
-        hdl_frame_text_scroll.grid(row=0, column=1, sticky="nsew")
+        self._hdl_frame_text_scroll = hdl_frame_text_scroll
+        hdl_frame_text.config(yscrollcommand=self._scroll)
+        hdl_frame_text_scroll.grid(row=0, column=2, sticky="nsew")
+
+        # The line numbers are not part of the text, they restart at the first line of the architecture file:
+        self._gutter = LineNumberGutter(hdl_frame, hdl_frame_text)
+        self._gutter.set_line_number_function(self._get_line_number_in_file)
+        self._gutter.grid(row=0, column=0, sticky="ns")
+
+        self._highlighter = ViewportHighlighter(hdl_frame_text)
 
         hdl_frame_text.bind("<Motion>", self._cursor_move_hdl_tab)
 
-        project_manager.notebook.add(hdl_frame, sticky="nsew", text=GuiTab.GENERATED_HDL.value)
+    def show_hdl(self, hdl) -> None:
+        """
+        Only the lines which differ from the shown HDL are replaced, so the scroll position and the
+        highlighting of the unchanged lines are kept. The changed lines are flagged in the line number gutter.
+        """
+        new_lines = hdl.splitlines(keepends=True)
+        if not self._shown_lines or not new_lines:
+            opcodes = [("replace", 0, len(self._shown_lines), 0, len(new_lines))]
+            changed_lines = set()
+        else:
+            opcodes = difflib.SequenceMatcher(None, self._shown_lines, new_lines, autojunk=False).get_opcodes()
+            changed_lines = {
+                line_number
+                for operation, _, _, first, last in opcodes
+                if operation != "equal"
+                for line_number in range(first + 1, max(last, first + 1) + 1)
+            }
+        project_manager.hdl_frame_text.config(state=tk.NORMAL)
+        # Replacing from the end keeps the line numbers of the hunks before valid:
+        for operation, old_first, old_last, first, last in reversed(opcodes):
+            if operation != "equal":
+                project_manager.hdl_frame_text.delete(f"{old_first + 1}.0", f"{old_last + 1}.0")
+                project_manager.hdl_frame_text.insert(f"{old_first + 1}.0", "".join(new_lines[first:last]))
+        project_manager.hdl_frame_text.config(state=tk.DISABLED)
+        self._shown_lines = new_lines
+        if changed_lines:
+            self._highlighter.update_highlighting(
+                [(first + 1, last + 1) for operation, _, _, first, last in opcodes if operation != "equal"]
+            )
+        else:
+            self._highlighter.update_highlighting()
+        self._gutter.set_flagged_lines(changed_lines)
+
+    def _scroll(self, *args) -> None:
+        # The highlighting and the line numbers follow the scrolling:
+        self._hdl_frame_text_scroll.set(*args)
+        self._highlighter.highlight_visible_lines_after_idle()
+        self._gutter.redraw_after_idle()
+
+    def _get_line_number_in_file(self, line_number) -> str:
+        if line_number > hdl_generation.last_line_number_of_file1 > 0:
+            return str(line_number - hdl_generation.last_line_number_of_file1)
+        return str(line_number)
 
     def _cursor_move_hdl_tab(self, *_) -> None:
         if project_manager.hdl_frame_text.get("1.0", tk.END + "- 1 char") == "":
@@ -51,21 +104,20 @@ class TabHDL:
         # Check if cursor is on a different line than before:
         if line_number != self._line_number_under_pointer_hdl_tab:
             project_manager.hdl_frame_text.tag_delete("underline")  # remove previous underline
-            config = GenerationConfig.from_main_window()
-            if line_number > hdl_generation.last_line_number_of_file1:
-                # Cursor is in file 2 (architecture file)
-                line_number_in_file = line_number - hdl_generation.last_line_number_of_file1
-                selected_file = config.get_architecture_file()
-                start_index = project_manager.size_of_file2_line_number
-            else:
-                line_number_in_file = line_number
-                selected_file = config.get_primary_file()
-                start_index = project_manager.size_of_file1_line_number
-            while project_manager.hdl_frame_text.get(f"{line_number}.{start_index - 1}") == " ":
-                start_index += 1  # leading blanks shall not be underlined
+            if hdl_preview.links_are_outdated:
+                # Creating the links runs the HDL generation, so it is done only when the user follows a link:
+                self._func_id_jump = project_manager.hdl_frame_text.bind(
+                    "<Control-Button-1>", lambda event: self._update_links_and_jump(line_number)
+                )
+                self._line_number_under_pointer_hdl_tab = line_number
+                return
+            selected_file, line_number_in_file = self._get_file_and_line_number(line_number)
             if project_manager.link_dict_ref.has_link(selected_file, line_number_in_file):
+                # Leading blanks shall not be underlined:
+                content_of_line = project_manager.hdl_frame_text.get(f"{line_number}.0", f"{line_number}.end")
+                start_index = len(content_of_line) - len(content_of_line.lstrip(" "))
                 project_manager.hdl_frame_text.tag_add(  # add tag for all characters until end of line
-                    "underline", f"{line_number}.{start_index - 1}", f"{line_number + 1}.0"
+                    "underline", f"{line_number}.{start_index}", f"{line_number + 1}.0"
                 )
                 project_manager.hdl_frame_text.tag_config("underline", underline=1)  # activate underline
                 self._func_id_jump = project_manager.hdl_frame_text.bind(  # Bind to text widget
@@ -74,6 +126,21 @@ class TabHDL:
                 )
             else:
                 # For this line no link exists:
-                project_manager.hdl_frame_text.unbind("<Button-1>", self._func_id_jump)
+                project_manager.hdl_frame_text.unbind("<Control-Button-1>", self._func_id_jump)
                 self._func_id_jump = None
             self._line_number_under_pointer_hdl_tab = line_number
+
+    def _get_file_and_line_number(self, line_number) -> tuple:
+        config = GenerationConfig.from_main_window()
+        if line_number > hdl_generation.last_line_number_of_file1:
+            # Line is in file 2 (architecture file)
+            return config.get_architecture_file(), line_number - hdl_generation.last_line_number_of_file1
+        return config.get_primary_file(), line_number
+
+    def _update_links_and_jump(self, line_number) -> None:
+        hdl_preview.update_links_if_outdated()
+        self._line_number_under_pointer_hdl_tab = 0  # So the line under the pointer is underlined with the new links.
+        self._cursor_move_hdl_tab()
+        selected_file, line_number_in_file = self._get_file_and_line_number(line_number)
+        if project_manager.link_dict_ref.has_link(selected_file, line_number_in_file):
+            project_manager.link_dict_ref.jump_to_source(selected_file, line_number_in_file)
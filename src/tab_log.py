@@ -1,25 +1,27 @@
-import re
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+import compile_handling
 import custom_text
 import undo_handling
 from constants import GuiTab
+from dialogs.log_messages import LogMessagesPanel
 from dialogs.regex_dialog import RegexDialog
+from log_message_index import log_message_index
 from project_manager import project_manager
 
 
 class TabLog:
     """Module for creating and managing the Log Notebook Tab."""
 
-    def __init__(self) -> None:
+    def __init__(self, log_frame) -> None:
+        """The log_frame is the (empty) frame, which was added to the notebook by NotebookTop."""
         self._debug_active = False
         self._regex_error_happened = False
         self._line_number_under_pointer_log_tab: int = 0
+        self._line_number_of_current_message: int = 0
         self._func_id_jump1 = None
         self._func_id_jump2 = None
-        log_frame = ttk.Frame(project_manager.notebook)
-        log_frame.grid()
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(1, weight=1)
 
@@ -41,6 +43,33 @@ class TabLog:
         log_frame_regex_button.grid(row=0, column=1, sticky=tk.W)
         log_frame_regex_button.config(command=self._edit_regex)
 
+        stop_compile_button = ttk.Button(
+            log_frame_button_frame, takefocus=False, text="Stop", style="Find.TButton", state=tk.DISABLED
+        )
+        stop_compile_button.grid(row=0, column=2, sticky=tk.W)
+        stop_compile_button.config(command=compile_handling.stop_compile)
+        project_manager.stop_compile_button = stop_compile_button
+
+        previous_message_button = ttk.Button(
+            log_frame_button_frame, takefocus=False, text="Previous Error", style="Find.TButton"
+        )
+        previous_message_button.grid(row=0, column=3, sticky=tk.W)
+        previous_message_button.config(command=lambda: self._show_next_message(forward=False))
+
+        next_message_button = ttk.Button(
+            log_frame_button_frame, takefocus=False, text="Next Error", style="Find.TButton"
+        )
+        next_message_button.grid(row=0, column=4, sticky=tk.W)
+        next_message_button.config(command=lambda: self._show_next_message(forward=True))
+
+        message_list_button = ttk.Button(
+            log_frame_button_frame, takefocus=False, text="Message List", style="Find.TButton"
+        )
+        message_list_button.grid(row=0, column=5, sticky=tk.W)
+        message_list_button.config(
+            command=lambda: LogMessagesPanel.show(log_message_index.get_all_messages(), self._show_message)
+        )
+
         log_frame_text_scroll = ttk.Scrollbar(
             log_frame, orient=tk.VERTICAL, cursor="arrow", command=log_frame_text.yview
         )
@@ -49,7 +78,6 @@ class TabLog:
 
         log_frame_text.bind("<Motion>", self._cursor_move_log_tab)
 
-        project_manager.notebook.add(log_frame, sticky="nsew", text=GuiTab.COMPILE_MSG.value)
         self._debug_active = tk.IntVar()
         self._debug_active.set(1)  # 1: inactive, 2: active
 
@@ -57,6 +85,9 @@ class TabLog:
         project_manager.log_frame_text.config(state=tk.NORMAL)
         project_manager.log_frame_text.delete("1.0", tk.END)
         project_manager.log_frame_text.config(state=tk.DISABLED)
+        log_message_index.clear()
+        self._line_number_under_pointer_log_tab = 0
+        self._line_number_of_current_message = 0
 
     def _edit_regex(self, *_) -> None:
         """Open the regex configuration dialog and update settings if confirmed."""
@@ -91,88 +122,75 @@ class TabLog:
 
             undo_handling.design_has_changed()
             self._regex_error_happened = False
-
-    def _cursor_move_log_tab(self, *_) -> None:
-        if project_manager.log_frame_text.get("1.0", tk.END + "- 1 char") == "":
+            log_message_index.rebuild(project_manager.log_frame_text.get("1.0", tk.END + "- 1 char"))
+            self._line_number_under_pointer_log_tab = 0
+
+    def _show_next_message(self, forward) -> None:
+        line_number = log_message_index.get_next_line_number(self._line_number_of_current_message, forward)
+        if line_number is not None:
+            self._show_message(line_number)
+
+    def _show_message(self, line_number) -> None:
+        project_manager.notebook.show_tab(GuiTab.COMPILE_MSG)
+        self._line_number_of_current_message = line_number
+        project_manager.log_frame_text.tag_remove("current_message", "1.0", tk.END)
+        project_manager.log_frame_text.tag_add("current_message", str(line_number) + ".0", str(line_number + 1) + ".0")
+        project_manager.log_frame_text.tag_config("current_message", background="yellow")
+        project_manager.log_frame_text.see(str(line_number) + ".0")
+
+    def _cursor_move_log_tab(self, event) -> None:
+        # Only the log message index is used here, so no regular expression is evaluated at a mouse motion:
+        index_string = project_manager.log_frame_text.index(f"@{event.x},{event.y}")
+        line_number = int(index_string.split(".")[0])
+        if line_number == self._line_number_under_pointer_log_tab:
             return
+        self._line_number_under_pointer_log_tab = line_number
         debug = self._debug_active.get() == 2
-        # Determine current cursor position:
-        delta_x = project_manager.log_frame_text.winfo_pointerx() - project_manager.log_frame_text.winfo_rootx()
-        delta_y = project_manager.log_frame_text.winfo_pointery() - project_manager.log_frame_text.winfo_rooty()
-        index_string = project_manager.log_frame_text.index(f"@{delta_x},{delta_y}")
-        # Determine current line number:
-        line_number = int(re.sub(r"\..*", "", index_string))
-        if line_number != self._line_number_under_pointer_log_tab and self._regex_error_happened is False:
-            project_manager.log_frame_text.tag_delete("underline")
-
-            regex_message_find = (
-                project_manager.regex_message_find_for_vhdl
-                if project_manager.language.get() == "VHDL"
-                else project_manager.regex_message_find_for_verilog
+        project_manager.log_frame_text.tag_remove("underline", "1.0", tk.END)
+        if log_message_index.get_regex() is None and not self._regex_error_happened:
+            self._regex_error_happened = True
+            messagebox.showerror("Error in HDL-FSM-Editor by regular expression", repr(log_message_index.regex_error))
+        message = log_message_index.get_message(line_number)
+        if message is None or message["file_name"] is None:
+            if debug:
+                print("Regex did not match line           : ", line_number)
+            self._unbind_jumps()
+            return
+        file_name = message["file_name"]
+        file_line_number = message["file_line_number"]
+        if debug:
+            print("Regex found line                   : ", message["text"])
+            print("Regex found filename (group 1)     :", '"' + file_name + '"')
+        if file_line_number is None:
+            if debug:
+                print("Regex found no line-number         : Getting line-number by group 2 did not work.")
+            return
+        if debug:
+            print("Regex found line-number (group 2)  :", '"' + str(file_line_number) + '"')
+        # Add the tag for coloring in red, but underline only if a link exists (for example not for ieee sources):
+        project_manager.log_frame_text.tag_add("underline", str(line_number) + ".0", str(line_number + 1) + ".0")
+        if project_manager.link_dict_ref.has_link(file_name, file_line_number):
+            if debug:
+                print("Filename and line-number are found in Link-Dictionary.")
+            project_manager.log_frame_text.tag_config("underline", underline=1, foreground="red")
+            self._func_id_jump1 = project_manager.log_frame_text.bind(
+                "<Control-Button-1>",
+                lambda event: project_manager.link_dict_ref.jump_to_source(file_name, file_line_number),
             )
+            self._func_id_jump2 = project_manager.log_frame_text.bind(
+                "<Alt-Button-1>",
+                lambda event: project_manager.link_dict_ref.jump_to_hdl(file_name, file_line_number),
+            )
+        else:
             if debug:
-                print("\nUsed Regex                         : ", regex_message_find)
-            try:
-                message_rgx = re.compile(regex_message_find)
-            except re.error as e:
-                self._regex_error_happened = True
-                messagebox.showerror("Error in HDL-FSM-Editor by regular expression", repr(e))
-                return
-
-            content_of_line = project_manager.log_frame_text.get(str(line_number) + ".0", str(line_number + 1) + ".0")
-            content_of_line = content_of_line[:-1]  # Remove return
-            if message_rgx.match(content_of_line):
-                file_name = message_rgx.sub(project_manager.regex_file_name_quote, content_of_line)
-                if debug:
-                    print("Regex found line                   : ", content_of_line)
-                    print("Regex found filename (group 1)     :", '"' + file_name + '"')
-
-                file_line_number_string = message_rgx.sub(project_manager.regex_file_line_number_quote, content_of_line)
-                if file_line_number_string != content_of_line:
-                    try:
-                        file_line_number = int(file_line_number_string)
-                    except ValueError:
-                        messagebox.showerror("Error converting line number to integer:", file_line_number_string)
-                        return
-                    if debug:
-                        print("Regex found line-number (group 2)  :", '"' + file_line_number_string + '"')
-                else:
-                    if debug:
-                        print("Regex found no line-number         : Getting line-number by group 2 did not work.")
-                    return
-
-                if project_manager.link_dict_ref.has_link(
-                    file_name, file_line_number
-                ):  # For example ieee source files are not a key in link_dict.
-                    if debug:
-                        print("Filename and line-number are found in Link-Dictionary.")
-                    project_manager.log_frame_text.tag_add(
-                        "underline", str(line_number) + ".0", str(line_number + 1) + ".0"
-                    )
-                    project_manager.log_frame_text.tag_config("underline", underline=1, foreground="red")
-                    self._func_id_jump1 = project_manager.log_frame_text.bind(
-                        "<Control-Button-1>",
-                        lambda event: project_manager.link_dict_ref.jump_to_source(file_name, file_line_number),
-                    )
-                    self._func_id_jump2 = project_manager.log_frame_text.bind(
-                        "<Alt-Button-1>",
-                        lambda event: project_manager.link_dict_ref.jump_to_hdl(file_name, file_line_number),
-                    )
-                else:
-                    if debug:
-                        print("Filename or line-number not found in Link-Dictionary.")
-                    # Add only tag (for coloring in red), but don't underline as no link exists.
-                    project_manager.log_frame_text.tag_add(
-                        "underline", str(line_number) + ".0", str(line_number + 1) + ".0"
-                    )
-
-            else:
-                if debug:
-                    print("Regex did not match line           : ", content_of_line)
-                if self._func_id_jump1 is not None:
-                    project_manager.log_frame_text.unbind("<Button-1>", self._func_id_jump1)
-                if self._func_id_jump2 is not None:
-                    project_manager.log_frame_text.unbind("<Button-1>", self._func_id_jump2)
-                self._func_id_jump1 = None
-                self._func_id_jump2 = None
-            self._line_number_under_pointer_log_tab = line_number
+                print("Filename or line-number not found in Link-Dictionary.")
+            project_manager.log_frame_text.tag_config("underline", underline=0, foreground="")
+            self._unbind_jumps()
+
+    def _unbind_jumps(self) -> None:
+        if self._func_id_jump1 is not None:
+            project_manager.log_frame_text.unbind("<Control-Button-1>", self._func_id_jump1)
+        if self._func_id_jump2 is not None:
+            project_manager.log_frame_text.unbind("<Alt-Button-1>", self._func_id_jump2)
+        self._func_id_jump1 = None
+        self._func_id_jump2 = None
@@ -8,6 +8,7 @@ import tkinter as tk
 
 import constants
 import file_handling
+import selection
 from elements import (
     condition_action,
     connector,
@@ -20,7 +21,9 @@ from elements import (
     state_comment,
     transition,
 )
+from hdl_preview import hdl_preview
 from project_manager import project_manager
+from spatial_index import spatial_index
 
 stack = []
 # Pylint expects this to be a constant with uppercase naming.
@@ -39,6 +42,8 @@ def update_window_title() -> None:
 def design_has_changed() -> None:
     _add_changes_to_design_stack()
     update_window_title()
+    project_manager.window_culling.update_after_idle()  # Windows may have been moved, added or recreated.
+    hdl_preview.design_has_changed()
     if project_manager.current_file != "" and not project_manager.root.title().startswith("unnamed"):
         # print("design_has_changed: tmp is created by =", inspect.stack()[1][3])
         file_handling.save_in_file(project_manager.current_file + ".tmp")
@@ -281,10 +286,10 @@ _line_index = 0  # pylint: disable=invalid-name # mutable loop index in parser
 def _set_diagram_to_version_selected_by_stack_pointer() -> None:
     global _line_index
     # Remove the old design:
-    state_action.StateAction.ref_dict = {}
-    condition_action.ConditionAction.ref_dict = {}
-    state_comment.StateComment.ref_dict = {}
+    file_handling.forget_design_elements()
     project_manager.canvas.delete("all")
+    spatial_index.clear()
+    selection.forget()
     project_manager.grid_drawer.draw_grid()  # must be available when transitions are raised above.
     # Bring the notebook tab with the diagram into the foreground:
     notebook_ids = project_manager.notebook.tabs()
@@ -727,6 +732,7 @@ def _set_diagram_to_version_selected_by_stack_pointer() -> None:
             condition_action_ref.action_id.grid_forget()
 
     transition.TransitionLine.hide_priority_of_single_outgoing_transitions()
+    project_manager.window_culling.update_after_idle()
 
 
 def _remove_keyword_from_line(line, keyword):
@@ -3,10 +3,10 @@ Copies the generated HDL into the HDL-tab if the HDL is younger than the hfe-fil
 """
 
 import os
-import tkinter as tk
 from tkinter import messagebox
 
 from codegen import hdl_generation
+from hdl_preview import hdl_preview
 from project_manager import project_manager
 
 
@@ -30,17 +30,15 @@ class UpdateHdlTab:
             hdlfilename = generate_path + "/" + module_name + ".v"
             hdlfilename_architecture = None
         # Compare modification time of HDL file against modification_time of design file (.hse):
-        project_manager.hdl_frame_text.config(state=tk.NORMAL)
-        project_manager.hdl_frame_text.delete("1.0", tk.END)
-        project_manager.hdl_frame_text.insert("1.0", "")
-        project_manager.hdl_frame_text.config(state=tk.DISABLED)
         hdl = ""
+        number_of_lines_of_file1 = 0
         if self.__hdl_is_up_to_date(readfile, hdlfilename, hdlfilename_architecture, show_message=False):
             # print("HDL-file exists and is 'newer' than the design-file =", self.date_of_hdl_file)
             try:
                 with open(hdlfilename, encoding="utf-8") as fileobject:
                     entity = fileobject.read()
-                hdl += self.__add_line_numbers(entity)
+                hdl += entity + "\n"  # The line numbers are shown by the gutter of the HDL tab.
+                number_of_lines_of_file1 = hdl.count("\n")
             except FileNotFoundError:
                 messagebox.showerror(
                     "Error in HDL-FSM-Editor", "File " + hdlfilename + " could not be opened for copying into HDL-Tab."
@@ -50,7 +48,7 @@ class UpdateHdlTab:
                 try:
                     with open(hdlfilename_architecture, encoding="utf-8") as fileobject:
                         arch = fileobject.read()
-                    hdl += self.__add_line_numbers(arch)
+                    hdl += arch + "\n"
                 except FileNotFoundError:
                     messagebox.showerror(
                         "Error in HDL-FSM-Editor",
@@ -58,14 +56,14 @@ class UpdateHdlTab:
                         + hdlfilename_architecture
                         + " (architecture-file) could not be opened for copying into HDL-Tab.",
                     )
-            # Create hdl without writing to file for Link-Generation:
-            hdl_generation.run_hdl_generation(write_to_file=False, is_script_mode=False)
-        project_manager.hdl_frame_text.config(state=tk.NORMAL)
-        project_manager.hdl_frame_text.insert("1.0", hdl)
-        project_manager.hdl_frame_text.config(state=tk.DISABLED)
-        project_manager.hdl_frame_text.update_highlight_tags(
-            10, ["not_read", "not_written", "control", "datatype", "function", "comment"]
-        )
+            if project_manager.tab_hdl_is_built:
+                # Create hdl without writing to file for Link-Generation:
+                hdl_generation.run_hdl_generation(write_to_file=False, is_script_mode=False)
+            else:
+                # The links are created when the HDL tab is used (as for the live preview):
+                hdl_generation.last_line_number_of_file1 = number_of_lines_of_file1 if hdlfilename_architecture else 0
+                hdl_preview.links_are_outdated = True
+        project_manager.notebook.show_hdl(hdl)
 
     def __hdl_is_up_to_date(self, path_name, hdlfilename, hdlfilename_architecture, show_message) -> bool:
         if not os.path.isfile(path_name):
@@ -107,17 +105,6 @@ class UpdateHdlTab:
             return False
         return True
 
-    def __add_line_numbers(self, text) -> str:
-        text_lines = text.split("\n")
-        text_length_as_string = str(len(text_lines))
-        number_of_needed_digits_as_string = str(len(text_length_as_string))
-        content_with_numbers = ""
-        for line_number, line in enumerate(text_lines, start=1):
-            content_with_numbers += (
-                format(line_number, "0" + number_of_needed_digits_as_string + "d") + ": " + line + "\n"
-            )
-        return content_with_numbers
-
     def get_date_of_hdl_file(self) -> float:
         return self.date_of_hdl_file
 
@@ -0,0 +1,149 @@
+"""
+Syntax highlighting for the "Generated HDL" tab, which only tags the lines near the visible area of the text.
+The highlighting of the other lines is added when they are scrolled into view.
+"""
+
+import bisect
+import collections
+import hashlib
+import re
+
+import config
+from project_manager import project_manager
+
+_BLOCK_SIZE = 200  # lines
+_MARGIN = 100  # lines above and below the visible lines, which are highlighted in advance
+_CACHE_SIZE = 4  # number of generated texts, whose tag ranges are kept
+_TAG_NAMES = ["not_read", "not_written", "control", "datatype", "function", "comment"]
+_WORD_REGEX = re.compile("[a-zA-Z0-9_]+")
+
+
+class ViewportHighlighter:
+    """
+    The tag ranges of the whole text are calculated by regular expressions in one pass (without any Tcl call)
+    and are stored per block of lines. Only the blocks near the visible area are tagged in the text widget.
+    The tag ranges are cached by a hash of the text and the highlight patterns, so that showing the same
+    HDL again (for example after a generation which did not change anything) needs no regex search at all.
+    """
+
+    def __init__(self, text_widget) -> None:
+        self.text_widget = text_widget
+        self.block_ranges = {}  # block number -> {tag name -> [start index, end index, start index, ...]}
+        self.highlighted_blocks = set()
+        self.cache = collections.OrderedDict()  # hash -> block_ranges
+        self.pattern_key = None  # The language and highlight patterns, which the tags in the text are based on.
+        self.after_id = None
+        text_widget.bind("<Configure>", lambda event: self.highlight_visible_lines_after_idle(), add="+")
+
+    def update_highlighting(self, changed_line_ranges=None) -> None:
+        """
+        Must be called after the text was replaced.
+        When only the lines in changed_line_ranges ([(first line, line after last line), ...]) were replaced,
+        the tags of the other lines are kept.
+        """
+        text = self.text_widget.get("1.0", "end - 1 chars")
+        pattern_dict = project_manager.highlight_dict_ref.highlight_pattern_dict
+        pattern_key = project_manager.language.get() + repr([pattern_dict[tag] for tag in _TAG_NAMES])
+        key = hashlib.sha1((pattern_key + text).encode()).hexdigest()
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        else:
+            self.cache[key] = _calculate_block_ranges(text, pattern_dict)
+            if len(self.cache) > _CACHE_SIZE:
+                self.cache.popitem(last=False)
+        self.block_ranges = self.cache[key]
+        self.highlighted_blocks = set()
+        if changed_line_ranges is not None and pattern_key == self.pattern_key:
+            for tag_name in _TAG_NAMES:
+                for first_line, last_line in changed_line_ranges:
+                    self.text_widget.tag_remove(tag_name, f"{first_line}.0", f"{last_line}.0")
+        else:
+            # The tags are created again in this order, as the tag created last has the highest priority:
+            for tag_name in _TAG_NAMES:
+                self.text_widget.tag_delete(tag_name)
+            for tag_name in _TAG_NAMES:
+                self.text_widget.tag_configure(
+                    tag_name, foreground=config.HIGHLIGHT_COLORS[tag_name], font=("Courier", 10, "normal")
+                )
+        self.pattern_key = pattern_key
+        self._highlight_visible_lines()
+
+    def highlight_visible_lines_after_idle(self) -> None:
+        """Must be called by the yscrollcommand of the text widget."""
+        if self.after_id is None:
+            self.after_id = self.text_widget.after_idle(self._highlight_visible_lines)
+
+    def _highlight_visible_lines(self) -> None:
+        self.after_id = None
+        if len(self.highlighted_blocks) == len(self.block_ranges):
+            return
+        first_line = int(self.text_widget.index("@0,0").split(".")[0]) - _MARGIN
+        last_line = int(self.text_widget.index(f"@0,{self.text_widget.winfo_height()}").split(".")[0]) + _MARGIN
+        for block in range(max(0, (first_line - 1) // _BLOCK_SIZE), (last_line - 1) // _BLOCK_SIZE + 1):
+            if block in self.highlighted_blocks or block not in self.block_ranges:
+                continue
+            self.highlighted_blocks.add(block)
+            for tag_name, indices in self.block_ranges[block].items():
+                self.text_widget.tag_add(tag_name, *indices)  # 1 Tcl call for all ranges of the tag in the block
+
+
+def _calculate_block_ranges(text, pattern_dict) -> dict:
+    line_starts = [0] + [match.end() for match in re.finditer("\n", text)]
+    block_ranges = {block: {} for block in range(len(line_starts) // _BLOCK_SIZE + 1)}
+
+    def add_range(tag_name, start, end) -> None:
+        start_line = bisect.bisect_right(line_starts, start) - 1
+        end_line = bisect.bisect_right(line_starts, end) - 1
+        start_index = f"{start_line + 1}.{start - line_starts[start_line]}"
+        end_index = f"{end_line + 1}.{end - line_starts[end_line]}"
+        for block in range(start_line // _BLOCK_SIZE, end_line // _BLOCK_SIZE + 1):
+            block_ranges[block].setdefault(tag_name, []).extend([start_index, end_index])
+
+    # Keywords in strings and attributes and in comments are not highlighted:
+    text = re.sub(r"'image|'length|\".*?\"|'.*?'", _blank, text, flags=re.IGNORECASE)
+    comment_regex = _compile_alternatives(pattern_dict["comment"], "", "", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+    if comment_regex is not None:
+        for match in comment_regex.finditer(text):
+            if match.end() > match.start():
+                add_range("comment", match.start(), match.end())
+        text = comment_regex.sub(_blank, text)
+    # Plain keywords are found by looking up each word of the text, other patterns by a regular expression:
+    tag_names_of_word = {}
+    for tag_name in _TAG_NAMES[:-1]:
+        other_patterns = []
+        for pattern in pattern_dict[tag_name]:
+            if _WORD_REGEX.fullmatch(pattern):
+                tag_names_of_word.setdefault(pattern.lower(), []).append(tag_name)
+            else:
+                other_patterns.append(pattern)
+        # The lookarounds prevent a hit, when the keyword is part of another word:
+        keyword_regex = _compile_alternatives(other_patterns, "(?<![a-zA-Z0-9_])", "(?![a-zA-Z0-9_])", re.IGNORECASE)
+        if keyword_regex is not None:
+            for match in keyword_regex.finditer(text):
+                if match.end() > match.start():
+                    add_range(tag_name, match.start(), match.end())
+    for match in _WORD_REGEX.finditer(text):
+        for tag_name in tag_names_of_word.get(match.group().lower(), ()):
+            add_range(tag_name, match.start(), match.end())
+    return block_ranges
+
+
+def _compile_alternatives(patterns, prefix, suffix, flags):
+    valid_patterns = []
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except re.error:  # Happens i.e. if a pattern contains "**".
+            continue
+        if pattern != "":
+            valid_patterns.append(pattern)
+    if not valid_patterns:
+        return None
+    valid_patterns.sort(key=len, reverse=True)  # Longer keywords first, for example "std_logic_vector".
+    return re.compile(
+        prefix + "(?:" + "|".join("(?:" + pattern + ")" for pattern in valid_patterns) + ")" + suffix, flags
+    )
+
+
+def _blank(match) -> str:
+    return re.sub(r"[^\n]", " ", match.group())
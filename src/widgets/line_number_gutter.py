@@ -0,0 +1,67 @@
+"""
+A line-number gutter for a tkinter.Text widget.
+
+- Shows the numbers of the visible lines only, so redrawing does not depend on the length of the text
+- The shown number of a line is given by a function, so the numbering can restart inside the text
+- Lines can be flagged by a colored marker
+"""
+
+import tkinter as tk
+from tkinter import font
+from typing import Any, Callable
+
+
+class LineNumberGutter(tk.Canvas):
+    """
+    A canvas placed left of a text widget.
+    The owner of the text widget must call redraw_after_idle() from the yscrollcommand of the text widget.
+    """
+
+    def __init__(self, master: Any, text_widget: tk.Text, text_font=("Courier", 10)) -> None:
+        super().__init__(master, width=30, highlightthickness=0, background="grey95")
+        self.text_widget = text_widget
+        self.font = font.Font(family=text_font[0], size=text_font[1])
+        self.line_number_function: Callable[[int], str] = str
+        self.flagged_lines: set[int] = set()
+        self.after_id = None
+        text_widget.bind("<Configure>", lambda event: self.redraw_after_idle(), add="+")
+
+    def set_line_number_function(self, line_number_function: Callable[[int], str]) -> None:
+        """The function gets the line number in the text widget and returns the shown string."""
+        self.line_number_function = line_number_function
+        self.redraw_after_idle()
+
+    def set_flagged_lines(self, flagged_lines: set[int]) -> None:
+        self.flagged_lines = flagged_lines
+        self.redraw_after_idle()
+
+    def redraw_after_idle(self) -> None:
+        if self.after_id is None:
+            self.after_id = self.after_idle(self.redraw)
+
+    def redraw(self) -> None:
+        self.after_id = None
+        self.delete("all")
+        last_line = int(self.text_widget.index("end - 1 chars").split(".")[0])
+        width = self.font.measure("0" * len(self.line_number_function(last_line))) + 12
+        if int(self.cget("width")) != width:
+            self.configure(width=width)
+        index = self.text_widget.index("@0,0")
+        while True:
+            line_info = self.text_widget.dlineinfo(index)
+            if line_info is None:  # The line is not visible anymore.
+                break
+            line_number = int(index.split(".")[0])
+            if line_number in self.flagged_lines:
+                self.create_rectangle(0, line_info[1], 3, line_info[1] + line_info[3], fill="orange", width=0)
+            self.create_text(
+                width - 4,
+                line_info[1],
+                anchor=tk.NE,
+                text=self.line_number_function(line_number),
+                font=self.font,
+                fill="grey40",
+            )
+            if line_number >= last_line:
+                break
+            index = str(line_number + 1) + ".0"
@@ -0,0 +1,104 @@
+"""
+This class hides the off-screen canvas windows (text boxes of the diagram) to cut the redraw cost.
+Hiding saves the mapping, configuring and redrawing of these windows at scrolling and zooming, but no memory:
+all widgets are kept, because saving, undo, the HDL generation and the checks read the texts from them.
+Replacing the off-screen windows by placeholders and reusing their widgets from a pool is not implemented.
+"""
+
+import tkinter as tk
+
+from elements import (
+    condition_action,
+    global_actions_clocked,
+    global_actions_combinatorial,
+    state_action,
+    state_actions_default,
+    state_comment,
+)
+
+
+class WindowCulling:
+    """
+    Tk maps, configures and redraws every embedded window of the canvas, even when it is far outside the
+    visible area. So all windows outside the visible area (plus a margin) are hidden and are shown again,
+    when they get near to the visible area. Hidden windows keep their widgets and their text, so all other modules
+    can still read it. The memory of the windows still grows with the size of the diagram (there is no widget pool).
+    """
+
+    margin = 200  # Pixels around the visible area, in which windows are kept visible.
+
+    def __init__(self, canvas) -> None:
+        self.canvas = canvas
+        self.active = True
+        self.hidden_window_ids = set()
+        self.update_after_id = None
+
+    def update_after_idle(self) -> None:
+        """Schedules update(), so that many viewport changes in a row (scrolling, zooming) cause only one update."""
+        if self.update_after_id is not None:
+            self.canvas.after_cancel(self.update_after_id)
+        self.update_after_id = self.canvas.after(100, self.update)
+
+    def update(self) -> None:
+        self.update_after_id = None
+        if not self.active:
+            self.show_all_windows()
+            return
+        visible_window = [
+            self.canvas.canvasx(0) - WindowCulling.margin,
+            self.canvas.canvasy(0) - WindowCulling.margin,
+            self.canvas.canvasx(self.canvas.winfo_width()) + WindowCulling.margin,
+            self.canvas.canvasy(self.canvas.winfo_height()) + WindowCulling.margin,
+        ]
+        focus_widget = _get_focus_widget(self.canvas)
+        hidden_window_ids = set()
+        for ref in _get_all_window_refs():
+            coords = self.canvas.coords(ref.window_id)
+            if not coords:
+                continue
+            # The anchor of a window may be at any side, so the requested size of the window is used
+            # as additional margin (the requested size is also known, when the window is hidden):
+            width = ref.frame_id.winfo_reqwidth()
+            height = ref.frame_id.winfo_reqheight()
+            is_near_visible_window = (
+                visible_window[0] - width < coords[0] < visible_window[2] + width
+                and visible_window[1] - height < coords[1] < visible_window[3] + height
+            )
+            if is_near_visible_window or _widget_is_inside(focus_widget, ref.frame_id):
+                if ref.window_id in self.hidden_window_ids:
+                    self.canvas.itemconfigure(ref.window_id, state=tk.NORMAL)
+            else:
+                if ref.window_id not in self.hidden_window_ids:
+                    self.canvas.itemconfigure(ref.window_id, state=tk.HIDDEN)
+                hidden_window_ids.add(ref.window_id)
+        self.hidden_window_ids = hidden_window_ids  # Ids of deleted windows are dropped here.
+
+    def show_all_windows(self) -> None:
+        """Must be called before the bounding box of all canvas items is determined, as hidden items have no bbox."""
+        for window_id in self.hidden_window_ids:
+            if self.canvas.type(window_id) == "window":  # The window may have been deleted meanwhile.
+                self.canvas.itemconfigure(window_id, state=tk.NORMAL)
+        self.hidden_window_ids.clear()
+
+
+def _get_all_window_refs() -> list:
+    return [
+        *state_action.StateAction.ref_dict.values(),
+        *state_comment.StateComment.ref_dict.values(),
+        *condition_action.ConditionAction.ref_dict.values(),
+        *global_actions_clocked.GlobalActionsClocked.ref_dict.values(),
+        *global_actions_combinatorial.GlobalActionsCombinatorial.ref_dict.values(),
+        *state_actions_default.StateActionsDefault.ref_dict.values(),
+    ]
+
+
+def _get_focus_widget(canvas):
+    try:
+        return canvas.focus_get()
+    except KeyError:  # Happens when the focus is at a popup menu, which is not known by tkinter.
+        return None
+
+
+def _widget_is_inside(widget, frame) -> bool:
+    # The window containing the keyboard focus is never hidden, as the user is editing its text.
+    return widget is not None and str(widget).startswith(str(frame))
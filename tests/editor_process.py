@@ -0,0 +1,35 @@
+"""
+Runs test scripts in a separate process, which has built the (withdrawn) main window of HDL-FSM-Editor.
+The script is executed after the GUI was created, it must print its results to STDOUT.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+TEST_INPUT_DIR = Path(__file__).parent / "test_input"
+
+needs_display = pytest.mark.skipif(
+    sys.platform.startswith("linux") and not os.environ.get("DISPLAY"), reason="needs a display"
+)
+
+_HEADER = """
+import sys
+sys.path.insert(0, {src_dir!r})
+{setup}
+import main_window
+main_window.create_gui()
+main_window.set_word_boundaries()
+from project_manager import project_manager
+"""
+
+
+def run_in_editor(script, timeout=60, setup="") -> subprocess.CompletedProcess:
+    """The setup (a single line) is executed before the GUI is created."""
+    source = _HEADER.format(src_dir=str(SRC_DIR), setup=setup) + textwrap.dedent(script)
+    return subprocess.run([sys.executable, "-c", source], capture_output=True, text=True, timeout=timeout)
@@ -0,0 +1,84 @@
+"""
+Tests of the automatic layout (src/auto_layout.py).
+"""
+
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import auto_layout
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+HFE_FILES = sorted((Path(__file__).parent / "test_input").glob("*.hfe"))
+
+
+def get_all_tags(design_dictionary) -> list:
+    tags = []
+    for element_name, definitions in design_dictionary.items():
+        if element_name in ("state", "text", "line", "polygon", "rectangle"):
+            tags += [tuple(definition[1]) for definition in definitions]
+        elif element_name.startswith("window_"):
+            tags += [tuple(definition[-1]) for definition in definitions]
+    return sorted(tags)
+
+
+@pytest.mark.batch_mode
+def test_layout_of_files(tmp_path):
+    hfe_files = [shutil.copy(hfe_file, tmp_path) for hfe_file in HFE_FILES]
+    cmd = [sys.executable, str(SRC_DIR / "main.py"), "--auto-layout", *hfe_files]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 0, f"Layout failed: {result.stdout}\n{result.stderr}"
+    for hfe_file in HFE_FILES:
+        before = json.loads(hfe_file.read_text(encoding="utf-8"))
+        after = json.loads((tmp_path / hfe_file.name).read_text(encoding="utf-8"))
+        assert get_all_tags(after) == get_all_tags(before), hfe_file.name
+        row_distance = auto_layout._ROW_DISTANCE * after["state_radius"]
+        centers = {}
+        for coords, tags, *_ in after["state"]:
+            centers[tags[0]] = ((coords[0] + coords[2]) / 2, (coords[1] + coords[3]) / 2, (coords[2] - coords[0]) / 2)
+        assert len({center[:2] for center in centers.values()}) == len(centers), hfe_file.name
+        top = min(center[1] for center in centers.values())
+        for _, y, _ in centers.values():  # All states are in rows.
+            assert round((y - top) / row_distance, 6) % 1 == 0, hfe_file.name
+        for coords, tags in after["line"]:
+            end_tag = next((tag[9:] for tag in tags if tag.startswith("going_to_")), None)
+            if end_tag in centers:  # The transition ends at the border of the state:
+                x, y, radius = centers[end_tag]
+                assert math.hypot(coords[-2] - x, coords[-1] - y) == pytest.approx(radius), hfe_file.name
+
+
+def test_rows_of_a_large_design_are_centered_and_have_no_overlapping_nodes():
+    random.seed(1)
+    number_of_nodes = 1000
+    layer = [index // 25 for index in range(number_of_nodes)]
+    edges = [(random.randrange(number_of_nodes), random.randrange(number_of_nodes)) for _ in range(3000)]
+    edges = [edge for edge in edges if edge[0] != edge[1]]
+
+    position = auto_layout._order_layers(layer, edges)
+
+    for row in range(max(layer) + 1):
+        positions_in_row = sorted(position[index] for index in range(number_of_nodes) if layer[index] == row)
+        assert positions_in_row == [rank - 12 for rank in range(25)]
+
+
+@pytest.mark.batch_mode
+@pytest.mark.skipif(sys.platform.startswith("linux") and not os.environ.get("DISPLAY"), reason="needs a display")
+def test_laid_out_design_is_generated(tmp_path):
+    hfe_file = shutil.copy(HFE_FILES[0], tmp_path)
+    subprocess.run([sys.executable, str(SRC_DIR / "main.py"), "--auto-layout", hfe_file], check=True, timeout=30)
+    cmd = [sys.executable, str(SRC_DIR / "main.py"), hfe_file, "--generate-hdl", "--no-version-check", "--no-message"]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, cwd=tmp_path)
+
+    assert result.returncode == 0, f"Generation failed: {result.stdout}\n{result.stderr}"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,74 @@
+"""
+Tests of zooming the diagram (src/canvas_editing.py), they need a display.
+"""
+
+import pytest
+
+from tests.editor_process import TEST_INPUT_DIR, needs_display, run_in_editor
+
+
+@pytest.mark.gui
+@needs_display
+def test_text_boxes_created_at_a_small_zoom_level_are_collapsed():
+    result = run_in_editor(
+        f"""
+        import canvas_editing
+        import constants
+        import file_handling
+        import undo_handling
+        from elements import (
+            condition_action,
+            global_actions_clocked,
+            global_actions_combinatorial,
+            state_action,
+            state_actions_default,
+            state_comment,
+        )
+
+        def get_number_of_shown_text_boxes():
+            number = 0
+            for element_class in (
+                state_action.StateAction,
+                state_comment.StateComment,
+                condition_action.ConditionAction,
+                global_actions_clocked.GlobalActionsClocked,
+                global_actions_combinatorial.GlobalActionsCombinatorial,
+                state_actions_default.StateActionsDefault,
+            ):
+                for ref in element_class.ref_dict.values():
+                    for attribute in ("text_id", "condition_id", "action_id", "text_before_id", "text_after_id"):
+                        text_widget = getattr(ref, attribute, None)
+                        if text_widget is not None and text_widget.winfo_manager() == "grid":
+                            number += 1
+            return number
+
+        file_handling.open_file_with_name({str(TEST_INPUT_DIR / "count10.hfe")!r}, is_script_mode=True)
+        project_manager.root.update()
+        print("opened", get_number_of_shown_text_boxes())
+        while project_manager.fontsize >= constants.MIN_READABLE_FONTSIZE:
+            canvas_editing.canvas_zoom([0, 0], 0.5)
+        canvas_editing._apply_pending_font_sizes()
+        project_manager.root.update()
+        print("zoomed_out", get_number_of_shown_text_boxes())
+        undo_handling.design_has_changed()
+        undo_handling.undo()  # Rebuilds the design with the readable font size.
+        project_manager.root.update()
+        print("undo", get_number_of_shown_text_boxes())
+        undo_handling.redo()  # Rebuilds the design with the small font size.
+        project_manager.root.update()
+        print("redo", get_number_of_shown_text_boxes())
+        while project_manager.fontsize < constants.MIN_READABLE_FONTSIZE:
+            canvas_editing.canvas_zoom([0, 0], 2)
+        canvas_editing._apply_pending_font_sizes()
+        project_manager.root.update()
+        print("zoomed_in", get_number_of_shown_text_boxes())
+        """
+    )
+
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    numbers = dict(line.split() for line in result.stdout.splitlines() if len(line.split()) == 2)
+    assert int(numbers["opened"]) > 0
+    assert numbers["zoomed_out"] == "0"
+    assert int(numbers["undo"]) > 0
+    assert numbers["redo"] == "0"
+    assert numbers["zoomed_in"] == numbers["undo"]
@@ -0,0 +1,183 @@
+"""
+Tests of the execution of the compile command (src/compile_handling.py), only the test of the log needs a display.
+"""
+
+import queue
+import shlex
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+import compile_handling
+from tests.editor_process import needs_display, run_in_editor
+
+
+@pytest.mark.parametrize(
+    ("command_string", "expected_command_groups"),
+    [
+        ("ghdl -a $file", [[["ghdl", "-a", "$file"]]]),
+        ("ghdl -a $file; ghdl -e $name", [[["ghdl", "-a", "$file"]], [["ghdl", "-e", "$name"]]]),
+        ("ghdl -a $file1 & ghdl -a $file2", [[["ghdl", "-a", "$file1"], ["ghdl", "-a", "$file2"]]]),
+        ("ghdl -a $file1&ghdl -a $file2", [[["ghdl", "-a", "$file1"], ["ghdl", "-a", "$file2"]]]),
+        ("a & b; c", [[["a"], ["b"]], [["c"]]]),
+        ('echo "a & b"', [[["echo", "a & b"]]]),
+        ("echo 'a&b' & c", [[["echo", "a&b"], ["c"]]]),
+        ('echo "x;y"; c', [[["echo", "x;y"]], [["c"]]]),
+        ('tool "C:/my dir/x.vhd"', [[["tool", "C:/my dir/x.vhd"]]]),
+        ("a && b", [[["a"], ["b"]]]),
+        ("a ;; b;", [[["a"]], [["b"]]]),
+        ("a # b", [[["a", "#", "b"]]]),
+        ("", []),
+    ],
+)
+def test_get_command_groups(command_string, expected_command_groups):
+    assert compile_handling._get_command_groups(command_string) == expected_command_groups
+
+
+def python_command(code) -> list:
+    return [sys.executable, "-c", code]
+
+
+def execute_all(command_groups) -> list:
+    output_queue = queue.Queue()
+    compile_handling._stop_requested.clear()
+    compile_handling._execute_all(command_groups, datetime.now(), output_queue)
+    return list(output_queue.queue)
+
+
+def test_worker_sends_the_lines_of_a_command_and_a_final_message():
+    command = python_command("print('a'); print(); print('b')")
+
+    messages = execute_all([[command]])
+
+    assert messages[:3] == [("line", " ".join(command) + "\n", None), ("line", "a\n", None), ("line", "b\n", None)]
+    assert messages[3][0] == "line"
+    assert messages[3][1].startswith("Finished user commands from Control-Tab after ")
+    assert messages[4] == ("finished", None, None)
+
+
+def test_worker_sends_the_output_of_each_parallel_job_as_one_block():
+    code = "import time\nfor i in range(3):\n    print({name!r}, i, flush=True)\n    time.sleep(0.05)"
+    group = [python_command(code.format(name="x")), python_command(code.format(name="y"))]
+
+    messages = execute_all([group])
+
+    blocks = [content for kind, content, _ in messages if kind == "lines"]
+    assert len(blocks) == 2
+    assert {block[0][1] for block in blocks} == {"job1", "job2"}
+    for block in blocks:
+        assert len(block) == 4  # The command and its 3 lines, which are not mixed with the lines of the other job.
+        assert len({job_tag for _, job_tag in block}) == 1
+        assert len({line.split()[0] for line, _ in block[1:]}) == 1
+
+
+def test_worker_skips_the_following_groups_after_a_missing_program():
+    messages = execute_all([[["program-which-does-not-exist"]], [python_command("print('not executed')")]])
+
+    errors = [content for kind, content, _ in messages if kind == "error"]
+    assert len(errors) == 1
+    assert errors[0].startswith("FileNotFoundError caused by compile command:\nprogram-which-does-not-exist\n")
+    assert all("not executed" not in str(content) for _, content, _ in messages)
+    assert messages[-1] == ("finished", None, None)
+
+
+def test_worker_reports_a_program_which_is_not_executable(tmp_path):
+    program = tmp_path / "not_executable"
+    program.write_text("print('x')")
+    program.chmod(0o644)
+
+    messages = execute_all([[[str(program)]]])
+
+    errors = [content for kind, content, _ in messages if kind == "error"]
+    assert len(errors) == 1
+    assert errors[0].startswith("PermissionError caused by compile command:")
+    assert messages[-1] == ("finished", None, None)
+
+
+def test_worker_reports_output_which_cannot_be_decoded():
+    messages = execute_all([[python_command("import sys; sys.stdout.buffer.write(b'ok\\n\\x81\\n')")]])
+
+    errors = [content for kind, content, _ in messages if kind == "error"]
+    assert len(errors) == 1
+    assert errors[0].startswith("UnicodeDecodeError caused by compile command:")
+    assert messages[-1] == ("finished", None, None)
+
+
+def test_worker_finishes_also_after_an_unexpected_exception(monkeypatch):
+    def raise_error(*_arguments):
+        raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(compile_handling, "_execute", raise_error)
+    output_queue = queue.Queue()
+
+    with pytest.raises(RuntimeError):
+        compile_handling._execute_all([[["a"], ["b"]]], datetime.now(), output_queue)
+
+    messages = list(output_queue.queue)
+    assert messages[-2][1].startswith("Finished user commands from Control-Tab after ")
+    assert messages[-1] == ("finished", None, None)
+
+
+def test_stop_terminates_the_running_command_and_skips_the_following_groups():
+    output_queue = queue.Queue()
+    compile_handling._stop_requested.clear()
+    command_groups = [
+        [python_command("import time; print('started', flush=True); time.sleep(30)")],
+        [python_command("print('not executed')")],
+    ]
+    worker = threading.Thread(target=compile_handling._execute_all, args=(command_groups, datetime.now(), output_queue))
+    worker.start()
+    messages = []
+    while ("line", "started\n", None) not in messages:
+        messages.append(output_queue.get(timeout=10))
+    start = time.monotonic()
+
+    compile_handling.stop_compile()
+    worker.join(timeout=10)
+
+    assert not worker.is_alive()
+    assert time.monotonic() - start < 5
+    messages.extend(output_queue.queue)
+    assert all("not executed" not in str(content) for _, content, _ in messages)
+    assert messages[-2][1].startswith("Stopped user commands from Control-Tab after ")
+    compile_handling._stop_requested.clear()
+
+
+@pytest.mark.gui
+@needs_display
+def test_log_is_filled_in_batches_and_trimmed():
+    command = shlex.join(python_command("for i in range(25000): print('line', i)"))
+    result = run_in_editor(
+        f"""
+        import compile_handling
+
+        batch_sizes = []
+        insert_lines_in_log = compile_handling._insert_lines_in_log
+        def record_batch(lines):
+            batch_sizes.append(len(lines))
+            insert_lines_in_log(lines)
+        compile_handling._insert_lines_in_log = record_batch
+        project_manager.working_directory_value.set("")
+        project_manager.compile_cmd.set({command!r})
+        compile_handling.compile_hdl()
+        while str(project_manager.stop_compile_button.cget("state")) != "disabled":
+            project_manager.root.update()
+        log = project_manager.log_frame_text.get("1.0", "end - 1 chars").split("\\n")
+        print("lines", len(log))
+        print("max_batch", max(batch_sizes))
+        print("batches", len(batch_sizes))
+        print("last", log[-3])
+        print("finished", log[-2].startswith("Finished"))
+        """
+    )
+
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    values = dict(line.split(" ", 1) for line in result.stdout.splitlines() if " " in line)
+    assert int(values["lines"]) <= compile_handling._MAX_LOG_LINES + 1
+    assert int(values["max_batch"]) <= compile_handling._MAX_LINES_PER_POLL
+    assert int(values["batches"]) > 25000 // compile_handling._MAX_LINES_PER_POLL
+    assert values["last"] == "line 24999"
+    assert values["finished"] == "True"
@@ -0,0 +1,56 @@
+"""
+Tests of the export of the diagrams as images (src/diagram_export.py), which needs no display.
+"""
+
+import json
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+TEST_INPUT_DIR = Path(__file__).parent / "test_input"
+HFE_FILES = sorted(TEST_INPUT_DIR.glob("*.hfe"))
+SVG_NAMESPACE = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.mark.batch_mode
+def test_all_diagrams_are_exported_as_svg(project_root, tmp_path):
+    cmd = [
+        sys.executable,
+        str(project_root / "src" / "main.py"),
+        "--export-svg",
+        *[str(hfe_file) for hfe_file in HFE_FILES],
+        "--export-dir",
+        str(tmp_path),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 0, f"Export failed: {result.stdout}\n{result.stderr}"
+    for hfe_file in HFE_FILES:
+        design_dictionary = json.loads(hfe_file.read_text(encoding="utf-8"))
+        svg = ET.parse(tmp_path / (hfe_file.stem + ".svg")).getroot()
+        assert len(svg.findall(SVG_NAMESPACE + "ellipse")) == len(design_dictionary["state"]), hfe_file.name
+        texts = [text.text for text in svg.findall(SVG_NAMESPACE + "text")]
+        for definition in design_dictionary["state"]:
+            state_name = next(text[2] for text in design_dictionary["text"] if text[1][0] == definition[1][0] + "_name")
+            assert state_name in texts, hfe_file.name
+
+
+@pytest.mark.batch_mode
+def test_missing_file_is_reported(project_root, tmp_path):
+    cmd = [
+        sys.executable,
+        str(project_root / "src" / "main.py"),
+        "--export-svg",
+        str(tmp_path / "missing.hfe"),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 1
+    assert "missing.hfe could not be exported" in result.stdout
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
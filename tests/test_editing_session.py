@@ -0,0 +1,117 @@
+"""
+Tests of the recording and replaying of editing sessions (src/editing_session.py), they need a display.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tests.editor_process import SRC_DIR, TEST_INPUT_DIR, needs_display, run_in_editor
+
+RECORDED_OPERATIONS = [
+    "open",
+    "rename_state",
+    "add_state_action",
+    "add_state_comment",
+    "edit_priority",
+    "straighten_transition",
+    "select",
+    "select",
+    "group_move",
+    "delete",
+    "undo",
+    "redo",
+]
+
+
+def record_session(session_file):
+    return run_in_editor(
+        f"""
+        import tkinter as tk
+
+        import canvas_delete
+        import file_handling
+        import selection
+        import undo_handling
+        from elements import state, transition
+
+        def get_ref(ref_dict, tag):
+            return ref_dict[project_manager.canvas.find_withtag(tag)[0]]
+
+        def create_entry(text):
+            entry = tk.Entry(project_manager.canvas)
+            entry.insert(0, text)
+            return entry
+
+        project_manager.root.deiconify()
+        project_manager.root.update()
+        file_handling.open_file_with_name({str(TEST_INPUT_DIR / "count10.hfe")!r}, is_script_mode=False)
+        get_ref(state.States.ref_dict, "state3")._update_state_name(create_entry("idle"))
+        get_ref(state.States.ref_dict, "state3").add_action(100, 350)
+        get_ref(state.States.ref_dict, "state3").add_comment(100, 420)
+        get_ref(transition.TransitionLine.ref_dict, "transition5")._update_priority("transition5", create_entry("3"))
+        get_ref(transition.TransitionLine.ref_dict, "transition2").straighten_shape()
+        selection.toggle(project_manager.canvas.find_withtag("state1")[0])
+        selection.toggle(project_manager.canvas.find_withtag("state3")[0])
+        selection.GroupMove(project_manager.canvas).finish(-80, 0)
+        project_manager.canvas.focus_force()
+        project_manager.root.update()
+        canvas_delete.CanvasDelete()
+        undo_handling.undo()
+        undo_handling.redo()
+        project_manager.root.update()
+        print("recorded")
+        """,
+        setup=f"import editing_session; editing_session.start_recording({str(session_file)!r})",
+    )
+
+
+def replay_session(session_file):
+    cmd = [
+        sys.executable,
+        str(SRC_DIR / "main.py"),
+        "--replay-session",
+        str(session_file),
+        "--no-version-check",
+        "--no-message",
+    ]
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+
+
+@pytest.mark.gui
+@needs_display
+def test_recorded_session_is_replayed(tmp_path):
+    session_file = tmp_path / "session.jsonl"
+    result = record_session(session_file)
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    assert "recorded" in result.stdout
+    operations = [json.loads(line) for line in session_file.read_text(encoding="utf-8").splitlines()]
+    recorded_operations = [
+        operation["operation"]
+        for operation in operations
+        if operation["operation"] not in ("session", "design_has_changed", "edit_text", "clear_selection")
+    ]
+    assert recorded_operations == RECORDED_OPERATIONS
+    assert all("design" in operation for operation in operations[1:])
+
+    result = replay_session(session_file)
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    assert "Replay of" in result.stdout
+
+
+@pytest.mark.gui
+@needs_display
+def test_replay_fails_when_the_design_differs_from_the_recorded_design(tmp_path):
+    session_file = tmp_path / "session.jsonl"
+    result = record_session(session_file)
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    operations = [json.loads(line) for line in session_file.read_text(encoding="utf-8").splitlines()]
+    # Removing the rename looks like an edit, which was not recorded:
+    operations = [operation for operation in operations if operation["operation"] != "rename_state"]
+    session_file.write_text("".join(json.dumps(operation) + "\n" for operation in operations), encoding="utf-8")
+
+    result = replay_session(session_file)
+    assert result.returncode != 0
+    assert "differs from the recorded design" in result.stdout
@@ -0,0 +1,141 @@
+"""
+Tests of the Python API for building designs and generating their HDL (src/fsm_api.py).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import fsm_api
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+needs_display = pytest.mark.skipif(
+    sys.platform.startswith("linux") and not os.environ.get("DISPLAY"), reason="needs a display"
+)
+
+
+def create_counter_design(module_name="api_counter") -> fsm_api.Design:
+    design = fsm_api.Design(module_name, clock_signal_name="clk_i", reset_signal_name="res_i")
+    design.interface_ports = (
+        "clk_i : in std_logic;\nres_i : in std_logic;\nstart_i : in std_logic;\nready_o : out std_logic"
+    )
+    design.state_actions_default = "ready_o <= '0';"
+    idle = design.add_state("idle", 200, 100, comment="Waits for start_i")
+    running = design.add_state("running", 200, 300, action="ready_o <= '1';")
+    connector = design.add_connector(400, 200)
+    design.add_transition(design.add_reset_entry(50, 100), idle, condition="res_i='1'")
+    design.add_transition(idle, running, condition="start_i='1'")
+    design.add_transition(running, connector)
+    design.add_transition(connector, idle, condition="start_i='0'")
+    design.add_transition(connector, running)
+    return design
+
+
+@pytest.mark.api
+def test_design_is_converted_into_the_file_format():
+    design_dictionary = create_counter_design().to_dict()
+
+    assert design_dictionary["modulename"] == "api_counter"
+    assert len(design_dictionary["state"]) == 2
+    assert len(design_dictionary["rectangle"]) == 1
+    assert len(design_dictionary["polygon"]) == 1
+    assert len(design_dictionary["window_state_action_block"]) == 1
+    assert len(design_dictionary["window_state_comment"]) == 1
+    assert len(design_dictionary["window_state_actions_default"]) == 1
+    # Only transitions with condition or action (and the reset transition) get a condition&action block:
+    assert len(design_dictionary["window_condition_action_block"]) == 3
+    state_tags = {definition[1][0]: definition[1] for definition in design_dictionary["state"]}
+    assert "transition0_end" in state_tags["state1"]
+    assert "transition1_start" in state_tags["state1"]
+    assert "connection1_end" in state_tags["state2"]
+    assert "state1_comment_line_end" in state_tags["state1"]
+    transition_lines = [line for line in design_dictionary["line"] if line[1][0].startswith("transition")]
+    assert [line[1][:3] for line in transition_lines][0] == [
+        "transition0",
+        "coming_from_reset_entry",
+        "going_to_state1",
+    ]
+    json.dumps(design_dictionary)  # Must be serializable.
+
+
+@pytest.mark.api
+def test_priorities_are_assigned_in_the_order_of_insertion():
+    design = create_counter_design()
+    connector = design.nodes[2]
+
+    assert [t.priority for t in design.transitions if t.start is connector] == [1, 2]
+
+
+@pytest.mark.api
+def test_inconsistent_design_is_rejected():
+    design = fsm_api.Design("", language="VHDL")
+    first = design.add_state("s", 0, 0)
+    design.add_state("s", 100, 0)
+    design.add_transition(first, first)
+    design.add_transition(first, first, condition="a='1'")
+
+    errors = design.validate()
+
+    assert "No module name is specified" in errors
+    assert "The state name s is used by more than one state." in errors
+    assert "The design has no reset entry." in errors
+    assert "A transition starting at s with no condition hides a transition with lower priority." in errors
+    with pytest.raises(fsm_api.DesignError):
+        design.to_dict()
+
+
+@pytest.mark.api
+def test_second_reset_entry_is_rejected():
+    design = create_counter_design()
+
+    with pytest.raises(fsm_api.DesignError):
+        design.add_reset_entry(0, 0)
+
+
+@pytest.mark.api
+@needs_display
+def test_saved_design_is_generated_in_batch_mode(tmp_path):
+    design = create_counter_design()
+    design.generate_path = str(tmp_path)
+    design.save(tmp_path / "api_counter.hfe")
+
+    cmd = [
+        sys.executable,
+        str(SRC_DIR / "main.py"),
+        str(tmp_path / "api_counter.hfe"),
+        "--generate-hdl",
+        "--no-version-check",
+        "--no-message",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 0, f"Generation failed: {result.stdout}\n{result.stderr}"
+    assert (tmp_path / "api_counter.vhd").exists()
+
+
+@pytest.mark.api
+def test_generator_generates_variants_in_one_process(tmp_path):
+    script = (
+        "import sys\n"
+        "sys.path.insert(0, sys.argv[1])\n"
+        "sys.path.insert(0, sys.argv[2])\n"
+        "import fsm_api\n"
+        "from test_fsm_api import create_counter_design\n"
+        "with fsm_api.Generator() as generator:\n"
+        "    results = [generator.generate(create_counter_design(f'api_counter{i}'), sys.argv[3]) for i in range(3)]\n"
+        "sys.exit(0 if all(results) else 1)\n"
+    )
+    cmd = [sys.executable, "-c", script, str(SRC_DIR), str(Path(__file__).parent), str(tmp_path)]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, f"Generation failed: {result.stdout}\n{result.stderr}"
+    for number in range(3):
+        assert (tmp_path / f"api_counter{number}.vhd").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
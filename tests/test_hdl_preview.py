@@ -0,0 +1,29 @@
+"""
+Tests of the handling of the results of the live HDL preview (src/hdl_preview.py), which need no display.
+"""
+
+import compile_handling
+from hdl_preview import HdlPreview
+
+
+def test_failed_generation_is_shown_in_the_log_tab(monkeypatch):
+    log_texts = []
+    monkeypatch.setattr(compile_handling, "append_to_log", log_texts.append)
+    preview = HdlPreview()
+    preview._result_queue.put((preview._run_number, 1, "Error: state names are not unique\n", []))
+
+    preview._poll_result()
+
+    assert log_texts == ["Live HDL preview: The generation failed:\nError: state names are not unique\n"]
+    assert not preview.links_are_outdated
+
+
+def test_result_of_a_superseded_generation_is_ignored(monkeypatch):
+    log_texts = []
+    monkeypatch.setattr(compile_handling, "append_to_log", log_texts.append)
+    preview = HdlPreview()
+    preview._result_queue.put((preview._run_number - 1, 1, "Error of an old snapshot\n", []))
+
+    preview._poll_result()
+
+    assert log_texts == []
@@ -0,0 +1,65 @@
+"""
+Tests of the HDL generation from a headless diagram (src/headless_diagram.py), which needs no display.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import headless_diagram
+import tag_plausibility
+from codegen import hdl_generation
+
+TEST_INPUT_DIR = Path(__file__).parent / "test_input"
+DESIGNS_WHICH_CANNOT_BE_GENERATED = ("fifo_test_error.hfe",)
+
+
+def generate_headless(design_dictionary) -> bool:
+    with headless_diagram.installed(design_dictionary):
+        assert tag_plausibility.TagPlausibility().get_tag_status_is_okay()
+        return hdl_generation.run_hdl_generation(
+            write_to_file=True, is_script_mode=True, save_design=False, show_in_hdl_tab=False
+        )
+
+
+@pytest.mark.api
+@pytest.mark.parametrize("hfe_file", sorted(TEST_INPUT_DIR.glob("*.hfe")), ids=lambda hfe_file: hfe_file.stem)
+def test_headless_generation_writes_the_golden_files(hfe_file, tmp_path, test_output_dir):
+    design_dictionary = json.loads(hfe_file.read_text(encoding="utf-8"))
+    design_dictionary["generate_path"] = str(tmp_path)
+
+    success = generate_headless(design_dictionary)
+
+    if hfe_file.name in DESIGNS_WHICH_CANNOT_BE_GENERATED:
+        assert not success
+        assert not list(tmp_path.iterdir())
+        return
+    assert success
+    generated_files = sorted(tmp_path.iterdir())
+    assert generated_files
+    for generated_file in generated_files:
+        golden_file = test_output_dir / generated_file.name
+        assert generated_file.read_text(encoding="utf-8") == golden_file.read_text(encoding="utf-8"), golden_file.name
+
+
+@pytest.mark.api
+def test_texts_end_with_a_return_like_tk_text():
+    text = headless_diagram.HeadlessText("a <= b;")
+
+    assert text.get("1.0", "end") == "a <= b;\n"
+    assert text.get("1.0", "end - 1 chars") == "a <= b;"
+    assert text.get("1.0", "end-1 chars") == "a <= b;"
+
+
+@pytest.mark.api
+def test_project_manager_is_restored_after_the_generation(tmp_path):
+    from project_manager import project_manager
+
+    design_dictionary = json.loads((TEST_INPUT_DIR / "count10.hfe").read_text(encoding="utf-8"))
+    design_dictionary["generate_path"] = str(tmp_path)
+    canvas = project_manager.canvas
+
+    generate_headless(design_dictionary)
+
+    assert project_manager.canvas is canvas
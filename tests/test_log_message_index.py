@@ -0,0 +1,104 @@
+"""
+Tests of the index of the compiler messages in the log tab (src/log_message_index.py), which needs no display.
+"""
+
+import pytest
+
+from headless_diagram import HeadlessVariable
+from log_message_index import LogMessageIndex
+from project_manager import project_manager
+
+VHDL_LOG = "\n".join(
+    [
+        "ghdl -a top.vhd",  # 1
+        "top.vhd:12:5: error: signal 'a' is not declared",  # 2
+        "top.vhd:20:1:warning: process has no sensitivity list",  # 3
+        "running simulation",  # 4
+        "top.vhd:30:9:@0ms:(report note): counter started",  # 5
+        "top.vhd:41:3: error: ';' expected",  # 6
+        "Build failed with 1 error in the elaboration",  # 7
+    ]
+)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(project_manager, "language", HeadlessVariable("VHDL"))
+    return LogMessageIndex()
+
+
+def test_vhdl_message_gives_file_name_and_line_number(index):
+    index.rebuild(VHDL_LOG)
+
+    message = index.get_message(2)
+    assert message["file_name"] == "top.vhd"
+    assert message["file_line_number"] == 12
+    assert message["severity"] == "error"
+    assert message["text"] == "top.vhd:12:5: error: signal 'a' is not declared"
+    assert index.get_message(1) is None
+    assert index.get_message(4) is None
+
+
+def test_verilog_message_gives_file_name_and_line_number(index, monkeypatch):
+    monkeypatch.setattr(project_manager, "language", HeadlessVariable("Verilog"))
+
+    index.rebuild("iverilog top.v\ntop.v:7: syntax error\ntop.v:9: warning: implicit net\n12:58:36 done")
+
+    assert index.get_message(2)["file_name"] == "top.v"
+    assert index.get_message(2)["file_line_number"] == 7
+    assert index.get_message(3)["severity"] == "warning"
+    assert index.get_message(4) is None  # A time stamp is no message.
+
+
+def test_messages_are_classified(index):
+    assert index.get_severity("top.vhd:12:5: error: signal 'a' is not declared") == "error"
+    assert index.get_severity("top.vhd:20:1:warning: process has no sensitivity list") == "warning"
+    assert index.get_severity("top.vhd:30:9:@0ms:(report note): counter started") == "note"
+    assert index.get_severity("Build failed with 1 error in the elaboration") == "error"
+    assert index.get_severity("there is 1 warning in the log") == "warning"
+    assert index.get_severity("running simulation") is None
+
+
+def test_message_without_file_reference_has_no_link(index):
+    index.rebuild(VHDL_LOG)
+
+    message = index.get_message(7)
+    assert message["severity"] == "error"
+    assert message["file_name"] is None
+    assert message["file_line_number"] is None
+
+
+def test_next_and_previous_skip_notes(index):
+    index.rebuild(VHDL_LOG)
+
+    assert index.get_next_line_number(0, forward=True) == 2
+    assert index.get_next_line_number(2, forward=True) == 3
+    assert index.get_next_line_number(3, forward=True) == 6  # The note in line 5 is skipped.
+    assert index.get_next_line_number(6, forward=True) == 7
+    assert index.get_next_line_number(7, forward=True) is None
+    assert index.get_next_line_number(8, forward=False) == 7
+    assert index.get_next_line_number(6, forward=False) == 3
+    assert index.get_next_line_number(3, forward=False) == 2
+    assert index.get_next_line_number(2, forward=False) is None
+
+
+def test_navigation_follows_the_lines_removed_at_the_top(index):
+    index.rebuild(VHDL_LOG)
+
+    index.shift_lines(-2)  # The first 2 lines were trimmed, the message of line 2 is removed.
+
+    assert [line_number for line_number, _ in index.get_all_messages()] == [1, 3, 4, 5]
+    assert index.get_next_line_number(0, forward=True) == 1
+    assert index.get_next_line_number(1, forward=True) == 4
+    assert index.get_message(4)["file_line_number"] == 41
+
+
+def test_edited_regex_is_compiled_again(index, monkeypatch):
+    monkeypatch.setattr(project_manager, "regex_message_find_for_vhdl", "(.*?):([0-9]+):[0-9]+:.*")
+    first_regex = index.get_regex()
+    assert index.get_regex() is first_regex
+
+    monkeypatch.setattr(project_manager, "regex_message_find_for_vhdl", "([")
+
+    assert index.get_regex() is None
+    assert index.regex_error is not None
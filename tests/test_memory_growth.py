@@ -0,0 +1,38 @@
+"""
+Memory growth test for HDL-FSM-Editor.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+NUMBER_OF_CYCLES = 1000
+
+
+@pytest.mark.memory
+@pytest.mark.skipif(sys.platform.startswith("linux") and not os.environ.get("DISPLAY"), reason="needs a display")
+def test_memory_growth_is_bounded():
+    """Insert, edit, delete, undo and redo many times and check that the registries and the memory do not grow."""
+    cmd = [
+        sys.executable,
+        str(Path(__file__).parent.parent / "src" / "main.py"),
+        "--memory-stress-test",
+        str(NUMBER_OF_CYCLES),
+        "--no-version-check",
+        "--no-message",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800)
+    result_lines = [line for line in result.stdout.splitlines() if line.startswith('{"cycles"')]
+    assert result_lines, f"No result of the stress test found in output:\n{result.stdout}\n{result.stderr}"
+    stress_test_result = json.loads(result_lines[-1])
+    assert stress_test_result["counter_growth"] == {}, f"Registries have grown:\n{result.stdout}"
+    assert stress_test_result["memory_growth"] <= stress_test_result["max_memory_growth"], result.stdout
+    assert result.returncode == 0, f"Stress test failed: {result.stderr}"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,88 @@
+"""
+Tests of the group selection in the diagram (src/selection.py), they need a display.
+"""
+
+import pytest
+
+from tests.editor_process import TEST_INPUT_DIR, needs_display, run_in_editor
+
+
+@pytest.mark.gui
+@needs_display
+def test_each_window_kind_can_be_selected():
+    result = run_in_editor(
+        f"""
+        import file_handling
+        import selection
+        from elements import (
+            condition_action,
+            global_actions_clocked,
+            global_actions_combinatorial,
+            state_action,
+            state_actions_default,
+            state_comment,
+        )
+
+        file_handling.open_file_with_name({str(TEST_INPUT_DIR / "count10.hfe")!r}, is_script_mode=True)
+        project_manager.root.update()
+        for element_class in (
+            state_action.StateAction,
+            state_comment.StateComment,
+            condition_action.ConditionAction,
+            global_actions_clocked.GlobalActionsClocked,
+            global_actions_combinatorial.GlobalActionsCombinatorial,
+            state_actions_default.StateActionsDefault,
+        ):
+            window_id = next(iter(element_class.ref_dict))
+            selection.toggle(window_id)
+            assert selection.is_selected(window_id)
+            selection.toggle(window_id)
+            assert not selection.is_selected(window_id)
+            selection.toggle(window_id)
+            print("selected", element_class.__name__)
+        selection.clear()
+        assert selection.get_selected_ids() == []
+        print("done")
+        """
+    )
+
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    assert result.stdout.count("selected ") == 6
+    assert "done" in result.stdout
+
+
+@pytest.mark.gui
+@needs_display
+def test_selected_group_is_deleted_only_when_the_canvas_has_the_focus():
+    result = run_in_editor(
+        f"""
+        import canvas_delete
+        import file_handling
+        import selection
+        from elements import state
+
+        file_handling.open_file_with_name({str(TEST_INPUT_DIR / "count10.hfe")!r}, is_script_mode=True)
+        project_manager.root.deiconify()
+        project_manager.root.update()
+        state_ids = list(state.States.ref_dict)
+        for state_id in state_ids[:2]:
+            selection.toggle(state_id)
+        project_manager.interface_ports_text.focus_force()
+        project_manager.root.update()
+        canvas_delete.CanvasDelete()
+        print("states after delete in text:", len(state.States.ref_dict))
+        project_manager.root.update()
+        print("selection after focus in text:", len(selection.get_selected_ids()))
+        for state_id in state_ids[:2]:
+            selection.toggle(state_id)
+        project_manager.canvas.focus_force()
+        project_manager.root.update()
+        canvas_delete.CanvasDelete()
+        print("states after delete in canvas:", len(state.States.ref_dict))
+        """
+    )
+
+    assert result.returncode == 0, f"{result.stdout}\n{result.stderr}"
+    assert "states after delete in text: 3" in result.stdout
+    assert "selection after focus in text: 0" in result.stdout
+    assert "states after delete in canvas: 1" in result.stdout
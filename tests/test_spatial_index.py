@@ -0,0 +1,93 @@
+"""
+Tests of the grid index of the states and connectors (src/spatial_index.py), which needs no display.
+"""
+
+import pytest
+
+from spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def index():
+    return SpatialIndex(cell_size=80.0)
+
+
+def test_box_crossing_cell_boundaries_is_stored_in_all_its_cells(index):
+    index.insert(1, "state", (70, -10, 170, 90))
+
+    assert set(index.cell_dict) == {(0, -1), (1, -1), (2, -1), (0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1)}
+    assert index.get_kind(1) == "state"
+    assert index.get_bbox(1) == (70, -10, 170, 90)
+
+
+def test_query_finds_boxes_in_neighbouring_cells(index):
+    index.insert(1, "state", (60, 60, 100, 100))  # crosses the boundary at 80
+    index.insert(2, "connector", (-30, -30, -10, -10))  # in the cells with negative numbers
+    index.insert(3, "state", (400, 400, 440, 440))
+
+    assert sorted(index.find_overlapping(75, 75, 85, 85)) == [1]
+    assert sorted(index.find_overlapping(-20, -20, 70, 70)) == [1, 2]
+    assert sorted(index.find_overlapping(-100, -100, 500, 500)) == [1, 2, 3]
+    assert index.find_overlapping(200, 200, 300, 300) == []
+
+
+def test_query_checks_the_box_and_not_only_the_cell(index):
+    index.insert(1, "state", (10, 10, 20, 20))
+
+    assert index.find_overlapping(30, 30, 70, 70) == []  # Same cell, but no overlap.
+    assert index.find_overlapping(20, 20, 30, 30) == [1]  # Touching boxes overlap.
+
+
+def test_update_moves_the_box_into_other_cells(index):
+    index.insert(1, "state", (10, 10, 50, 50))
+
+    index.update(1, (250, 10, 290, 50))
+
+    assert index.find_overlapping(0, 0, 60, 60) == []
+    assert index.find_overlapping(240, 0, 300, 60) == [1]
+    assert set(index.cell_dict) == {(3, 0)}
+    assert index.get_kind(1) == "state"
+
+
+def test_update_ignores_items_which_are_not_indexed(index):
+    index.update(1, (10, 10, 50, 50))
+
+    assert index.get_bbox(1) is None
+    assert index.cell_dict == {}
+
+
+def test_remove_deletes_empty_cells(index):
+    index.insert(1, "state", (70, 70, 90, 90))
+    index.insert(2, "connector", (10, 10, 20, 20))
+
+    index.remove(1)
+    index.remove(1)  # Removing twice is allowed.
+
+    assert index.get_bbox(1) is None
+    assert index.get_kind(1) is None
+    assert set(index.cell_dict) == {(0, 0)}
+    assert index.find_overlapping(0, 0, 100, 100) == [2]
+
+
+def test_scale_on_zoom_scales_boxes_and_cells(index):
+    index.insert(1, "state", (60, 60, 100, 100))
+    index.insert(2, "connector", (200, 0, 220, 20))
+    cells_before_zoom = set(index.cell_dict)
+
+    index.scale(2.0)
+
+    assert index.cell_size == 160.0
+    assert index.get_bbox(1) == (120, 120, 200, 200)
+    assert index.get_kind(2) == "connector"
+    assert set(index.cell_dict) == cells_before_zoom  # The canvas is scaled around (0, 0).
+    assert index.find_overlapping(110, 110, 130, 130) == [1]
+    assert index.find_overlapping(60, 60, 100, 100) == []
+
+
+def test_clear_removes_all_items(index):
+    index.insert(1, "state", (10, 10, 50, 50))
+
+    index.clear()
+
+    assert index.find_overlapping(-1000, -1000, 1000, 1000) == []
+    assert index.get_bbox(1) is None
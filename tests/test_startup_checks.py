@@ -0,0 +1,118 @@
+"""
+Tests of the version and message checks at startup (src/main_window.py) against a local HTTP server.
+"""
+
+import http.server
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+import constants
+import main_window
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):  # noqa: N802 (name is defined by BaseHTTPRequestHandler)
+        _Handler.requests.append(self.path)
+        if self.path == "/slow":
+            time.sleep(1)
+        if self.path == "/index.php":
+            body = f"<p>Version {constants.VERSION} (released)</p>".encode()
+        else:
+            body = b"Hello from the server"
+        try:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # The client has closed the connection after its timeout.
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    _Handler.requests = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    cache_file_name = tmp_path / "startup_checks.json"
+    monkeypatch.setattr(main_window, "_CACHE_FILE_NAME", cache_file_name)
+    return cache_file_name
+
+
+def test_results_are_written_into_the_cache(server_url, cache_file):
+    assert main_window.check_version(server_url + "/index.php") == "Your version of HDL-FSM-Editor is up to date."
+    assert main_window.read_message(server_url + "/message.txt") == "Hello from the server"
+    cache = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert cache["version"]["url"] == server_url + "/index.php"
+    assert cache["version"]["version"] == constants.VERSION
+    assert cache["message"]["result"] == "Hello from the server"
+
+
+def test_cached_results_are_used_for_24_hours(server_url, cache_file):
+    main_window.read_message(server_url + "/message.txt")
+    assert main_window.read_message(server_url + "/message.txt") == "Hello from the server"
+    assert _Handler.requests == ["/message.txt"]
+
+    cache = json.loads(cache_file.read_text(encoding="utf-8"))
+    cache["message"]["time"] -= 24 * 60 * 60 + 1
+    cache_file.write_text(json.dumps(cache), encoding="utf-8")
+    assert main_window.read_message(server_url + "/message.txt") == "Hello from the server"
+    assert _Handler.requests == ["/message.txt", "/message.txt"]
+
+
+def test_cached_results_are_not_used_for_another_url(server_url, cache_file):
+    main_window.read_message(server_url + "/message.txt")
+    main_window.read_message(server_url + "/other_message.txt")
+    assert _Handler.requests == ["/message.txt", "/other_message.txt"]
+
+
+def test_checks_end_at_the_timeout(server_url, cache_file, monkeypatch):
+    monkeypatch.setattr(main_window, "_URL_TIMEOUT_S", 0.2)
+    start = time.perf_counter()
+    assert main_window.check_version(server_url + "/slow") == (
+        "HDL-FSM-Editor version could not be checked, as you are offline."
+    )
+    assert main_window.read_message(server_url + "/slow") == ""
+    assert time.perf_counter() - start < 1.5
+    assert not cache_file.exists()  # Failed checks are not cached.
+
+
+@pytest.mark.parametrize("read_message_result", [None, "", "Hello from the server"])
+def test_version_result_is_copied_into_the_log_tab_independent_of_the_message(read_message_result, monkeypatch):
+    copied_results = []
+    monkeypatch.setattr(main_window, "_copy_message_into_log_tab", copied_results.append)
+    result_queue = queue.Queue()
+    result_queue.put(("Your version of HDL-FSM-Editor is up to date.", read_message_result))
+
+    main_window._poll_startup_checks(result_queue)
+
+    expected_results = ["Your version of HDL-FSM-Editor is up to date."]
+    if read_message_result:
+        expected_results.append(read_message_result)
+    assert copied_results == [expected_results]
+
+
+def test_log_tab_is_not_built_without_results(monkeypatch):
+    copied_results = []
+    monkeypatch.setattr(main_window, "_copy_message_into_log_tab", copied_results.append)
+    result_queue = queue.Queue()
+    result_queue.put((None, ""))
+
+    main_window._poll_startup_checks(result_queue)
+
+    assert copied_results == []